@@ -6,6 +6,8 @@ Handles Beeminder API calls and beemergency logic
 import os
 import logging
 import asyncio
+import threading
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -29,6 +31,7 @@ class BeeminderGoal:
     pledge: float
     rate: float
     runits: str  # Rate units (e.g., "d" for daily)
+    losedate: Optional[int] = None  # Unix time of derailment, as reported by Beeminder
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -41,7 +44,8 @@ class BeeminderGoal:
             "derail_risk": self.derail_risk,
             "pledge": self.pledge,
             "rate": self.rate,
-            "runits": self.runits
+            "runits": self.runits,
+            "losedate": self.losedate
         }
 
 @dataclass
@@ -61,6 +65,54 @@ class BeeminderAPIError(Exception):
 
 from services.encryption_service import EncryptionService
 
+# Decrypted per-user credentials, shared by every client in the process so a
+# pooled (or freshly built) client skips the Neon round trip + AES-GCM decrypt.
+# {user_id: (expires_monotonic, username, auth_token)}
+CREDENTIAL_TTL_SECONDS = float(os.getenv("MECRIS_BEEMINDER_CREDENTIAL_TTL", "900"))
+_credential_cache: Dict[Optional[str], tuple] = {}
+_credential_lock = threading.Lock()
+
+
+def invalidate_credentials(user_id: Optional[str] = None) -> None:
+    """Forget cached credentials for user_id (all users when None)."""
+    with _credential_lock:
+        if user_id is None:
+            _credential_cache.clear()
+        else:
+            _credential_cache.pop(user_id, None)
+
+
+# Incremental goal mirror (users/{u}.json?diff_since=...)
+GOAL_FULL_REFRESH_SECONDS = float(os.getenv("MECRIS_BEEMINDER_FULL_REFRESH", "21600"))
+DIFF_SINCE_OVERLAP_SECONDS = 120
+
+
+def _diff_since_enabled() -> bool:
+    return os.getenv("MECRIS_BEEMINDER_DIFF_SINCE", "true").lower() not in ("0", "false", "no")
+
+
+def _goal_key(goal: Dict[str, Any]) -> str:
+    return str(goal.get("id") or goal.get("slug"))
+
+
+def _strip_datapoints(goal: Dict[str, Any]) -> Dict[str, Any]:
+    """diff_since responses embed datapoints; the mirror only keeps goal attributes."""
+    if "datapoints" not in goal:
+        return goal
+    return {k: v for k, v in goal.items() if k != "datapoints"}
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("MECRIS_BEEMINDER_HTTP2", "false").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("MECRIS_BEEMINDER_HTTP2 set but the h2 package is not installed; using HTTP/1.1")
+        return False
+
+
 class BeeminderClient:
     """Client for Beeminder API with derailment detection"""
     
@@ -71,11 +123,31 @@ class BeeminderClient:
         self.base_url = os.getenv("BEEMINDER_API_BASE", "https://www.beeminder.com/api/v1")
         self.encryption = EncryptionService()
         
-        # HTTP client with timeout
-        self.client = httpx.AsyncClient(timeout=15.0)
+        # HTTP client with timeout; keep-alive connections are reused while
+        # the client lives in services/beeminder_pool.py
+        self.client = httpx.AsyncClient(
+            timeout=15.0,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60.0),
+            http2=_http2_enabled(),
+        )
+        self.credentials_loaded_at: Optional[float] = None
+
+        # Local goal mirror refreshed incrementally via users/{u}.json?diff_since
+        # {goal id (or slug): raw goal dict without datapoints}
+        self._goal_mirror: Dict[str, Dict[str, Any]] = {}
+        self._mirror_synced_at: Optional[int] = None  # unix seconds the last sync started
+        self._mirror_full_at: Optional[float] = None  # monotonic time of the last full fetch
+        self._mirror_day: Optional[str] = None
 
     async def _load_credentials(self):
-        """Fetch and decrypt credentials from Neon."""
+        """Fetch and decrypt credentials from Neon (served from the TTL cache when fresh)."""
+        with _credential_lock:
+            cached = _credential_cache.get(self.user_id)
+        if cached and cached[0] > time.monotonic():
+            _, self.username, self.auth_token = cached
+            self.credentials_loaded_at = time.monotonic()
+            return
+
         # Avoid circular import
         from usage_tracker import UsageTracker
         tracker = UsageTracker()
@@ -126,6 +198,11 @@ class BeeminderClient:
                         )
 
                 if self.username and self.auth_token:
+                    self.credentials_loaded_at = time.monotonic()
+                    with _credential_lock:
+                        _credential_cache[self.user_id] = (
+                            self.credentials_loaded_at + CREDENTIAL_TTL_SECONDS, self.username, self.auth_token
+                        )
                     return
 
                 # Final fallback to env. Reaching here means DB credentials were absent
@@ -145,6 +222,19 @@ class BeeminderClient:
             logger.error(f"Failed to load Beeminder credentials: {e}")
             raise
 
+    def credentials_expired(self) -> bool:
+        """True once loaded credentials are older than CREDENTIAL_TTL_SECONDS."""
+        return (
+            self.credentials_loaded_at is not None
+            and time.monotonic() - self.credentials_loaded_at > CREDENTIAL_TTL_SECONDS
+        )
+
+    def forget_credentials(self):
+        """Drop loaded credentials so the next API call reloads them."""
+        self.username = None
+        self.auth_token = None
+        self.credentials_loaded_at = None
+
     async def health_check(self) -> str:
         """Check if Beeminder API is accessible"""
         if not self.username or not self.auth_token:
@@ -163,13 +253,13 @@ class BeeminderClient:
             logger.warning(f"Beeminder health check failed: {e}")
             return "unreachable"
     
-    async def _api_call(self, endpoint: str, method: str = "GET", data: Dict = None) -> Optional[Dict]:
+    async def _api_call(self, endpoint: str, method: str = "GET", data: Dict = None, query: Dict = None) -> Optional[Dict]:
         """Make authenticated API call to Beeminder"""
         if not self.username or not self.auth_token:
             await self._load_credentials()
             
         url = f"{self.base_url}/{endpoint}"
-        params = {"auth_token": self.auth_token}
+        params = {"auth_token": self.auth_token, **(query or {})}
         
         try:
             if method == "GET":
@@ -184,6 +274,10 @@ class BeeminderClient:
             if response.status_code != 200:
                 msg = f"Beeminder API call failed: {response.status_code} - {response.text}"
                 logger.error(msg)
+                if response.status_code == 401:
+                    # Token rotated or revoked: don't keep serving it from the cache
+                    invalidate_credentials(self.user_id)
+                    self.forget_credentials()
                 raise BeeminderAPIError(msg, status_code=response.status_code)
             
             return response.json()
@@ -194,12 +288,53 @@ class BeeminderClient:
             raise BeeminderAPIError(msg) from e
     
     async def get_user_goals(self) -> List[Dict[str, Any]]:
-        """Get all goals for the authenticated user"""
+        """Get all goals for the authenticated user (from the incrementally synced mirror)"""
         try:
-            result = await self._api_call(f"users/{self.username}/goals.json")
-            return result if result else []
+            if not _diff_since_enabled():
+                result = await self._api_call(f"users/{self.username}/goals.json")
+                return result if result else []
+            if self._mirror_needs_full_refresh():
+                await self._full_goal_refresh()
+            else:
+                await self._incremental_goal_refresh()
+            return list(self._goal_mirror.values())
         except BeeminderAPIError:
             return []
+
+    def _mirror_needs_full_refresh(self) -> bool:
+        # safebuf and friends are relative to "today", and goals that saw no
+        # change are not returned by diff_since, so re-baseline every new day
+        # and every GOAL_FULL_REFRESH_SECONDS.
+        return (
+            self._mirror_synced_at is None
+            or self._mirror_day != datetime.now().strftime("%Y-%m-%d")
+            or time.monotonic() - self._mirror_full_at > GOAL_FULL_REFRESH_SECONDS
+        )
+
+    async def _full_goal_refresh(self):
+        started = int(time.time())
+        result = await self._api_call(f"users/{self.username}/goals.json")
+        self._goal_mirror = {_goal_key(g): _strip_datapoints(g) for g in (result or [])}
+        self._mirror_synced_at = started
+        self._mirror_full_at = time.monotonic()
+        self._mirror_day = datetime.now().strftime("%Y-%m-%d")
+        logger.info(f"Beeminder goal mirror rebuilt for {self.username}: {len(self._goal_mirror)} goals")
+
+    async def _incremental_goal_refresh(self):
+        started = int(time.time())
+        # Overlap the window a little to absorb clock skew against Beeminder
+        since = self._mirror_synced_at - DIFF_SINCE_OVERLAP_SECONDS
+        result = await self._api_call(f"users/{self.username}.json", query={"diff_since": since}) or {}
+        changed = result.get("goals") or []
+        for goal in changed:
+            if isinstance(goal, dict):
+                self._goal_mirror[_goal_key(goal)] = _strip_datapoints(goal)
+        deleted_ids = {str(d.get("id")) for d in result.get("deleted_goals") or [] if isinstance(d, dict)}
+        for key in [k for k, g in self._goal_mirror.items() if str(g.get("id")) in deleted_ids]:
+            del self._goal_mirror[key]
+        self._mirror_synced_at = started
+        if changed or deleted_ids:
+            logger.info(f"Beeminder goal mirror for {self.username}: {len(changed)} changed, {len(deleted_ids)} deleted")
     
     async def get_goal_details(self, goal_slug: str) -> Optional[Dict[str, Any]]:
         """Get detailed information for specific goal"""
@@ -346,8 +481,10 @@ class BeeminderClient:
         else:
             return "SAFE"
     
-    def _calculate_deadline(self, safebuf: int) -> datetime:
-        """Calculate deadline based on safebuf"""
+    def _calculate_deadline(self, safebuf: int, losedate: Optional[int] = None) -> datetime:
+        """Derailment time from losedate when Beeminder reports it, else estimated from safebuf"""
+        if losedate:
+            return datetime.fromtimestamp(losedate)
         return datetime.now() + timedelta(days=safebuf)
     
     def _is_goal_active(self, goal_data: Dict[str, Any]) -> bool:
@@ -382,6 +519,10 @@ class BeeminderClient:
             safebuf = int(goal_data.get("safebuf", 0))
         except (ValueError, TypeError):
             safebuf = 0
+        try:
+            losedate = int(goal_data["losedate"]) if goal_data.get("losedate") else None
+        except (ValueError, TypeError):
+            losedate = None
         
         return BeeminderGoal(
             slug=goal_data.get("slug", ""),
@@ -389,11 +530,12 @@ class BeeminderClient:
             current_value=float(goal_data.get("curval", 0)),
             target_value=float(goal_data.get("goalval") or 0),
             safebuf=safebuf,
-            deadline=self._calculate_deadline(safebuf),
+            deadline=self._calculate_deadline(safebuf, losedate),
             derail_risk=self._classify_derail_risk(safebuf),
             pledge=float(goal_data.get("pledge", 0)),
             rate=float(goal_data.get("rate") or 0),
-            runits=goal_data.get("runits", "d")
+            runits=goal_data.get("runits", "d"),
+            losedate=losedate
         )
     
     async def get_all_goals(self) -> List[Dict[str, Any]]:
@@ -557,7 +699,8 @@ class BeeminderClient:
                 "runway": f"{goal.get('safebuf', 0)} days",
                 "rate": goal.get("rate", 0),
                 "runits": goal.get("runits", "d"),
-                "derail_risk": goal.get("derail_risk", "SAFE")
+                "derail_risk": goal.get("derail_risk", "SAFE"),
+                "losedate": goal.get("losedate")
             })
         
         # Add ob_mirror alert to runway info if detected
@@ -11,7 +11,7 @@ import json
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-import psycopg2
+from services.neon_pool import get_connection
 from psycopg2.extras import RealDictCursor
 import os
 
@@ -217,7 +217,7 @@ class BillingReconciliation:
         """Get estimated costs for a provider on a specific date."""
         if self.neon_url:
             try:
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             SELECT id, estimated_cost FROM provider_usage 
@@ -323,7 +323,7 @@ class BillingReconciliation:
         
         if self.neon_url:
             try:
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         for record in usage_records:
                             actual_cost = record["estimated_cost"] * scale_factor
@@ -347,7 +347,7 @@ class BillingReconciliation:
         
         if self.neon_url:
             try:
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             INSERT INTO reconciliation_jobs 
@@ -366,7 +366,7 @@ class BillingReconciliation:
         target_user_id = user_id or self.user_id
         if self.neon_url:
             try:
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         # Summary by provider
                         cur.execute("""
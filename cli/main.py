@@ -241,12 +241,15 @@ async def run_nag_trigger(args):
             }
             print(f"Payload: {json.dumps(check_result, indent=2)}")
         
-        send_result = await send_reminder_message(check_result, user_id)
+        send_result = await send_reminder_message(check_result, user_id, wait=True)
         print(f"Send result: {json.dumps(send_result, indent=2)}")
     else:
         print(f"Triggering normal reminder check for user_id='{user_id}'...")
         result = await trigger_reminder_check(user_id)
         print(json.dumps(result, indent=2))
+        # A queued reminder is delivered by a background worker; don't exit before it finishes
+        from services.delivery_queue import get_delivery_queue
+        await get_delivery_queue().drain(timeout=120)
 
 def run_presence(args):
     """Check for or take the presence lock."""
@@ -300,6 +303,29 @@ async def run_internal_presence(args):
         print(f"❌ Failed to report presence: {e}")
         sys.exit(1)
 
+def run_usage_import(args):
+    """Bulk-load historical usage sessions from a JSON or JSONL export."""
+    from usage_tracker import get_tracker, iter_usage_records
+    user_id = resolve_user_id(args)
+
+    if args.path != "-" and not os.path.exists(args.path):
+        print(f"❌ No such file: {args.path}")
+        return 1
+
+    verb = "Checking" if args.dry_run else "Importing"
+    print(f"{verb} usage sessions from {args.path} for user_id='{user_id}'...")
+    try:
+        stats = get_tracker().import_sessions(
+            iter_usage_records(args.path), user_id=user_id, batch_size=args.batch_size, dry_run=args.dry_run
+        )
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+        return 1
+
+    print(json.dumps(stats, indent=2))
+    print(f"✅ {stats['inserted']} session(s) {'would be ' if args.dry_run else ''}imported.")
+    return 0
+
 def _actual_main():
     parser = argparse.ArgumentParser(description="Mecris CLI - The Ground Truth")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
@@ -334,6 +360,15 @@ def _actual_main():
     trigger_parser = nag_subparsers.add_parser("trigger", help="Evaluate and send if needed")
     trigger_parser.add_argument("--force", action="store_true", help="Force send even if heuristic says no (dangerous)")
     
+    # --- Usage Subcommands ---
+    usage_parser = subparsers.add_parser("usage", help="Usage session tools")
+    usage_subparsers = usage_parser.add_subparsers(dest="usage_command")
+
+    import_parser = usage_subparsers.add_parser("import", help="Bulk-load sessions from a JSON array or JSONL file")
+    import_parser.add_argument("path", help="Export file (e.g. claude_usage.json), or - for stdin")
+    import_parser.add_argument("--batch-size", type=int, default=5000, help="Sessions per COPY batch")
+    import_parser.add_argument("--dry-run", action="store_true", help="Parse and dedupe without writing to Neon")
+
     args = parser.parse_args()
     
     setup_logging(args.verbose)
@@ -349,6 +384,11 @@ def _actual_main():
             asyncio.run(run_internal_presence(args))
         else:
             internal_parser.print_help()
+    elif args.command == "usage":
+        if args.usage_command == "import":
+            sys.exit(run_usage_import(args))
+        else:
+            usage_parser.print_help()
     elif args.command == "nag":
         if args.nag_command == "eval":
             asyncio.run(run_nag_eval(args))
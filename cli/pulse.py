@@ -173,10 +173,18 @@ def build_mock_context() -> Dict[str, Any]:
     }
 
 
+# Narrator context keys render_pulse reads; bookmarks, presence and the
+# budget governor summary are skipped.
+PULSE_SECTIONS = [
+    "summary", "urgent_items", "recommendations", "goal_runway", "budget_status",
+    "daily_walk_status", "system_pulse", "daily_aggregate_status", "vacation_mode",
+]
+
+
 async def run_pulse(user_id: str = None) -> None:
     """Fetch live context and render the dashboard."""
     from mcp_server import get_narrator_context
-    context = await get_narrator_context(user_id)
+    context = await get_narrator_context(user_id, sections=PULSE_SECTIONS)
     if context.get("error"):
         from rich.console import Console
         Console().print(f"[bold red]Error:[/bold red] {context['error']}")
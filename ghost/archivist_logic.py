@@ -2,6 +2,7 @@ import logging
 import asyncio
 from datetime import datetime, timezone
 from ghost.presence import PresenceRecord, get_neon_store, StatusType
+from services.reminder_fanout import fan_out, fanout_concurrency
 
 logger = logging.getLogger("mecris.ghost")
 
@@ -87,12 +88,14 @@ async def archivists_round_robin():
         return
 
     current_time = datetime.now(timezone.utc)
-    
-    for user_id in user_ids:
-        try:
-            record = store.get(user_id)
-            if record and should_ghost_wake_up(record, current_time):
-                logger.info(f"Archivist: Waking up for user {user_id}")
-                await perform_archival_sync(user_id)
-        except Exception as e:
-            logger.error(f"Archivist: Failed processing user {user_id}: {e}")
+
+    async def _archive(user_id):
+        record = store.get(user_id)
+        if record and should_ghost_wake_up(record, current_time):
+            logger.info(f"Archivist: Waking up for user {user_id}")
+            await perform_archival_sync(user_id)
+
+    outcomes = await fan_out(user_ids, _archive, fanout_concurrency())
+    for user_id, (result, _) in outcomes.items():
+        if isinstance(result, Exception):
+            logger.error(f"Archivist: Failed processing user {user_id}: {result}")
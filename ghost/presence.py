@@ -51,9 +51,11 @@ logger = logging.getLogger("mecris.presence")
 
 try:
     import psycopg2
+    from services.neon_pool import get_connection
     _PSYCOPG2_AVAILABLE = True
 except ImportError:
     psycopg2 = None
+    get_connection = None
     _PSYCOPG2_AVAILABLE = False
 
 
@@ -260,7 +262,7 @@ class NeonPresenceStore:
 
     def upsert(self, user_id: str, status_type: StatusType, source: str = "cli") -> PresenceRecord:
         """Upsert a presence record. Creates or overwrites the row for user_id."""
-        with psycopg2.connect(self.neon_url) as conn:
+        with get_connection(self.neon_url) as conn:
             with conn.cursor() as cur:
                 cur.execute(_UPSERT_SQL, (user_id, source, status_type.value, status_type.value, status_type.value))
                 row = cur.fetchone()
@@ -268,7 +270,7 @@ class NeonPresenceStore:
 
     def get(self, user_id: str) -> Optional[PresenceRecord]:
         """Return the current presence record for user_id, or None if absent."""
-        with psycopg2.connect(self.neon_url) as conn:
+        with get_connection(self.neon_url) as conn:
             with conn.cursor() as cur:
                 cur.execute(_GET_SQL, (user_id,))
                 row = cur.fetchone()
@@ -278,7 +280,7 @@ class NeonPresenceStore:
 
     def get_all_users(self) -> list[str]:
         """Return a list of all user_ids in the presence table."""
-        with psycopg2.connect(self.neon_url) as conn:
+        with get_connection(self.neon_url) as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT user_id FROM presence")
                 rows = cur.fetchall()
@@ -13,7 +13,7 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 import os
-import psycopg2
+from services.neon_pool import get_connection
 from psycopg2.extras import RealDictCursor
 
 logger = logging.getLogger("groq_odometer")
@@ -48,7 +48,7 @@ class GroqOdometerTracker:
             return user_id or self.user_id
             
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT pocket_id_sub FROM users WHERE familiar_id = %s", (user_id,))
                     row = cur.fetchone()
@@ -62,7 +62,7 @@ class GroqOdometerTracker:
     def init_database(self):
         """Initialize odometer tracking tables in Neon."""
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         CREATE TABLE IF NOT EXISTS groq_odometer_readings (
@@ -139,7 +139,7 @@ class GroqOdometerTracker:
             else:
                 record_timestamp = now
 
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         INSERT INTO groq_odometer_readings 
@@ -168,7 +168,7 @@ class GroqOdometerTracker:
         target_user_id = self.resolve_user_id(user_id)
         if not self.neon_url: return None
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute("""
                         SELECT timestamp, created_at, month, cumulative_value as value, is_final_reading as is_final, is_reset
@@ -198,7 +198,7 @@ class GroqOdometerTracker:
         if not self.neon_url: return
         now = datetime.now()
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("UPDATE groq_odometer_readings SET is_final_reading = TRUE WHERE month = %s AND user_id = %s", (month, user_id))
                     cur.execute("UPDATE groq_monthly_summaries SET total_cost = %s, finalized = TRUE, updated_at = %s WHERE month = %s AND user_id = %s", (final_value, now, month, user_id))
@@ -242,7 +242,7 @@ class GroqOdometerTracker:
             last_month = (now.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
             finalized = False
             try:
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("SELECT finalized FROM groq_monthly_summaries WHERE month = %s AND user_id = %s", (last_month, target_user_id))
                         row = cur.fetchone()
@@ -270,7 +270,7 @@ class GroqOdometerTracker:
         now = datetime.now()
         current_month = now.strftime("%Y-%m")
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT cumulative_value, timestamp FROM groq_odometer_readings WHERE month = %s AND user_id = %s ORDER BY timestamp DESC LIMIT 1", (current_month, target_user_id))
                     curr = cur.fetchone()
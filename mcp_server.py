@@ -74,9 +74,21 @@ from scripts.anthropic_cost_tracker import AnthropicCostTracker
 from scripts.clozemaster_scraper import sync_clozemaster_to_beeminder
 from services.weather_service import WeatherService
 from services.neon_sync_checker import NeonSyncChecker
-from services.reminder_service import ReminderService
+from services.reminder_service import ReminderService, REMINDER_CONTEXT_SECTIONS
+from services.reminder_fanout import ReminderFanout
+from services.delivery_queue import delivery_queue_enabled, delivery_queue_stats, get_delivery_queue, shutdown_delivery_queues
+from services.smart_nag import WalkHistogram
 from services.language_sync_service import LanguageSyncService
 from services.review_pump import ReviewPump, ARABIC_POINTS_PER_CARD
+from services.neon_pool import get_connection, pool_stats as neon_pool_stats
+from services.neon_async import AsyncNeonReader, close_async_pools
+from services.context_snapshot import context_snapshot, snapshot_cached
+from services.context_cache import context_cache
+from services.cache import get_cache, invalidate_user as invalidate_user_caches, cache_stats
+from services.cache_store import flush_persistent_caches, persistence_stats
+from services.beeminder_pool import beeminder_pool
+from services.singleflight import group as singleflight_group, singleflight, singleflight_stats
+from services.spend_queue import spend_queue_stats
 
 # Feature Flags - set these to 'true' in .env to enable
 ENABLE_OBSIDIAN = os.getenv("MECRIS_ENABLE_OBSIDIAN", "false").lower() == "true"
@@ -173,19 +185,25 @@ async def get_authorized_user(user_id: Optional[str] = Depends(get_current_user)
 
 @app.get("/health")
 async def health_check():
-    # Check Neon connectivity
+    # Check Neon connectivity (off the event loop)
     neon_active = False
-    try:
-        import psycopg2
-        conn = psycopg2.connect(os.getenv("NEON_DB_URL"))
-        conn.close()
-        neon_active = True
-    except: pass
+    if neon_reader.enabled:
+        neon_active = await neon_reader.ping()
+    else:
+        def _ping():
+            with get_connection(os.getenv("NEON_DB_URL")) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+        try:
+            await asyncio.to_thread(_ping)
+            neon_active = True
+        except: pass
     
     return {
         "status": "healthy",
         "home_server_active": True,
         "neon_connected": neon_active,
+        "neon_pool": neon_pool_stats(),
         "leader_pid": scheduler.process_id if scheduler else "unknown",
         "last_seen": datetime.now(timezone.utc).isoformat()
     }
@@ -193,7 +211,6 @@ async def health_check():
 @app.post("/walks")
 async def upload_walk(walk_data: Dict[str, Any], user_id: str = Depends(get_authorized_user)):
     try:
-        import psycopg2
         neon_url = os.getenv("NEON_DB_URL")
         
         # Encrypt gps_route_points if present and encryption is active
@@ -201,30 +218,35 @@ async def upload_walk(walk_data: Dict[str, Any], user_id: str = Depends(get_auth
         if gps_points != "0":
             gps_points = usage_tracker.encryption.try_encrypt(gps_points)
 
-        with psycopg2.connect(neon_url) as conn:
-            with conn.cursor() as cur:
-                # Mirror Rust logic: Insert as 'logging' status
-                cur.execute("""
-                    INSERT INTO walk_inferences 
-                    (user_id, start_time, end_time, step_count, distance_meters, distance_source, confidence_score, gps_route_points, status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'logging')
-                    ON CONFLICT (user_id, start_time) DO UPDATE SET 
-                        end_time = EXCLUDED.end_time, 
-                        step_count = EXCLUDED.step_count,
-                        distance_meters = EXCLUDED.distance_meters,
-                        gps_route_points = EXCLUDED.gps_route_points,
-                        status = 'logging'
-                """, (
-                    user_id,
-                    walk_data.get("start_time"),
-                    walk_data.get("end_time"),
-                    walk_data.get("step_count"),
-                    walk_data.get("distance_meters"),
-                    walk_data.get("distance_source"),
-                    walk_data.get("confidence_score", 0.9),
-                    gps_points,
-                    'logging'
-                ))
+        def _insert():
+            with get_connection(neon_url) as conn:
+                with conn.cursor() as cur:
+                    # Mirror Rust logic: Insert as 'logging' status
+                    cur.execute("""
+                        INSERT INTO walk_inferences 
+                        (user_id, start_time, end_time, step_count, distance_meters, distance_source, confidence_score, gps_route_points, status)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'logging')
+                        ON CONFLICT (user_id, start_time) DO UPDATE SET 
+                            end_time = EXCLUDED.end_time, 
+                            step_count = EXCLUDED.step_count,
+                            distance_meters = EXCLUDED.distance_meters,
+                            gps_route_points = EXCLUDED.gps_route_points,
+                            status = 'logging'
+                    """, (
+                        user_id,
+                        walk_data.get("start_time"),
+                        walk_data.get("end_time"),
+                        walk_data.get("step_count"),
+                        walk_data.get("distance_meters"),
+                        walk_data.get("distance_source"),
+                        walk_data.get("confidence_score", 0.9),
+                        gps_points,
+                        'logging'
+                    ))
+
+        await asyncio.to_thread(_insert)
+        invalidate_user_caches(user_id, namespaces=("daily_activity",), reason="walk upload")
+        record_walk_in_histogram(user_id, walk_data.get("start_time"))
         
         # Trigger immediate sync for this user
         asyncio.create_task(_global_walk_sync_job(user_id))
@@ -330,8 +352,13 @@ async def trigger_reminder_endpoint(user_id: str = Depends(get_authorized_user))
     return await trigger_reminder_check(user_id)
 
 @app.get("/narrator/context")
-async def narrator_context_endpoint(user_id: str = Depends(get_authorized_user)):
-    return await get_narrator_context(user_id)
+async def narrator_context_endpoint(sections: Optional[str] = None, user_id: str = Depends(get_authorized_user)):
+    """Optional ?sections=daily_walk_status,vacation_mode limits the context to those keys."""
+    try:
+        wanted = _normalize_sections(sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await get_narrator_context(user_id, sections=list(wanted) if wanted else None)
 
 @app.get("/beeminder/status")
 async def beeminder_status_endpoint(user_id: str = Depends(get_authorized_user)):
@@ -339,43 +366,44 @@ async def beeminder_status_endpoint(user_id: str = Depends(get_authorized_user))
 
 @app.get("/budget")
 async def get_budget_endpoint(user_id: str = Depends(get_authorized_user)):
-    status = get_budget_status(user_id)
+    status = await _neon_budget_status(user_id)
     return {"remaining_budget": status.get("remaining_budget", 0.0)}
 
 @app.get("/profile")
 async def get_profile(user_id: str = Depends(get_authorized_user)):
     try:
-        import psycopg2
         neon_url = os.getenv("NEON_DB_URL")
-        with psycopg2.connect(neon_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT phone_number_encrypted, beeminder_user, location_lat, location_lon, vacation_mode_until, autonomous_sync_enabled, phone_verified 
-                    FROM users WHERE pocket_id_sub = %s
-                """, (user_id,))
-                row = cur.fetchone()
-                if not row:
-                    return {
-                        "phone_number": None, "beeminder_user": None, "latitude": None, "longitude": None, 
-                        "vacation_mode_until": None, "autonomous_sync_enabled": True, "phone_verified": False
-                    }
+        def _fetch():
+            with get_connection(neon_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT phone_number_encrypted, beeminder_user, location_lat, location_lon, vacation_mode_until, autonomous_sync_enabled, phone_verified 
+                        FROM users WHERE pocket_id_sub = %s
+                    """, (user_id,))
+                    row = cur.fetchone()
+                    if not row:
+                        return {
+                            "phone_number": None, "beeminder_user": None, "latitude": None, "longitude": None, 
+                            "vacation_mode_until": None, "autonomous_sync_enabled": True, "phone_verified": False
+                        }
                 
-                # Decrypt phone number if present
-                phone_number = row[0]
-                if phone_number and usage_tracker.encryption.aesgcm:
-                    try:
-                        phone_number = usage_tracker.encryption.decrypt(phone_number)
-                    except: pass
+                    # Decrypt phone number if present
+                    phone_number = row[0]
+                    if phone_number and usage_tracker.encryption.aesgcm:
+                        try:
+                            phone_number = usage_tracker.encryption.decrypt(phone_number)
+                        except: pass
 
-                return {
-                    "phone_number": phone_number,
-                    "beeminder_user": row[1],
-                    "latitude": float(row[2]) if row[2] else None,
-                    "longitude": float(row[3]) if row[3] else None,
-                    "vacation_mode_until": row[4].isoformat() if row[4] else None,
-                    "autonomous_sync_enabled": bool(row[5]),
-                    "phone_verified": bool(row[6])
-                }
+                    return {
+                        "phone_number": phone_number,
+                        "beeminder_user": row[1],
+                        "latitude": float(row[2]) if row[2] else None,
+                        "longitude": float(row[3]) if row[3] else None,
+                        "vacation_mode_until": row[4].isoformat() if row[4] else None,
+                        "autonomous_sync_enabled": bool(row[5]),
+                        "phone_verified": bool(row[6])
+                    }
+        return await asyncio.to_thread(_fetch)
     except Exception as e:
         logger.error(f"Profile fetch failed: {e}")
         return {"error": str(e)}
@@ -383,7 +411,6 @@ async def get_profile(user_id: str = Depends(get_authorized_user)):
 @app.post("/profile")
 async def update_profile_endpoint(request: Dict[str, Any], user_id: str = Depends(get_authorized_user)):
     try:
-        import psycopg2
         neon_url = os.getenv("NEON_DB_URL")
         
         # Extract fields
@@ -398,35 +425,41 @@ async def update_profile_endpoint(request: Dict[str, Any], user_id: str = Depend
         if phone and usage_tracker.encryption.aesgcm:
             phone = usage_tracker.encryption.encrypt(phone)
 
-        with psycopg2.connect(neon_url) as conn:
-            with conn.cursor() as cur:
-                # Update users table
-                updates = []
-                params = []
-                if phone is not None:
-                    updates.append("phone_number_encrypted = %s")
-                    params.append(phone)
-                    # Reset verification if phone changed? 
-                    # For now we'll just let the user verify again.
-                if beeminder_user is not None:
-                    updates.append("beeminder_user = %s")
-                    params.append(beeminder_user)
-                if lat is not None:
-                    updates.append("location_lat = %s")
-                    params.append(lat)
-                if lon is not None:
-                    updates.append("location_lon = %s")
-                    params.append(lon)
-                if vacation_until is not None:
-                    updates.append("vacation_mode_until = %s")
-                    params.append(vacation_until)
-                if auto_sync is not None:
-                    updates.append("autonomous_sync_enabled = %s")
-                    params.append(auto_sync)
+        def _update():
+            with get_connection(neon_url) as conn:
+                with conn.cursor() as cur:
+                    # Update users table
+                    updates = []
+                    params = []
+                    if phone is not None:
+                        updates.append("phone_number_encrypted = %s")
+                        params.append(phone)
+                        # Reset verification if phone changed? 
+                        # For now we'll just let the user verify again.
+                    if beeminder_user is not None:
+                        updates.append("beeminder_user = %s")
+                        params.append(beeminder_user)
+                    if lat is not None:
+                        updates.append("location_lat = %s")
+                        params.append(lat)
+                    if lon is not None:
+                        updates.append("location_lon = %s")
+                        params.append(lon)
+                    if vacation_until is not None:
+                        updates.append("vacation_mode_until = %s")
+                        params.append(vacation_until)
+                    if auto_sync is not None:
+                        updates.append("autonomous_sync_enabled = %s")
+                        params.append(auto_sync)
                 
-                if updates:
-                    params.append(user_id)
-                    cur.execute(f"UPDATE users SET {', '.join(updates)} WHERE pocket_id_sub = %s", tuple(params))
+                    if updates:
+                        params.append(user_id)
+                        cur.execute(f"UPDATE users SET {', '.join(updates)} WHERE pocket_id_sub = %s", tuple(params))
+        await asyncio.to_thread(_update)
+
+        if beeminder_user is not None:
+            beeminder_pool.evict(user_id)
+        invalidate_user_caches(user_id, namespaces=("user_prefs",), reason="profile update")
         
         return {"status": "success", "message": "Profile updated"}
     except Exception as e:
@@ -447,25 +480,27 @@ async def request_phone_verification_endpoint(request: Dict[str, Any], user_id:
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=15)
     
     try:
-        import psycopg2
         neon_url = os.getenv("NEON_DB_URL")
-        with psycopg2.connect(neon_url) as conn:
-            with conn.cursor() as cur:
-                # Upsert into phone_verifications
-                cur.execute("""
-                    INSERT INTO phone_verifications (user_id, code_hash, expires_at)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (user_id) DO UPDATE SET 
-                        code_hash = EXCLUDED.code_hash, 
-                        expires_at = EXCLUDED.expires_at, 
-                        attempts = 0
-                """, (user_id, code_hash, expires_at))
+        def _store():
+            with get_connection(neon_url) as conn:
+                with conn.cursor() as cur:
+                    # Upsert into phone_verifications
+                    cur.execute("""
+                        INSERT INTO phone_verifications (user_id, code_hash, expires_at)
+                        VALUES (%s, %s, %s)
+                        ON CONFLICT (user_id) DO UPDATE SET 
+                            code_hash = EXCLUDED.code_hash, 
+                            expires_at = EXCLUDED.expires_at, 
+                            attempts = 0
+                    """, (user_id, code_hash, expires_at))
                 
-                # Also update user's phone number (encrypted)
-                enc_phone = phone
-                if usage_tracker.encryption.aesgcm:
-                    enc_phone = usage_tracker.encryption.encrypt(phone)
-                cur.execute("UPDATE users SET phone_number_encrypted = %s, phone_verified = false WHERE pocket_id_sub = %s", (enc_phone, user_id))
+                    # Also update user's phone number (encrypted)
+                    enc_phone = phone
+                    if usage_tracker.encryption.aesgcm:
+                        enc_phone = usage_tracker.encryption.encrypt(phone)
+                    cur.execute("UPDATE users SET phone_number_encrypted = %s, phone_verified = false WHERE pocket_id_sub = %s", (enc_phone, user_id))
+        await asyncio.to_thread(_store)
+        invalidate_user_caches(user_id, namespaces=("user_prefs",), reason="phone change")
         
         # Send Verification Code via WhatsApp Template (reliable delivery)
         try:
@@ -499,29 +534,30 @@ async def confirm_phone_verification_endpoint(request: Dict[str, Any], user_id:
     provided_hash = hashlib.sha1(code.encode()).hexdigest()
     
     try:
-        import psycopg2
         neon_url = os.getenv("NEON_DB_URL")
-        with psycopg2.connect(neon_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT code_hash, expires_at, attempts FROM phone_verifications WHERE user_id = %s", (user_id,))
-                row = cur.fetchone()
-                if not row:
-                    raise HTTPException(status_code=404, detail="No pending verification found")
+        def _confirm():
+            with get_connection(neon_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT code_hash, expires_at, attempts FROM phone_verifications WHERE user_id = %s", (user_id,))
+                    row = cur.fetchone()
+                    if not row:
+                        raise HTTPException(status_code=404, detail="No pending verification found")
                 
-                stored_hash, expires_at, attempts = row
-                if attempts >= 5:
-                    raise HTTPException(status_code=401, detail="Too many attempts")
+                    stored_hash, expires_at, attempts = row
+                    if attempts >= 5:
+                        raise HTTPException(status_code=401, detail="Too many attempts")
                 
-                if datetime.now(timezone.utc) > expires_at:
-                    raise HTTPException(status_code=401, detail="Code expired")
+                    if datetime.now(timezone.utc) > expires_at:
+                        raise HTTPException(status_code=401, detail="Code expired")
                 
-                if provided_hash != stored_hash:
-                    cur.execute("UPDATE phone_verifications SET attempts = attempts + 1 WHERE user_id = %s", (user_id,))
-                    raise HTTPException(status_code=401, detail="Invalid code")
+                    if provided_hash != stored_hash:
+                        cur.execute("UPDATE phone_verifications SET attempts = attempts + 1 WHERE user_id = %s", (user_id,))
+                        raise HTTPException(status_code=401, detail="Invalid code")
                 
-                # Success!
-                cur.execute("UPDATE users SET phone_verified = true WHERE pocket_id_sub = %s", (user_id,))
-                cur.execute("DELETE FROM phone_verifications WHERE user_id = %s", (user_id,))
+                    # Success!
+                    cur.execute("UPDATE users SET phone_verified = true WHERE pocket_id_sub = %s", (user_id,))
+                    cur.execute("DELETE FROM phone_verifications WHERE user_id = %s", (user_id,))
+        await asyncio.to_thread(_confirm)
         
         return {"status": "success", "message": "Phone number verified"}
     except HTTPException:
@@ -550,6 +586,7 @@ from scheduler import MecrisScheduler, _global_walk_sync_job
 obsidian_client = ObsidianMCPClient()
 default_beeminder_client = BeeminderClient()
 neon_checker = NeonSyncChecker()
+neon_reader = AsyncNeonReader(neon_checker.db_url)
 language_sync_service = LanguageSyncService(default_beeminder_client)
 # Trackers will use DEFAULT_USER_ID from env if not specified
 usage_tracker = UsageTracker()
@@ -564,37 +601,93 @@ except Exception as e:
     anthropic_cost_tracker = None
 
 # --- Cache Implementation ---
-daily_activity_cache = {}
-# Multi-tenant cache: {user_id: {"data": [...], "cache_expires": ...}}
-beeminder_goals_cache: Dict[str, Dict[str, Any]] = {}
+# Bounded TTL+LRU caches (services/cache.py); stats via get_cache_stats.
+# Goals refresh incrementally (diff_since) on the pooled client, so the TTL
+# can stay short without re-downloading the whole portfolio.
+BEEMINDER_GOALS_TTL = float(os.getenv("MECRIS_BEEMINDER_GOALS_TTL", "120"))
+# {"user:goal:YYYY-MM-DD": {"has_activity_today", "source", "last_check"}}
+daily_activity_cache = get_cache("daily_activity", max_size=1024, ttl=15 * 60, persist=True)
+# {user_id: [goal dicts]}
+beeminder_goals_cache = get_cache("beeminder_goals", max_size=256, ttl=BEEMINDER_GOALS_TTL, persist=True)
+# {"user:walk_histogram:YYYY-MM-DD": WalkHistogram}; new walks are folded in, not refetched
+walk_histogram_cache = get_cache("walk_histogram", max_size=1024, ttl=24 * 3600)
+
+# --- Neon read path ---
+# Hot reads run natively on the event loop via asyncpg (services/neon_async.py);
+# without asyncpg (or with MECRIS_NEON_ASYNC=false) they fall back to the
+# psycopg2 classes in a worker thread.
+# @snapshot_cached memoizes a source for the duration of an active
+# context_snapshot (one reminder tick), so nested callers share one fetch.
+# @singleflight coalesces concurrent calls across callers (services/singleflight.py).
+
+@snapshot_cached("neon_has_walk_today")
+async def _neon_has_walk_today(user_id: str) -> bool:
+    if neon_reader.enabled:
+        return await neon_reader.has_walk_today(user_id)
+    return await asyncio.to_thread(neon_checker.has_walk_today, user_id)
+
+@snapshot_cached("neon_latest_walk")
+async def _neon_latest_walk(user_id: str) -> Optional[Dict[str, Any]]:
+    if neon_reader.enabled:
+        return await neon_reader.get_latest_walk(user_id)
+    return await asyncio.to_thread(neon_checker.get_latest_walk, user_id)
+
+@snapshot_cached("neon_language_stats")
+@singleflight("neon_language_stats")
+async def _neon_language_stats(user_id: str) -> Dict[str, Any]:
+    if neon_reader.enabled:
+        return await neon_reader.get_language_stats(user_id)
+    return await asyncio.to_thread(neon_checker.get_language_stats, user_id)
+
+@snapshot_cached("neon_notification_prefs")
+async def _neon_notification_prefs(user_id: str) -> Dict[str, Any]:
+    if neon_reader.enabled:
+        return await neon_reader.get_notification_prefs(user_id)
+    return await asyncio.to_thread(neon_checker.get_notification_prefs, user_id)
+
+@snapshot_cached("neon_budget_status")
+@singleflight("neon_budget_status")
+async def _neon_budget_status(user_id: str) -> Dict[str, Any]:
+    if neon_reader.enabled:
+        return await neon_reader.get_budget_status(user_id)
+    return await asyncio.to_thread(usage_tracker.get_budget_status, user_id)
+
+@snapshot_cached("neon_goals")
+async def _neon_goals(user_id: str) -> List[Dict[str, Any]]:
+    if neon_reader.enabled:
+        return await neon_reader.get_goals(user_id)
+    return await asyncio.to_thread(usage_tracker.get_goals, user_id)
+
+@snapshot_cached("weather")
+async def _get_weather() -> Dict[str, Any]:
+    # Global, so a fan-out tick fetches it once for every user. WeatherService caches for an hour; coalesce the refill when it expires
+    return await singleflight_group("weather").do("current", lambda: asyncio.to_thread(weather_service.get_weather))
 
 def get_user_beeminder_client(user_id: str = None) -> BeeminderClient:
-    """Return a BeeminderClient for the specific user."""
+    """Return the pooled BeeminderClient for the specific user."""
     target_user_id = usage_tracker.resolve_user_id(user_id)
-    return BeeminderClient(user_id=target_user_id)
+    return beeminder_pool.get(target_user_id)
 
+@snapshot_cached("beeminder_goals")
 async def get_cached_beeminder_goals(user_id: str = None) -> List[Dict[str, Any]]:
-    """Get Beeminder goals with 30-minute cache per user."""
+    """Get Beeminder goals with a short (MECRIS_BEEMINDER_GOALS_TTL) cache per user."""
     target_user_id = usage_tracker.resolve_user_id(user_id)
-    now = datetime.now()
-    
-    user_cache = beeminder_goals_cache.get(target_user_id, {})
-    if ("data" in user_cache and "cache_expires" in user_cache and now < user_cache["cache_expires"]):
-        return user_cache["data"]
+
+    cached = beeminder_goals_cache.get(target_user_id)
+    if cached is not None:
+        return cached
     
     try:
         client = get_user_beeminder_client(target_user_id)
-        goals_data = await client.get_all_goals()
-        beeminder_goals_cache[target_user_id] = {
-            "data": goals_data, 
-            "last_check": now, 
-            "cache_expires": now + timedelta(minutes=30)
-        }
+        # Concurrent misses for this user share one Beeminder fetch
+        goals_data = await singleflight_group("beeminder_goals").do(target_user_id, client.get_all_goals)
+        beeminder_goals_cache.set(target_user_id, goals_data)
         return goals_data
     except Exception as e:
         logger.error(f"Failed to fetch Beeminder goals for user {target_user_id}: {e}")
-        return user_cache.get("data", [])
+        return beeminder_goals_cache.get_stale(target_user_id, [])
 
+@snapshot_cached("daily_activity")
 async def get_cached_daily_activity(goal_slug: str = "bike", user_id: str = None) -> Dict[str, Any]:
     """Get daily activity status with 15-minute cache (refreshed for Cloud sync)."""
     target_user_id = usage_tracker.resolve_user_id(user_id)
@@ -605,58 +698,60 @@ async def get_cached_daily_activity(goal_slug: str = "bike", user_id: str = None
     
     cache_key = f"{target_user_id}:{goal_slug}:{today_str}"
     
-    if cache_key in daily_activity_cache:
-        cache_entry = daily_activity_cache[cache_key]
-        if local_now < cache_entry["cache_expires"]:
-            return {
-                "goal_slug": goal_slug, 
-                "has_activity_today": cache_entry["has_activity_today"], 
-                "status": "completed" if cache_entry["has_activity_today"] else "needed", 
-                "source": cache_entry.get("source", "cache"),
-                "cached": True
-            }
+    cache_entry = daily_activity_cache.get(cache_key)
+    if cache_entry is not None:
+        return {
+            "goal_slug": goal_slug, 
+            "has_activity_today": cache_entry["has_activity_today"], 
+            "status": "completed" if cache_entry["has_activity_today"] else "needed", 
+            "source": cache_entry.get("source", "cache"),
+            "cached": True
+        }
 
-    try:
-        # Phase 2: Check Neon Cloud DB first for 'bike' (walks)
-        if goal_slug == "bike":
-            has_walk = await asyncio.to_thread(neon_checker.has_walk_today, target_user_id)
-            if has_walk:
-                latest = await asyncio.to_thread(neon_checker.get_latest_walk, target_user_id)
-                walk_info = f" (Steps: {latest['step_count']})" if latest else ""
-                activity_status = {
-                    "goal_slug": goal_slug,
-                    "has_activity_today": True,
-                    "status": "completed",
-                    "check_time": local_now.isoformat(),
-                    "message": f"✅ Walk detected in Cloud Sync (Neon){walk_info}",
-                    "source": "neon_cloud"
-                }
-                daily_activity_cache[cache_key] = {
-                    "last_check": local_now, 
-                    "has_activity_today": True, 
-                    "cache_expires": local_now + timedelta(minutes=15),
-                    "source": "neon_cloud"
-                }
-                activity_status["cached"] = False
-                return activity_status
+    # Concurrent misses for the same user/goal/day share one Neon/Beeminder check
+    async def _refresh() -> Dict[str, Any]:
+        try:
+            # Phase 2: Check Neon Cloud DB first for 'bike' (walks)
+            if goal_slug == "bike":
+                has_walk = await _neon_has_walk_today(target_user_id)
+                if has_walk:
+                    latest = await _neon_latest_walk(target_user_id)
+                    walk_info = f" (Steps: {latest['step_count']})" if latest else ""
+                    activity_status = {
+                        "goal_slug": goal_slug,
+                        "has_activity_today": True,
+                        "status": "completed",
+                        "check_time": local_now.isoformat(),
+                        "message": f"✅ Walk detected in Cloud Sync (Neon){walk_info}",
+                        "source": "neon_cloud"
+                    }
+                    daily_activity_cache.set(cache_key, {
+                        "last_check": local_now, 
+                        "has_activity_today": True, 
+                        "source": "neon_cloud"
+                    }, ttl=15 * 60)
+                    activity_status["cached"] = False
+                    return activity_status
+
+            # Fallback to Beeminder (Legacy or non-walk goals)
+            client = get_user_beeminder_client(target_user_id)
+            activity_status = await client.get_daily_activity_status(goal_slug)
+            daily_activity_cache.set(cache_key, {
+                "last_check": local_now, 
+                "has_activity_today": activity_status["has_activity_today"], 
+                "source": "beeminder"
+            }, ttl=(15 if goal_slug == "bike" else 60) * 60)
+            activity_status["cached"] = False
+            activity_status["source"] = "beeminder"
+            return activity_status
+        except Exception as e:
+            logger.error(f"Failed to fetch daily activity for {goal_slug}: {e}")
+            stale = daily_activity_cache.get_stale(cache_key)
+            if stale is not None:
+                return {"goal_slug": goal_slug, "has_activity_today": stale["has_activity_today"], "status": "stale", "error": str(e)}
+            return {"goal_slug": goal_slug, "has_activity_today": False, "status": "unknown", "error": str(e)}
 
-        # Fallback to Beeminder (Legacy or non-walk goals)
-        client = get_user_beeminder_client(target_user_id)
-        activity_status = await client.get_daily_activity_status(goal_slug)
-        daily_activity_cache[cache_key] = {
-            "last_check": local_now, 
-            "has_activity_today": activity_status["has_activity_today"], 
-            "cache_expires": local_now + timedelta(minutes=15 if goal_slug == "bike" else 60),
-            "source": "beeminder"
-        }
-        activity_status["cached"] = False
-        activity_status["source"] = "beeminder"
-        return activity_status
-    except Exception as e:
-        logger.error(f"Failed to fetch daily activity for {goal_slug}: {e}")
-        if cache_key in daily_activity_cache:
-            return {"goal_slug": goal_slug, "has_activity_today": daily_activity_cache[cache_key]["has_activity_today"], "status": "stale", "error": str(e)}
-        return {"goal_slug": goal_slug, "has_activity_today": False, "status": "unknown", "error": str(e)}
+    return await singleflight_group("daily_activity").do(cache_key, _refresh)
 
 # --- Tool Implementations ---
 
@@ -702,86 +797,212 @@ def _enrich_bookmarks_for_narrator(goals: List[Dict[str, Any]]) -> List[Dict[str
     return results
 
 
+def _completed(value: Any) -> asyncio.Future:
+    """An already-resolved future standing in for a skipped narrator source."""
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
+
+
+# Per-source deadlines for get_narrator_context (seconds). Sources not listed
+# use MECRIS_NARRATOR_SOURCE_TIMEOUT. A source that misses its deadline
+# degrades to an empty/default value instead of stalling the whole context.
+NARRATOR_SOURCE_TIMEOUT = float(os.getenv("MECRIS_NARRATOR_SOURCE_TIMEOUT", "8"))
+NARRATOR_SOURCE_TIMEOUTS: Dict[str, float] = {
+    "beeminder_goals": 10.0,
+    "emergencies": 12.0,
+    "goal_runway": 12.0,
+    "daily_aggregate": 12.0,
+    "weather": 5.0,
+    "presence": 3.0,
+    "related_bookmarks": 12.0,
+}
+
+
+# Sections of the narrator context (its output keys) -> the sources each one
+# reads. A caller passing `sections` only pays for the union of these;
+# degraded_sources and last_updated are always included.
+NARRATOR_SECTION_SOURCES: Dict[str, frozenset] = {
+    "summary": frozenset({"goals", "todos", "beeminder_goals", "budget_status"}),
+    "goals_status": frozenset({"goals"}),
+    "urgent_items": frozenset({"beeminder_goals", "budget_status", "daily_walk_status", "user_prefs", "weather", "groq_context"}),
+    "beeminder_alerts": frozenset({"emergencies"}),
+    "goal_runway": frozenset({"goal_runway"}),
+    "budget_status": frozenset({"budget_status"}),
+    "recommendations": frozenset({
+        "todos", "beeminder_goals", "budget_status", "daily_aggregate", "lang_stats",
+        "user_prefs", "daily_walk_status", "weather", "groq_context", "presence",
+    }),
+    "daily_walk_status": frozenset({"daily_walk_status"}),
+    "latest_cloud_walk": frozenset({"latest_cloud_walk"}),
+    "daily_aggregate_status": frozenset({"daily_aggregate"}),
+    "system_pulse": frozenset(),
+    "vacation_mode": frozenset({"user_prefs"}),
+    "time_window_start": frozenset({"user_prefs"}),
+    "time_window_end": frozenset({"user_prefs"}),
+    "greek_backlog_boost": frozenset({"lang_stats"}),
+    "greek_backlog_cards": frozenset({"lang_stats"}),
+    "budget_governor": frozenset(),
+    "presence": frozenset({"presence"}),
+    "presence_status": frozenset({"presence"}),
+    "related_bookmarks": frozenset({"related_bookmarks"}),
+}
+# Sources that need the shared Beeminder goals fetch
+_BEEMINDER_DEPENDENTS = frozenset({"beeminder_goals", "emergencies", "goal_runway", "related_bookmarks"})
+
+
+def _normalize_sections(sections: Optional[List[str]]) -> Optional[tuple]:
+    """Sorted, de-duplicated section tuple (None = everything); raises ValueError on unknown names."""
+    if not sections:
+        return None
+    if isinstance(sections, str):
+        sections = sections.split(",")
+    wanted = {s.strip() for s in sections if s and s.strip()}
+    unknown = wanted - NARRATOR_SECTION_SOURCES.keys()
+    if unknown:
+        raise ValueError(f"Unknown narrator sections: {sorted(unknown)}. Valid: {sorted(NARRATOR_SECTION_SOURCES)}")
+    return tuple(sorted(wanted)) or None
+
+
+async def _narrator_source(name: str, coro, default: Any, degraded: Dict[str, str]) -> Any:
+    """Await one narrator source under its deadline; record and default on timeout/error."""
+    timeout = NARRATOR_SOURCE_TIMEOUTS.get(name, NARRATOR_SOURCE_TIMEOUT)
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"get_narrator_context: {name} timed out after {timeout:.1f}s; returning partial context")
+        degraded[name] = "timeout"
+    except Exception as e:
+        logger.error(f"get_narrator_context: {name} failed: {e}")
+        degraded[name] = f"error: {e}"
+    return default
+
+
 @mcp.tool(description="Get unified strategic context with goals, budget, and recommendations.")
-async def get_narrator_context(user_id: str = None) -> Dict[str, Any]:
-    """Get unified strategic context with goals, budget, and recommendations."""
+@snapshot_cached("narrator_context")
+async def get_narrator_context(user_id: str = None, sections: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get unified strategic context with goals, budget, and recommendations.
+
+    Pass `sections` (context keys, e.g. ["daily_walk_status", "vacation_mode"])
+    to build only those; sources no requested section reads are skipped.
+    """
+    return await _narrator_context(user_id, sections)
+
+async def _narrator_context(user_id: Optional[str], sections: Optional[List[str]], allow_stale: bool = True) -> Dict[str, Any]:
     target_user_id = resolve_target_user(user_id)
     if not target_user_id:
         return {
             "error": "Authentication Required",
             "instruction": "Please run `mecris login` in your terminal to authenticate."
         }
+    try:
+        wanted = _normalize_sections(sections)
+    except ValueError as e:
+        return {"error": str(e)}
     await _record_presence(target_user_id)
+    namespace = "narrator" if wanted is None else "narrator:" + ",".join(wanted)
+    return await context_cache.get(namespace, target_user_id, lambda: _build_narrator_context(target_user_id, wanted),
+                                   allow_stale=allow_stale)
+
+async def _build_narrator_context(target_user_id: str, sections: Optional[tuple] = None) -> Dict[str, Any]:
     try:
-        goals = usage_tracker.get_goals(target_user_id)
-        active_goals = [g for g in goals if g.get("status") == "active"]
-        
-        todos = []
-        if ENABLE_OBSIDIAN:
-            try:
-                todos = await obsidian_client.get_todos()
-            except Exception as e:
-                logger.warning(f"Failed to fetch Obsidian todos (server may be offline): {e}")
-        
-        try:
-            beeminder_goals = await get_cached_beeminder_goals(target_user_id)
-        except Exception as e:
-            logger.error(f"Failed to fetch Beeminder goals: {e}")
-            beeminder_goals = []
+        degraded: Dict[str, str] = {}
+        if sections is None:
+            needed = frozenset().union(*NARRATOR_SECTION_SOURCES.values())
+        else:
+            needed = frozenset().union(*(NARRATOR_SECTION_SOURCES[name] for name in sections))
 
-        client = get_user_beeminder_client(target_user_id)
-        
-        emergencies = []
-        try:
-            emergencies = await client.get_emergencies(beeminder_goals)
-        except Exception as e:
-            logger.error(f"Failed to fetch Beeminder emergencies: {e}")
+        def source(name: str, coro, default):
+            """Schedule one narrator source with its own deadline (never raises)."""
+            return asyncio.ensure_future(_narrator_source(name, coro, default, degraded))
 
-        goal_runway = []
-        try:
-            goal_runway = await client.get_runway_summary(limit=6, all_goals=beeminder_goals)
-        except Exception as e:
-            logger.error(f"Failed to fetch goal runway: {e}")
+        async def _obsidian_todos():
+            return await obsidian_client.get_todos() if ENABLE_OBSIDIAN else []
 
-        budget_status = {}
-        try:
-            budget_status = await asyncio.to_thread(usage_tracker.get_budget_status, target_user_id)
-        except Exception as e:
-            logger.error(f"Failed to fetch budget status: {e}")
+        # Beeminder goals feed emergencies, runway and bookmark enrichment;
+        # dependents await a shielded handle so their own deadline never
+        # cancels the shared fetch.
+        if needed & _BEEMINDER_DEPENDENTS:
+            beeminder_task = source("beeminder_goals", get_cached_beeminder_goals(target_user_id), [])
+        else:
+            beeminder_task = _completed([])
+        client = get_user_beeminder_client(target_user_id)
 
-        daily_walk_status = {}
-        try:
-            daily_walk_status = await get_cached_daily_activity("bike", target_user_id)
-        except Exception as e:
-            logger.error(f"Failed to fetch daily activity: {e}")
+        async def _emergencies():
+            return await client.get_emergencies(await asyncio.shield(beeminder_task))
+
+        async def _runway():
+            return await client.get_runway_summary(limit=6, all_goals=await asyncio.shield(beeminder_task))
+
+        async def _bookmarks():
+            goals_for_bookmarks = await asyncio.shield(beeminder_task)
+            return await asyncio.to_thread(_enrich_bookmarks_for_narrator, goals_for_bookmarks)
+
+        async def _daily_aggregate():
+            return await get_daily_aggregate_status(target_user_id)
+
+        # name -> (coroutine factory, default); skipped sources resolve to their default
+        specs = {
+            "goals": (lambda: _neon_goals(target_user_id), []),
+            "todos": (_obsidian_todos, []),
+            "emergencies": (_emergencies, []),
+            "goal_runway": (_runway, []),
+            "budget_status": (lambda: _neon_budget_status(target_user_id), {}),
+            "daily_walk_status": (lambda: get_cached_daily_activity("bike", target_user_id), {}),
+            "groq_context": (lambda: asyncio.to_thread(get_groq_context_for_narrator, target_user_id), {}),
+            "lang_stats": (lambda: _neon_language_stats(target_user_id), {}),
+            "latest_cloud_walk": (lambda: _neon_latest_walk(target_user_id), None),
+            "user_prefs": (lambda: _neon_notification_prefs(target_user_id), {}),
+            "weather": (_get_weather, {"error": "weather unavailable"}),
+            "daily_aggregate": (_daily_aggregate, None),
+            "presence": (lambda: _get_presence_summary(target_user_id), {"status": "unknown"}),
+            "related_bookmarks": (_bookmarks, []),
+        }
+        tasks = {
+            name: source(name, factory(), default) if name in needed else _completed(default)
+            for name, (factory, default) in specs.items()
+        }
+        await asyncio.gather(beeminder_task, *tasks.values())
+        fetched = {name: task.result() for name, task in tasks.items()}
 
-        groq_context = {}
-        try:
-            groq_context = await asyncio.to_thread(get_groq_context_for_narrator, target_user_id)
-        except Exception as e:
-            logger.error(f"Failed to fetch Groq context: {e}")
+        beeminder_goals = beeminder_task.result()
+        goals = fetched["goals"]
+        active_goals = [g for g in goals if g.get("status") == "active"]
+        todos = fetched["todos"]
+        emergencies = fetched["emergencies"]
+        goal_runway = fetched["goal_runway"]
+        budget_status = fetched["budget_status"]
+        daily_walk_status = fetched["daily_walk_status"]
+        groq_context = fetched["groq_context"]
+        related_bookmarks = fetched["related_bookmarks"]
+        presence_info = fetched["presence"]
 
         # Greek backlog boost: check if 7-day review forecast exceeds threshold
-        lang_stats = await asyncio.to_thread(neon_checker.get_language_stats, target_user_id)
+        lang_stats = fetched["lang_stats"]
         greek_backlog_boost = language_sync_service._greek_backlog_active(lang_stats)
         greek_backlog_cards = int(lang_stats.get("greek", lang_stats.get("GREEK", {})).get("next_7_days") or 0)
 
-        # Add latest cloud walk info if available (use to_thread to avoid blocking event loop)
-        latest_cloud_walk = await asyncio.to_thread(neon_checker.get_latest_walk, target_user_id)
+        # Add latest cloud walk info if available
+        latest_cloud_walk = fetched["latest_cloud_walk"]
         if latest_cloud_walk:
+            # Copy: the row may be shared with get_daily_aggregate_status via the snapshot
+            latest_cloud_walk = dict(latest_cloud_walk)
             # Convert datetime to ISO string for JSON serialization
             if isinstance(latest_cloud_walk.get("start_time"), datetime):
                 latest_cloud_walk["start_time"] = latest_cloud_walk["start_time"].isoformat()
         
-        # Fetch user preferences for vacation_mode and time windows from Neon
-        user_prefs = await asyncio.to_thread(neon_checker.get_notification_prefs, target_user_id)
+        # User preferences for vacation_mode and time windows from Neon
+        user_prefs = fetched["user_prefs"]
         vacation_mode = user_prefs.get("vacation_mode", False)
         time_window_start = user_prefs.get("time_window_start", 13)
         time_window_end = user_prefs.get("time_window_end", 17)
 
         # Weather-aware logic
-        weather = await asyncio.to_thread(weather_service.get_weather)
-        is_appropriate, weather_msg = weather_service.is_walk_appropriate(weather)
+        weather = fetched["weather"]
+        if "weather" in needed:
+            is_appropriate, weather_msg = weather_service.is_walk_appropriate(weather)
+        else:
+            is_appropriate, weather_msg = False, "weather not requested"
 
         pending_todos = [t for t in todos if not t.get("completed", False)]
         critical_beeminder = [g for g in beeminder_goals if g.get("derail_risk") == "CRITICAL"]
@@ -799,17 +1020,15 @@ async def get_narrator_context(user_id: str = None) -> Dict[str, Any]:
         if budget_days <= 2: recommendations.append("Urgent: Focus on highest-value work due to budget constraints")
 
         # Majesty Cake: surface aggregate daily goal status early for discoverability (kingdonb/mecris#170)
-        try:
-            daily_aggregate = await get_daily_aggregate_status(target_user_id)
-            if not daily_aggregate.get("error"):
-                if daily_aggregate.get("all_clear"):
-                    recommendations.insert(0, f"🎂 Majesty Cake! All daily goals complete ({daily_aggregate.get('score', '?/?')})")
-                else:
-                    score = daily_aggregate.get("score", "?/?")
-                    recommendations.append(f"🎯 Daily goals progress: {score} — keep going!")
-        except Exception as e:
-            logger.error(f"get_narrator_context: daily aggregate status failed: {e}")
-            daily_aggregate = {"error": str(e)}
+        daily_aggregate = fetched["daily_aggregate"]
+        if daily_aggregate is None:
+            daily_aggregate = {"error": degraded.get("daily_aggregate", "unavailable")}
+        elif not daily_aggregate.get("error"):
+            if daily_aggregate.get("all_clear"):
+                recommendations.insert(0, f"🎂 Majesty Cake! All daily goals complete ({daily_aggregate.get('score', '?/?')})")
+            else:
+                score = daily_aggregate.get("score", "?/?")
+                recommendations.append(f"🎯 Daily goals progress: {score} — keep going!")
 
         # Greek Stack Vitality Coaching (kingdonb/mecris#129)
         if greek_backlog_boost:
@@ -836,7 +1055,6 @@ async def get_narrator_context(user_id: str = None) -> Dict[str, Any]:
                 urgent_items.append(f"GROQ: {groq_urgent}")
                 recommendations.append(groq_urgent)
 
-        presence_info = await _get_presence_summary(target_user_id)
         if presence_info.get("ghost_age_seconds") is not None:
             ghost_age_min = presence_info["ghost_age_seconds"] / 60
             if ghost_age_min < 120:
@@ -844,14 +1062,7 @@ async def get_narrator_context(user_id: str = None) -> Dict[str, Any]:
             else:
                 recommendations.insert(0, f"👻 Ghost Heartbeat: Bot hasn't been seen for {ghost_age_min/60:.1f}h.")
 
-        # Narrator bookmark enrichment (kingdonb/mecris#208 phase 2 / yebyen/mecris#281)
-        related_bookmarks = []
-        try:
-            related_bookmarks = await asyncio.to_thread(_enrich_bookmarks_for_narrator, beeminder_goals)
-        except Exception as e:
-            logger.warning(f"get_narrator_context: bookmark enrichment failed: {e}")
-
-        return {
+        context = {
             "summary": summary, "goals_status": {"total": len(active_goals)},
             "urgent_items": urgent_items, "beeminder_alerts": [e.get("message", "") for e in emergencies[:5]],
             "goal_runway": goal_runway, "budget_status": budget_status, "recommendations": recommendations,
@@ -871,12 +1082,16 @@ async def get_narrator_context(user_id: str = None) -> Dict[str, Any]:
             "time_window_end": time_window_end,
             "greek_backlog_boost": greek_backlog_boost,
             "greek_backlog_cards": greek_backlog_cards,
-            "budget_governor": _neon_budget_governor.get_narrator_summary(),
+            "budget_governor": _neon_budget_governor.get_narrator_summary() if sections is None or "budget_governor" in sections else None,
             "presence": presence_info,
             "presence_status": presence_info.get("status", "unknown"),
             "related_bookmarks": related_bookmarks,
+            "degraded_sources": degraded,
             "last_updated": datetime.now().isoformat()
         }
+        if sections is not None:
+            context = {k: v for k, v in context.items() if k in sections or k in ("degraded_sources", "last_updated")}
+        return context
     except Exception as e:
         logger.error(f"Failed to build narrator context: {e}")
         return {"error": f"Failed to build narrator context: {e}"}
@@ -1212,12 +1427,15 @@ async def trigger_reminder_check(user_id: str = None, apply_fuzz: bool = False)
     if not target_user_id:
         return {"error": "Authentication Required. Run `mecris login`."}
     try:
-        check_result = await check_reminder_needed(target_user_id)
+        # One snapshot per tick: narrator, coaching and velocity providers share fetches
+        with context_snapshot(f"reminder:{target_user_id}"):
+            check_result = await check_reminder_needed(target_user_id)
         if not check_result.get("should_send"):
             return {"triggered": False, "reason": check_result.get("reason")}
 
-        # If we want to fuzz the delivery time and this is the initial background check
-        if apply_fuzz:
+        # If we want to fuzz the delivery time and this is the initial background check.
+        # Tier 3 goes out immediately: the goal derails within two hours.
+        if apply_fuzz and check_result.get("tier") != 3:
             import random
             from datetime import datetime, timedelta, timezone
             from apscheduler.triggers.date import DateTrigger
@@ -1225,7 +1443,7 @@ async def trigger_reminder_check(user_id: str = None, apply_fuzz: bool = False)
             # Fuzz between 3 and 25 minutes to break up exact 2-hour formulas
             fuzz_minutes = random.randint(3, 25)
             run_time = datetime.now(timezone.utc) + timedelta(minutes=fuzz_minutes)
-            job_id = f"fuzzed_reminder_{int(run_time.timestamp())}"
+            job_id = f"fuzzed_reminder_{target_user_id}_{int(run_time.timestamp())}"
             
             # Enqueue a one-off job to actually send the reminder after the fuzz delay
             scheduler.scheduler.add_job(
@@ -1258,7 +1476,22 @@ def get_scheduler_queue() -> Dict[str, Any]:
     return {
         "process_id": scheduler.process_id,
         "is_leader": scheduler.is_leader,
-        "queue": scheduler.get_queue()
+        "queue": scheduler.get_queue(),
+        "reminder_fanout": reminder_fanout.stats(),
+    }
+
+@mcp.tool(description="Get hit/miss/eviction counters for the in-process caches, context cache, request coalescing, spend write-behind queue, outbound delivery queue and connection pools.")
+def get_cache_stats() -> Dict[str, Any]:
+    """Report cache and pool counters so TTLs and sizes can be tuned from data."""
+    return {
+        "caches": cache_stats(),
+        "persistence": persistence_stats(),
+        "context_cache": context_cache.stats(),
+        "singleflight": singleflight_stats(),
+        "spend_queues": spend_queue_stats(),
+        "delivery_queue": delivery_queue_stats(),
+        "beeminder_pool": beeminder_pool.stats(),
+        "neon_pool": neon_pool_stats(),
     }
 
 from services.health_checker import HealthChecker as _HealthChecker
@@ -1276,7 +1509,11 @@ async def get_system_health(user_id: str = None) -> Dict[str, Any]:
         result["is_leader"] = scheduler.is_leader
     return result
 
-from services.coaching_service import CoachingService
+from services.coaching_service import CoachingService, COACHING_CONTEXT_SECTIONS
+
+# The reminder tick and its coaching call share one narrator build (see
+# context_snapshot), so both request the union of the sections they read.
+TICK_CONTEXT_SECTIONS = sorted(set(REMINDER_CONTEXT_SECTIONS) | set(COACHING_CONTEXT_SECTIONS))
 
 @mcp.tool(description="Get a personalized coaching insight based on momentum and current needs.")
 async def get_coaching_insight(user_id: str = None) -> Dict[str, Any]:
@@ -1294,9 +1531,10 @@ async def get_coaching_insight(user_id: str = None) -> Dict[str, Any]:
             return await obsidian_client.get_daily_note(today)
 
         service = CoachingService(
-            context_provider=lambda: get_narrator_context(target_user_id),
-            goal_provider=get_cached_beeminder_goals,
-            obsidian_provider=_get_obsidian_context
+            context_provider=lambda: get_narrator_context(target_user_id, sections=TICK_CONTEXT_SECTIONS),
+            goal_provider=lambda: get_cached_beeminder_goals(target_user_id),
+            obsidian_provider=_get_obsidian_context,
+            lang_stats_provider=lambda: _neon_language_stats(target_user_id),
         )
         
         insight = await service.generate_insight()
@@ -1318,11 +1556,13 @@ async def set_review_pump_lever(language: str, multiplier: float, user_id: str =
 
     success = await asyncio.to_thread(neon_checker.update_pump_multiplier, language, multiplier, target_user_id)
     if success:
+        invalidate_user_caches(target_user_id, namespaces=(), reason="pump lever")
         return {"success": True, "message": f"Review Pump for {language} set to {multiplier}x"}
     else:
         return {"error": "Failed to update multiplier in Neon DB"}
 
 @mcp.tool(description="Calculate the language review velocity (Review Pump) required to hit 0 reviews.")
+@snapshot_cached("language_velocity_stats")
 async def get_language_velocity_stats(user_id: str = None) -> Dict[str, Any]:
     """Calculate the velocity required to hit 0 reviews based on current debt, forecasted liabilities, and chosen lever."""
     target_user_id = resolve_target_user(user_id)
@@ -1330,7 +1570,7 @@ async def get_language_velocity_stats(user_id: str = None) -> Dict[str, Any]:
         return {"error": "Authentication Required"}
     try:
         # 1. Get stats from Neon (cached from last scraper run)
-        db_stats = await asyncio.to_thread(neon_checker.get_language_stats, target_user_id)
+        db_stats = await _neon_language_stats(target_user_id)
         
         # 2. Trigger async sync if empty OR stale (> 1 hour)
         is_stale = False
@@ -1452,6 +1692,7 @@ async def get_language_velocity_stats(user_id: str = None) -> Dict[str, Any]:
 async def check_reminder_needed(user_id: str = None) -> Dict[str, Any]:
     return await reminder_service.check_reminder_needed(user_id)
 
+@snapshot_cached("last_sent_time")
 async def get_last_sent_time(msg_type: Optional[str] = None, user_id: str = None) -> Optional[datetime]:
     target_user_id = usage_tracker.resolve_user_id(user_id)
     neon_url = os.getenv("NEON_DB_URL")
@@ -1459,8 +1700,7 @@ async def get_last_sent_time(msg_type: Optional[str] = None, user_id: str = None
         return None
     
     def _fetch():
-        import psycopg2
-        with psycopg2.connect(neon_url) as conn:
+        with get_connection(neon_url) as conn:
             with conn.cursor() as cur:
                 if msg_type:
                     cur.execute(
@@ -1480,7 +1720,35 @@ async def get_last_sent_time(msg_type: Optional[str] = None, user_id: str = None
         logger.error(f"Failed to fetch last sent time: {e}")
         return None
 
-async def send_reminder_message(message_data: Dict[str, Any], user_id: str = None) -> Dict[str, Any]:
+async def get_last_sent_times(user_id: str = None) -> Dict[Optional[str], datetime]:
+    """Most recent send per message type in one query (key None = latest of any type)."""
+    target_user_id = usage_tracker.resolve_user_id(user_id)
+    neon_url = os.getenv("NEON_DB_URL")
+    if not neon_url:
+        return {}
+
+    def _fetch():
+        with get_connection(neon_url) as conn:
+            with conn.cursor() as cur:
+                # Walks idx_message_log_user_type_sent_at: one index probe per type
+                cur.execute(
+                    "SELECT DISTINCT ON (type) type, sent_at FROM message_log WHERE user_id = %s ORDER BY type, sent_at DESC",
+                    (target_user_id,)
+                )
+                last_sent = {msg_type: sent_at for msg_type, sent_at in cur.fetchall() if sent_at}
+        if last_sent:
+            last_sent[None] = max(last_sent.values())
+        return last_sent
+    return await asyncio.to_thread(_fetch)
+
+async def send_reminder_message(message_data: Dict[str, Any], user_id: str = None, wait: bool = False) -> Dict[str, Any]:
+    """Deliver a reminder and record it in message_log.
+
+    With the delivery queue on (MECRIS_DELIVERY_QUEUE, default) the message is
+    logged as 'queued' and handed to services/delivery_queue.py, and this
+    returns at once; the row's status becomes sent/failed when delivery
+    finishes. wait=True (or the queue off) sends inline, off the event loop.
+    """
     msg_type = message_data.get("type")
     use_template = message_data.get("template_sid") is not None
     target_user_id = usage_tracker.resolve_user_id(user_id)
@@ -1496,35 +1764,39 @@ async def send_reminder_message(message_data: Dict[str, Any], user_id: str = Non
     # We trust the engine.
 
     message = message_data.get("message") or message_data.get("fallback_message")
-    if use_template:
-        from twilio_sender import send_whatsapp_template
-        template_sid = message_data.get("template_sid")
-        variables = message_data.get("variables", {})
-        success = send_whatsapp_template(template_sid, variables, user_id=target_user_id)
-        delivery_result = {
-            "sent": success,
-            "method": "whatsapp_template",
-            "template_sid": template_sid
-        }
-    else:
-        delivery_result = smart_send_message(message, user_id=target_user_id)
-    # Log to Neon, regardless of success or failure
-    status_val = "sent" if delivery_result.get("sent") else "failed"
-    error_val = None if delivery_result.get("sent") else "Failed to send (check twilio_sender logs)"
-    
-    # Encrypt PII fields (error_msg, content) before storing
+
+    def _send() -> Dict[str, Any]:
+        if use_template:
+            from twilio_sender import send_whatsapp_template
+            template_sid = message_data.get("template_sid")
+            variables = message_data.get("variables", {})
+            success = send_whatsapp_template(template_sid, variables, user_id=target_user_id, raise_errors=True)
+            return {
+                "sent": success,
+                "method": "whatsapp_template",
+                "template_sid": template_sid
+            }
+        return smart_send_message(message, user_id=target_user_id)
+
+    def _status(delivery_result: Dict[str, Any]):
+        status_val = "sent" if delivery_result.get("sent") else "failed"
+        error_val = None if delivery_result.get("sent") else "Failed to send (check twilio_sender logs)"
+        # Encrypt PII fields (error_msg, content) before storing
+        return status_val, usage_tracker.encryption.try_encrypt(error_val)
+
     encrypted_content = usage_tracker.encryption.try_encrypt(message)
-    error_val = usage_tracker.encryption.try_encrypt(error_val)
-    
-    def _write_log():
+
+    def _write_log(status_val: str, error_val: Optional[str]) -> Optional[int]:
         import psycopg2
-        with psycopg2.connect(neon_url) as conn:
+        with get_connection(neon_url) as conn:
             with conn.cursor() as cur:
                 try:
                     cur.execute(
-                        "INSERT INTO message_log (date, type, sent_at, user_id, status, error_msg, content) VALUES (%s, %s, %s, %s, %s, %s, %s)", 
+                        "INSERT INTO message_log (date, type, sent_at, user_id, status, error_msg, content) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id", 
                         (today, msg_type, now, target_user_id, status_val, error_val, encrypted_content)
                     )
+                    row = cur.fetchone()
+                    return row[0] if row else None
                 except psycopg2.errors.UndefinedColumn:
                     # Fallback if schema wasn't migrated
                     conn.rollback()
@@ -1532,16 +1804,49 @@ async def send_reminder_message(message_data: Dict[str, Any], user_id: str = Non
                         "INSERT INTO message_log (date, type, sent_at, user_id) VALUES (%s, %s, %s, %s)", 
                         (today, msg_type, now, target_user_id)
                     )
+                    return None
+
+    if delivery_queue_enabled() and not wait:
+        # Logged up front so the rate limit and cooldowns count it while it is in flight
+        try:
+            log_id = await asyncio.to_thread(_write_log, "queued", None)
+        except Exception as e:
+            logger.error(f"Failed to log message to Neon: {e}")
+            log_id = None
+        invalidate_user_caches(target_user_id, namespaces=(), reason="message queued")
 
+        async def _record_outcome(delivery_result: Dict[str, Any]) -> None:
+            if log_id is None:
+                return
+            status_val, error_val = _status(delivery_result)
+
+            def _update_log():
+                with get_connection(neon_url) as conn:
+                    with conn.cursor() as cur:
+                        cur.execute("UPDATE message_log SET status = %s, error_msg = %s WHERE id = %s",
+                                    (status_val, error_val, log_id))
+
+            await asyncio.to_thread(_update_log)
+
+        delivery_id = await get_delivery_queue().enqueue(_send, _record_outcome, label=f"{msg_type}:{target_user_id}")
+        return {"sent": False, "queued": True, "method": "queued", "delivery_id": delivery_id}
+
+    try:
+        delivery_result = await asyncio.to_thread(_send)
+    except Exception as e:
+        delivery_result = {"sent": False, "method": "whatsapp_template", "error": str(e)}
+    # Log to Neon, regardless of success or failure
     try:
-        await asyncio.to_thread(_write_log)
+        await asyncio.to_thread(_write_log, *_status(delivery_result))
     except Exception as e:
         logger.error(f"Failed to log message to Neon: {e}")
+    invalidate_user_caches(target_user_id, namespaces=(), reason="message sent")
 
     return delivery_result
 
 
 
+@snapshot_cached("arabic_skip_count")
 async def get_arabic_skip_count(user_id: str = None) -> int:
     """Return the number of Arabic reminders sent in the last 24h (skip count proxy).
 
@@ -1556,40 +1861,100 @@ async def get_arabic_skip_count(user_id: str = None) -> int:
     return await asyncio.to_thread(count_arabic_reminders, neon_url, target_user_id)
 
 
-async def get_walk_history(user_id: str = None) -> list:
-    """Return start_time datetimes for walk_inferences in the last 30 days.
+def _walk_histogram_key(user_id: str) -> str:
+    from services.timezone_service import today_eastern
+    return f"{user_id}:walk_histogram:{today_eastern().isoformat()}"
+
+
+@snapshot_cached("walk_history")
+async def get_walk_history(user_id: str = None) -> WalkHistogram:
+    """Return the user's walk_inferences from the last 30 days as a WalkHistogram.
 
     Used as walk_history_provider for ReminderService smart_nag integration.
-    Returns [] if NEON_DB_URL is not configured or on any DB error.
+    Postgres reduces the rows to one hour bitmask per day, so at most 30 small
+    rows cross the wire; the result is cached for the day and upload_walk /
+    the walk listener fold new walks into it.  Returns an empty histogram if
+    NEON_DB_URL is not configured or on any DB error.
     """
     from datetime import timedelta
     target_user_id = usage_tracker.resolve_user_id(user_id)
     neon_url = os.getenv("NEON_DB_URL", "")
     if not neon_url:
-        return []
+        return WalkHistogram()
+
+    key = _walk_histogram_key(target_user_id)
+    cached = walk_histogram_cache.get(key)
+    if cached is not None:
+        return cached
 
     def _fetch():
-        import psycopg2
-        cutoff = datetime.now(tz=None) - timedelta(days=30)
-        with psycopg2.connect(neon_url) as conn:
+        from services.timezone_service import now_eastern
+        # start_time is TEXT; bin by the Eastern hour, the clock ReminderService compares against
+        cutoff = now_eastern().replace(tzinfo=None) - timedelta(days=30)
+        with get_connection(neon_url) as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    "SELECT start_time FROM walk_inferences "
-                    "WHERE user_id = %s AND start_time >= %s "
-                    "ORDER BY start_time ASC",
+                    "SELECT local_start::date, bit_or(1 << extract(hour FROM local_start)::int) "
+                    "FROM (SELECT (start_time::TIMESTAMPTZ AT TIME ZONE 'America/New_York') AS local_start "
+                    "      FROM walk_inferences WHERE user_id = %s) w "
+                    "WHERE local_start >= %s "
+                    "GROUP BY 1",
                     (target_user_id, cutoff),
                 )
-                rows = cur.fetchall()
-                return [row[0] for row in rows]
+                return WalkHistogram({day: mask for day, mask in cur.fetchall()})
 
     try:
-        return await asyncio.to_thread(_fetch)
+        histogram = await asyncio.to_thread(_fetch)
     except Exception as e:
         logger.error(f"get_walk_history failed: {e}")
-        return []
+        return WalkHistogram()
+    walk_histogram_cache.set(key, histogram)
+    return histogram
+
+
+def record_walk_in_histogram(user_id: str, start_time: Any) -> None:
+    """Fold a new walk into the user's cached histogram, if one is cached for today."""
+    key = _walk_histogram_key(user_id)
+    histogram = walk_histogram_cache.get(key)
+    if histogram is None or not start_time:
+        return
+    try:
+        histogram.add_walk(start_time)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Could not fold walk {start_time!r} into histogram: {e}")
+        walk_histogram_cache.delete(key)
+
+
+@snapshot_cached("reminder_context")
+async def _reminder_context(user_id: str = None) -> Dict[str, Any]:
+    # A send decision must not rest on a stale-while-revalidate copy (walks or
+    # Beeminder datapoints added since, or yesterday's walk status)
+    return await _narrator_context(user_id, TICK_CONTEXT_SECTIONS, allow_stale=False)
 
 
-reminder_service = ReminderService(get_narrator_context, get_coaching_insight, get_last_sent_time, velocity_provider=get_language_velocity_stats, skip_count_provider=get_arabic_skip_count, walk_history_provider=get_walk_history)
+reminder_service = ReminderService(_reminder_context, get_coaching_insight, get_last_sent_time, velocity_provider=get_language_velocity_stats, skip_count_provider=get_arabic_skip_count, walk_history_provider=get_walk_history, last_sent_map_provider=get_last_sent_times)
+
+
+async def _list_due_reminder_users() -> List[str]:
+    """Users the leader evaluates each fan-out tick: those who consented to autonomous tasks, plus its own."""
+    neon_url = os.getenv("NEON_DB_URL")
+    if not neon_url:
+        return [scheduler.user_id] if scheduler.user_id else []
+
+    def _fetch():
+        with get_connection(neon_url) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT pocket_id_sub FROM users WHERE autonomous_sync_enabled OR pocket_id_sub = %s",
+                    (scheduler.user_id,)
+                )
+                return [row[0] for row in cur.fetchall()]
+    return await asyncio.to_thread(_fetch)
+
+
+reminder_fanout = ReminderFanout(
+    lambda user_id: trigger_reminder_check(user_id=user_id, apply_fuzz=True), _list_due_reminder_users
+)
 
 # ---------------------------------------------------------------------------
 # Budget Governor — Neon-backed (Phase 1 complete, Phase 2 MCP exposure)
@@ -1722,11 +2087,9 @@ async def fetch_system_pulse(user_id: str) -> Dict[str, Any]:
     if not neon_url:
         return {"modalities": []}
 
-    target_user_id = usage_tracker.resolve_user_id(user_id)
-
     def _query():
-        import psycopg2
-        with psycopg2.connect(neon_url) as conn:
+        target_user_id = usage_tracker.resolve_user_id(user_id)
+        with get_connection(neon_url) as conn:
             with conn.cursor() as cur:
                 try:
                     cur.execute("""
@@ -1750,7 +2113,10 @@ async def fetch_system_pulse(user_id: str) -> Dict[str, Any]:
                 return cur.fetchall()
 
     try:
-        rows = await asyncio.to_thread(_query)
+        if neon_reader.enabled:
+            rows = await neon_reader.get_scheduler_heartbeats(user_id)
+        else:
+            rows = await asyncio.to_thread(_query)
         modalities = []
         for role, heartbeat, mins_since, last_status, intent, last_error in rows:
             # Skip only unknown ghosts
@@ -1781,11 +2147,15 @@ async def fetch_system_pulse(user_id: str) -> Dict[str, Any]:
         return {"modalities": []}
 
 @mcp.tool(description="Get unified daily goal completion status for the Majesty Cake widget (kingdonb/mecris#170). Returns X/Y goals satisfied and all_clear flag.")
+@snapshot_cached("daily_aggregate_status")
 async def get_daily_aggregate_status(user_id: str = None) -> Dict[str, Any]:
     """Returns aggregated daily goal completion: daily walk (>=2000 steps), Arabic review pump, Greek review pump."""
     target_user_id = resolve_target_user(user_id)
     if not target_user_id:
         return {"error": "Authentication Required"}
+    return await context_cache.get("daily_aggregate", target_user_id, lambda: _build_daily_aggregate_status(target_user_id))
+
+async def _build_daily_aggregate_status(target_user_id: str) -> Dict[str, Any]:
     goals = []
 
     # Goal 1: Daily Walk (>=2000 steps via Neon or Beeminder)
@@ -1842,8 +2212,8 @@ async def get_daily_aggregate_status(user_id: str = None) -> Dict[str, Any]:
     system_pulse = await fetch_system_pulse(target_user_id)
 
     # Fetch budget and distance for odometers
-    budget_status = await asyncio.to_thread(usage_tracker.get_budget_status, target_user_id)
-    latest_walk = await asyncio.to_thread(neon_checker.get_latest_walk, target_user_id)
+    budget_status = await _neon_budget_status(target_user_id)
+    latest_walk = await _neon_latest_walk(target_user_id)
     
     today_distance_miles = 0.0
     today_steps = 0
@@ -1901,6 +2271,7 @@ async def set_notification_prefs(
 
     success = await asyncio.to_thread(neon_checker.update_notification_prefs, target_user_id, prefs)
     if success:
+        invalidate_user_caches(target_user_id, namespaces=("user_prefs",), reason="notification prefs")
         return {"status": "success", "message": "Preferences updated", "updated_fields": list(prefs.keys())}
     else:
         return {"status": "error", "message": "Failed to update preferences in database"}
@@ -1913,8 +2284,7 @@ def delete_user_data(user_id: str = None) -> Dict[str, Any]:
         return {"deleted": False, "error": "NEON_DB_URL not configured"}
 
     def _delete():
-        import psycopg2
-        with psycopg2.connect(neon_url) as conn:
+        with get_connection(neon_url) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT pocket_id_sub FROM users WHERE pocket_id_sub = %s",
@@ -1927,14 +2297,17 @@ def delete_user_data(user_id: str = None) -> Dict[str, Any]:
                 return {"deleted": True, "user_id": target_user_id}
 
     try:
-        return _delete()
+        result = _delete()
+        if result.get("deleted"):
+            invalidate_user_caches(target_user_id, namespaces=("user_prefs",), reason="user deleted")
+        return result
     except Exception as e:
         logger.error(f"delete_user_data failed: {e}")
         return {"deleted": False, "error": str(e)}
 
 
 @mcp.tool(description="GDPR data portability: export all data for a user as structured JSON. Returns rows from users, language_stats, budget_tracking, token_bank, walk_inferences, and message_log tables.")
-def export_user_data(user_id: str = None) -> Dict[str, Any]:
+async def export_user_data(user_id: str = None) -> Dict[str, Any]:
     target_user_id = usage_tracker.resolve_user_id(user_id)
     neon_url = os.getenv("NEON_DB_URL")
     if not neon_url:
@@ -1946,8 +2319,7 @@ def export_user_data(user_id: str = None) -> Dict[str, Any]:
         return [dict(zip(cols, row)) for row in cur.fetchall()]
 
     def _export():
-        import psycopg2
-        with psycopg2.connect(neon_url) as conn:
+        with get_connection(neon_url) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT * FROM users WHERE pocket_id_sub = %s",
@@ -1971,7 +2343,7 @@ def export_user_data(user_id: str = None) -> Dict[str, Any]:
                 }
 
     try:
-        return _export()
+        return await asyncio.to_thread(_export)
     except Exception as e:
         logger.error(f"export_user_data failed: {e}")
         return {"exported": False, "error": str(e)}
@@ -2086,8 +2458,7 @@ if __name__ == "__main__":
             scheduler.start()
             # Start walk cache listener (pg_notify invalidation)
             try:
-                from services.walk_cache_listener import start_walk_cache_listener, set_cache_reference
-                set_cache_reference(daily_activity_cache)
+                from services.walk_cache_listener import start_walk_cache_listener
                 asyncio.create_task(start_walk_cache_listener())
                 log("Walk cache listener started")
             except Exception as e:
@@ -2099,6 +2470,10 @@ if __name__ == "__main__":
             finally:
                 log("Shutting down scheduler")
                 scheduler.shutdown()
+                await shutdown_delivery_queues()
+                await close_async_pools()
+                await beeminder_pool.close_all()
+                flush_persistent_caches()
         
         try:
             asyncio.run(run_stdio_with_scheduler())
@@ -2120,8 +2495,7 @@ if __name__ == "__main__":
             scheduler.start()
             # Start walk cache listener (pg_notify invalidation)
             try:
-                from services.walk_cache_listener import start_walk_cache_listener, set_cache_reference
-                set_cache_reference(daily_activity_cache)
+                from services.walk_cache_listener import start_walk_cache_listener
                 asyncio.create_task(start_walk_cache_listener())
                 log("Walk cache listener started")
             except Exception as e:
@@ -2133,6 +2507,10 @@ if __name__ == "__main__":
             finally:
                 log("Shutting down scheduler")
                 scheduler.shutdown()
+                await shutdown_delivery_queues()
+                await close_async_pools()
+                await beeminder_pool.close_all()
+                flush_persistent_caches()
         
         try:
             asyncio.run(run_with_scheduler())
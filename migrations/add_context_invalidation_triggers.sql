@@ -0,0 +1,41 @@
+-- Migration: Add pg_notify triggers for narrator context cache invalidation
+-- Run: psql "$NEON_DB_URL" -f migrations/add_context_invalidation_triggers.sql
+--
+-- Complements add_walk_invalidation_trigger.sql: each table notifies on its own
+-- channel (passed as the trigger argument) with the affected user_id.
+
+CREATE OR REPLACE FUNCTION notify_context_change()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+  row_user_id TEXT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    row_user_id := OLD.user_id;
+  ELSE
+    row_user_id := NEW.user_id;
+  END IF;
+  PERFORM pg_notify(
+    TG_ARGV[0],
+    json_build_object('user_id', row_user_id, 'op', TG_OP)::text
+  );
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS language_stats_change_trigger ON language_stats;
+CREATE TRIGGER language_stats_change_trigger
+AFTER INSERT OR UPDATE OR DELETE ON language_stats
+FOR EACH ROW EXECUTE FUNCTION notify_context_change('language_stats_change');
+
+DROP TRIGGER IF EXISTS message_log_change_trigger ON message_log;
+CREATE TRIGGER message_log_change_trigger
+AFTER INSERT OR UPDATE OR DELETE ON message_log
+FOR EACH ROW EXECUTE FUNCTION notify_context_change('message_log_change');
+
+DROP TRIGGER IF EXISTS budget_tracking_change_trigger ON budget_tracking;
+CREATE TRIGGER budget_tracking_change_trigger
+AFTER INSERT OR UPDATE OR DELETE ON budget_tracking
+FOR EACH ROW EXECUTE FUNCTION notify_context_change('budget_tracking_change');
+
+-- Verify
+SELECT 'context invalidation triggers created' AS status;
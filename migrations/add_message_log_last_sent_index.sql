@@ -0,0 +1,14 @@
+-- Migration: Index for the per-tick last-sent-per-type reminder lookup
+-- Run: psql "$NEON_DB_URL" -f migrations/add_message_log_last_sent_index.sql
+--
+-- ReminderService loads the latest send of every message type with
+--   SELECT DISTINCT ON (type) type, sent_at FROM message_log
+--   WHERE user_id = $1 ORDER BY type, sent_at DESC
+-- CONCURRENTLY keeps message_log writable while the index builds
+-- (UsageTracker._init_neon creates it non-concurrently on fresh databases).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_message_log_user_type_sent_at
+    ON message_log (user_id, type, sent_at DESC);
+
+-- Verify
+SELECT indexname, indexdef FROM pg_indexes WHERE indexname = 'idx_message_log_user_type_sent_at';
@@ -6,7 +6,7 @@ RETURNS trigger LANGUAGE plpgsql AS $$
 BEGIN
   PERFORM pg_notify(
     'walk_inferences_change',
-    json_build_object('user_id', NEW.user_id, 'op', TG_OP)::text
+    json_build_object('user_id', NEW.user_id, 'op', TG_OP, 'start_time', NEW.start_time)::text
   );
   RETURN NEW;
 END;
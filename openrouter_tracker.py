@@ -14,7 +14,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 import requests
-import psycopg2
+from services.neon_pool import get_connection
 from psycopg2.extras import RealDictCursor
 
 logger = logging.getLogger("mecris.openrouter_tracker")
@@ -38,7 +38,7 @@ class OpenRouterTracker:
         if not self.neon_url:
             return
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     # Dollar spend tracking (synced from OpenRouter)
                     cur.execute("""
@@ -99,7 +99,7 @@ class OpenRouterTracker:
         now = datetime.now(timezone.utc)
         
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     # Upsert daily request count
                     cur.execute("""
@@ -138,7 +138,7 @@ class OpenRouterTracker:
         today = datetime.now(timezone.utc).date()
         
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # Today's requests
                     cur.execute("""
@@ -199,7 +199,7 @@ class OpenRouterTracker:
             total_usage = float(data.get("total_usage", 0.0))
             remaining = total_credits - total_usage
             
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         INSERT INTO openrouter_dollar_spend (user_id, total_credits, total_usage, remaining_credits)
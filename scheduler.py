@@ -2,15 +2,30 @@ import logging
 import asyncio
 import os
 import uuid
-import psycopg2
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional, Callable, Coroutine
+from typing import Dict, Any, List, Optional, Callable, Coroutine
+import asyncpg
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 
+from services.leader_lock import AdvisoryLeaderLock, advisory_election_enabled
+from services.neon_pool import get_connection
+from services.reminder_fanout import fanout_enabled
+from services.reminder_service import planner_enabled
+from services.spend_queue import shutdown_spend_queues
+
 logger = logging.getLogger("mecris.scheduler")
 
+# scheduler_election row leased by the one process that runs the tenant-wide
+# reminder jobs (MECRIS_REMINDER_FANOUT). Per-user leadership cannot own them:
+# every process that leads its own user would run them for all users.
+FANOUT_SLOT = "__fanout__"
+# A planned evaluation picked up by a process that does not own it goes back
+# into the shared jobstore this far ahead instead of being dropped.
+PLAN_REARM_DELAY = timedelta(minutes=1)
+
 # We need a separate task function that doesn't capture the Scheduler instance
 # so it can be serialized by SQLAlchemyJobStore
 async def _global_reminder_job(trigger_func_name: str, user_id: str):
@@ -29,6 +44,61 @@ async def _global_reminder_job(trigger_func_name: str, user_id: str):
     except Exception as e:
         logger.error(f"Background reminder job failed for {user_id}: {e}")
 
+async def _global_reminder_fanout_job():
+    """
+    Background job that runs on the fan-out leader and evaluates reminders for every due user.
+    """
+    try:
+        from mcp_server import reminder_fanout, scheduler
+        if not scheduler.is_fanout_leader:
+            return
+
+        await reminder_fanout.run_tick()
+    except Exception as e:
+        logger.error(f"Reminder fan-out job failed: {e}")
+
+async def _global_reminder_plan_job(user_id: str):
+    """
+    Background job that runs on the owner of the user's reminders (the fan-out
+    leader, or the user's leader without fan-out): evaluates one user's
+    reminders, then reschedules itself for the next instant the decision could change.
+    """
+    next_at = None
+    try:
+        from mcp_server import trigger_reminder_check, reminder_service, scheduler
+        from services.context_snapshot import context_snapshot
+        if not scheduler.owns_reminder_plan(user_id):
+            # The one-shot job is already consumed: put it back for the owner
+            scheduler.plan_reminder(user_id, datetime.now(timezone.utc) + PLAN_REARM_DELAY)
+            return
+
+        with context_snapshot(f"reminder-plan:{user_id}"):
+            result = await trigger_reminder_check(user_id=user_id, apply_fuzz=True)
+            if result.get("triggered"):
+                logger.info(f"Reminder sent for {user_id}: {result.get('send', {}).get('method')}")
+            next_at = await reminder_service.next_check_at(user_id)
+    except Exception as e:
+        logger.error(f"Planned reminder job failed for {user_id}: {e}")
+        next_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+
+    if next_at:
+        scheduler.plan_reminder(user_id, next_at)
+
+async def _global_reminder_plan_seed_job():
+    """
+    Background job that runs on the fan-out leader: makes sure every due user
+    has a planned reminder evaluation (planner + fan-out mode).
+    """
+    try:
+        from mcp_server import _list_due_reminder_users, scheduler
+        if not scheduler.is_fanout_leader:
+            return
+
+        for user_id in await _list_due_reminder_users():
+            scheduler.ensure_reminder_plan(user_id)
+    except Exception as e:
+        logger.error(f"Reminder plan seeding failed: {e}")
+
 async def _global_language_sync_job(user_id: str):
     """
     Background job that syncs Clozemaster stats to Beeminder and Neon DB.
@@ -64,10 +134,9 @@ async def _global_walk_sync_job(user_id: str):
         if not neon_url:
             return
             
-        import psycopg2
         
         pending_walks = []
-        with psycopg2.connect(neon_url) as conn:
+        with get_connection(neon_url) as conn:
             with conn.cursor() as cur:
                 # We target 'logging' status which is used by the Spin backend
                 cur.execute("SELECT id, start_time, step_count, distance_meters, distance_source FROM walk_inferences WHERE status = 'logging' AND user_id = %s", (user_id,))
@@ -88,7 +157,7 @@ async def _global_walk_sync_job(user_id: str):
         for walk in pending_walks:
             try:
                 # get user configuration
-                with psycopg2.connect(neon_url) as conn:
+                with get_connection(neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("SELECT beeminder_goal FROM users WHERE pocket_id_sub = %s", (user_id,))
                         row = cur.fetchone()
@@ -119,7 +188,7 @@ async def _global_walk_sync_job(user_id: str):
                 # Push (Beeminder handles deduplication/update via requestid)
                 success = await beeminder_client.add_datapoint(goal, miles, comment=comment, requestid=request_id)
                 if success:
-                    with psycopg2.connect(neon_url) as conn:
+                    with get_connection(neon_url) as conn:
                         with conn.cursor() as cur:
                             cur.execute("UPDATE walk_inferences SET status = 'logged' WHERE id = %s", (walk['id'],))
                         conn.commit()
@@ -159,11 +228,10 @@ async def _global_cooperative_monitor_job(user_id: str):
         if not neon_url:
             return
 
-        import psycopg2
         from psycopg2.extras import RealDictCursor
         from twilio_sender import smart_send_message
 
-        with psycopg2.connect(neon_url) as conn:
+        with get_connection(neon_url) as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Scoped by user_id
                 cur.execute("SELECT heartbeat FROM scheduler_election WHERE role = 'android_client' AND user_id = %s", (user_id,))
@@ -214,8 +282,11 @@ class MecrisScheduler:
         self.scheduler = AsyncIOScheduler(jobstores=jobstores, job_defaults=job_defaults)
         self.process_id = str(uuid.uuid4())[:8]
         self.is_leader = False
+        # Holder of the FANOUT_SLOT lease (tenant-wide reminder jobs)
+        self.is_fanout_leader = False
         self.running = False
         self._election_task = None
+        self._fanout_election_task = None
         # Cached flag: True if scheduler_election has observability columns (migration v8+).
         # None = unknown (check on first write). False = columns absent (pre-migration).
         self._has_obs_columns: Optional[bool] = None
@@ -231,6 +302,8 @@ class MecrisScheduler:
             self._init_db()
             self.running = True
             self._election_task = asyncio.create_task(self._election_loop())
+            if fanout_enabled():
+                self._fanout_election_task = asyncio.create_task(self._fanout_election_loop())
             self.scheduler.start()
             logger.info(f"Mecris Coordination Engine started (PID: {self.process_id}).")
 
@@ -238,7 +311,7 @@ class MecrisScheduler:
         """Initialize the coordination tables."""
         if self.neon_url:
             try:
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             CREATE TABLE IF NOT EXISTS scheduler_election (
@@ -251,6 +324,8 @@ class MecrisScheduler:
                         """)
                         if self.user_id:
                             cur.execute("INSERT INTO scheduler_election (user_id, role) VALUES (%s, 'leader') ON CONFLICT DO NOTHING", (self.user_id,))
+                        if fanout_enabled():
+                            cur.execute("INSERT INTO scheduler_election (user_id, role) VALUES (%s, 'leader') ON CONFLICT DO NOTHING", (FANOUT_SLOT,))
                 return
             except Exception as e:
                 logger.error(f"Neon scheduler init failed: {e}. SQLite fallback is disabled.")
@@ -260,6 +335,8 @@ class MecrisScheduler:
 
     async def _election_loop(self):
         """Continuous leader election and heartbeat."""
+        if advisory_election_enabled():
+            return await self._advisory_election_loop()
         while self.running:
             try:
                 await self._attempt_leadership()
@@ -270,6 +347,72 @@ class MecrisScheduler:
                 logger.error(f"Election error: {e}")
                 await asyncio.sleep(5)
 
+    async def _advisory_election_loop(self):
+        """Leader election by session advisory lock (MECRIS_LEADER_ELECTION=advisory).
+
+        See services/leader_lock.py. Runs every round on one persistent
+        connection; losing it demotes this process immediately.
+        """
+        if not self.user_id:
+            return
+        lock = AdvisoryLeaderLock(self.neon_url, self.user_id)
+        try:
+            while self.running:
+                try:
+                    if self.is_leader and not lock.held:
+                        await lock.release()
+                        self._demote("connection to Postgres lost")
+                    if not lock.connected:
+                        await lock.connect()
+                    if not lock.held and await lock.try_acquire():
+                        logger.info(f"🏆 Process {self.process_id} ELECTED as Leader for {self.user_id} (advisory lock).")
+                        self.is_leader = True
+                        await self._advisory_heartbeat(lock, "Elected as leader", "claim leadership")
+                    elif lock.held:
+                        await self._advisory_heartbeat(lock, "Heartbeat active", "maintain leadership")
+                    if self.is_leader:
+                        await self._start_leader_jobs()
+                    await lock.wait()
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    logger.error(f"Advisory election error: {e}")
+                    await lock.release()
+                    if self.is_leader:
+                        self._demote(str(e))
+                    await asyncio.sleep(5)
+        finally:
+            # Unlock and NOTIFY so a standby takes over without waiting for its retry
+            await lock.release()
+            self.is_leader = False
+
+    async def _advisory_heartbeat(self, lock: AdvisoryLeaderLock, last_status: str, intent: str) -> None:
+        """Stamp the leader row over the lock connection; doubles as its keep-alive."""
+        if self._has_obs_columns is not False:
+            try:
+                await lock.execute(
+                    "UPDATE scheduler_election SET process_id = $1, heartbeat = NOW(), "
+                    "last_status = $2, intent = $3, last_error = NULL WHERE user_id = $4 AND role = 'leader'",
+                    self.process_id, last_status, intent, self.user_id,
+                )
+                self._has_obs_columns = True
+                self.last_status, self.intent, self.last_error = last_status, intent, None
+                return
+            except asyncpg.UndefinedColumnError:
+                logger.debug("Observability columns absent in scheduler_election — run migrate_v8_observability.py")
+                self._has_obs_columns = False
+        await lock.execute(
+            "UPDATE scheduler_election SET process_id = $1, heartbeat = NOW() WHERE user_id = $2 AND role = 'leader'",
+            self.process_id, self.user_id,
+        )
+
+    def _demote(self, reason: str) -> None:
+        """Drop leadership after the advisory lock was lost (the row can't be written without it)."""
+        logger.warning(f"🏳️ Process {self.process_id} LOST leadership for {self.user_id} (advisory lock): {reason}")
+        self.is_leader = False
+        self.last_status, self.intent, self.last_error = "Lost leadership", "standby", reason
+        self._stop_leader_jobs()
+
     def _write_obs_status(self, cur, last_status: str, intent: str, error: str = None) -> None:
         """Write last_status, intent, and optionally last_error to scheduler_election.
 
@@ -305,41 +448,13 @@ class MecrisScheduler:
         if not self.user_id:
             return
 
-        now = datetime.now(timezone.utc)
-        timeout = now - timedelta(seconds=90)
-        
         if self.neon_url:
             try:
-                with psycopg2.connect(self.neon_url) as conn:
-                    with conn.cursor() as cur:
-                        # 1. Try to claim if slot is empty or stale
-                        cur.execute(
-                            "UPDATE scheduler_election SET process_id = %s, heartbeat = %s "
-                            "WHERE user_id = %s AND role = 'leader' AND (process_id = %s OR heartbeat < %s OR process_id IS NULL)",
-                            (self.process_id, now, self.user_id, self.process_id, timeout)
-                        )
-                        
-                        if cur.rowcount > 0:
-                            if not self.is_leader:
-                                logger.info(f"🏆 Process {self.process_id} ELECTED as Leader for {self.user_id} (Neon).")
-                                self.is_leader = True
-                            self._write_obs_status(cur, "Elected as leader", "claim leadership")
-                        else:
-                            # Check if WE are currently the leader
-                            cur.execute("SELECT process_id, heartbeat FROM scheduler_election WHERE user_id = %s AND role = 'leader'", (self.user_id,))
-                            row = cur.fetchone()
-                            if self.is_leader:
-                                if not row or row[0] != self.process_id:
-                                    logger.warning(f"🏳️ Process {self.process_id} LOST leadership for {self.user_id} (Neon). Current leader: {row[0] if row else 'None'}")
-                                    self.is_leader = False
-                                    preempted_by = row[0] if row else "unknown"
-                                    self._write_obs_status(cur, "Lost leadership", "standby", error=f"preempted by {preempted_by}")
-                                    self._stop_leader_jobs()
-                                else:
-                                    # We are still leader, maintain heartbeat
-                                    cur.execute("UPDATE scheduler_election SET heartbeat = %s WHERE user_id = %s AND role = 'leader' AND process_id = %s", (now, self.user_id, self.process_id))
-                                    self._write_obs_status(cur, "Heartbeat active", "maintain leadership")
-                                    logger.debug(f"💓 Leader {self.process_id} heartbeat active.")
+                # Blocking psycopg2 round trips run in a worker thread so the
+                # election loop never stalls the MCP/HTTP event loop.
+                lost_leadership = await asyncio.to_thread(self._claim_leadership_sync)
+                if lost_leadership:
+                    self._stop_leader_jobs()
                 if self.is_leader:
                     await self._start_leader_jobs()
                 return
@@ -348,6 +463,127 @@ class MecrisScheduler:
 
         raise RuntimeError("MecrisScheduler: Neon connection not active. Cannot attempt leadership.")
 
+    def _claim_leadership_sync(self) -> bool:
+        """Run one election round against scheduler_election.
+
+        Updates self.is_leader and returns True when this process just lost
+        leadership (the caller stops leader jobs on the event loop).
+        """
+        now = datetime.now(timezone.utc)
+        timeout = now - timedelta(seconds=90)
+        lost_leadership = False
+
+        with get_connection(self.neon_url) as conn:
+            with conn.cursor() as cur:
+                # 1. Try to claim if slot is empty or stale
+                cur.execute(
+                    "UPDATE scheduler_election SET process_id = %s, heartbeat = %s "
+                    "WHERE user_id = %s AND role = 'leader' AND (process_id = %s OR heartbeat < %s OR process_id IS NULL)",
+                    (self.process_id, now, self.user_id, self.process_id, timeout)
+                )
+                
+                if cur.rowcount > 0:
+                    if not self.is_leader:
+                        logger.info(f"🏆 Process {self.process_id} ELECTED as Leader for {self.user_id} (Neon).")
+                        self.is_leader = True
+                    self._write_obs_status(cur, "Elected as leader", "claim leadership")
+                else:
+                    # Check if WE are currently the leader
+                    cur.execute("SELECT process_id, heartbeat FROM scheduler_election WHERE user_id = %s AND role = 'leader'", (self.user_id,))
+                    row = cur.fetchone()
+                    if self.is_leader:
+                        if not row or row[0] != self.process_id:
+                            logger.warning(f"🏳️ Process {self.process_id} LOST leadership for {self.user_id} (Neon). Current leader: {row[0] if row else 'None'}")
+                            self.is_leader = False
+                            preempted_by = row[0] if row else "unknown"
+                            self._write_obs_status(cur, "Lost leadership", "standby", error=f"preempted by {preempted_by}")
+                            lost_leadership = True
+                        else:
+                            # We are still leader, maintain heartbeat
+                            cur.execute("UPDATE scheduler_election SET heartbeat = %s WHERE user_id = %s AND role = 'leader' AND process_id = %s", (now, self.user_id, self.process_id))
+                            self._write_obs_status(cur, "Heartbeat active", "maintain leadership")
+                            logger.debug(f"💓 Leader {self.process_id} heartbeat active.")
+        return lost_leadership
+
+    async def _fanout_election_loop(self):
+        """Lease FANOUT_SLOT so exactly one process runs the tenant-wide reminder jobs.
+
+        Independent of per-user leadership, and always a heartbeat lease on
+        the scheduler_election row (also under MECRIS_LEADER_ELECTION=advisory):
+        a missed renewal only delays fan-out, never duplicates a user's nag.
+        """
+        while self.running:
+            try:
+                was_leader = self.is_fanout_leader
+                self.is_fanout_leader = await asyncio.to_thread(self._claim_fanout_slot_sync)
+                if self.is_fanout_leader:
+                    if not was_leader:
+                        logger.info(f"🏆 Process {self.process_id} ELECTED as reminder fan-out leader.")
+                    self._start_fanout_jobs()
+                elif was_leader:
+                    logger.warning(f"🏳️ Process {self.process_id} LOST reminder fan-out leadership.")
+                    self._stop_fanout_jobs()
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Fan-out election error: {e}")
+                # The lease can't be renewed, so another process may take it over
+                if self.is_fanout_leader:
+                    self.is_fanout_leader = False
+                    self._stop_fanout_jobs()
+                await asyncio.sleep(5)
+
+    def _claim_fanout_slot_sync(self) -> bool:
+        """Claim or renew the FANOUT_SLOT lease; True while this process holds it."""
+        now = datetime.now(timezone.utc)
+        with get_connection(self.neon_url) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE scheduler_election SET process_id = %s, heartbeat = %s "
+                    "WHERE user_id = %s AND role = 'leader' AND (process_id = %s OR heartbeat < %s OR process_id IS NULL)",
+                    (self.process_id, now, FANOUT_SLOT, self.process_id, now - timedelta(seconds=90))
+                )
+                return cur.rowcount > 0
+
+    def _start_fanout_jobs(self):
+        """Register the tenant-wide reminder job (fan-out leader only)."""
+        if planner_enabled():
+            # Event-driven: plan every due user now, and users as they become due
+            if self.scheduler.get_job('auto_reminder_fanout'):
+                self.scheduler.remove_job('auto_reminder_fanout')
+            if not self.scheduler.get_job('auto_reminder_plan_seed'):
+                self.scheduler.add_job(
+                    _global_reminder_plan_seed_job,
+                    'interval',
+                    minutes=30,
+                    id='auto_reminder_plan_seed',
+                    next_run_time=datetime.now(timezone.utc),
+                    replace_existing=True
+                )
+        elif not self.scheduler.get_job('auto_reminder_fanout'):
+            self.scheduler.add_job(
+                _global_reminder_fanout_job,
+                'interval',
+                minutes=30,
+                id='auto_reminder_fanout',
+                replace_existing=True
+            )
+
+    def _fanout_job_ids(self) -> List[str]:
+        """IDs of the jobs _start_fanout_jobs registers in the current reminder mode."""
+        return ['auto_reminder_plan_seed'] if planner_enabled() else ['auto_reminder_fanout']
+
+    def owns_reminder_plan(self, user_id: str) -> bool:
+        """True when user_id's reminder_plan job should run here rather than be re-armed."""
+        if fanout_enabled():
+            return self.is_fanout_leader
+        return self.is_leader and user_id == self.user_id
+
+    def _stop_fanout_jobs(self):
+        """Remove the tenant-wide jobs when the FANOUT_SLOT lease is lost."""
+        self._remove_jobs(self._fanout_job_ids())
+
     async def _start_leader_jobs(self):
         """Register recurring jobs that only the leader should run."""
         from ghost.presence import is_human_present, SYSTEM_LOCK_PATH
@@ -363,7 +599,16 @@ class MecrisScheduler:
                 monitor_job_id = f'auto_cooperative_monitor_{self.user_id}'
                 archivist_job_id = f'auto_archivist_{self.user_id}'
 
-                if not self.scheduler.get_job(reminder_job_id):
+                if fanout_enabled():
+                    # The fan-out leader's tenant-wide jobs evaluate this user; drop the single-user one
+                    if self.scheduler.get_job(reminder_job_id):
+                        self.scheduler.remove_job(reminder_job_id)
+                elif planner_enabled():
+                    # Event-driven: the user's plan job re-arms itself at the next decision point
+                    if self.scheduler.get_job(reminder_job_id):
+                        self.scheduler.remove_job(reminder_job_id)
+                    self.ensure_reminder_plan(self.user_id)
+                elif not self.scheduler.get_job(reminder_job_id):
                     self.scheduler.add_job(
                         _global_reminder_job, 
                         'interval', 
@@ -421,16 +666,41 @@ class MecrisScheduler:
                         logger.error(f"Failed to start leader jobs after 5 attempts for {self.user_id}: {e}")
                     break
 
+    def _leader_job_ids(self) -> List[str]:
+        """IDs of the jobs _start_leader_jobs registers in the current reminder mode."""
+        if fanout_enabled():
+            # Tenant-wide jobs (and every user's plan) belong to the fan-out leader
+            reminder_job_ids = []
+        elif planner_enabled():
+            reminder_job_ids = [f'reminder_plan_{self.user_id}']
+        else:
+            reminder_job_ids = [f'auto_reminder_check_{self.user_id}']
+        return reminder_job_ids + [
+            f'auto_language_sync_{self.user_id}',
+            f'auto_walk_sync_{self.user_id}',
+            f'auto_cooperative_monitor_{self.user_id}',
+            f'auto_archivist_{self.user_id}',
+        ]
+
     def _stop_leader_jobs(self):
-        """Remove jobs when leadership is lost."""
-        try:
-            if self.scheduler.running:
-                self.scheduler.remove_job(f'auto_reminder_check_{self.user_id}')
-                self.scheduler.remove_job(f'auto_language_sync_{self.user_id}')
-                self.scheduler.remove_job(f'auto_walk_sync_{self.user_id}')
-                self.scheduler.remove_job(f'auto_cooperative_monitor_{self.user_id}')
-                self.scheduler.remove_job(f'auto_archivist_{self.user_id}')
-        except: pass
+        """Remove jobs when leadership is lost.
+
+        Each removal is guarded on its own: a one-shot reminder_plan job has
+        already left the store while it runs (JobLookupError), and that must
+        not leave the other jobs registered on a demoted leader.
+        """
+        self._remove_jobs(self._leader_job_ids())
+
+    def _remove_jobs(self, job_ids: List[str]):
+        if not self.scheduler.running:
+            return
+        for job_id in job_ids:
+            try:
+                self.scheduler.remove_job(job_id)
+            except JobLookupError:
+                pass
+            except Exception as e:
+                logger.warning(f"Could not remove leader job {job_id}: {e}")
 
     def _update_heartbeat(self, role: str, process_id: str, user_id: str):
         """Record a heartbeat for a specific role and process."""
@@ -439,7 +709,7 @@ class MecrisScheduler:
 
         now = datetime.now(timezone.utc)
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute(
                         "INSERT INTO scheduler_election (user_id, role, process_id, heartbeat) "
@@ -477,6 +747,26 @@ class MecrisScheduler:
         
         return {"error": "Failed to enqueue after retries", "leader": self.is_leader}
 
+    def plan_reminder(self, user_id: str, run_at: datetime):
+        """(Re)arm the one-shot reminder evaluation for user_id at run_at."""
+        job_id = f'reminder_plan_{user_id}'
+        try:
+            self.scheduler.add_job(
+                _global_reminder_plan_job,
+                trigger=DateTrigger(run_date=run_at),
+                args=[user_id],
+                id=job_id,
+                replace_existing=True
+            )
+            logger.info(f"Next reminder evaluation for {user_id} at {run_at.isoformat()}")
+        except Exception as e:
+            logger.error(f"Failed to plan reminder for {user_id}: {e}")
+
+    def ensure_reminder_plan(self, user_id: str):
+        """Plan an immediate evaluation for user_id unless one is already planned."""
+        if not self.scheduler.get_job(f'reminder_plan_{user_id}'):
+            self.plan_reminder(user_id, datetime.now(timezone.utc))
+
     def get_queue(self):
         """View all pending jobs in the shared store."""
         try:
@@ -496,14 +786,26 @@ class MecrisScheduler:
         self.running = False
         if self._election_task:
             self._election_task.cancel()
+        if self._fanout_election_task:
+            self._fanout_election_task.cancel()
+        if self.is_fanout_leader:
+            try:
+                with get_connection(self.neon_url) as conn:
+                    with conn.cursor() as cur:
+                        cur.execute("UPDATE scheduler_election SET process_id = NULL WHERE user_id = %s AND process_id = %s", (FANOUT_SLOT, self.process_id))
+            except Exception as e:
+                logger.warning(f"Could not release the reminder fan-out slot: {e}")
+            self.is_fanout_leader = False
         if self.is_leader:
             if self.neon_url:
                 try:
-                    with psycopg2.connect(self.neon_url) as conn:
+                    with get_connection(self.neon_url) as conn:
                         with conn.cursor() as cur:
                             cur.execute("UPDATE scheduler_election SET process_id = NULL WHERE user_id = %s AND process_id = %s", (self.user_id, self.process_id))
                 except: pass
         
         if self.scheduler.running:
             self.scheduler.shutdown()
+        # Write out spend still buffered by the write-behind queue (spills if Neon is down)
+        shutdown_spend_queues()
         logger.info(f"Mecris Coordination Engine shut down (PID: {self.process_id}).")
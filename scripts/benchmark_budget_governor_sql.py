@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark Budget Governor spend aggregation strategies against a local Postgres.
+
+Loads synthetic spend rows (default 100k, spread over 6 buckets and 90 days)
+into a throwaway schema, then times one get_status-equivalent read for:
+
+  full-load     SELECT every row and sum in Python (the pre-aggregate behaviour)
+  memory        NeonBudgetGovernor incremental SpendAggregate (steady state)
+  sql-filter    SUM(cost) FILTER (...) GROUP BY bucket over the log
+  sql-rollup    budget_governor_bucket_totals + indexed window query
+
+Usage:
+    BENCH_DB_URL=postgresql://localhost/mecris_bench \\
+        python scripts/benchmark_budget_governor_sql.py [--rows 100000] [--repeat 50]
+
+Never point BENCH_DB_URL at Neon: the script creates and drops its own schema.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.migrate_budget_governor_rollup import SQL as ROLLUP_SQL  # noqa: E402
+from services.budget_governor import NeonBudgetGovernor  # noqa: E402
+
+SCHEMA = "mecris_bench"
+USER_ID = "bench-user"
+BUCKETS = ["helix", "gemini", "anthropic_api", "groq", "openrouter", "openrouter_requests"]
+
+
+def _schema_url(url: str) -> str:
+    sep = "&" if "?" in url else "?"
+    return f"{url}{sep}options={quote(f'-csearch_path={SCHEMA}')}"
+
+
+def _seed(url: str, rows: int) -> None:
+    now = datetime.now(timezone.utc)
+    with psycopg2.connect(url) as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+            cur.execute(f"SET search_path = {SCHEMA}")
+            cur.execute("""
+                CREATE TABLE budget_governor_spend_log (
+                    id SERIAL PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    cost DOUBLE PRECISION NOT NULL,
+                    ts TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """)
+            data = [
+                (USER_ID if i % 10 else "other-user", random.choice(BUCKETS), round(random.uniform(0.0001, 0.01), 6),
+                 now - timedelta(seconds=random.uniform(0, 90 * 86400)))
+                for i in range(rows)
+            ]
+            execute_values(cur, "INSERT INTO budget_governor_spend_log (user_id, bucket, cost, ts) VALUES %s",
+                           data, page_size=5000)
+            cur.execute(ROLLUP_SQL)
+            cur.execute("ANALYZE budget_governor_spend_log; ANALYZE budget_governor_bucket_totals")
+
+
+def _time(label: str, fn, repeat: int) -> float:
+    fn()  # warm up (and the memory strategy's initial full load)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    median = statistics.median(samples)
+    print(f"{label:<12} median {median:8.2f} ms   p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.2f} ms")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budget Governor aggregation benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    base_url = os.getenv("BENCH_DB_URL", "postgresql://localhost/mecris_bench")
+    if "neon.tech" in base_url:
+        print("ERROR: refusing to benchmark against Neon; use a local Postgres")
+        exit(1)
+
+    print(f"Seeding {args.rows} spend rows into {SCHEMA}...")
+    _seed(base_url, args.rows)
+    url = _schema_url(base_url)
+
+    def full_load():
+        gov._load_spend_log(None)
+
+    def memory():
+        gov._refresh()
+
+    def sql_filter():
+        gov._rollup_available = False
+        gov._query_totals()
+
+    def sql_rollup():
+        gov._rollup_available = True
+        gov._query_totals()
+
+    try:
+        os.environ.pop("MECRIS_BUDGET_AGGREGATION", None)
+        gov = NeonBudgetGovernor(neon_url=url, user_id=USER_ID)
+        _time("full-load", full_load, args.repeat)
+        _time("memory", memory, args.repeat)
+        _time("sql-filter", sql_filter, args.repeat)
+        _time("sql-rollup", sql_rollup, args.repeat)
+    finally:
+        with psycopg2.connect(base_url) as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+
+
+if __name__ == "__main__":
+    main()
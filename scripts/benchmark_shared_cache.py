@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cross-process shared cache (services/cache_store.py) against
+the in-process TTLCache and a plain dict.
+
+Part 1 times single-process get/set latency for each backend. Part 2 starts
+N worker processes that all need the same goal lists, as the stdio server,
+HTTP bridge and cli/pulse.py do, and counts how many simulated Beeminder
+fetches each backend needs.
+
+Usage: python scripts/benchmark_shared_cache.py [--ops 20000] [--procs 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cache import TTLCache  # noqa: E402
+from services.cache_store import CacheStore  # noqa: E402
+
+USERS = [f"user-{i}" for i in range(50)]
+GOALS = [{"slug": f"goal-{i}", "safebuf": i, "losedate": 1767225600 + i} for i in range(12)]
+FETCH_SECONDS = 0.02  # stand-in for one Beeminder round trip
+
+
+def _time_ops(label, get, put, ops):
+    for user in USERS:
+        put(user, GOALS)
+    start = time.perf_counter()
+    for i in range(ops):
+        get(USERS[i % len(USERS)])
+    read_us = (time.perf_counter() - start) / ops * 1e6
+    start = time.perf_counter()
+    for i in range(ops // 10):
+        put(USERS[i % len(USERS)], GOALS)
+    write_us = (time.perf_counter() - start) / (ops // 10) * 1e6
+    print(f"{label:<28} get {read_us:8.2f} us   set {write_us:8.2f} us")
+
+
+def _worker(args):
+    path, shared, offset = args
+    cache = TTLCache("beeminder_goals", ttl=300)
+    store = None
+    if shared:
+        store = CacheStore(path, wal=True)
+        cache.attach_shared(store, l1_ttl=5)
+    fetches = 0
+    # Workers walk the users from different offsets, like processes polling at different times
+    for user in USERS[offset:] + USERS[:offset]:
+        if cache.get(user) is None:
+            time.sleep(FETCH_SECONDS)
+            fetches += 1
+            cache.set(user, GOALS)
+    if store is not None:
+        store.close()
+    return fetches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--procs", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+
+        print(f"Single process, {args.ops} gets over {len(USERS)} users")
+        plain = {}
+        _time_ops("dict", plain.get, plain.__setitem__, args.ops)
+        memory = TTLCache("bench_memory", max_size=1024, ttl=300)
+        _time_ops("TTLCache (in-process)", memory.get, memory.set, args.ops)
+        store = CacheStore(path, wal=True)
+        for l1 in (5.0, 0.0):
+            shared = TTLCache(f"bench_shared_{l1}", max_size=1024, ttl=300)
+            shared.attach_shared(store, l1_ttl=l1)
+            _time_ops(f"TTLCache (shared, l1={l1:g}s)", shared.get, shared.set, args.ops)
+        store.close()
+
+        print(f"\n{args.procs} processes, {len(USERS)} users each, {FETCH_SECONDS * 1000:g} ms per fetch")
+        for label, use_shared in (("in-process caches", False), ("shared SQLite WAL", True)):
+            start = time.perf_counter()
+            with Pool(args.procs) as pool:
+                work = [(path, use_shared, i * len(USERS) // args.procs) for i in range(args.procs)]
+                fetches = pool.map(_worker, work)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<28} fetches {sum(fetches):5d}   wall {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
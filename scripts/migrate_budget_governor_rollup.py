@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the per-user, per-bucket spend rollup for the Budget Governor.
+
+Creates budget_governor_bucket_totals, keeps it current with a trigger on
+budget_governor_spend_log, backfills it from existing rows, and ensures the
+(user_id, bucket, ts) index used by the 39-minute window query exists.
+NeonBudgetGovernor reads it when MECRIS_BUDGET_AGGREGATION=sql.
+
+Run with: python scripts/migrate_budget_governor_rollup.py
+"""
+import os
+import psycopg2
+from dotenv import load_dotenv
+
+# Load environment
+dotenv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.env')
+load_dotenv(dotenv_path=dotenv_path)
+
+NEON_DB_URL = os.getenv("NEON_DB_URL")
+
+SQL = """
+-- Running all-time totals per user and bucket
+CREATE TABLE IF NOT EXISTS budget_governor_bucket_totals (
+    user_id TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    total_cost DOUBLE PRECISION NOT NULL DEFAULT 0,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, bucket)
+);
+
+-- Index for the per-user 39-minute rolling window query
+CREATE INDEX IF NOT EXISTS idx_budget_governor_spend_log_user_bucket_ts
+    ON budget_governor_spend_log (user_id, bucket, ts);
+
+CREATE OR REPLACE FUNCTION budget_governor_rollup()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE budget_governor_bucket_totals
+       SET total_cost = total_cost - OLD.cost,
+           event_count = event_count - 1,
+           updated_at = NOW()
+     WHERE user_id = OLD.user_id AND bucket = OLD.bucket;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO budget_governor_bucket_totals (user_id, bucket, total_cost, event_count)
+    VALUES (NEW.user_id, NEW.bucket, NEW.cost, 1)
+    ON CONFLICT (user_id, bucket) DO UPDATE
+       SET total_cost = budget_governor_bucket_totals.total_cost + EXCLUDED.total_cost,
+           event_count = budget_governor_bucket_totals.event_count + 1,
+           updated_at = NOW();
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Block concurrent spend inserts while the trigger goes in and totals are rebuilt
+LOCK TABLE budget_governor_spend_log IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS budget_governor_rollup_trigger ON budget_governor_spend_log;
+CREATE TRIGGER budget_governor_rollup_trigger
+AFTER INSERT OR UPDATE OR DELETE ON budget_governor_spend_log
+FOR EACH ROW EXECUTE FUNCTION budget_governor_rollup();
+
+-- Backfill (idempotent: rebuilds totals from the log)
+DELETE FROM budget_governor_bucket_totals;
+INSERT INTO budget_governor_bucket_totals (user_id, bucket, total_cost, event_count)
+SELECT user_id, bucket, SUM(cost), COUNT(*)
+FROM budget_governor_spend_log
+GROUP BY user_id, bucket;
+"""
+
+def main():
+    if not NEON_DB_URL:
+        print("ERROR: NEON_DB_URL not set in environment")
+        exit(1)
+
+    print("Creating budget_governor_bucket_totals rollup...")
+    try:
+        with psycopg2.connect(NEON_DB_URL) as conn:
+            with conn.cursor() as cur:
+                cur.execute(SQL)
+                print("✅ Rollup table, trigger and index created")
+
+                # Verify the rollup matches the log
+                cur.execute("""
+                    SELECT t.user_id, t.bucket, t.total_cost, t.event_count, COALESCE(l.total, 0)
+                    FROM budget_governor_bucket_totals t
+                    LEFT JOIN (
+                        SELECT user_id, bucket, SUM(cost) AS total
+                        FROM budget_governor_spend_log
+                        GROUP BY user_id, bucket
+                    ) l USING (user_id, bucket)
+                    ORDER BY t.user_id, t.bucket;
+                """)
+                print("\nBucket totals:")
+                for user_id, bucket, total, count, log_total in cur.fetchall():
+                    match = "ok" if abs(float(total) - float(log_total)) < 1e-6 else "MISMATCH"
+                    print(f"  {user_id}/{bucket}: {float(total):.4f} over {count} events ({match})")
+
+                cur.execute("""
+                    SELECT indexname, indexdef
+                    FROM pg_indexes
+                    WHERE tablename = 'budget_governor_spend_log';
+                """)
+                print("\nIndexes:")
+                for row in cur.fetchall():
+                    print(f"  {row[0]}: {row[1]}")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        exit(1)
+
+if __name__ == "__main__":
+    main()
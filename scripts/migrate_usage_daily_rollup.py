@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the per-user, per-local-day usage rollup.
+
+Creates usage_daily_rollup keyed by (user_id, day), where day is the
+America/New_York calendar date of the session, keeps it current with a
+trigger on usage_sessions (so write-behind batches and the Go sync service
+are covered too), and backfills it from existing sessions.
+UsageTracker.get_budget_status reads today's and the 7-day spend from it
+once it exists.
+
+Re-running is safe: the backfill rebuilds the rollup from usage_sessions.
+
+Run with: python scripts/migrate_usage_daily_rollup.py
+"""
+import os
+import psycopg2
+from dotenv import load_dotenv
+
+# Load environment
+dotenv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.env')
+load_dotenv(dotenv_path=dotenv_path)
+
+NEON_DB_URL = os.getenv("NEON_DB_URL")
+
+SQL = """
+-- Spend per user per Eastern calendar day (estimated_cost may be NULL in the Go schema: counts as 0)
+CREATE TABLE IF NOT EXISTS usage_daily_rollup (
+    user_id TEXT NOT NULL,
+    day DATE NOT NULL,
+    total_cost DOUBLE PRECISION NOT NULL DEFAULT 0,
+    session_count BIGINT NOT NULL DEFAULT 0,
+    input_tokens BIGINT NOT NULL DEFAULT 0,
+    output_tokens BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, day)
+);
+
+CREATE OR REPLACE FUNCTION usage_daily_rollup_apply()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.user_id IS NOT NULL THEN
+    UPDATE usage_daily_rollup
+       SET total_cost = total_cost - COALESCE(OLD.estimated_cost, 0),
+           session_count = session_count - 1,
+           input_tokens = input_tokens - COALESCE(OLD.input_tokens, 0),
+           output_tokens = output_tokens - COALESCE(OLD.output_tokens, 0),
+           updated_at = NOW()
+     WHERE user_id = OLD.user_id
+       AND day = (OLD.timestamp AT TIME ZONE 'America/New_York')::date;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.user_id IS NOT NULL THEN
+    INSERT INTO usage_daily_rollup (user_id, day, total_cost, session_count, input_tokens, output_tokens)
+    VALUES (NEW.user_id, (NEW.timestamp AT TIME ZONE 'America/New_York')::date,
+            COALESCE(NEW.estimated_cost, 0), 1, COALESCE(NEW.input_tokens, 0), COALESCE(NEW.output_tokens, 0))
+    ON CONFLICT (user_id, day) DO UPDATE
+       SET total_cost = usage_daily_rollup.total_cost + EXCLUDED.total_cost,
+           session_count = usage_daily_rollup.session_count + 1,
+           input_tokens = usage_daily_rollup.input_tokens + EXCLUDED.input_tokens,
+           output_tokens = usage_daily_rollup.output_tokens + EXCLUDED.output_tokens,
+           updated_at = NOW();
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Block concurrent session inserts while the trigger goes in and the rollup is rebuilt
+LOCK TABLE usage_sessions IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS usage_daily_rollup_trigger ON usage_sessions;
+CREATE TRIGGER usage_daily_rollup_trigger
+AFTER INSERT OR UPDATE OR DELETE ON usage_sessions
+FOR EACH ROW EXECUTE FUNCTION usage_daily_rollup_apply();
+
+-- Backfill (idempotent: rebuilds the rollup from the sessions)
+DELETE FROM usage_daily_rollup;
+INSERT INTO usage_daily_rollup (user_id, day, total_cost, session_count, input_tokens, output_tokens)
+SELECT user_id, (timestamp AT TIME ZONE 'America/New_York')::date,
+       COALESCE(SUM(estimated_cost), 0), COUNT(*), COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0)
+FROM usage_sessions
+WHERE user_id IS NOT NULL
+GROUP BY 1, 2;
+"""
+
+def main():
+    if not NEON_DB_URL:
+        print("ERROR: NEON_DB_URL not set in environment")
+        exit(1)
+
+    print("Creating usage_daily_rollup...")
+    try:
+        with psycopg2.connect(NEON_DB_URL) as conn:
+            with conn.cursor() as cur:
+                cur.execute(SQL)
+                print("✅ Rollup table and trigger created, sessions backfilled")
+
+                # Verify the rollup matches the sessions
+                cur.execute("""
+                    SELECT r.user_id, COUNT(*), SUM(r.session_count), SUM(r.total_cost), s.total
+                    FROM usage_daily_rollup r
+                    JOIN (
+                        SELECT user_id, COALESCE(SUM(estimated_cost), 0) AS total
+                        FROM usage_sessions
+                        WHERE user_id IS NOT NULL
+                        GROUP BY user_id
+                    ) s USING (user_id)
+                    GROUP BY r.user_id, s.total
+                    ORDER BY r.user_id;
+                """)
+                print("\nPer-user totals:")
+                for user_id, days, sessions, total, session_total in cur.fetchall():
+                    match = "ok" if abs(float(total) - float(session_total)) < 1e-6 else "MISMATCH"
+                    print(f"  {user_id}: ${float(total):.4f} over {sessions} sessions on {days} days ({match})")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Beeminder Client Pool — long-lived per-user BeeminderClient instances.
+
+Building a BeeminderClient per call leaked an httpx.AsyncClient each time and
+paid TLS setup plus a credential load before every API call. The pool keeps
+a bounded LRU of clients so keep-alive connections and loaded credentials
+are reused; evicted clients are closed.
+
+httpx connections belong to the event loop that opened them, and the server
+runs two loops (stdio MCP and the uvicorn thread), so entries are keyed by
+(user_id, loop). Credentials are re-read once older than
+MECRIS_BEEMINDER_CREDENTIAL_TTL, and evict(user_id) drops a user's clients
+and cached credentials when they change.
+"""
+import asyncio
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from beeminder_client import BeeminderClient, invalidate_credentials
+
+logger = logging.getLogger("mecris.services.beeminder_pool")
+
+
+class BeeminderClientPool:
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or int(os.getenv("MECRIS_BEEMINDER_POOL_SIZE", "32"))
+        self._clients: "OrderedDict[Tuple[Optional[str], int], BeeminderClient]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "credential_refreshes": 0}
+
+    def get(self, user_id: Optional[str]) -> BeeminderClient:
+        """Return the pooled client for user_id on the running loop, creating it on first use."""
+        key = (user_id, _loop_id())
+        evicted = []
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self._stats["hits"] += 1
+            else:
+                client = BeeminderClient(user_id=user_id)
+                self._clients[key] = client
+                self._stats["misses"] += 1
+                while len(self._clients) > self.max_size:
+                    evicted.append(self._clients.popitem(last=False))
+                    self._stats["evictions"] += 1
+        if client.credentials_expired():
+            client.forget_credentials()
+            self._stats["credential_refreshes"] += 1
+        for old_key, old in evicted:
+            _close_later(old, old_key[1])
+        return client
+
+    def evict(self, user_id: Optional[str]) -> int:
+        """Drop user_id's clients (on every loop) and cached credentials, e.g. after a credential update."""
+        invalidate_credentials(user_id)
+        with self._lock:
+            keys = [key for key in self._clients if key[0] == user_id]
+            evicted = [(key, self._clients.pop(key)) for key in keys]
+        for key, client in evicted:
+            _close_later(client, key[1])
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} pooled Beeminder client(s) for {user_id}")
+        return len(evicted)
+
+    async def close_all(self) -> None:
+        """Close the clients bound to the running loop (call on shutdown)."""
+        loop_id = _loop_id()
+        with self._lock:
+            keys = [key for key in self._clients if key[1] == loop_id]
+            clients = [self._clients.pop(key) for key in keys]
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close Beeminder client for {client.user_id}: {e}")
+
+    def clear(self) -> None:
+        """Forget every pooled client without closing it."""
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "size": len(self._clients), "max_size": self.max_size}
+
+
+def _loop_id() -> int:
+    try:
+        return id(asyncio.get_running_loop())
+    except RuntimeError:
+        return 0
+
+
+def _close_later(client: BeeminderClient, loop_id: int) -> None:
+    """Close an evicted client without blocking the caller.
+
+    Only possible on the loop that owns its connections; otherwise the client
+    is simply dropped and its sockets are reclaimed with it.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if id(loop) == loop_id:
+        loop.create_task(client.close())
+
+
+# Process-wide pool used by mcp_server and services
+beeminder_pool = BeeminderClientPool()
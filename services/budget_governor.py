@@ -20,12 +20,16 @@ Manages multi-bucket LLM quotas with:
 
 Plan: yebyen/mecris#26
 """
+from collections import Counter, deque
 from enum import Enum
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Deque, Tuple, Hashable
 from datetime import datetime, timedelta, timezone
 import json
 import os
 import logging
+import threading
+
+from services.spend_queue import get_spend_queue, write_behind_enabled
 
 logger = logging.getLogger("mecris.services.budget_governor")
 
@@ -44,6 +48,15 @@ class BucketType(Enum):
 _DAYLIGHT_MINUTES = 780
 _ENVELOPE_WINDOW_MINUTES = int(_DAYLIGHT_MINUTES * 0.05)  # 39 min
 _ENVELOPE_SPEND_RATIO = 0.05  # 5% of period quota per window
+# Incremental loads page by spend_log id, so rows committed late with an old
+# ts (spill replays, lagging writers) are still picked up. Concurrent inserts
+# can make a SERIAL id visible after a higher one, so the aggregate is also
+# rebuilt from a full load this often.
+_FULL_RESYNC_INTERVAL = timedelta(minutes=10)
+# Locally recorded rows whose Neon copy has not shown up by a full resync
+# this long after their ts are dropped: they were spilled (and will arrive
+# with a new id) or dead-lettered.
+_LOCAL_GRACE = timedelta(minutes=2)
 
 
 class BudgetGovernor:
@@ -52,6 +65,14 @@ class BudgetGovernor:
 
     Buckets are defined at instantiation. Spend events are logged in-memory;
     this is intentionally lightweight — no DB dependency.
+
+    With a spend_log_path, each event is appended to a JSONL journal there.
+    Every MECRIS_SPEND_JOURNAL_COMPACT_EVERY journal lines (default 500) the
+    events older than the envelope window are folded into per-bucket totals
+    and written, with the window's events, to <path>.snapshot; the journal
+    is then truncated. Startup loads the snapshot and replays only journal
+    lines with a later sequence number. A legacy JSON-array log is read once
+    and compacted into the new layout.
     """
 
     def __init__(self, spend_log_path: Optional[str] = None):
@@ -95,43 +116,133 @@ class BudgetGovernor:
             },
         }
         self._spend_log_path: Optional[str] = spend_log_path
-        # Spend log: list of dicts with keys: bucket, cost, ts
+        self._snapshot_path: Optional[str] = f"{spend_log_path}.snapshot" if spend_log_path else None
+        self._compact_every = int(os.getenv("MECRIS_SPEND_JOURNAL_COMPACT_EVERY", "500"))
+        # All-time spend per bucket already folded out of _spend_log by compaction
+        self._base_totals: Dict[str, float] = {}
+        self._journal_seq = 0
+        self._journal_lines = 0
+        self._legacy_log = False
+        # Spend log: list of dicts with keys: bucket, cost, ts (events since the snapshot)
         self._spend_log: List[Dict[str, Any]] = self._load_spend_log()
+        if self._legacy_log:
+            self._compact()
+
+    @staticmethod
+    def _parse_event(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "bucket": entry["bucket"],
+            "cost": float(entry["cost"]),
+            "ts": datetime.fromisoformat(entry["ts"]),
+        }
+
+    @staticmethod
+    def _serialize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+        return {"bucket": event["bucket"], "cost": event["cost"], "ts": event["ts"].isoformat()}
 
     def _load_spend_log(self) -> List[Dict[str, Any]]:
-        """Load spend events from JSON file. Returns empty list on any error."""
+        """Load the snapshot and replay newer journal lines. Bad data is skipped, never fatal."""
         if not self._spend_log_path:
             return []
+        events: List[Dict[str, Any]] = []
+        snapshot_seq = 0
+        try:
+            with open(self._snapshot_path, "r") as f:
+                snapshot = json.load(f)
+            self._base_totals = {b: float(v) for b, v in snapshot.get("totals", {}).items()}
+            events = [self._parse_event(e) for e in snapshot.get("events", [])]
+            snapshot_seq = int(snapshot.get("seq", 0))
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.warning("Could not load spend snapshot from %s: %s — replaying journal only.", self._snapshot_path, exc)
+            self._base_totals, events = {}, []
+        self._journal_seq = snapshot_seq
+
         try:
             with open(self._spend_log_path, "r") as f:
-                raw = json.load(f)
-            result = []
-            for entry in raw:
-                result.append({
-                    "bucket": entry["bucket"],
-                    "cost": float(entry["cost"]),
-                    "ts": datetime.fromisoformat(entry["ts"]),
-                })
-            return result
+                text = f.read()
         except FileNotFoundError:
-            return []
+            return events
         except Exception as exc:
             logger.warning("Could not load spend log from %s: %s — starting fresh.", self._spend_log_path, exc)
-            return []
+            return events
+
+        if text.lstrip().startswith("["):
+            # Pre-journal format: the whole log as one JSON array
+            try:
+                events.extend(self._parse_event(e) for e in json.loads(text))
+                self._legacy_log = True
+            except Exception as exc:
+                logger.warning("Could not load spend log from %s: %s — starting fresh.", self._spend_log_path, exc)
+            return events
+
+        skipped = 0
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                seq = int(entry.get("seq", 0))
+                if seq and seq <= snapshot_seq:
+                    continue
+                events.append(self._parse_event(entry))
+            except Exception:
+                skipped += 1
+                continue
+            self._journal_seq = max(self._journal_seq, seq)
+            self._journal_lines += 1
+        if skipped:
+            logger.warning("Skipped %d unreadable line(s) in spend journal %s", skipped, self._spend_log_path)
+        return events
+
+    def _append_spend(self, event: Dict[str, Any]) -> None:
+        """Append one event to the journal (O(1)); compact once enough lines accumulate."""
+        if not self._spend_log_path:
+            return
+        self._journal_seq += 1
+        try:
+            with open(self._spend_log_path, "a") as f:
+                f.write(json.dumps({"seq": self._journal_seq, **self._serialize_event(event)}) + "\n")
+            self._journal_lines += 1
+        except Exception as exc:
+            logger.warning("Could not append to spend journal %s: %s", self._spend_log_path, exc)
+            return
+        if self._journal_lines >= self._compact_every:
+            self._compact()
 
-    def _persist_spend_log(self) -> None:
-        """Write the current spend log to disk as JSON."""
+    def _compact(self) -> None:
+        """Fold events older than the envelope window into the snapshot and truncate the journal."""
         if not self._spend_log_path:
             return
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=_ENVELOPE_WINDOW_MINUTES)
+        totals = dict(self._base_totals)
+        keep = []
+        for e in self._spend_log:
+            if e["ts"] >= cutoff:
+                keep.append(e)
+            else:
+                totals[e["bucket"]] = totals.get(e["bucket"], 0.0) + e["cost"]
+        snapshot = {
+            "seq": self._journal_seq,
+            "totals": totals,
+            "events": [self._serialize_event(e) for e in keep],
+        }
+        tmp_path = f"{self._snapshot_path}.tmp"
         try:
-            serializable = [
-                {"bucket": e["bucket"], "cost": e["cost"], "ts": e["ts"].isoformat()}
-                for e in self._spend_log
-            ]
-            with open(self._spend_log_path, "w") as f:
-                json.dump(serializable, f)
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self._snapshot_path)
+            # Every journal line is now covered by the snapshot's seq, so a crash
+            # before this truncate only leaves lines that replay will skip.
+            open(self._spend_log_path, "w").close()
         except Exception as exc:
-            logger.warning("Could not persist spend log to %s: %s", self._spend_log_path, exc)
+            logger.warning("Could not compact spend journal %s: %s", self._spend_log_path, exc)
+            return
+        self._base_totals = totals
+        self._spend_log = keep
+        self._journal_lines = 0
+        self._legacy_log = False
 
     # ------------------------------------------------------------------
     # Core envelope logic
@@ -139,7 +250,7 @@ class BudgetGovernor:
 
     def _total_spent(self, bucket_name: str) -> float:
         """Sum all spend events for a bucket across all time."""
-        return sum(
+        return self._base_totals.get(bucket_name, 0.0) + sum(
             e["cost"] for e in self._spend_log if e["bucket"] == bucket_name
         )
 
@@ -182,12 +293,13 @@ class BudgetGovernor:
         """Record an actual spend event for rate tracking."""
         if bucket_name not in self.buckets:
             raise ValueError(f"Unknown bucket: {bucket_name!r}")
-        self._spend_log.append({
+        event = {
             "bucket": bucket_name,
             "cost": cost,
             "ts": datetime.now(timezone.utc),
-        })
-        self._persist_spend_log()
+        }
+        self._spend_log.append(event)
+        self._append_spend(event)
 
     # ------------------------------------------------------------------
     # Routing recommendation
@@ -400,12 +512,135 @@ class BudgetGovernor:
 # Neon-backed Budget Governor (Phase 2: MCP exposure)
 # ------------------------------------------------------------------
 
+def _sql_aggregation() -> bool:
+    return os.getenv("MECRIS_BUDGET_AGGREGATION", "memory").lower() == "sql"
+
+
+class SpendTotals:
+    """Per-bucket all-time and 39-minute-window spend."""
+
+    def __init__(self, totals: Optional[Dict[str, float]] = None, window_sums: Optional[Dict[str, float]] = None):
+        self.totals: Dict[str, float] = totals or {}
+        self.window_sums: Dict[str, float] = window_sums or {}
+
+    def total(self, bucket: str) -> float:
+        return self.totals.get(bucket, 0.0)
+
+    def window(self, bucket: str) -> float:
+        return max(0.0, self.window_sums.get(bucket, 0.0))
+
+
+class SpendAggregate(SpendTotals):
+    """
+    Running per-bucket totals plus a time-ordered deque of the rolling window.
+
+    Loaded rows are folded in by id: apply() takes rows with id above the
+    last one seen. Rows recorded locally (apply_local) are counted at once
+    and remembered until their copy is loaded back from Neon, which is then
+    skipped. The owner rebuilds the aggregate from a full load every
+    _FULL_RESYNC_INTERVAL to catch ids that became visible out of order.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._window: Deque[Tuple[datetime, str, float]] = deque()
+        self._local: Dict[Hashable, List[Dict[str, Any]]] = {}
+        self.last_id: Optional[int] = None
+        self.loaded = False
+        self.loaded_at: Optional[datetime] = None
+
+    @staticmethod
+    def _identity(row: Dict[str, Any]) -> Hashable:
+        return (row["bucket"], round(float(row["cost"]), 6), row["ts"])
+
+    def since_id(self) -> int:
+        """Lower (exclusive) id bound for the next incremental load."""
+        return self.last_id or 0
+
+    def needs_full_load(self, now: datetime) -> bool:
+        return not self.loaded or self.loaded_at is None or now - self.loaded_at >= _FULL_RESYNC_INTERVAL
+
+    def apply(self, rows: List[Dict[str, Any]], now: datetime) -> int:
+        """Fold in rows loaded from Neon; returns how many were counted."""
+        cutoff = now - timedelta(minutes=_ENVELOPE_WINDOW_MINUTES)
+        applied = 0
+        for row in rows:
+            row_id = row.get("id")
+            if row_id is not None:
+                if self.loaded and self.last_id is not None and row_id <= self.last_id:
+                    continue
+                self.last_id = row_id if self.last_id is None else max(self.last_id, row_id)
+            pending = self._local.get(self._identity(row))
+            if pending:
+                # Already counted when it was recorded here
+                pending.pop()
+                if not pending:
+                    del self._local[self._identity(row)]
+                continue
+            self._count(row, cutoff)
+            applied += 1
+        self.loaded = True
+        self._expire(cutoff)
+        return applied
+
+    def apply_local(self, row: Dict[str, Any], now: datetime) -> None:
+        """Count a row recorded by this process before Neon has it."""
+        cutoff = now - timedelta(minutes=_ENVELOPE_WINDOW_MINUTES)
+        self._count(row, cutoff)
+        self._local.setdefault(self._identity(row), []).append(row)
+        self._expire(cutoff)
+
+    @classmethod
+    def rebuild(cls, rows: List[Dict[str, Any]], now: datetime,
+                previous: Optional["SpendAggregate"] = None) -> "SpendAggregate":
+        """Aggregate from a full load, carrying over local rows Neon does not have yet."""
+        fresh = cls()
+        fresh.apply(rows, now)
+        fresh.loaded_at = now
+        if previous is not None and previous._local:
+            # Local rows whose copy is among the rows previous had not loaded yet are in `rows` already
+            arrived = Counter(cls._identity(r) for r in rows
+                              if r.get("id") is None or previous.last_id is None or r["id"] > previous.last_id)
+            for key, pending in previous._local.items():
+                for row in pending[arrived[key]:]:
+                    if row["ts"] >= now - _LOCAL_GRACE:
+                        fresh.apply_local(row, now)
+        return fresh
+
+    def _count(self, row: Dict[str, Any], cutoff: datetime) -> None:
+        ts, bucket, cost = row["ts"], row["bucket"], float(row["cost"])
+        self.totals[bucket] = self.totals.get(bucket, 0.0) + cost
+        if ts >= cutoff:
+            if self._window and ts < self._window[-1][0]:
+                self._window = deque(sorted([*self._window, (ts, bucket, cost)], key=lambda e: e[0]))
+            else:
+                self._window.append((ts, bucket, cost))
+            self.window_sums[bucket] = self.window_sums.get(bucket, 0.0) + cost
+
+    def _expire(self, cutoff: datetime) -> None:
+        while self._window and self._window[0][0] < cutoff:
+            _, bucket, cost = self._window.popleft()
+            self.window_sums[bucket] -= cost
+        if not self._window:
+            # Reset rather than accumulate float drift from repeated subtraction
+            self.window_sums.clear()
+
+
 class NeonBudgetGovernor:
     """
     Budget Governor with Neon PostgreSQL persistence.
     
     Replaces the JSON file backend with a proper database table.
     Uses the same envelope logic (5%/5% rule) as BudgetGovernor.
+
+    Totals and the 39-minute window are kept in a SpendAggregate; each public
+    call first fetches only rows newer than the last one seen, so a gate
+    check costs the same however long the spend history is.
+
+    With MECRIS_BUDGET_AGGREGATION=sql (for several processes sharing one
+    user's budget) each call instead runs one aggregate query against the
+    budget_governor_bucket_totals rollup (scripts/migrate_budget_governor_rollup.py),
+    falling back to SUM ... FILTER over the log if the rollup is missing.
     """
     
     def __init__(self, neon_url: Optional[str] = None, user_id: Optional[str] = None):
@@ -453,6 +688,10 @@ class NeonBudgetGovernor:
             },
         }
         
+        self._aggregate = SpendAggregate()
+        self._aggregate_lock = threading.Lock()
+        self._rollup_available = True
+
         if not self.neon_url:
             logger.warning("NEON_DB_URL not set; NeonBudgetGovernor will fail on DB operations.")
         else:
@@ -461,8 +700,8 @@ class NeonBudgetGovernor:
     def _init_db(self):
         """Create the spend_log table if it doesn't exist."""
         try:
-            import psycopg2
-            with psycopg2.connect(self.neon_url) as conn:
+            from services.neon_pool import get_connection
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         CREATE TABLE IF NOT EXISTS budget_governor_spend_log (
@@ -480,37 +719,53 @@ class NeonBudgetGovernor:
             logger.error(f"NeonBudgetGovernor: DB init failed: {exc}")
             raise
     
-    def _load_spend_log(self) -> List[Dict[str, Any]]:
-        """Load all spend events for this user from Neon."""
+    def _load_spend_log(self, after_id: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """Load this user's spend events from Neon (all, or those with id > after_id); None on error."""
         if not self.neon_url:
             return []
         try:
-            import psycopg2
             from psycopg2.extras import RealDictCursor
-            with psycopg2.connect(self.neon_url) as conn:
+            from services.neon_pool import get_connection
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute("""
-                        SELECT bucket, cost, ts
-                        FROM budget_governor_spend_log
-                        WHERE user_id = %s
-                        ORDER BY ts ASC
-                    """, (self.user_id,))
+                    if after_id is None:
+                        cur.execute("""
+                            SELECT id, bucket, cost, ts
+                            FROM budget_governor_spend_log
+                            WHERE user_id = %s
+                            ORDER BY id ASC
+                        """, (self.user_id,))
+                    else:
+                        cur.execute("""
+                            SELECT id, bucket, cost, ts
+                            FROM budget_governor_spend_log
+                            WHERE user_id = %s AND id > %s
+                            ORDER BY id ASC
+                        """, (self.user_id, after_id))
                     rows = cur.fetchall()
                     return [
-                        {"bucket": r["bucket"], "cost": float(r["cost"]), "ts": r["ts"]}
+                        {"id": r["id"], "bucket": r["bucket"], "cost": float(r["cost"]), "ts": r["ts"]}
                         for r in rows
                     ]
         except Exception as exc:
             logger.error(f"NeonBudgetGovernor: load spend log failed: {exc}")
-            return []
+            return None
     
     def _persist_spend(self, bucket: str, cost: float, ts: datetime) -> None:
-        """Insert a single spend event into Neon."""
+        """Insert a single spend event into Neon (write-behind unless MECRIS_SPEND_WRITE_BEHIND=false)."""
         if not self.neon_url:
             return
+        if write_behind_enabled():
+            get_spend_queue(self.neon_url).enqueue(
+                "governor_spend", {"user_id": self.user_id, "bucket": bucket, "cost": cost, "ts": ts})
+            # Count it now rather than after the flush lands in Neon
+            with self._aggregate_lock:
+                if self._aggregate.loaded:
+                    self._aggregate.apply_local({"bucket": bucket, "cost": cost, "ts": ts}, ts)
+            return
         try:
-            import psycopg2
-            with psycopg2.connect(self.neon_url) as conn:
+            from services.neon_pool import get_connection
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         INSERT INTO budget_governor_spend_log (user_id, bucket, cost, ts)
@@ -521,24 +776,103 @@ class NeonBudgetGovernor:
             raise
 
     # Core envelope logic (mirrors BudgetGovernor)
-    
+
+    def _query_totals(self) -> SpendTotals:
+        """Compute per-bucket total and window spend in Postgres with one query."""
+        if not self.neon_url:
+            return SpendTotals()
+        import psycopg2
+        from services.neon_pool import get_connection
+        window = f"{_ENVELOPE_WINDOW_MINUTES} minutes"
+        try:
+            with get_connection(self.neon_url) as conn:
+                with conn.cursor() as cur:
+                    if self._rollup_available:
+                        try:
+                            cur.execute("""
+                                SELECT bucket, SUM(total_cost), SUM(window_cost)
+                                FROM (
+                                    SELECT bucket, total_cost, 0::double precision AS window_cost
+                                    FROM budget_governor_bucket_totals
+                                    WHERE user_id = %s
+                                    UNION ALL
+                                    SELECT bucket, 0::double precision, SUM(cost)::double precision
+                                    FROM budget_governor_spend_log
+                                    WHERE user_id = %s AND ts >= NOW() - %s::interval
+                                    GROUP BY bucket
+                                ) s
+                                GROUP BY bucket
+                            """, (self.user_id, self.user_id, window))
+                            rows = cur.fetchall()
+                        except psycopg2.errors.UndefinedTable:
+                            conn.rollback()
+                            logger.warning("budget_governor_bucket_totals missing; run scripts/migrate_budget_governor_rollup.py")
+                            self._rollup_available = False
+                    if not self._rollup_available:
+                        cur.execute("""
+                            SELECT bucket,
+                                   SUM(cost),
+                                   COALESCE(SUM(cost) FILTER (WHERE ts >= NOW() - %s::interval), 0)
+                            FROM budget_governor_spend_log
+                            WHERE user_id = %s
+                            GROUP BY bucket
+                        """, (window, self.user_id))
+                        rows = cur.fetchall()
+        except Exception as exc:
+            logger.error(f"NeonBudgetGovernor: aggregate query failed: {exc}")
+            return SpendTotals()
+        return SpendTotals(
+            {bucket: float(total or 0) for bucket, total, _ in rows},
+            {bucket: float(win or 0) for bucket, _, win in rows},
+        )
+
+    def _refresh(self) -> SpendTotals:
+        """Fold rows recorded since the last refresh into the running aggregate."""
+        if _sql_aggregation():
+            return self._query_totals()
+        with self._aggregate_lock:
+            now = datetime.now(timezone.utc)
+            if self._aggregate.needs_full_load(now):
+                rows = self._load_spend_log()
+                if rows is not None:
+                    self._aggregate = SpendAggregate.rebuild(rows, now, previous=self._aggregate)
+            else:
+                self._aggregate.apply(self._load_spend_log(self._aggregate.since_id()) or [], now)
+            return self._aggregate
+
     def _total_spent(self, bucket_name: str, spend_log: Optional[List[Dict[str, Any]]] = None) -> float:
         """Sum all spend events for a bucket across all time."""
-        log = spend_log if spend_log is not None else self._load_spend_log()
+        if spend_log is None:
+            return self._refresh().total(bucket_name)
         return sum(
-            e["cost"] for e in log if e["bucket"] == bucket_name
+            e["cost"] for e in spend_log if e["bucket"] == bucket_name
         )
 
     def _window_spent(self, bucket_name: str, spend_log: Optional[List[Dict[str, Any]]] = None) -> float:
         """Sum spend events for a bucket in the last 39-minute rolling window."""
-        log = spend_log if spend_log is not None else self._load_spend_log()
+        if spend_log is None:
+            return self._refresh().window(bucket_name)
         cutoff = datetime.now(timezone.utc) - timedelta(minutes=_ENVELOPE_WINDOW_MINUTES)
         return sum(
             e["cost"]
-            for e in log
+            for e in spend_log
             if e["bucket"] == bucket_name and e["ts"] >= cutoff
         )
 
+    def _envelope(self, bucket_name: str, cost_estimate: float, agg: SpendTotals) -> str:
+        limit = self.buckets[bucket_name]["limit"]
+
+        # Hard stop: total exhausted
+        if agg.total(bucket_name) >= limit:
+            return "deny"
+
+        # Rate envelope: rolling window cap
+        window_cap = _ENVELOPE_SPEND_RATIO * limit
+        if agg.window(bucket_name) + cost_estimate > window_cap:
+            return "defer"
+
+        return "allow"
+
     def check_envelope(self, bucket_name: str, cost_estimate: float) -> str:
         """
         Returns 'allow', 'defer', or 'deny' based on the 5%/5% rule.
@@ -549,21 +883,7 @@ class NeonBudgetGovernor:
         """
         if bucket_name not in self.buckets:
             raise ValueError(f"Unknown bucket: {bucket_name!r}")
-
-        cfg = self.buckets[bucket_name]
-        limit = cfg["limit"]
-        spend_log = self._load_spend_log()
-
-        # Hard stop: total exhausted
-        if self._total_spent(bucket_name, spend_log) >= limit:
-            return "deny"
-
-        # Rate envelope: rolling window cap
-        window_cap = _ENVELOPE_SPEND_RATIO * limit
-        if self._window_spent(bucket_name, spend_log) + cost_estimate > window_cap:
-            return "defer"
-
-        return "allow"
+        return self._envelope(bucket_name, cost_estimate, self._refresh())
 
     def record_spend(self, bucket_name: str, cost: float) -> None:
         """Record an actual spend event for rate tracking."""
@@ -582,32 +902,34 @@ class NeonBudgetGovernor:
           2. GUARD buckets that are not exhausted (fallback).
           3. Least-spent GUARD bucket (emergency fallback when all are tight).
         """
-        spend_log = self._load_spend_log()
+        return self._recommend(self._refresh())
+
+    def _recommend(self, agg: SpendTotals) -> str:
         spend_available = [
             name for name, cfg in self.buckets.items()
             if cfg["type"] == BucketType.SPEND
-            and self._total_spent(name, spend_log) < cfg["limit"]
+            and agg.total(name) < cfg["limit"]
         ]
         if spend_available:
             return max(
                 spend_available,
-                key=lambda n: self.buckets[n]["limit"] - self._total_spent(n, spend_log),
+                key=lambda n: self.buckets[n]["limit"] - agg.total(n),
             )
 
         guard_available = [
             name for name, cfg in self.buckets.items()
             if cfg["type"] == BucketType.GUARD
-            and self._total_spent(name, spend_log) < cfg["limit"]
+            and agg.total(name) < cfg["limit"]
         ]
         if guard_available:
             return min(
                 guard_available,
-                key=lambda n: self._total_spent(n, spend_log) / self.buckets[n]["limit"],
+                key=lambda n: agg.total(n) / self.buckets[n]["limit"],
             )
 
         return min(
             self.buckets.keys(),
-            key=lambda n: self._total_spent(n, spend_log) / self.buckets[n]["limit"],
+            key=lambda n: agg.total(n) / self.buckets[n]["limit"],
         )
 
     # Status report
@@ -619,15 +941,15 @@ class NeonBudgetGovernor:
           - recommendation: best bucket for next task
           - envelope_status: overall system state
         """
-        spend_log = self._load_spend_log()
+        agg = self._refresh()
         bucket_report: Dict[str, Any] = {}
         all_denied = True
 
         for name, cfg in self.buckets.items():
-            spent = self._total_spent(name, spend_log)
-            window = self._window_spent(name, spend_log)
+            spent = agg.total(name)
+            window = agg.window(name)
             limit = cfg["limit"]
-            envelope = self.check_envelope(name, 0.01)
+            envelope = self._envelope(name, 0.01, agg)
             if envelope != "deny":
                 all_denied = False
 
@@ -647,7 +969,7 @@ class NeonBudgetGovernor:
 
         return {
             "buckets": bucket_report,
-            "recommendation": self.recommend_bucket(),
+            "recommendation": self._recommend(agg),
             "envelope_status": "HALTED" if all_denied else "OK",
             "window_minutes": _ENVELOPE_WINDOW_MINUTES,
             "envelope_spend_pct": int(_ENVELOPE_SPEND_RATIO * 100),
@@ -0,0 +1,303 @@
+"""
+Cache — bounded, instrumented in-process caches shared by the MCP server.
+
+Each namespace is a TTLCache: entries expire after a TTL (overridable per
+entry) and the namespace is capped, evicting expired entries first and then
+the least recently used. Every namespace counts hits, misses, expirations,
+evictions and invalidations; get_cache_stats (MCP tool) reports them so
+TTLs can be tuned from data.
+
+Defaults passed to get_cache() can be overridden per namespace with
+MECRIS_CACHE_TTL_<NAMESPACE> / MECRIS_CACHE_MAX_<NAMESPACE>. Namespaces
+created with persist=True survive restarts when MECRIS_CACHE_PERSIST is on,
+or are shared by every local process when MECRIS_CACHE_BACKEND=shared (see
+services/cache_store.py).
+
+invalidate_user() is the single invalidation entry point for write paths
+and the pg_notify listener. Keys belonging to a user are the user_id itself,
+tuples starting with it, or strings prefixed "user_id:". Other caches (e.g.
+services/context_cache.py) subscribe via register_invalidation_hook().
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("mecris.services.cache")
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, namespace: str, max_size: int = 256, ttl: float = 300.0):
+        self.namespace = namespace
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0,
+                          "stale_reads": 0, "shared_hits": 0}
+        # Pending write-behind changes (key -> still live?); None when not persisted
+        self._changes: Optional[Dict[Hashable, bool]] = None
+        self._cleared = False
+        # Cross-process store read/written through (MECRIS_CACHE_BACKEND=shared)
+        self._shared = None
+        self._l1_ttl = 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the fresh value for key, or default (expired entries count as misses)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[1]
+        if self._shared is not None:
+            found = self._shared_call("get", self.namespace, key)
+            if found is not None:
+                value, expires_at = found
+                with self._lock:
+                    self._data[key] = (self._l1_expiry(expires_at), value)
+                    self._data.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["shared_hits"] += 1
+                    if len(self._data) > self.max_size:
+                        self._evict_locked()
+                return value
+        with self._lock:
+            self._counters["misses"] += 1
+            if entry is not None:
+                self._counters["expired"] += 1
+        return default
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for key even if expired (fallback when a refresh fails)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._counters["stale_reads"] += 1
+                return entry[1]
+        if self._shared is not None:
+            found = self._shared_call("get", self.namespace, key, include_expired=True)
+            if found is not None:
+                self._counters["stale_reads"] += 1
+                return found[0]
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        lifetime = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + lifetime
+        if self._shared is not None:
+            self._shared_call("put", self.namespace, key, value, time.time() + lifetime)
+            expires = min(expires, time.monotonic() + self._l1_ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            self._changed(key, True)
+            if len(self._data) > self.max_size:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._data.items() if expires <= now]:
+            del self._data[key]
+            self._changed(key, False)
+            self._counters["evictions"] += 1
+        while len(self._data) > self.max_size:
+            key, _ = self._data.popitem(last=False)
+            self._changed(key, False)
+            self._counters["evictions"] += 1
+
+    def delete(self, key: Hashable) -> bool:
+        if self._shared is not None:
+            self._shared_call("delete", self.namespace, [key])
+        with self._lock:
+            if self._data.pop(key, _MISSING) is _MISSING:
+                return False
+            self._changed(key, False)
+            self._counters["invalidations"] += 1
+            return True
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            for key in keys:
+                del self._data[key]
+                self._changed(key, False)
+            self._counters["invalidations"] += len(keys)
+        if keys and self._shared is not None:
+            self._shared_call("delete", self.namespace, keys)
+        return len(keys)
+
+    def invalidate_user(self, user_id: str) -> int:
+        if self._shared is not None:
+            # Also drops rows other processes wrote that this one never read
+            self._shared_call("delete_user", self.namespace, user_id)
+        return self.invalidate_where(lambda key: _belongs_to(key, user_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            if self._changes is not None:
+                self._changes.clear()
+                self._cleared = True
+        if self._shared is not None:
+            self._shared_call("clear_namespace", self.namespace)
+
+    # --- cross-process backend (services/cache_store.py) ---
+
+    def attach_shared(self, store, l1_ttl: float) -> None:
+        self._shared = store
+        self._l1_ttl = l1_ttl
+
+    def _l1_expiry(self, expires_at: float) -> float:
+        return time.monotonic() + min(expires_at - time.time(), self._l1_ttl)
+
+    def _shared_call(self, method: str, *args, **kwargs) -> Any:
+        # A locked or unreadable shared file degrades to a local miss, never an error
+        try:
+            return getattr(self._shared, method)(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Shared cache {method} failed for {self.namespace}: {e}")
+            return None
+
+    # --- write-behind persistence hooks (services/cache_store.py) ---
+
+    def _changed(self, key: Hashable, live: bool) -> None:
+        if self._changes is not None:
+            self._changes[key] = live
+
+    def track_changes(self) -> None:
+        with self._lock:
+            if self._changes is None:
+                self._changes = {}
+
+    def restore(self, entries: Iterable[Tuple[Hashable, Any, float]]) -> int:
+        """Load (key, value, wall-clock expiry) rows without marking them dirty."""
+        offset = time.monotonic() - time.time()
+        restored = 0
+        with self._lock:
+            for key, value, expires_at in entries:
+                if key not in self._data:
+                    self._data[key] = (expires_at + offset, value)
+                    restored += 1
+            if len(self._data) > self.max_size:
+                self._evict_locked()
+        return restored
+
+    def drain_changes(self) -> Tuple[Dict[Hashable, Tuple[float, Any]], List[Hashable], bool]:
+        """Return and reset pending (upserts with wall-clock expiry, deletes, cleared)."""
+        offset = time.time() - time.monotonic()
+        with self._lock:
+            if not self._changes and not self._cleared:
+                return {}, [], False
+            upserts, deletes = {}, []
+            for key, live in self._changes.items():
+                entry = self._data.get(key)
+                if live and entry is not None:
+                    upserts[key] = (entry[0] + offset, entry[1])
+                else:
+                    deletes.append(key)
+            cleared, self._cleared = self._cleared, False
+            self._changes.clear()
+        return upserts, deletes, cleared
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "persisted": self._changes is not None,
+                "shared": self._shared is not None,
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else None,
+            }
+
+
+def _belongs_to(key: Hashable, user_id: str) -> bool:
+    if key == user_id:
+        return True
+    if isinstance(key, tuple):
+        return bool(key) and key[0] == user_id
+    return isinstance(key, str) and key.startswith(f"{user_id}:")
+
+
+_registry: Dict[str, TTLCache] = {}
+_registry_lock = threading.Lock()
+_invalidation_hooks: List[Callable[[str, str], None]] = []
+
+
+def get_cache(namespace: str, max_size: int = 256, ttl: float = 300.0, persist: bool = False) -> TTLCache:
+    """Return the process-wide cache for namespace, creating it on first use.
+
+    persist=True warms the cache from disk and writes it behind when
+    MECRIS_CACHE_PERSIST is enabled; values must then be JSON serialisable.
+    """
+    with _registry_lock:
+        cache = _registry.get(namespace)
+        if cache is not None:
+            return cache
+        env_name = namespace.upper()
+        cache = TTLCache(
+            namespace,
+            max_size=int(os.getenv(f"MECRIS_CACHE_MAX_{env_name}", max_size)),
+            ttl=float(os.getenv(f"MECRIS_CACHE_TTL_{env_name}", ttl)),
+        )
+        _registry[namespace] = cache
+    if persist:
+        from services.cache_store import get_shared_store, get_writer, shared_l1_ttl
+        shared = get_shared_store()
+        if shared is not None:
+            cache.attach_shared(shared, shared_l1_ttl())
+        else:
+            writer = get_writer()
+            if writer is not None:
+                writer.attach(cache)
+    return cache
+
+
+def register_invalidation_hook(hook: Callable[[str, str], None]) -> None:
+    """hook(user_id, reason) runs on every invalidate_user call."""
+    _invalidation_hooks.append(hook)
+
+
+def invalidate_user(user_id: str, namespaces: Optional[Iterable[str]] = None, reason: str = "") -> int:
+    """Drop user_id's entries from the given namespaces (all when None) and run the hooks."""
+    if not user_id:
+        return 0
+    with _registry_lock:
+        caches = list(_registry.values()) if namespaces is None else [_registry[n] for n in namespaces if n in _registry]
+    dropped = sum(cache.invalidate_user(user_id) for cache in caches)
+    for hook in _invalidation_hooks:
+        try:
+            hook(user_id, reason)
+        except Exception as e:
+            logger.error(f"Cache invalidation hook failed for {user_id}: {e}")
+    if dropped:
+        logger.info(f"Invalidated {dropped} cache entries for {user_id}" + (f" ({reason})" if reason else ""))
+    return dropped
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    with _registry_lock:
+        caches = dict(_registry)
+    return {name: cache.stats() for name, cache in sorted(caches.items())}
+
+
+def clear_all() -> None:
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.clear()
@@ -0,0 +1,301 @@
+"""
+Cache Store — SQLite snapshot of services/cache.py namespaces across restarts.
+
+Every stdio spawn (Pi/Gemini, mcp_stdio_server.py, py_harness) used to start
+with empty goal, activity and weather caches and pay the full Beeminder/Neon
+fan-out on its first tool call. With MECRIS_CACHE_PERSIST=true, namespaces
+created with get_cache(..., persist=True) are written behind to a local
+SQLite file (MECRIS_CACHE_DB_PATH, default mecris_cache.db beside
+mecris_usage.db) and reloaded at startup with their original expiry times,
+so a short-lived session answers from a warm cache immediately.
+
+Writes are batched: caches record dirty keys and a daemon thread flushes them
+every MECRIS_CACHE_FLUSH_SECONDS (default 5), plus once at shutdown.
+Invalidations and evictions are persisted as deletes so a restart never
+resurrects an entry the previous process dropped. Values must be JSON
+serialisable; anything else stays memory-only.
+
+MECRIS_CACHE_BACKEND=shared instead makes the same namespaces read and write
+through a WAL-mode SQLite file shared by every local process (stdio server,
+HTTP bridge thread, cli/pulse.py, py_harness), at MECRIS_SHARED_CACHE_PATH
+(default ~/.mecris/cache.db). Expiry is checked inside the SELECT, so a row
+is either fresh or absent; each process keeps at most
+MECRIS_SHARED_CACHE_L1_SECONDS (default 5) of in-memory copy so another
+process's invalidation is seen quickly. scripts/benchmark_shared_cache.py
+compares it with the in-process cache.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("mecris.services.cache_store")
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mecris_cache.db")
+SHARED_PATH = os.path.join(os.path.expanduser("~"), ".mecris", "cache.db")
+# Rows are pruned lazily, once every this many writes
+PRUNE_EVERY = 256
+
+
+def persistence_enabled() -> bool:
+    return os.getenv("MECRIS_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+
+
+def shared_backend_enabled() -> bool:
+    return os.getenv("MECRIS_CACHE_BACKEND", "memory").lower() == "shared"
+
+
+def _json_default(value: Any) -> Any:
+    # Timestamps (e.g. daily_activity "last_check") come back as ISO strings
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+
+def encode_key(key: Hashable) -> str:
+    return json.dumps(list(key) if isinstance(key, tuple) else key)
+
+
+def decode_key(raw: str) -> Hashable:
+    key = json.loads(raw)
+    # Lists are unhashable, so a JSON array was always a tuple key
+    return tuple(key) if isinstance(key, list) else key
+
+
+class CacheStore:
+    def __init__(self, path: Optional[str] = None, wal: bool = False):
+        self.path = path or os.getenv("MECRIS_CACHE_DB_PATH", DEFAULT_PATH)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+        if wal:
+            # Readers never block the writer; concurrent writers wait up to the timeout
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+
+    def load(self, namespace: str) -> List[Tuple[Hashable, Any, float]]:
+        """Return (key, value, wall-clock expiry) for the namespace's unexpired rows."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, expires_at FROM cache_entries WHERE namespace = ? AND expires_at > ?",
+                (namespace, time.time()),
+            ).fetchall()
+        entries = []
+        for raw_key, raw_value, expires_at in rows:
+            try:
+                entries.append((decode_key(raw_key), json.loads(raw_value), expires_at))
+            except ValueError:
+                continue
+        return entries
+
+    def write(self, namespace: str, upserts: Dict[Hashable, Tuple[float, Any]],
+              deletes: Iterable[Hashable], cleared: bool = False) -> int:
+        """Apply one namespace's pending changes in a single transaction."""
+        rows = []
+        for key, (expires_at, value) in upserts.items():
+            try:
+                rows.append((namespace, encode_key(key), json.dumps(value, default=_json_default), expires_at))
+            except (TypeError, ValueError):
+                logger.debug(f"Not persisting unserialisable {namespace} entry {key!r}")
+        with self._lock, self._conn:
+            if cleared:
+                self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+            self._conn.executemany(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                [(namespace, encode_key(key)) for key in deletes],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def get(self, namespace: str, key: Hashable, include_expired: bool = False) -> Optional[Tuple[Any, float]]:
+        """Return (value, wall-clock expiry) for a fresh row, or None."""
+        query = "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?"
+        params: Tuple[Any, ...] = (namespace, encode_key(key))
+        if not include_expired:
+            query += " AND expires_at > ?"
+            params += (time.time(),)
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0]), row[1]
+        except ValueError:
+            return None
+
+    def put(self, namespace: str, key: Hashable, value: Any, expires_at: float) -> bool:
+        try:
+            raw = json.dumps(value, default=_json_default)
+        except (TypeError, ValueError):
+            return False
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, encode_key(key), raw, expires_at),
+            )
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        return True
+
+    def delete(self, namespace: str, keys: Iterable[Hashable]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                [(namespace, encode_key(key)) for key in keys],
+            )
+
+    def delete_user(self, namespace: str, user_id: str) -> int:
+        """Delete user_id's rows (same key rules as services.cache._belongs_to)."""
+        plain = encode_key(user_id)
+        tuple_prefix = encode_key((user_id,))[:-1] + ","
+        str_prefix = plain[:-1] + ":"
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND (key = ? OR key = ? "
+                "OR substr(key, 1, length(?)) = ? OR substr(key, 1, length(?)) = ?)",
+                (namespace, plain, encode_key((user_id,)), tuple_prefix, tuple_prefix, str_prefix, str_prefix),
+            ).rowcount
+
+    def clear_namespace(self, namespace: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def prune(self) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class WriteBehind:
+    """Flushes dirty entries of attached caches to a CacheStore on an interval."""
+
+    def __init__(self, store: CacheStore, interval: Optional[float] = None):
+        self.store = store
+        self.interval = interval if interval is not None else float(os.getenv("MECRIS_CACHE_FLUSH_SECONDS", "5"))
+        self._caches: List[Any] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    def attach(self, cache) -> int:
+        """Load cache's persisted entries into it and start tracking its writes."""
+        loaded = cache.restore(self.store.load(cache.namespace))
+        cache.track_changes()
+        with self._lock:
+            self._caches.append(cache)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mecris-cache-flush", daemon=True)
+                self._thread.start()
+        if loaded:
+            logger.info(f"Warmed {cache.namespace} cache with {loaded} persisted entries")
+        return loaded
+
+    def flush(self) -> int:
+        with self._lock:
+            caches = list(self._caches)
+        written = 0
+        for cache in caches:
+            upserts, deletes, cleared = cache.drain_changes()
+            if upserts or deletes or cleared:
+                try:
+                    written += self.store.write(cache.namespace, upserts, deletes, cleared)
+                except sqlite3.Error as e:
+                    logger.warning(f"Cache flush failed for {cache.namespace}: {e}")
+        self.flushes += 1
+        self.rows_written += written
+        return written
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.flush()
+        try:
+            self.store.prune()
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.store.path, "flushes": self.flushes, "rows_written": self.rows_written,
+                "interval_seconds": self.interval}
+
+
+_writer: Optional[WriteBehind] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> Optional[WriteBehind]:
+    """Return the process-wide write-behind writer, or None when persistence is off."""
+    global _writer
+    if not persistence_enabled():
+        return None
+    with _writer_lock:
+        if _writer is None:
+            try:
+                _writer = WriteBehind(CacheStore())
+            except sqlite3.Error as e:
+                logger.warning(f"Cache persistence disabled, cannot open store: {e}")
+                return None
+            atexit.register(_writer.stop)
+        return _writer
+
+
+_shared: Optional[CacheStore] = None
+
+
+def get_shared_store() -> Optional[CacheStore]:
+    """Return this process's handle on the cross-process store, or None when not enabled."""
+    global _shared
+    if not shared_backend_enabled():
+        return None
+    with _writer_lock:
+        if _shared is None:
+            path = os.getenv("MECRIS_SHARED_CACHE_PATH", SHARED_PATH)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _shared = CacheStore(path, wal=True)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Shared cache backend disabled, cannot open {path}: {e}")
+                return None
+        return _shared
+
+
+def shared_l1_ttl() -> float:
+    return float(os.getenv("MECRIS_SHARED_CACHE_L1_SECONDS", "5"))
+
+
+def persistence_stats() -> Optional[Dict[str, Any]]:
+    if _shared is not None:
+        return {"backend": "shared", "path": _shared.path, "l1_seconds": shared_l1_ttl()}
+    return _writer.stats() if _writer is not None else None
+
+
+def flush_persistent_caches() -> int:
+    """Flush pending writes now (called from server shutdown)."""
+    return _writer.flush() if _writer is not None else 0
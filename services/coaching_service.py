@@ -6,6 +6,9 @@ import random
 
 logger = logging.getLogger("mecris.services.coaching")
 
+# Narrator context keys generate_insight reads (see get_narrator_context sections)
+COACHING_CONTEXT_SECTIONS = ("daily_walk_status", "vacation_mode", "greek_backlog_boost", "greek_backlog_cards")
+
 class InsightType(Enum):
     MOMENTUM_PIVOT = "momentum_pivot"
     URGENCY_ALERT = "urgency_alert"
@@ -30,10 +33,11 @@ class CoachingInsight:
         }
 
 class CoachingService:
-    def __init__(self, context_provider, goal_provider, obsidian_provider):
+    def __init__(self, context_provider, goal_provider, obsidian_provider, lang_stats_provider=None):
         self.context_provider = context_provider
         self.goal_provider = goal_provider
         self.obsidian_provider = obsidian_provider
+        self.lang_stats_provider = lang_stats_provider
 
     async def generate_insight(self) -> CoachingInsight:
         """Generate a personalized coaching insight based on context."""
@@ -48,9 +52,12 @@ class CoachingService:
             critical_goals = [g for g in beeminder_goals if g.get("derail_risk") == "CRITICAL"]
             
             # Fetch Language Stats for Lever Awareness
-            from services.neon_sync_checker import NeonSyncChecker
-            neon = NeonSyncChecker()
-            lang_stats = neon.get_language_stats()
+            if self.lang_stats_provider:
+                lang_stats = await self.lang_stats_provider()
+            else:
+                from services.neon_sync_checker import NeonSyncChecker
+                neon = NeonSyncChecker()
+                lang_stats = neon.get_language_stats()
 
             greek_backlog_boost = context.get("greek_backlog_boost", False)
             greek_backlog_cards = context.get("greek_backlog_cards", 0)
@@ -0,0 +1,157 @@
+"""
+Context Cache — per-user narrator/aggregate context with stale-while-revalidate.
+
+Entries are keyed by (namespace, user_id). A read inside the soft TTL is a
+memory read; an older entry (up to max_stale) is still returned immediately
+while one background refresh rebuilds it. Missing, invalidated or too-stale
+entries are rebuilt inline, with concurrent callers sharing one build.
+Callers that act on the value (reminder decisions) pass allow_stale=False to
+rebuild inline once past the soft TTL instead of taking the stale copy.
+At most max_entries (MECRIS_CONTEXT_CACHE_MAX_ENTRIES, default 512) are
+kept: entries past max_stale go first, then the least recently used.
+
+Invalidation is event driven: services/walk_cache_listener.py calls
+services.cache.invalidate_user() on pg_notify from walk_inferences,
+language_stats, message_log and budget_tracking (see migrations/), as do the
+in-process writers; that reaches this cache through its invalidation hook.
+A build that started before an invalidation is discarded rather than stored,
+so it can never resurrect the old state.
+
+The server runs two event loops (stdio MCP and the uvicorn thread), so
+in-flight builds are tracked per loop and entry bookkeeping is lock-guarded.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from services.cache import register_invalidation_hook
+
+logger = logging.getLogger("mecris.services.context_cache")
+
+Builder = Callable[[], Awaitable[Any]]
+
+
+def cache_enabled() -> bool:
+    return os.getenv("MECRIS_CONTEXT_CACHE", "true").lower() not in ("0", "false", "no")
+
+
+class ContextCache:
+    def __init__(self, soft_ttl: Optional[float] = None, max_stale: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.soft_ttl = soft_ttl if soft_ttl is not None else float(os.getenv("MECRIS_CONTEXT_CACHE_SOFT_TTL", "60"))
+        self.max_stale = max_stale if max_stale is not None else float(os.getenv("MECRIS_CONTEXT_CACHE_MAX_STALE", "900"))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("MECRIS_CONTEXT_CACHE_MAX_ENTRIES", "512"))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[Tuple[str, str, int], asyncio.Future] = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "invalidations": 0, "discarded": 0,
+                       "evictions": 0}
+
+    async def get(self, namespace: str, user_id: str, builder: Builder, allow_stale: bool = True) -> Any:
+        """Return the cached value, refreshing in the background once past the soft TTL.
+
+        With allow_stale=False an entry past the soft TTL is rebuilt inline instead.
+        """
+        if not cache_enabled():
+            return await builder()
+        key = (namespace, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.soft_ttl:
+                self._stats["hits"] += 1
+                return entry[1]
+            if allow_stale and age < self.max_stale:
+                self._stats["stale_hits"] += 1
+                if self._start_build(key, builder, background=True) is not None:
+                    self._stats["refreshes"] += 1
+                return entry[1]
+        self._stats["misses"] += 1
+        return await asyncio.shield(self._start_build(key, builder))
+
+    def _start_build(self, key: Tuple[str, str], builder: Builder, background: bool = False) -> Optional[asyncio.Future]:
+        """Start (or join) the build for key on the running loop.
+
+        In background mode returns None when a build is already running.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (*key, id(loop))
+        with self._lock:
+            running = self._inflight.get(flight_key)
+            if running is not None and not running.done():
+                return None if background else running
+            generation = self._generations.get(key[1], 0)
+            task = loop.create_task(self._build(key, builder, generation))
+            self._inflight[flight_key] = task
+        task.add_done_callback(lambda t: self._build_done(flight_key, t))
+        return task
+
+    async def _build(self, key: Tuple[str, str], builder: Builder, generation: int) -> Any:
+        value = await builder()
+        with self._lock:
+            if self._generations.get(key[1], 0) != generation:
+                self._stats["discarded"] += 1
+                return value
+            if isinstance(value, dict) and value.get("error"):
+                return value
+            built_at = time.monotonic()
+            if isinstance(value, dict) and value.get("degraded_sources"):
+                # Serve it, but let the next read trigger a refresh
+                built_at -= self.soft_ttl
+            self._entries[key] = (built_at, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._evict_locked()
+        return value
+
+    def _evict_locked(self) -> None:
+        cutoff = time.monotonic() - self.max_stale
+        for key in [k for k, (built_at, _) in self._entries.items() if built_at <= cutoff]:
+            del self._entries[key]
+            self._stats["evictions"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _build_done(self, flight_key: Tuple[str, str, int], task: asyncio.Future) -> None:
+        with self._lock:
+            if self._inflight.get(flight_key) is task:
+                del self._inflight[flight_key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Context build failed for {flight_key[0]}/{flight_key[1]}: {task.exception()}")
+
+    def invalidate(self, user_id: str, reason: str = "") -> None:
+        """Drop every cached namespace for user_id and orphan builds already in flight."""
+        if not user_id:
+            return
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            dropped = [key for key in self._entries if key[1] == user_id]
+            for key in dropped:
+                del self._entries[key]
+            self._stats["invalidations"] += 1
+        if dropped:
+            logger.info(f"Invalidated {len(dropped)} cached context(s) for {user_id}" + (f" ({reason})" if reason else ""))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries),
+                    "max_entries": self.max_entries, "soft_ttl": self.soft_ttl, "max_stale": self.max_stale}
+
+
+# Process-wide instance; services.cache.invalidate_user() reaches it via the hook
+context_cache = ContextCache()
+register_invalidation_hook(context_cache.invalidate)
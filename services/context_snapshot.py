@@ -0,0 +1,128 @@
+"""
+Context Snapshot — request-scoped memoization of async context providers.
+
+A single reminder tick used to rebuild the same context several times:
+ReminderService calls get_narrator_context, then get_coaching_insight whose
+CoachingService calls get_narrator_context again, and the narrator's
+get_daily_aggregate_status recomputes get_language_velocity_stats that the
+velocity provider fetches yet again.
+
+Inside ``with context_snapshot("label"):`` every provider decorated with
+``@snapshot_cached("name")`` runs at most once per distinct argument set.
+Concurrent callers share the in-flight fetch, which is wrapped in
+``asyncio.shield`` so one caller's deadline never cancels it for the rest.
+Outside a snapshot the decorator is a pass-through.
+
+The active snapshot lives in a ContextVar, so it follows the evaluation into
+tasks spawned with asyncio.create_task/ensure_future/gather.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional
+
+logger = logging.getLogger("mecris.services.context_snapshot")
+
+_current: contextvars.ContextVar[Optional["ContextSnapshot"]] = contextvars.ContextVar(
+    "mecris_context_snapshot", default=None
+)
+
+
+class ContextSnapshot:
+    """Memo of provider results for one evaluation (e.g. one reminder tick)."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self.fetches: Counter = Counter()
+        self.saved: Counter = Counter()
+
+    async def get(self, key: Hashable, factory: Callable[[], Awaitable[Any]], name: str = "") -> Any:
+        """Return the memoized result for key, running factory() on first request.
+
+        A fetch that raised or was cancelled is not memoized; the next caller retries.
+        """
+        name = name or str(key)
+        task = self._tasks.get(key)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            self.fetches[name] += 1
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+        else:
+            self.saved[name] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fetches": sum(self.fetches.values()),
+            "duplicate_fetches_saved": sum(self.saved.values()),
+            "saved_by_provider": dict(self.saved),
+        }
+
+    def log_summary(self) -> None:
+        stats = self.stats()
+        detail = ", ".join(f"{name}x{count}" for name, count in sorted(self.saved.items()))
+        logger.info(
+            f"Context snapshot [{self.label}]: {stats['fetches']} fetches, "
+            f"saved {stats['duplicate_fetches_saved']} duplicate fetches"
+            + (f" ({detail})" if detail else "")
+        )
+
+
+def current_snapshot() -> Optional[ContextSnapshot]:
+    return _current.get()
+
+
+@contextmanager
+def context_snapshot(label: str = "") -> Iterator[ContextSnapshot]:
+    """Activate a fresh snapshot for the enclosed evaluation and log its savings on exit.
+
+    Nested use reuses the outer snapshot so an inner evaluation never refetches.
+    """
+    outer = _current.get()
+    if outer is not None:
+        yield outer
+        return
+    snapshot = ContextSnapshot(label)
+    token = _current.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _current.reset(token)
+        snapshot.log_summary()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Make list/dict arguments usable as part of a memo key."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def snapshot_cached(name: str):
+    """Decorate an async provider so it is fetched once per active snapshot.
+
+    The memo key is the provider name plus its bound arguments (defaults applied),
+    so get_x("u1") and get_x(user_id="u1") share an entry.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            snapshot = _current.get()
+            if snapshot is None:
+                return await fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, tuple((arg, _freeze(value)) for arg, value in bound.arguments.items()))
+            return await snapshot.get(key, lambda: fn(*args, **kwargs), name=name)
+
+        return wrapper
+    return decorator
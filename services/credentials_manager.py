@@ -73,8 +73,8 @@ class CredentialsManager:
             return None
 
         try:
-            import psycopg2
-            with psycopg2.connect(db_url) as conn:
+            from services.neon_pool import get_connection
+            with get_connection(db_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT pocket_id_sub FROM users WHERE familiar_id = %s", (familiar_id,))
                     row = cur.fetchone()
@@ -0,0 +1,184 @@
+"""
+Delivery Queue — outbound reminders leave the reminder tick.
+
+send_reminder_message used to call Twilio (a blocking HTTP client) directly
+on the event loop, so a slow send stalled every MCP tool call and scheduler
+job behind it. With MECRIS_DELIVERY_QUEUE on (the default) the reminder is
+logged to message_log as 'queued' (so cooldowns see it at once) and handed
+to this queue; send_reminder_message returns immediately.
+
+A small pool of worker tasks (MECRIS_DELIVERY_WORKERS, default 4) runs each
+send in a thread against the shared Twilio client in twilio_sender, whose
+HTTP session is reused across sends. Only sends that certainly did not go
+out are retried: an explicit {"sent": False} result or a connection error.
+Anything else (a read timeout after Twilio may already have accepted the
+message, an API rejection) fails at once rather than risk a duplicate
+WhatsApp message. Retries run up to MECRIS_DELIVERY_MAX_ATTEMPTS times
+(default 3) with exponential backoff from MECRIS_DELIVERY_BACKOFF_SECONDS
+(default 2). The job's on_done callback then records the outcome.
+
+Queued deliveries live in memory: shutdown_delivery_queues() drains them on
+a clean exit, and a crash leaves their message_log rows at 'queued'.
+Enqueue-to-outcome latency is reported by delivery_queue_stats().
+"""
+import asyncio
+import itertools
+import logging
+import os
+import statistics
+import time
+import weakref
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger("mecris.services.delivery_queue")
+
+Result = Dict[str, Any]
+
+
+def delivery_queue_enabled() -> bool:
+    return os.getenv("MECRIS_DELIVERY_QUEUE", "true").lower() not in ("0", "false", "no")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _retryable(exc: BaseException) -> bool:
+    """True when the request never reached Twilio, so sending again cannot duplicate it."""
+    try:
+        from requests.exceptions import ConnectionError as RequestsConnectionError
+    except ImportError:  # pragma: no cover - requests ships with twilio
+        RequestsConnectionError = ConnectionError
+    return isinstance(exc, (ConnectionError, RequestsConnectionError))
+
+
+class DeliveryQueue:
+    """Async queue of outbound sends drained by a fixed pool of worker tasks."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, workers: Optional[int] = None, max_attempts: Optional[int] = None,
+                 backoff: Optional[float] = None):
+        self.workers = max(1, int(workers or _env_number("MECRIS_DELIVERY_WORKERS", 4)))
+        self.max_attempts = max(1, int(max_attempts or _env_number("MECRIS_DELIVERY_MAX_ATTEMPTS", 3)))
+        self.backoff = backoff if backoff is not None else _env_number("MECRIS_DELIVERY_BACKOFF_SECONDS", 2.0)
+        self._queue: "asyncio.Queue" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._latency: Deque[float] = deque(maxlen=500)
+        self._counters = {"enqueued": 0, "delivered": 0, "failed": 0, "retries": 0}
+
+    def _ensure_workers(self) -> None:
+        self._tasks = [t for t in self._tasks if not t.done()]
+        for _ in range(self.workers - len(self._tasks)):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def enqueue(self, send: Callable[[], Result],
+                      on_done: Optional[Callable[[Result], Awaitable[None]]] = None, label: str = "") -> str:
+        """Queue a blocking send() for delivery; returns the delivery id."""
+        delivery_id = f"dlv-{next(self._ids)}"
+        self._ensure_workers()
+        await self._queue.put((delivery_id, label, send, on_done, time.monotonic()))
+        self._counters["enqueued"] += 1
+        return delivery_id
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._deliver(*job)
+            except Exception as e:
+                logger.error(f"Delivery worker error: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, delivery_id: str, label: str, send: Callable[[], Result],
+                       on_done: Optional[Callable[[Result], Awaitable[None]]], enqueued_at: float) -> None:
+        result: Result = {"sent": False}
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = await asyncio.to_thread(send)
+            except Exception as e:
+                result = {"sent": False, "error": str(e)}
+                if not _retryable(e):
+                    logger.error(f"Delivery {delivery_id} ({label}) raised {type(e).__name__}; not retrying")
+                    break
+            if result.get("sent"):
+                break
+            if attempt < self.max_attempts:
+                self._counters["retries"] += 1
+                delay = self.backoff * 2 ** (attempt - 1)
+                logger.warning(f"Delivery {delivery_id} ({label}) attempt {attempt} failed; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        latency = time.monotonic() - enqueued_at
+        self._latency.append(latency)
+        result = {**result, "delivery_id": delivery_id, "attempts": attempt, "latency_s": round(latency, 3)}
+        if result.get("sent"):
+            self._counters["delivered"] += 1
+            logger.info(f"Delivery {delivery_id} ({label}) sent via {result.get('method')} in {latency:.2f}s")
+        else:
+            self._counters["failed"] += 1
+            logger.error(f"Delivery {delivery_id} ({label}) failed after {attempt} attempt(s)")
+        if on_done:
+            try:
+                await on_done(result)
+            except Exception as e:
+                logger.error(f"Delivery {delivery_id} completion callback failed: {e}")
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued delivery has finished; False on timeout."""
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def shutdown(self, timeout: Optional[float] = None) -> None:
+        if not await self.drain(timeout):
+            logger.warning(f"Delivery queue shut down with {self._queue.qsize()} message(s) undelivered")
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latency)
+        return {
+            **self._counters,
+            "queued": self._queue.qsize(),
+            "workers": self.workers,
+            "latency_p50_s": round(statistics.median(latencies), 3) if latencies else None,
+            "latency_p95_s": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+            "latency_max_s": round(latencies[-1], 3) if latencies else None,
+        }
+
+
+# One queue per event loop: the MCP loop and the HTTP server thread each get their own
+_queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, DeliveryQueue]" = weakref.WeakKeyDictionary()
+
+
+def get_delivery_queue() -> DeliveryQueue:
+    """Return the running loop's delivery queue, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    queue = _queues.get(loop)
+    if queue is None:
+        queue = DeliveryQueue()
+        _queues[loop] = queue
+    return queue
+
+
+async def shutdown_delivery_queues(timeout: float = 30.0) -> None:
+    """Drain and stop the running loop's queue (called on MCP server exit)."""
+    queue = _queues.pop(asyncio.get_running_loop(), None)
+    if queue is not None:
+        await queue.shutdown(timeout)
+
+
+def delivery_queue_stats() -> Dict[str, Any]:
+    queues = list(_queues.values())
+    if len(queues) == 1:
+        return queues[0].stats()
+    return {f"loop-{i}": q.stats() for i, q in enumerate(queues)}
@@ -34,8 +34,8 @@ class HealthChecker:
             return []
 
         try:
-            import psycopg2
-            with psycopg2.connect(self.neon_url) as conn:
+            from services.neon_pool import get_connection
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     # Detect whether observability columns exist (migration v8).
                     cur.execute("""
@@ -1,11 +1,11 @@
 import os
 import logging
-import psycopg2
 import asyncio
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 import zoneinfo
 from scripts.clozemaster_scraper import sync_clozemaster_to_beeminder
+from services.neon_pool import get_connection
 
 logger = logging.getLogger("mecris.services.language_sync")
 
@@ -39,7 +39,7 @@ class LanguageSyncService:
         """Synchronous helper method to update Neon DB."""
         try:
             logger.info(f"Updating Neon DB with scraper data for user {user_id}. Languages found: {list(scraper_data.keys())}")
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     for lang, data in scraper_data.items():
                         name = lang.upper()
@@ -154,9 +154,9 @@ class LanguageSyncService:
             # 2. Fetch fresh Beeminder goals to get safebuf and derail_risk
             # We must set the user_id on the client or create a new one
             if self.beeminder_client.user_id != target_user_id:
-                # Create a temporary client for this user to avoid shared state issues
-                from beeminder_client import BeeminderClient
-                user_client = BeeminderClient(user_id=target_user_id)
+                # Use this user's pooled client to avoid shared state issues
+                from services.beeminder_pool import beeminder_pool
+                user_client = beeminder_pool.get(target_user_id)
             else:
                 user_client = self.beeminder_client
 
@@ -0,0 +1,127 @@
+"""
+Leader Lock — scheduler leadership as a Postgres session advisory lock.
+
+The heartbeat election (MecrisScheduler._claim_leadership_sync) opens a
+connection every 30s for an UPDATE/SELECT/UPDATE round and only fails over
+once the leader's heartbeat is 90s stale. With MECRIS_LEADER_ELECTION=advisory
+each process instead keeps ONE asyncpg connection and competes for
+pg_try_advisory_lock on a key derived from the user_id:
+
+- Leadership lives exactly as long as the leader's session. If the process
+  dies or its connection drops, Postgres releases the lock at once.
+- Standbys LISTEN on scheduler_leader_change. A leader that steps down
+  NOTIFYs it, and standbys retry the lock immediately. A leader that vanished
+  without a NOTIFY is picked up by the retry every MECRIS_LEADER_RETRY_SECONDS
+  (default 10).
+- The leader notices a lost connection through asyncpg's termination
+  listener, and through the scheduler_election heartbeat it still writes on
+  this connection every MECRIS_LEADER_HEARTBEAT_SECONDS (default 30) so
+  health_checker keeps working.
+
+Session-level advisory locks need a direct connection: point NEON_DB_URL at
+the non-pooler endpoint, since a transaction-mode PgBouncer does not pin
+sessions. Every process electing for a user must use the same mode.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Optional
+
+import asyncpg
+
+logger = logging.getLogger("mecris.services.leader_lock")
+
+LEADER_CHANNEL = "scheduler_leader_change"
+QUERY_TIMEOUT_SECONDS = 10.0
+
+
+def advisory_election_enabled() -> bool:
+    return os.getenv("MECRIS_LEADER_ELECTION", "heartbeat").lower() == "advisory"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def lock_key(user_id: str) -> int:
+    """Stable signed 64-bit advisory lock key for a user's leader slot."""
+    digest = hashlib.blake2b(f"mecris_leader:{user_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class AdvisoryLeaderLock:
+    """One persistent connection holding (or waiting for) a user's leader lock."""
+
+    def __init__(self, dsn: str, user_id: str, retry_seconds: Optional[float] = None,
+                 heartbeat_seconds: Optional[float] = None):
+        # asyncpg expects postgresql:// not postgres://
+        if dsn.startswith("postgres://"):
+            dsn = dsn.replace("postgres://", "postgresql://", 1)
+        self.dsn = dsn
+        self.user_id = user_id
+        self.key = lock_key(user_id)
+        self.retry_seconds = retry_seconds or _env_float("MECRIS_LEADER_RETRY_SECONDS", 10.0)
+        self.heartbeat_seconds = heartbeat_seconds or _env_float("MECRIS_LEADER_HEARTBEAT_SECONDS", 30.0)
+        self.conn: Optional[asyncpg.Connection] = None
+        self.held = False
+        self._wake = asyncio.Event()
+
+    @property
+    def connected(self) -> bool:
+        return self.conn is not None and not self.conn.is_closed()
+
+    async def connect(self) -> None:
+        self.held = False
+        self._wake.clear()
+        self.conn = await asyncpg.connect(self.dsn)
+        self.conn.add_termination_listener(self._on_terminated)
+        await self.conn.add_listener(LEADER_CHANNEL, self._on_notify)
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        if payload == self.user_id and not self.held:
+            self._wake.set()
+
+    def _on_terminated(self, conn) -> None:
+        # The session is gone, and with it the lock
+        self.held = False
+        self._wake.set()
+
+    async def try_acquire(self) -> bool:
+        """Take the lock if it is free. Never call while held: advisory locks stack."""
+        self.held = bool(await self.conn.fetchval(
+            "SELECT pg_try_advisory_lock($1)", self.key, timeout=QUERY_TIMEOUT_SECONDS))
+        return self.held
+
+    async def execute(self, query: str, *args) -> str:
+        return await self.conn.execute(query, *args, timeout=QUERY_TIMEOUT_SECONDS)
+
+    async def wait(self) -> None:
+        """Sleep until the next heartbeat (leader) or retry (standby), a NOTIFY, or connection loss."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), self.heartbeat_seconds if self.held else self.retry_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def release(self) -> None:
+        """Step down: unlock, NOTIFY standbys and close the connection. Never raises."""
+        conn, was_held = self.conn, self.held
+        self.conn, self.held = None, False
+        if conn is None or conn.is_closed():
+            return
+        try:
+            if was_held:
+                await conn.execute("SELECT pg_advisory_unlock($1)", self.key, timeout=QUERY_TIMEOUT_SECONDS)
+                await conn.execute("SELECT pg_notify($1, $2)", LEADER_CHANNEL, self.user_id,
+                                   timeout=QUERY_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Leader lock release for {self.user_id} failed: {e}")
+        finally:
+            try:
+                await conn.close(timeout=QUERY_TIMEOUT_SECONDS)
+            except Exception:
+                conn.terminate()
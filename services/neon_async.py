@@ -0,0 +1,356 @@
+"""
+Neon Async — native asyncpg read path for the MCP/HTTP hot endpoints.
+
+The psycopg2 data-access classes (NeonSyncChecker, UsageTracker) are
+blocking, so mcp_server had to push every read through ``asyncio.to_thread``.
+Concurrent Android polls then queued on the default thread pool, and any
+call that forgot the wrapper stalled the stdio MCP loop outright.
+
+``AsyncNeonReader`` runs the reads behind /aggregate-status, /languages,
+/budget and the narrator context directly on the event loop via asyncpg,
+using the same queries and returning the same shapes as the sync classes.
+Familiar IDs (e.g. 'yebyen') are resolved inside each query instead of with
+a separate round trip.
+
+``async_enabled(dsn)`` is the single switch callers use to choose between
+this path and the psycopg2 fallback (``asyncio.to_thread``). It is off when
+asyncpg is not installed, the DSN is missing, or MECRIS_NEON_ASYNC=false.
+
+Tunables (env):
+    MECRIS_NEON_ASYNC             "false" disables the asyncpg path (default on)
+    MECRIS_NEON_ASYNC_POOL_MAX    max connections per DSN per event loop (default 10)
+    MECRIS_NEON_ASYNC_TIMEOUT     per-statement timeout in seconds (default 15)
+"""
+import asyncio
+import json
+import logging
+import os
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import asyncpg
+except ImportError:  # optional: callers fall back to psycopg2 in a worker thread
+    asyncpg = None
+
+from services.credentials_manager import credentials_manager
+from services.timezone_service import day_start_eastern
+
+logger = logging.getLogger("mecris.services.neon_async")
+
+DEFAULT_POOL_MAX = 10
+DEFAULT_COMMAND_TIMEOUT = 15.0
+# Close pooled connections before Neon suspends idle compute (~5 min).
+MAX_INACTIVE_CONNECTION_LIFETIME = 240.0
+
+# Resolve a familiar_id to pocket_id_sub in-query; UUIDs fall through unchanged.
+_RESOLVE_USER_SQL = "COALESCE((SELECT pocket_id_sub FROM users WHERE familiar_id = $1), $1)"
+
+
+def async_enabled(dsn: Optional[str]) -> bool:
+    """True when reads for dsn should use asyncpg rather than psycopg2 in a thread."""
+    if asyncpg is None or not dsn or not isinstance(dsn, str):
+        return False
+    return os.getenv("MECRIS_NEON_ASYNC", "true").lower() != "false"
+
+
+def _asyncpg_dsn(dsn: str) -> str:
+    # asyncpg expects postgresql:// not postgres://
+    if dsn.startswith("postgres://"):
+        return dsn.replace("postgres://", "postgresql://", 1)
+    return dsn
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# ----------------------------------------------------------------------
+# Pool registry — asyncpg pools are bound to the loop that created them,
+# so keep one per dsn per running loop. A pool references its loop, so the
+# weak keys alone never let go of it: pools whose loop has since closed
+# (e.g. an asyncio.run() in a worker thread) are swept on the next lookup.
+# ----------------------------------------------------------------------
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_pool_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = weakref.WeakKeyDictionary()
+
+
+def _sweep_closed_loops() -> None:
+    for loop in [l for l in list(_pools.keys()) if l.is_closed()]:
+        _pool_locks.pop(loop, None)
+        for pool in _pools.pop(loop, {}).values():
+            try:
+                pool.terminate()
+            except Exception as e:
+                logger.debug(f"Error terminating asyncpg pool of a closed loop: {e}")
+
+
+async def get_async_pool(dsn: str):
+    """Return the asyncpg pool for dsn on the running loop, creating it on first use."""
+    if asyncpg is None:
+        raise RuntimeError("asyncpg is not installed")
+    if not dsn:
+        raise ValueError("get_async_pool: a Neon DSN is required")
+
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop, {}).get(dsn)
+    if pool is not None:
+        return pool
+
+    lock = _pool_locks.setdefault(loop, {}).setdefault(dsn, asyncio.Lock())
+    async with lock:
+        pool = _pools.get(loop, {}).get(dsn)
+        if pool is None:
+            _sweep_closed_loops()
+            kwargs: Dict[str, Any] = {
+                "min_size": 0,
+                "max_size": max(1, int(_env_number("MECRIS_NEON_ASYNC_POOL_MAX", DEFAULT_POOL_MAX))),
+                "max_inactive_connection_lifetime": MAX_INACTIVE_CONNECTION_LIFETIME,
+                "command_timeout": _env_number("MECRIS_NEON_ASYNC_TIMEOUT", DEFAULT_COMMAND_TIMEOUT),
+            }
+            # Neon's "-pooler" endpoints run PgBouncer in transaction mode, which
+            # cannot keep server-side prepared statements between transactions.
+            if "-pooler" in dsn:
+                kwargs["statement_cache_size"] = 0
+            pool = await asyncpg.create_pool(_asyncpg_dsn(dsn), **kwargs)
+            _pools.setdefault(loop, {})[dsn] = pool
+            logger.info("Created asyncpg pool for Neon (max_size=%s)", kwargs["max_size"])
+    return pool
+
+
+async def close_async_pools() -> None:
+    """Close every pool owned by the running loop (shutdown hook)."""
+    loop = asyncio.get_running_loop()
+    _pool_locks.pop(loop, None)
+    for pool in _pools.pop(loop, {}).values():
+        try:
+            await pool.close()
+        except Exception as e:
+            logger.warning(f"Error closing asyncpg pool: {e}")
+
+
+class AsyncNeonReader:
+    """Async twins of the hot Neon read paths. Same SQL, same return shapes."""
+
+    def __init__(self, db_url: Optional[str] = None):
+        self.db_url = db_url or os.getenv("NEON_DB_URL")
+
+    @property
+    def enabled(self) -> bool:
+        return async_enabled(self.db_url)
+
+    async def _fetch(self, query: str, *args) -> List[Any]:
+        pool = await get_async_pool(self.db_url)
+        async with pool.acquire() as conn:
+            return await conn.fetch(query, *args)
+
+    async def _fetchrow(self, query: str, *args) -> Optional[Any]:
+        pool = await get_async_pool(self.db_url)
+        async with pool.acquire() as conn:
+            return await conn.fetchrow(query, *args)
+
+    async def ping(self) -> bool:
+        """SELECT 1 round trip; False on any error."""
+        try:
+            pool = await get_async_pool(self.db_url)
+            async with pool.acquire() as conn:
+                return await conn.fetchval("SELECT 1") == 1
+        except Exception as e:
+            logger.warning(f"Async Neon ping failed: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # NeonSyncChecker twins
+    # ------------------------------------------------------------------
+
+    async def has_walk_today(self, user_id: Optional[str] = None, min_steps: int = 2000) -> bool:
+        """See NeonSyncChecker.has_walk_today."""
+        target_user_id = credentials_manager.resolve_user_id(user_id)
+        try:
+            # The column is compared in Eastern wall-clock time, so pass the
+            # Eastern midnight as a naive timestamp.
+            today_start = day_start_eastern().replace(tzinfo=None)
+            count = 0
+            query = """
+                SELECT COUNT(*) FROM walk_inferences
+                WHERE (start_time::TIMESTAMPTZ AT TIME ZONE 'America/New_York') >= $1
+                AND (
+                    CAST(step_count AS INTEGER) >= $2
+                    OR CAST(distance_meters AS FLOAT) >= 1609.34
+                    OR distance_source LIKE '%Workouts%'
+                    OR distance_source LIKE '%Activity%'
+                )
+            """
+            params: List[Any] = [today_start, min_steps]
+            if target_user_id:
+                query += f" AND user_id = {_RESOLVE_USER_SQL.replace('$1', '$3')}"
+                params.append(target_user_id)
+            row = await self._fetchrow(query, *params)
+            if row:
+                count = row[0]
+            logger.info(f"Neon walk check (async) for {today_start} (min {min_steps} steps): found {count} walks")
+            return count > 0
+        except Exception as e:
+            logger.error(f"Failed to query Neon for walk data (async): {e}")
+            return False
+
+    async def get_latest_walk(self, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """See NeonSyncChecker.get_latest_walk."""
+        target_user_id = credentials_manager.resolve_user_id(user_id)
+        try:
+            query = "SELECT start_time::TIMESTAMPTZ, step_count, distance_meters, distance_source FROM walk_inferences"
+            params: List[Any] = []
+            if target_user_id:
+                query += f" WHERE user_id = {_RESOLVE_USER_SQL}"
+                params.append(target_user_id)
+            query += " ORDER BY start_time DESC LIMIT 1"
+            row = await self._fetchrow(query, *params)
+            if row:
+                return {
+                    "start_time": row[0],
+                    "step_count": row[1],
+                    "distance_meters": row[2],
+                    "distance_source": row[3],
+                }
+            return None
+        except Exception as e:
+            logger.error(f"Failed to fetch latest walk from Neon (async): {e}")
+            return None
+
+    async def get_language_stats(self, user_id: str) -> Dict[str, Any]:
+        """See NeonSyncChecker.get_language_stats."""
+        try:
+            rows = await self._fetch(f"""
+                SELECT language_name, current_reviews, tomorrow_reviews, next_7_days_reviews,
+                       pump_multiplier, daily_completions, beeminder_slug, safebuf
+                FROM language_stats
+                WHERE user_id = {_RESOLVE_USER_SQL}
+            """, user_id)
+            stats = {}
+            for row in rows:
+                stats[row[0].lower()] = {
+                    "current": row[1],
+                    "tomorrow": row[2],
+                    "next_7_days": row[3],
+                    "multiplier": float(row[4]) if row[4] is not None else 1.0,
+                    "daily_completions": int(row[5]) if row[5] is not None else 0,
+                    "beeminder_slug": row[6],
+                    "safebuf": row[7] if row[7] is not None else 0,
+                }
+            return stats
+        except Exception as e:
+            logger.error(f"Failed to fetch language stats from Neon (async): {e}")
+            return {}
+
+    async def get_notification_prefs(self, user_id: str) -> Dict[str, Any]:
+        """See NeonSyncChecker.get_notification_prefs."""
+        try:
+            row = await self._fetchrow(
+                f"SELECT notification_prefs FROM users WHERE pocket_id_sub = {_RESOLVE_USER_SQL}",
+                user_id,
+            )
+            if row and row[0]:
+                # asyncpg hands JSONB back as text unless a codec is registered
+                return row[0] if isinstance(row[0], dict) else json.loads(row[0])
+        except Exception as e:
+            logger.error(f"Failed to fetch notification prefs for {user_id} (async): {e}")
+        return {}
+
+    # ------------------------------------------------------------------
+    # UsageTracker twins
+    # ------------------------------------------------------------------
+
+    async def get_budget_status(self, user_id: str) -> Dict[str, Any]:
+        """See UsageTracker.get_budget_status. One round trip instead of three."""
+        from usage_tracker import UsageTracker
+
+        row = None
+        if UsageTracker._daily_rollup_available:
+            try:
+                row = await self._fetchrow(f"""
+                    WITH target AS (SELECT {_RESOLVE_USER_SQL} AS user_id)
+                    SELECT b.total_budget, b.remaining_budget, b.budget_period_end,
+                           COALESCE(SUM(r.total_cost) FILTER (WHERE r.day = (NOW() AT TIME ZONE 'America/New_York')::date), 0) AS today_spend,
+                           COALESCE(SUM(r.total_cost), 0) AS week_spend
+                    FROM budget_tracking b
+                    JOIN target t ON b.user_id = t.user_id
+                    LEFT JOIN usage_daily_rollup r
+                      ON r.user_id = b.user_id AND r.day > (NOW() AT TIME ZONE 'America/New_York')::date - 7
+                    GROUP BY b.total_budget, b.remaining_budget, b.budget_period_end
+                """, user_id)
+                return self._budget_status(user_id, row)
+            except asyncpg.exceptions.UndefinedTableError:
+                logger.warning("usage_daily_rollup missing; run scripts/migrate_usage_daily_rollup.py")
+                UsageTracker._daily_rollup_available = False
+
+        row = await self._fetchrow(f"""
+            WITH target AS (SELECT {_RESOLVE_USER_SQL} AS user_id)
+            SELECT b.total_budget, b.remaining_budget, b.budget_period_end,
+                   (SELECT SUM(estimated_cost) FROM usage_sessions s
+                     WHERE s.user_id = b.user_id
+                       AND (s.timestamp::TIMESTAMPTZ AT TIME ZONE 'America/New_York')::date = CURRENT_DATE AT TIME ZONE 'America/New_York'
+                   ) AS today_spend,
+                   (SELECT SUM(estimated_cost) FROM usage_sessions s
+                     WHERE s.user_id = b.user_id AND s.timestamp > NOW() - INTERVAL '7 days'
+                   ) AS week_spend
+            FROM budget_tracking b, target t
+            WHERE b.user_id = t.user_id
+        """, user_id)
+        return self._budget_status(user_id, row)
+
+    @staticmethod
+    def _budget_status(user_id: str, row) -> Dict[str, Any]:
+        from usage_tracker import UsageTracker
+
+        if not row:
+            return {"error": f"No budget information found for {user_id} in Neon"}
+        return UsageTracker.build_budget_status(
+            dict(row), row["today_spend"] or 0, row["week_spend"] or 0
+        )
+
+    async def get_goals(self, user_id: str) -> List[Dict[str, Any]]:
+        """See UsageTracker.get_goals."""
+        rows = await self._fetch(f"""
+            SELECT id, title, description, priority, status, created_at, completed_at, due_date
+            FROM goals
+            WHERE user_id = {_RESOLVE_USER_SQL}
+            ORDER BY
+                CASE priority
+                    WHEN 'high' THEN 1
+                    WHEN 'medium' THEN 2
+                    WHEN 'low' THEN 3
+                END,
+                CASE status
+                    WHEN 'active' THEN 1
+                    WHEN 'completed' THEN 2
+                END,
+                created_at
+        """, user_id)
+        return [dict(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # mcp_server.fetch_system_pulse
+    # ------------------------------------------------------------------
+
+    async def get_scheduler_heartbeats(self, user_id: str) -> List[Tuple]:
+        """Rows of (role, heartbeat, minutes_since, last_status, intent, last_error)."""
+        def _query(obs_columns: str) -> str:
+            return f"""
+                SELECT role, heartbeat,
+                       EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - heartbeat)) / 60 AS minutes_since,
+                       {obs_columns}
+                FROM scheduler_election
+                WHERE user_id = {_RESOLVE_USER_SQL} OR user_id IS NULL
+                ORDER BY heartbeat DESC
+            """
+
+        try:
+            rows = await self._fetch(_query("last_status, intent, last_error"), user_id)
+        except asyncpg.exceptions.UndefinedColumnError:
+            # Pre-migrate_v8_observability schema
+            rows = await self._fetch(_query("NULL, NULL, NULL"), user_id)
+        return [tuple(r) for r in rows]
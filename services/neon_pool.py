@@ -0,0 +1,297 @@
+"""
+Neon Pool — process-wide psycopg2 connection pooling for Mecris.
+
+Every data-access module used to open a fresh ``psycopg2.connect(neon_url)``
+per query, paying a full TCP + TLS + auth handshake against serverless
+Postgres each time (a single ``get_narrator_context`` opened 10+ of them).
+This module keeps one bounded pool per DSN and hands out connections with a
+health check on checkout.
+
+Usage (drop-in for ``with psycopg2.connect(url) as conn:``)::
+
+    from services.neon_pool import get_connection
+
+    with get_connection(self.neon_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+
+The block is a transaction scope exactly like psycopg2's own context manager:
+commit on success, rollback on exception. The connection then returns to the
+pool instead of being discarded.
+
+Tunables (env):
+    MECRIS_NEON_POOL_MAX         max open connections per DSN (default 10)
+    MECRIS_NEON_POOL_TIMEOUT     seconds to wait for a free connection (default 30)
+    MECRIS_NEON_POOL_MAX_IDLE    close idle connections older than this (default 240s;
+                                 Neon suspends idle compute after ~5 min)
+    MECRIS_NEON_POOL_PING_AFTER  ping (SELECT 1) reused connections idle this long (default 30s)
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+
+logger = logging.getLogger("mecris.services.neon_pool")
+
+DEFAULT_MAX_SIZE = 10
+DEFAULT_CHECKOUT_TIMEOUT = 30.0
+DEFAULT_MAX_IDLE_SECONDS = 240.0
+DEFAULT_PING_AFTER_SECONDS = 30.0
+
+# Errors after which a connection must not go back into the pool.
+_BROKEN_CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+class NeonPoolExhausted(RuntimeError):
+    """Raised when no connection became free within the checkout timeout."""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _is_closed(conn) -> bool:
+    """psycopg2 exposes ``closed`` as 0 (open) or a non-zero int (closed/broken)."""
+    try:
+        return bool(conn.closed)
+    except Exception:
+        return True
+
+
+class NeonConnectionPool:
+    """
+    Thread-safe, bounded pool of psycopg2 connections for a single DSN.
+
+    - ``max_size`` caps open connections (idle + checked out); callers block
+      up to ``checkout_timeout`` seconds when the pool is saturated.
+    - Checkout discards closed connections, recycles ones idle longer than
+      ``max_idle_seconds``, and pings ones idle longer than ``ping_after_seconds``.
+    - Connections that raised ``OperationalError``/``InterfaceError`` are
+      dropped on return instead of being reused.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        max_size: Optional[int] = None,
+        checkout_timeout: Optional[float] = None,
+        max_idle_seconds: Optional[float] = None,
+        ping_after_seconds: Optional[float] = None,
+    ):
+        self.dsn = dsn
+        self.max_size = max(1, int(max_size or _env_float("MECRIS_NEON_POOL_MAX", DEFAULT_MAX_SIZE)))
+        self.checkout_timeout = (
+            checkout_timeout if checkout_timeout is not None
+            else _env_float("MECRIS_NEON_POOL_TIMEOUT", DEFAULT_CHECKOUT_TIMEOUT)
+        )
+        self.max_idle_seconds = (
+            max_idle_seconds if max_idle_seconds is not None
+            else _env_float("MECRIS_NEON_POOL_MAX_IDLE", DEFAULT_MAX_IDLE_SECONDS)
+        )
+        self.ping_after_seconds = (
+            ping_after_seconds if ping_after_seconds is not None
+            else _env_float("MECRIS_NEON_POOL_PING_AFTER", DEFAULT_PING_AFTER_SECONDS)
+        )
+
+        self._cond = threading.Condition()
+        # Idle connections as (conn, returned_at_monotonic); LIFO so the warmest is reused first.
+        self._idle: List[Tuple[Any, float]] = []
+        self._in_use = 0
+        self._closed = False
+        self._stats: Dict[str, int] = {
+            "checkouts": 0,
+            "connects": 0,
+            "reuses": 0,
+            "health_check_failures": 0,
+            "recycled_idle": 0,
+            "discarded_broken": 0,
+            "waits": 0,
+            "timeouts": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+
+    def getconn(self):
+        """Check out a healthy connection, opening a new one if needed."""
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("NeonConnectionPool is closed")
+            waited = False
+            while not self._idle and self._in_use >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise NeonPoolExhausted(
+                        f"No Neon connection free after {self.checkout_timeout:.0f}s "
+                        f"(max_size={self.max_size})"
+                    )
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+            self._stats["checkouts"] += 1
+            self._in_use += 1
+            candidate = self._idle.pop() if self._idle else None
+
+        # Network I/O (ping/connect) happens outside the lock.
+        try:
+            if candidate is not None:
+                conn = self._revalidate(*candidate)
+                if conn is not None:
+                    with self._cond:
+                        self._stats["reuses"] += 1
+                    return conn
+            conn = psycopg2.connect(self.dsn)
+            with self._cond:
+                self._stats["connects"] += 1
+            return conn
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def _revalidate(self, conn, returned_at: float):
+        """Return conn if it is still usable, otherwise close it and return None."""
+        idle_for = time.monotonic() - returned_at
+        if _is_closed(conn):
+            with self._cond:
+                self._stats["health_check_failures"] += 1
+            return None
+        if idle_for > self.max_idle_seconds:
+            with self._cond:
+                self._stats["recycled_idle"] += 1
+            self._close_quietly(conn)
+            return None
+        if idle_for > self.ping_after_seconds:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except Exception as e:
+                logger.info(f"NeonConnectionPool: dropping stale connection ({e})")
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+                self._close_quietly(conn)
+                return None
+        return conn
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """Return a connection to the pool (or close it when discard/broken)."""
+        if not discard and _is_closed(conn):
+            discard = True
+        with self._cond:
+            self._in_use = max(0, self._in_use - 1)
+            if discard or self._closed:
+                if discard:
+                    self._stats["discarded_broken"] += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+        if conn is not None:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Transaction-scoped checkout: commit on success, rollback on error."""
+        raw = self.getconn()
+        discard = False
+        try:
+            with raw as conn:
+                yield conn
+        except _BROKEN_CONNECTION_ERRORS:
+            discard = True
+            raise
+        finally:
+            self.putconn(raw, discard=discard)
+
+    # ------------------------------------------------------------------
+    # Lifecycle / introspection
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+            }
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry (one pool per DSN)
+# ----------------------------------------------------------------------
+
+_pools: Dict[str, NeonConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(dsn: str) -> NeonConnectionPool:
+    """Return the shared pool for dsn, creating it on first use."""
+    if not dsn:
+        raise ValueError("get_pool: a Neon DSN is required")
+    pool = _pools.get(dsn)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(dsn)
+            if pool is None:
+                pool = NeonConnectionPool(dsn)
+                _pools[dsn] = pool
+    return pool
+
+
+@contextmanager
+def get_connection(dsn: str) -> Iterator[Any]:
+    """Pooled drop-in for ``with psycopg2.connect(dsn) as conn:``."""
+    with get_pool(dsn).connection() as conn:
+        yield conn
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-pool counters keyed by a redacted DSN (host/db only, no credentials)."""
+    return {_redact(dsn): pool.stats() for dsn, pool in list(_pools.items())}
+
+
+def close_all() -> None:
+    """Close and forget every pool (shutdown hook, and test isolation)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _redact(dsn: str) -> str:
+    """Strip user:password from a postgres URL for safe logging."""
+    if "@" in dsn:
+        scheme, _, rest = dsn.partition("://")
+        return f"{scheme}://{rest.rsplit('@', 1)[1]}" if rest else dsn
+    return dsn
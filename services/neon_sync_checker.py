@@ -2,11 +2,11 @@ import os
 import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
-import psycopg2
 from dotenv import load_dotenv
 
 from services.credentials_manager import credentials_manager
 from services.timezone_service import day_start_eastern
+from services.neon_pool import get_connection
 
 load_dotenv()
 logger = logging.getLogger("mecris.neon")
@@ -26,7 +26,7 @@ class NeonSyncChecker:
             return target_user_id
 
         try:
-            with psycopg2.connect(self.db_url) as conn:
+            with get_connection(self.db_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT pocket_id_sub FROM users WHERE familiar_id = %s", (target_user_id,))
                     row = cur.fetchone()
@@ -44,7 +44,7 @@ class NeonSyncChecker:
 
         target_user_id = self.resolve_user_id(user_id)
         try:
-            with psycopg2.connect(self.db_url) as conn:
+            with get_connection(self.db_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT notification_prefs FROM users WHERE pocket_id_sub = %s", (target_user_id,))
                     row = cur.fetchone()
@@ -67,7 +67,7 @@ class NeonSyncChecker:
             current = self.get_notification_prefs(target_user_id)
             current.update(prefs)
             
-            with psycopg2.connect(self.db_url) as conn:
+            with get_connection(self.db_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         UPDATE users 
@@ -92,10 +92,6 @@ class NeonSyncChecker:
         target_user_id = self.resolve_user_id(user_id)
 
         try:
-            # Connect to Neon
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
-
             # Define 'today' in Eastern Time midnight using TimezoneService
             today_start = day_start_eastern()
 
@@ -119,11 +115,10 @@ class NeonSyncChecker:
                 query += " AND user_id = %s"
                 params.append(target_user_id)
 
-            cur.execute(query, params)
-            count = cur.fetchone()[0]
-
-            cur.close()
-            conn.close()
+            with get_connection(self.db_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query, params)
+                    count = cur.fetchone()[0]
 
             logger.info(f"Neon walk check for {today_start} (min {min_steps} steps): found {count} walks")
             return count > 0
@@ -140,9 +135,6 @@ class NeonSyncChecker:
         target_user_id = self.resolve_user_id(user_id)
 
         try:
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
-
             query = "SELECT start_time::TIMESTAMPTZ, step_count, distance_meters, distance_source FROM walk_inferences"
             params = []
             
@@ -152,11 +144,10 @@ class NeonSyncChecker:
             
             query += " ORDER BY start_time DESC LIMIT 1"
 
-            cur.execute(query, params)
-            row = cur.fetchone()
-
-            cur.close()
-            conn.close()
+            with get_connection(self.db_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query, params)
+                    row = cur.fetchone()
 
             if row:
                 return {
@@ -179,19 +170,15 @@ class NeonSyncChecker:
         target_user_id = self.resolve_user_id(user_id)
 
         try:
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
-
-            cur.execute("""
-                SELECT language_name, current_reviews, tomorrow_reviews, next_7_days_reviews, 
-                       pump_multiplier, daily_completions, beeminder_slug, safebuf 
-                FROM language_stats 
-                WHERE user_id = %s
-            """, (target_user_id,))
-            rows = cur.fetchall()
-
-            cur.close()
-            conn.close()
+            with get_connection(self.db_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT language_name, current_reviews, tomorrow_reviews, next_7_days_reviews, 
+                               pump_multiplier, daily_completions, beeminder_slug, safebuf 
+                        FROM language_stats 
+                        WHERE user_id = %s
+                    """, (target_user_id,))
+                    rows = cur.fetchall()
 
             stats = {}
             for row in rows:
@@ -218,18 +205,14 @@ class NeonSyncChecker:
         target_user_id = self.resolve_user_id(user_id)
 
         try:
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
-
-            cur.execute("""
-                UPDATE language_stats 
-                SET pump_multiplier = %s 
-                WHERE language_name = %s AND user_id = %s
-            """, (multiplier, language_name.upper(), target_user_id))
-            
-            conn.commit()
-            cur.close()
-            conn.close()
+            with get_connection(self.db_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        UPDATE language_stats 
+                        SET pump_multiplier = %s 
+                        WHERE language_name = %s AND user_id = %s
+                    """, (multiplier, language_name.upper(), target_user_id))
+                conn.commit()
             return True
 
         except Exception as e:
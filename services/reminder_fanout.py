@@ -0,0 +1,129 @@
+"""
+Reminder Fan-out — evaluate every due tenant on one leader tick.
+
+MecrisScheduler used to register one reminder job for its own user_id, and
+the archivist walked users one at a time, so a leader served a single user
+per tick. ``ReminderFanout.run_tick`` lists the due users and evaluates them
+concurrently, bounded by MECRIS_REMINDER_CONCURRENCY (default 16). Each
+evaluation is capped at MECRIS_REMINDER_USER_TIMEOUT seconds (default 120),
+so one slow tenant cannot hold up the rest.
+
+The tick runs only on the process holding the scheduler's FANOUT_SLOT lease
+(see MecrisScheduler._fanout_election_loop), not on every per-user leader.
+
+The whole tick runs inside one context snapshot, so providers that take no
+user argument (weather) are fetched once per tick rather than once per user.
+Per-user providers are keyed by user_id and stay separate.
+
+Per-user evaluation latency and a summary of the last tick are kept for
+get_scheduler_queue.
+"""
+import asyncio
+import logging
+import os
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from services.context_snapshot import context_snapshot
+
+logger = logging.getLogger("mecris.services.reminder_fanout")
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_USER_TIMEOUT = 120.0
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def fanout_concurrency() -> int:
+    return max(1, int(_env_number("MECRIS_REMINDER_CONCURRENCY", DEFAULT_CONCURRENCY)))
+
+
+def fanout_enabled() -> bool:
+    return os.getenv("MECRIS_REMINDER_FANOUT", "false").lower() in ("1", "true", "yes")
+
+
+async def fan_out(items: Iterable[Hashable], worker: Callable[[Any], Awaitable[Any]], concurrency: int,
+                  timeout: Optional[float] = None) -> Dict[Hashable, Tuple[Any, float]]:
+    """Run worker(item) for every item, at most `concurrency` at a time.
+
+    Returns {item: (result or raised exception, seconds)}; a failure for one
+    item never cancels the others.
+    """
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+
+    async def _one(item):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                call = worker(item)
+                result = await (asyncio.wait_for(call, timeout) if timeout else call)
+            except Exception as e:
+                result = e
+            return item, (result, time.perf_counter() - start)
+
+    return dict(await asyncio.gather(*(_one(item) for item in items)))
+
+
+class ReminderFanout:
+    """Evaluates reminders for every due user on each tick under a semaphore."""
+
+    def __init__(self, evaluate: Callable[[str], Awaitable[Dict[str, Any]]],
+                 list_due_users: Callable[[], Awaitable[List[str]]],
+                 concurrency: Optional[int] = None, user_timeout: Optional[float] = None):
+        self.evaluate = evaluate
+        self.list_due_users = list_due_users
+        self.concurrency = int(concurrency or fanout_concurrency())
+        self.user_timeout = user_timeout or _env_number("MECRIS_REMINDER_USER_TIMEOUT", DEFAULT_USER_TIMEOUT)
+        self.latency: Dict[str, float] = {}
+        self.last_tick: Dict[str, Any] = {}
+
+    async def run_tick(self) -> Dict[str, Any]:
+        """Evaluate every due user once; returns the tick summary."""
+        start = time.perf_counter()
+        try:
+            user_ids = list(dict.fromkeys(await self.list_due_users()))
+        except Exception as e:
+            logger.error(f"Reminder fan-out: failed to list due users: {e}")
+            return {"error": str(e)}
+
+        with context_snapshot(f"reminder-tick:{len(user_ids)} users"):
+            outcomes = await fan_out(user_ids, self.evaluate, self.concurrency, self.user_timeout)
+
+        triggered, errors = [], {}
+        self.latency = {user_id: round(seconds, 4) for user_id, (_, seconds) in outcomes.items()}
+        for user_id, (result, _) in outcomes.items():
+            if isinstance(result, Exception):
+                errors[user_id] = str(result) or type(result).__name__
+            elif isinstance(result, dict) and result.get("error"):
+                errors[user_id] = result["error"]
+            elif isinstance(result, dict) and result.get("triggered"):
+                triggered.append(user_id)
+
+        latencies = sorted(seconds for _, seconds in outcomes.values())
+        self.last_tick = {
+            "users": len(user_ids),
+            "triggered": triggered,
+            "errors": errors,
+            "duration_s": round(time.perf_counter() - start, 4),
+            "latency_p50_s": round(statistics.median(latencies), 4) if latencies else 0.0,
+            "latency_max_s": round(latencies[-1], 4) if latencies else 0.0,
+        }
+        logger.info(
+            f"Reminder fan-out: {len(user_ids)} users in {self.last_tick['duration_s']:.2f}s "
+            f"(p50 {self.last_tick['latency_p50_s']:.2f}s, max {self.last_tick['latency_max_s']:.2f}s), "
+            f"{len(triggered)} triggered, {len(errors)} errors"
+        )
+        return self.last_tick
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "last_tick": self.last_tick,
+            "latency_by_user_s": dict(self.latency),
+        }
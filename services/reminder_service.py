@@ -1,13 +1,46 @@
 import os
+import time
 import logging
-from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
 
 from services.smart_nag import evaluate_nag
 
 logger = logging.getLogger("mecris.services.reminder")
 
 TIER2_IDLE_HOURS = 6.0  # hours idle before a Tier 1 reminder escalates to Tier 2
+TIER3_RUNWAY_HOURS = 2.0  # goal derails within this many hours → Tier 3
+
+# Fixed cooldowns in hours (None = global rate limit across all types). Arabic
+# and emergency reminders use _calculate_dynamic_cooldown on top of their base.
+COOLDOWN_HOURS: Dict[Optional[str], float] = {
+    None: 0.5,
+    "beeminder_emergency_tier3": 1.0,
+    "arabic_review_escalation": 1.0,
+    "walk_reminder": 2.5,
+    "momentum_coaching": 12.0,
+}
+DYNAMIC_COOLDOWN_BASE = {"arabic_review_reminder": 2.0, "beeminder_emergency": 4.0}
+
+# Clock hours at which a send can become possible: sleep ends, evening coaching starts
+WAKE_HOUR, EVENING_HOUR, SLEEP_HOUR = 8, 16, 20
+
+# Narrator context keys check_reminder_needed reads (see get_narrator_context sections)
+REMINDER_CONTEXT_SECTIONS = (
+    "daily_walk_status", "vacation_mode", "beeminder_alerts", "goal_runway",
+    "time_window_start", "time_window_end",
+)
+
+def planner_enabled() -> bool:
+    """True when reminders run as self-rescheduling one-shot jobs instead of a 30-minute poll."""
+    return os.getenv("MECRIS_REMINDER_PLANNER", "false").lower() in ("1", "true", "yes")
+
+
+# Most recent send per message type (None = any type) for the tick in progress
+_last_sent_snapshot: ContextVar[Optional[Dict[Optional[str], datetime]]] = ContextVar(
+    "reminder_last_sent_snapshot", default=None
+)
 
 
 class ReminderService:
@@ -18,13 +51,15 @@ class ReminderService:
     - Cooldowns are enforced per-type, but the aggregate frequency is the primary rate-limit.
     """
 
-    def __init__(self, context_provider, coaching_provider, log_provider=None, velocity_provider=None, skip_count_provider=None, walk_history_provider=None):
+    def __init__(self, context_provider, coaching_provider, log_provider=None, velocity_provider=None, skip_count_provider=None, walk_history_provider=None, last_sent_map_provider=None):
         self.context_provider = context_provider
         self.coaching_provider = coaching_provider
         self.log_provider = log_provider
+        # async (user_id) -> {type: sent_at, None: latest of any type}; one query per tick instead of log_provider per type
+        self.last_sent_map_provider = last_sent_map_provider
         self.velocity_provider = velocity_provider
         self.skip_count_provider = skip_count_provider  # async (user_id) -> int: consecutive ignored Arabic cycles
-        self.walk_history_provider = walk_history_provider  # async (user_id) -> List[datetime]: recent walk start times
+        self.walk_history_provider = walk_history_provider  # async (user_id) -> WalkHistogram (or List[datetime] of walk starts)
         # HX9403f1b85350b8c05780a1128b79f3c2 = mecris_status_v2 (Confirmed working)
         self.walk_template_sid = "HX9403f1b85350b8c05780a1128b79f3c2" 
         self.urgency_template_sid = "HX638b7f9403e04c8fa880370f1b7a9ba1" # urgency_alert_v2
@@ -32,11 +67,14 @@ class ReminderService:
     def _parse_runway_hours(self, goal: dict) -> float:
         """Return hours of runway from a goal dict.
 
-        Only returns a sub-24h value when the runway string explicitly uses an
+        Uses the goal's losedate when Beeminder reported one.  Otherwise only
+        returns a sub-24h value when the runway string explicitly uses an
         'hours' unit (e.g. '1.5 hours').  Goals expressed in days (e.g. '0 days')
         return 999.0 so they do NOT trigger Tier 3 — 'today' is not the same as
         'within 2 hours'.
         """
+        if goal.get("losedate"):
+            return max(0.0, (goal["losedate"] - time.time()) / 3600.0)
         runway = goal.get("runway", "")
         try:
             parts = runway.lower().split()
@@ -48,10 +86,13 @@ class ReminderService:
 
     async def _get_hours_since_last(self, msg_type: Optional[str] = None, user_id: str = None) -> float:
         """Helper to get hours since a specific message type (or ANY type) was sent."""
-        if not self.log_provider:
+        snapshot = _last_sent_snapshot.get()
+        if snapshot is not None:
+            last_sent = snapshot.get(msg_type)
+        elif not self.log_provider:
             return 999.0
-
-        last_sent = await self.log_provider(msg_type, user_id)
+        else:
+            last_sent = await self.log_provider(msg_type, user_id)
         if not last_sent:
             return 999.0
 
@@ -111,9 +152,9 @@ class ReminderService:
         import random
         reduction = 0.0
         # If it's evening (after 4 PM/16:00), start reducing the cooldown
-        if current_hour >= 16:
+        if current_hour >= EVENING_HOUR:
             # Reduce by 0.15 hours (9 mins) for every hour past 4 PM
-            reduction = (current_hour - 16) * 0.15
+            reduction = (current_hour - EVENING_HOUR) * 0.15
             
         # Add random fuzz between -0.25 and +0.25 hours (-15 to +15 mins)
         fuzz = random.uniform(-0.25, 0.25)
@@ -123,9 +164,88 @@ class ReminderService:
 
     async def check_reminder_needed(self, user_id: str = None) -> Dict[str, Any]:
         """Core logic for proactive nudges."""
+        snapshot = None
+        if self.last_sent_map_provider:
+            try:
+                snapshot = await self.last_sent_map_provider(user_id)
+            except Exception as e:
+                logger.warning(f"Last-sent lookup failed, falling back to per-type queries: {e}")
+        token = _last_sent_snapshot.set(snapshot)
+        try:
+            return await self._check_reminder_needed(user_id)
+        finally:
+            _last_sent_snapshot.reset(token)
+
+    async def _load_last_sent(self, user_id: str = None) -> Dict[Optional[str], datetime]:
+        """Most recent send per cooled-down type (None = any type)."""
+        if self.last_sent_map_provider:
+            try:
+                return await self.last_sent_map_provider(user_id) or {}
+            except Exception as e:
+                logger.warning(f"Last-sent lookup failed, falling back to per-type queries: {e}")
+        if not self.log_provider:
+            return {}
+        last_sent = {}
+        for msg_type in (*COOLDOWN_HOURS, *DYNAMIC_COOLDOWN_BASE):
+            sent_at = await self.log_provider(msg_type, user_id)
+            if sent_at:
+                last_sent[msg_type] = sent_at
+        return last_sent
+
+    async def next_check_at(self, user_id: str = None, now: Optional[datetime] = None) -> datetime:
+        """Earliest instant check_reminder_needed could reach a different decision.
+
+        Candidates are goal deadlines (Tier 3 onset and derailment), cooldown
+        expiries, the clock hours where sleep and the walk window open, and the
+        next hour boundary while hour-dependent rules (smart-nag, evening
+        cooldown decay) are live.  State that changes without a clock (a walk
+        gets logged, a goal is updated) is picked up within
+        MECRIS_REMINDER_PLAN_HORIZON_HOURS (default 6).  Returns an aware datetime.
+        """
+        now = (now or datetime.now()).astimezone()
+        try:
+            horizon = float(os.getenv("MECRIS_REMINDER_PLAN_HORIZON_HOURS", 6))
+        except ValueError:
+            horizon = 6.0
+        candidates = [now + timedelta(hours=horizon)]
+
+        context = await self.context_provider(user_id)
+        last_sent = await self._load_last_sent(user_id)
+
+        def _at_hour(hour: int) -> datetime:
+            at = now.replace(hour=hour % 24, minute=0, second=0, microsecond=0)
+            return at if at > now else at + timedelta(days=1)
+
+        window_start = context.get("time_window_start", 13)
+        candidates += [_at_hour(WAKE_HOUR), _at_hour(EVENING_HOUR), _at_hour(window_start)]
+
+        critical_goals = [g for g in context.get("goal_runway", []) if g.get("derail_risk") == "CRITICAL"]
+        has_walked = context.get("daily_walk_status", {}).get("has_activity_today", False)
+        if WAKE_HOUR <= now.hour < SLEEP_HOUR and (not has_walked or critical_goals):
+            candidates.append(_at_hour(now.hour + 1))
+
+        for goal in context.get("goal_runway", []):
+            if goal.get("losedate"):
+                losedate = datetime.fromtimestamp(goal["losedate"]).astimezone()
+                candidates += [losedate - timedelta(hours=TIER3_RUNWAY_HOURS), losedate]
+
+        # Dynamic cooldowns can land up to 15 minutes early (fuzz), never below 45 minutes
+        cooldowns = dict(COOLDOWN_HOURS)
+        for msg_type, base in DYNAMIC_COOLDOWN_BASE.items():
+            decay = max(0, now.hour - EVENING_HOUR) * 0.15
+            cooldowns[msg_type] = max(0.75, base - decay - 0.25)
+        for msg_type, hours in cooldowns.items():
+            sent_at = last_sent.get(msg_type)
+            if sent_at:
+                candidates.append(sent_at.astimezone() + timedelta(hours=hours))
+
+        future = [c for c in candidates if c > now]
+        return max(min(future), now + timedelta(minutes=1))
+
+    async def _check_reminder_needed(self, user_id: str = None) -> Dict[str, Any]:
         # 1. ENFORCE GLOBAL RATE LIMIT: No more than 2 messages per hour (30m cooldown)
         hours_since_any = await self._get_hours_since_last(None, user_id)
-        if hours_since_any < 0.5:
+        if hours_since_any < COOLDOWN_HOURS[None]:
             return {
                 "should_send": False, 
                 "reason": f"Global rate limit: 2x/hour (last sent {hours_since_any*60:.1f}m ago)"
@@ -143,18 +263,18 @@ class ReminderService:
         vacation_mode = context.get("vacation_mode", False)
 
         # 1a. ENFORCE SLEEP WINDOWS
-        is_normal_sleep_time = current_hour >= 20 or current_hour < 8
-        is_emergency_sleep_time = current_hour < 8
+        is_normal_sleep_time = current_hour >= SLEEP_HOUR or current_hour < WAKE_HOUR
+        is_emergency_sleep_time = current_hour < WAKE_HOUR
         
         # 1. Beeminder Emergencies (Higher Priority, any time)
         beeminder_alerts = context.get("beeminder_alerts", [])
         critical_goals = [g for g in context.get("goal_runway", []) if g.get("derail_risk") == "CRITICAL"]
 
         # 0. Tier 3: Goal runway expressed in hours and < 2h remaining → WhatsApp High Urgency
-        subhour_critical = [g for g in critical_goals if self._parse_runway_hours(g) < 2.0]
+        subhour_critical = [g for g in critical_goals if self._parse_runway_hours(g) < TIER3_RUNWAY_HOURS]
         if subhour_critical:
             hours_since_urgent = await self._get_hours_since_last("beeminder_emergency_tier3", user_id)
-            if hours_since_urgent >= 1.0:
+            if hours_since_urgent >= COOLDOWN_HOURS["beeminder_emergency_tier3"]:
                 target = subhour_critical[0]
                 return {
                     "should_send": True,
@@ -181,7 +301,7 @@ class ReminderService:
                         skip_count = await self.skip_count_provider(user_id)
                         if skip_count >= 3:
                             hours_since_escalation = await self._get_hours_since_last("arabic_review_escalation", user_id)
-                            if hours_since_escalation >= 1.0:
+                            if hours_since_escalation >= COOLDOWN_HOURS["arabic_review_escalation"]:
                                 target = arabic_critical[0]
                                 return {
                                     "should_send": True,
@@ -201,7 +321,7 @@ class ReminderService:
                     except Exception:
                         logger.warning("skip_count_provider failed; falling back to arabic_review_reminder")
 
-                dynamic_arabic_cooldown = self._calculate_dynamic_cooldown(2.0, current_hour)
+                dynamic_arabic_cooldown = self._calculate_dynamic_cooldown(DYNAMIC_COOLDOWN_BASE["arabic_review_reminder"], current_hour)
                 hours_since_arabic = await self._get_hours_since_last("arabic_review_reminder", user_id)
                 
                 if hours_since_arabic >= dynamic_arabic_cooldown:
@@ -242,7 +362,7 @@ class ReminderService:
                     return {"should_send": False, "reason": f"Arabic review reminder on cooldown ({hours_since_arabic:.1f}h since last)"}
 
             if critical_goals:
-                dynamic_emerg_cooldown = self._calculate_dynamic_cooldown(4.0, current_hour)
+                dynamic_emerg_cooldown = self._calculate_dynamic_cooldown(DYNAMIC_COOLDOWN_BASE["beeminder_emergency"], current_hour)
                 hours_since_emergency = await self._get_hours_since_last("beeminder_emergency", user_id)
                 if hours_since_emergency >= dynamic_emerg_cooldown:
                     target = critical_goals[0]
@@ -269,7 +389,7 @@ class ReminderService:
         smart_nag_result = None
         if not has_walked and self.walk_history_provider:
             try:
-                walk_history: List[datetime] = await self.walk_history_provider(user_id)
+                walk_history = await self.walk_history_provider(user_id)
                 smart_nag_result = evaluate_nag(walk_history, current_hour, has_walked, now=now)
                 if smart_nag_result["catch_up_nag"]:
                     hours_since_walk = await self._get_hours_since_last("walk_reminder", user_id)
@@ -298,7 +418,7 @@ class ReminderService:
                     return {"should_send": False, "reason": f"smart_nag: {smart_nag_result['reason']}"}
                 # Cooldown: 2.5 hours between walk nags
                 hours_since_walk = await self._get_hours_since_last("walk_reminder", user_id)
-                if hours_since_walk >= 2.5:
+                if hours_since_walk >= COOLDOWN_HOURS["walk_reminder"]:
                     # Format variables for mecris_activity_check_v2
                     result = {
                         "should_send": True,
@@ -317,10 +437,10 @@ class ReminderService:
                     return await self._apply_tier2_escalation(result, user_id)
                 else:
                     return {"should_send": False, "reason": f"Walk reminder on cooldown ({hours_since_walk:.1f}h since last)"}
-            elif insight and insight.get("momentum") == "high" and current_hour >= 16:
+            elif insight and insight.get("momentum") == "high" and current_hour >= EVENING_HOUR:
                 # Coaching pivot for high achievers late in the day
                 hours_since_coaching = await self._get_hours_since_last("momentum_coaching", user_id)
-                if hours_since_coaching >= 12.0: # Once a day max
+                if hours_since_coaching >= COOLDOWN_HOURS["momentum_coaching"]: # Once a day max
                     return {
                         "should_send": True,
                         "type": "momentum_coaching",
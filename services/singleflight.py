@@ -0,0 +1,88 @@
+"""
+Singleflight — coalesce concurrent async calls for the same key.
+
+When a cache entry expires, every caller that arrives before it is refilled
+misses together (an Android /aggregate-status poll, the reminder job and a
+CLI pulse) and each would fire its own Beeminder or Neon request. Routing
+the fill through a SingleFlight makes concurrent callers for one key share
+a single in-flight call; the next call after it settles starts a new one.
+
+The shared call is awaited behind asyncio.shield, so a cancelled or timed
+out waiter never cancels it for the others. In-flight calls are tracked per
+event loop because a future cannot be awaited from another loop (the MCP
+server runs the stdio loop and the uvicorn thread's loop side by side).
+"""
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger("mecris.services.singleflight")
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Tuple[Hashable, int], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory() for key, or join the call already in flight for it."""
+        loop = asyncio.get_running_loop()
+        flight_key = (key, id(loop))
+        with self._lock:
+            task = self._calls.get(flight_key)
+            if task is not None and not task.done():
+                self.shared += 1
+            else:
+                self.calls += 1
+                task = loop.create_task(factory())
+                self._calls[flight_key] = task
+                task.add_done_callback(lambda t: self._forget(flight_key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, flight_key: Tuple[Hashable, int], task: asyncio.Future) -> None:
+        with self._lock:
+            if self._calls.get(flight_key) is task:
+                del self._calls[flight_key]
+        # Retrieve the exception so a failure nobody awaited isn't logged as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._calls)}
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def group(name: str) -> SingleFlight:
+    """Return the process-wide SingleFlight registered under name."""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: flight.stats() for name, flight in _groups.items()}
+
+
+def singleflight(name: str):
+    """Decorate an async function so concurrent calls with equal arguments share one call."""
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        flight = group(name)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return await flight.do(tuple(bound.arguments.items()), lambda: fn(*args, **kwargs))
+
+        return wrapper
+    return decorator
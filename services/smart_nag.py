@@ -4,16 +4,79 @@ services/smart_nag.py — Success-pattern heuristic for walk nag suppression.
 Implements kingdonb/mecris#200: suppress walk nags during high-probability
 success windows and fire a catch-up nag when the window passes without activity.
 """
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from services.timezone_service import to_eastern
 
 SUPPRESS_THRESHOLD = 0.70  # suppress nag if historical success rate exceeds this
 HISTORY_DAYS = 30          # days of walk history to analyse
 WINDOW_HOURS = 1           # success window is ±WINDOW_HOURS around each hour
 
 
+class WalkHistogram:
+    """Walk start hours per calendar day over the last HISTORY_DAYS days.
+
+    Each day is a 24-bit mask with bit h set when a walk started during hour h,
+    so a month of history is at most HISTORY_DAYS small ints.  The 24 hourly
+    success probabilities are computed once and reused until add_walk() folds
+    a new walk in, which keeps evaluate_nag O(24).
+    """
+
+    def __init__(self, day_masks: Optional[Dict[date, int]] = None):
+        self.day_masks: Dict[date, int] = dict(day_masks or {})
+        self._probabilities: Optional[List[float]] = None
+
+    @classmethod
+    def from_walks(cls, walks: Iterable[datetime], now: Optional[datetime] = None) -> "WalkHistogram":
+        """Reduce raw walk start times, dropping those before the history cutoff."""
+        if now is None:
+            now = datetime.now()
+        cutoff = now - timedelta(days=HISTORY_DAYS)
+        histogram = cls()
+        for w in walks:
+            if w >= cutoff:
+                histogram.add_walk(w)
+        return histogram
+
+    def add_walk(self, start: Union[datetime, str]) -> None:
+        """Fold one walk in. ISO strings are accepted; aware times are binned by
+        their US/Eastern hour, the clock evaluate_nag's current_hour is read on
+        (naive times are already Eastern)."""
+        if isinstance(start, str):
+            start = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        if start.tzinfo:
+            start = to_eastern(start).replace(tzinfo=None)
+        day = start.date()
+        self.day_masks[day] = self.day_masks.get(day, 0) | (1 << start.hour)
+        self._probabilities = None
+
+    def probabilities(self) -> List[float]:
+        """success_probability for every hour 0–23."""
+        if self._probabilities is None:
+            masks = list(self.day_masks.values())
+            probabilities = []
+            for hour in range(24):
+                window = 0
+                for offset in range(-WINDOW_HOURS, WINDOW_HOURS + 1):
+                    window |= 1 << ((hour + offset) % 24)
+                probabilities.append(sum(1 for mask in masks if mask & window) / HISTORY_DAYS)
+            self._probabilities = probabilities
+        return self._probabilities
+
+    def __bool__(self) -> bool:
+        return bool(self.day_masks)
+
+
+Walks = Union[List[datetime], WalkHistogram]
+
+
+def _histogram(walks: Walks, now: Optional[datetime]) -> WalkHistogram:
+    return walks if isinstance(walks, WalkHistogram) else WalkHistogram.from_walks(walks or [], now=now)
+
+
 def success_probability(
-    walks: List[datetime],
+    walks: Walks,
     target_hour: int,
     now: Optional[datetime] = None,
 ) -> float:
@@ -25,39 +88,19 @@ def success_probability(
     are considered.
 
     Args:
-        walks: Walk start datetimes (any timezone-naive datetimes).
+        walks: Walk start datetimes (any timezone-naive datetimes), or a
+            WalkHistogram already reduced from them.
         target_hour: Hour to centre the window on (0–23).
         now: Reference point for the history cutoff (defaults to datetime.now()).
 
     Returns:
         Float in [0.0, 1.0].
     """
-    if not walks:
-        return 0.0
-    if now is None:
-        now = datetime.now()
-
-    cutoff = now - timedelta(days=HISTORY_DAYS)
-    recent = [w for w in walks if w >= cutoff]
-    if not recent:
-        return 0.0
-
-    window_start = (target_hour - WINDOW_HOURS) % 24
-    window_end = (target_hour + WINDOW_HOURS) % 24
-    wraps = window_start > window_end  # window crosses midnight
-
-    walked_dates: set = set()
-    for w in recent:
-        h = w.hour
-        in_window = (h >= window_start or h <= window_end) if wraps else (window_start <= h <= window_end)
-        if in_window:
-            walked_dates.add(w.date())
-
-    return len(walked_dates) / HISTORY_DAYS
+    return _histogram(walks, now).probabilities()[target_hour % 24]
 
 
 def find_peak_success_window(
-    walks: List[datetime],
+    walks: Walks,
     now: Optional[datetime] = None,
 ) -> Tuple[int, float]:
     """Return the hour with the highest success probability.
@@ -67,8 +110,7 @@ def find_peak_success_window(
         peak_probability == 0.0 when walks is empty or all probabilities are 0.
     """
     best_hour, best_prob = -1, 0.0
-    for h in range(24):
-        p = success_probability(walks, h, now=now)
+    for h, p in enumerate(_histogram(walks, now).probabilities()):
         if p > best_prob:
             best_prob = p
             best_hour = h
@@ -76,7 +118,7 @@ def find_peak_success_window(
 
 
 def evaluate_nag(
-    walks: List[datetime],
+    walks: Walks,
     current_hour: int,
     has_walked_today: bool,
     now: Optional[datetime] = None,
@@ -92,7 +134,8 @@ def evaluate_nag(
     4. Otherwise → do not suppress, do not catch-up (normal nag logic applies).
 
     Args:
-        walks: Walk start datetimes from the last HISTORY_DAYS days.
+        walks: Walk start datetimes from the last HISTORY_DAYS days, or
+            their WalkHistogram.
         current_hour: Current local hour (0–23).
         has_walked_today: True if a qualifying walk is already logged today.
         now: Reference point for history cutoff (defaults to datetime.now()).
@@ -112,7 +155,8 @@ def evaluate_nag(
             "reason": "already walked today",
         }
 
-    prob = success_probability(walks, current_hour, now=now)
+    histogram = _histogram(walks, now)
+    prob = success_probability(histogram, current_hour)
 
     if prob > SUPPRESS_THRESHOLD:
         return {
@@ -125,7 +169,7 @@ def evaluate_nag(
             ),
         }
 
-    peak_hour, peak_prob = find_peak_success_window(walks, now=now)
+    peak_hour, peak_prob = find_peak_success_window(histogram)
     if peak_prob > SUPPRESS_THRESHOLD and peak_hour >= 0 and current_hour > peak_hour + WINDOW_HOURS:
         return {
             "should_suppress": False,
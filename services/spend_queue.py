@@ -0,0 +1,326 @@
+"""
+Spend Queue — write-behind recording of LLM spend off the agent's call path.
+
+budget_governor_record, _record_governor_spend and record_usage_session used
+to INSERT into Neon while the agent waited, and a Neon hiccup surfaced as a
+failed turn. With MECRIS_SPEND_WRITE_BEHIND on (the default), spend rows are
+appended to an in-memory buffer and a daemon thread writes them in batched
+multi-row INSERTs every MECRIS_SPEND_FLUSH_SECONDS (default 1), or sooner
+once MECRIS_SPEND_BATCH_SIZE rows (default 100) are waiting.
+
+Nothing is dropped: when the buffer (MECRIS_SPEND_QUEUE_MAX, default 10000)
+is full, or a flush fails because Neon is unreachable (connection-level
+errors only), rows are appended to a local JSONL spill file
+(MECRIS_SPEND_SPILL_DIR, default ~/.mecris) that is replayed ahead of the
+buffer on the next successful flush. Delivery is at-least-once: a crash
+between a commit and removing the replayed spill can write those rows again.
+
+A batch that Postgres rejects for its data (an IntegrityError, an FK
+violation on user_id, ...) is rewritten row by row under savepoints; the
+rows that still fail go to a dead-letter file (<spill>.dead) with the error
+instead of being retried forever, and the rest are written.
+
+shutdown_spend_queues() runs from MecrisScheduler.shutdown and at interpreter
+exit, so a clean exit of any process leaves nothing behind in memory.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("mecris.services.spend_queue")
+
+Row = Dict[str, Any]
+
+
+def write_behind_enabled() -> bool:
+    return os.getenv("MECRIS_SPEND_WRITE_BEHIND", "true").lower() not in ("0", "false", "no")
+
+
+def _iso(value: Any) -> str:
+    # Spilled rows come back with ISO strings where fresh ones hold datetimes
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _write_governor_spend(cur, rows: List[Row]) -> None:
+    from psycopg2.extras import execute_values
+    execute_values(cur, """
+        INSERT INTO budget_governor_spend_log (user_id, bucket, cost, ts) VALUES %s
+    """, [(r["user_id"], r["bucket"], r["cost"], r["ts"]) for r in rows])
+
+
+def _write_usage_sessions(cur, rows: List[Row]) -> None:
+    from psycopg2.extras import execute_values
+    execute_values(cur, """
+        INSERT INTO usage_sessions
+        (timestamp, model, input_tokens, output_tokens, estimated_cost, session_type, notes, user_id)
+        VALUES %s
+    """, [(r["timestamp"], r["model"], r["input_tokens"], r["output_tokens"], r["estimated_cost"],
+           r["session_type"], r["notes"], r["user_id"]) for r in rows])
+    # One budget_tracking update per user for the whole batch
+    per_user: Dict[str, Tuple[float, Any]] = {}
+    for r in rows:
+        spent, last = per_user.get(r["user_id"], (0.0, r["timestamp"]))
+        per_user[r["user_id"]] = (spent + r["estimated_cost"], max(last, r["timestamp"], key=_iso))
+    execute_values(cur, """
+        UPDATE budget_tracking AS b
+        SET remaining_budget = b.remaining_budget - v.cost, last_updated = v.ts::timestamp
+        FROM (VALUES %s) AS v(user_id, cost, ts)
+        WHERE b.user_id = v.user_id
+    """, [(user_id, spent, last) for user_id, (spent, last) in per_user.items()])
+
+
+# Kinds are written in this order, so sessions and governor rows from one
+# flush commit together.
+WRITERS: Dict[str, Callable[[Any, List[Row]], None]] = {
+    "usage_session": _write_usage_sessions,
+    "governor_spend": _write_governor_spend,
+}
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Errors worth spilling and retrying: Neon unreachable, not a bad row."""
+    import psycopg2
+    from services.neon_pool import NeonPoolExhausted
+    return isinstance(exc, (psycopg2.OperationalError, psycopg2.InterfaceError, NeonPoolExhausted, OSError))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+
+class SpendQueue:
+    def __init__(self, neon_url: str, max_buffer: Optional[int] = None, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None, spill_path: Optional[str] = None):
+        self.neon_url = neon_url
+        self.max_buffer = max_buffer or int(os.getenv("MECRIS_SPEND_QUEUE_MAX", "10000"))
+        self.batch_size = batch_size or int(os.getenv("MECRIS_SPEND_BATCH_SIZE", "100"))
+        self.flush_interval = flush_interval if flush_interval is not None else float(os.getenv("MECRIS_SPEND_FLUSH_SECONDS", "1"))
+        if spill_path is None:
+            spill_dir = os.getenv("MECRIS_SPEND_SPILL_DIR", os.path.join(os.path.expanduser("~"), ".mecris"))
+            digest = hashlib.sha1(neon_url.encode()).hexdigest()[:8]
+            spill_path = os.path.join(spill_dir, f"spend_spill-{digest}.jsonl")
+        self.spill_path = spill_path
+        self._buffer: Deque[Tuple[str, Row]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"enqueued": 0, "written": 0, "batches": 0, "spilled": 0, "replayed": 0, "failures": 0,
+                       "dead_lettered": 0}
+
+    def enqueue(self, kind: str, row: Row) -> None:
+        """Buffer one row for writing; never blocks on the database."""
+        if kind not in WRITERS:
+            raise ValueError(f"Unknown spend kind: {kind!r}")
+        with self._lock:
+            self._stats["enqueued"] += 1
+            overflow = len(self._buffer) >= self.max_buffer
+            if not overflow:
+                self._buffer.append((kind, row))
+                ready = len(self._buffer) >= self.batch_size
+        if overflow:
+            logger.warning(f"Spend buffer full ({self.max_buffer}); spilling to {self.spill_path}")
+            self._spill([(kind, row)])
+            return
+        self._ensure_started()
+        if ready:
+            self._wake.set()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="mecris-spend-queue", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if not self._stopped:
+                self.flush()
+
+    def flush(self) -> int:
+        """Write spilled rows, then everything buffered. Returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                pending = list(self._buffer)
+                self._buffer.clear()
+            replay = self._take_spill()
+            items = replay + pending
+            if not items:
+                return 0
+            try:
+                try:
+                    self._write(items)
+                    rejected = []
+                except Exception as e:
+                    if _is_transient(e):
+                        raise
+                    logger.warning(f"Spend flush of {len(items)} row(s) rejected ({e}); writing rows one by one")
+                    rejected = self._write_each(items)
+            except Exception as e:
+                self._stats["failures"] += 1
+                logger.warning(f"Spend flush of {len(items)} row(s) failed, spilling to disk: {e}")
+                # Replayed rows are still in the .replay file; only spill the new ones
+                self._spill(pending)
+                return 0
+            if rejected:
+                self._dead_letter(rejected)
+            if replay:
+                self._stats["replayed"] += len(replay)
+                try:
+                    os.remove(self._replay_path)
+                except FileNotFoundError:
+                    pass
+            written = len(items) - len(rejected)
+            self._stats["written"] += written
+            return written
+
+    def _write(self, items: List[Tuple[str, Row]]) -> None:
+        from services.neon_pool import get_connection
+        by_kind: Dict[str, List[Row]] = {}
+        for kind, row in items:
+            by_kind.setdefault(kind, []).append(row)
+        with get_connection(self.neon_url) as conn:
+            with conn.cursor() as cur:
+                for kind, writer in WRITERS.items():
+                    rows = by_kind.get(kind)
+                    for start in range(0, len(rows or ()), self.batch_size):
+                        writer(cur, rows[start:start + self.batch_size])
+                        self._stats["batches"] += 1
+
+    def _write_each(self, items: List[Tuple[str, Row]]) -> List[Tuple[str, Row, str]]:
+        """Write rows one at a time under savepoints; returns the rows Postgres rejected."""
+        from services.neon_pool import get_connection
+        rejected = []
+        with get_connection(self.neon_url) as conn:
+            with conn.cursor() as cur:
+                for kind, writer in WRITERS.items():
+                    for row in (r for k, r in items if k == kind):
+                        cur.execute("SAVEPOINT spend_row")
+                        try:
+                            writer(cur, [row])
+                            cur.execute("RELEASE SAVEPOINT spend_row")
+                        except Exception as e:
+                            if _is_transient(e):
+                                raise
+                            cur.execute("ROLLBACK TO SAVEPOINT spend_row")
+                            rejected.append((kind, row, str(e)))
+        return rejected
+
+    # --- durable spill file ---
+
+    @property
+    def _dead_letter_path(self) -> str:
+        return f"{self.spill_path}.dead"
+
+    def _dead_letter(self, rejected: List[Tuple[str, Row, str]]) -> None:
+        self._stats["dead_lettered"] += len(rejected)
+        logger.error(f"Dead-lettering {len(rejected)} spend row(s) Postgres rejected to {self._dead_letter_path}")
+        try:
+            os.makedirs(os.path.dirname(self._dead_letter_path) or ".", exist_ok=True)
+            with open(self._dead_letter_path, "a") as f:
+                for kind, row, error in rejected:
+                    f.write(json.dumps({"kind": kind, "row": row, "error": error}, default=_json_default) + "\n")
+        except Exception as e:
+            logger.error(f"Could not write spend dead-letter file {self._dead_letter_path}: {e}")
+
+    @property
+    def _replay_path(self) -> str:
+        return f"{self.spill_path}.replay"
+
+    def _spill(self, items: List[Tuple[str, Row]]) -> None:
+        if not items:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+            with open(self.spill_path, "a") as f:
+                for kind, row in items:
+                    f.write(json.dumps({"kind": kind, "row": row}, default=_json_default) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._stats["spilled"] += len(items)
+        except Exception as e:
+            logger.error(f"Could not spill {len(items)} spend row(s) to {self.spill_path}: {e}")
+
+    def _take_spill(self) -> List[Tuple[str, Row]]:
+        """Move the spill file aside for replay and return its rows."""
+        if os.path.exists(self.spill_path):
+            try:
+                if not os.path.exists(self._replay_path):
+                    os.replace(self.spill_path, self._replay_path)
+                else:
+                    # An earlier replay failed; fold new spill rows into it
+                    with open(self.spill_path) as src, open(self._replay_path, "a") as dst:
+                        dst.write(src.read())
+                    os.remove(self.spill_path)
+            except OSError as e:
+                logger.warning(f"Could not stage spend spill file {self.spill_path}: {e}")
+        try:
+            with open(self._replay_path) as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        items = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                if entry["kind"] in WRITERS:
+                    items.append((entry["kind"], entry["row"]))
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping unreadable line in {self._replay_path}")
+        return items
+
+    def shutdown(self, timeout: float = 5.0) -> int:
+        """Stop the flush thread and write (or spill) whatever is still buffered."""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "buffered": len(self._buffer)}
+
+
+_queues: Dict[str, SpendQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_spend_queue(neon_url: str) -> SpendQueue:
+    with _queues_lock:
+        queue = _queues.get(neon_url)
+        if queue is None or queue._stopped:
+            queue = SpendQueue(neon_url)
+            _queues[neon_url] = queue
+        return queue
+
+
+def shutdown_spend_queues() -> None:
+    with _queues_lock:
+        queues = list(_queues.values())
+    for queue in queues:
+        try:
+            queue.shutdown()
+        except Exception as e:
+            logger.error(f"Spend queue shutdown failed: {e}")
+
+
+# CLI, py_harness and stdio processes exit without MecrisScheduler.shutdown
+atexit.register(shutdown_spend_queues)
+
+
+def spend_queue_stats() -> Dict[str, Dict[str, Any]]:
+    with _queues_lock:
+        queues = list(_queues.values())
+    return {hashlib.sha1(q.neon_url.encode()).hexdigest()[:8]: q.stats() for q in queues}
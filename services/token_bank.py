@@ -11,9 +11,10 @@ import logging
 from datetime import datetime, timezone, date
 from typing import Optional
 
-import psycopg2
 from dotenv import load_dotenv
 
+from services.neon_pool import get_connection
+
 load_dotenv()
 logger = logging.getLogger("mecris.services.token_bank")
 
@@ -59,7 +60,7 @@ class TokenBankService:
             logger.warning("No DB URL — skipping token bank check for %s", user_id)
             return 0
 
-        with psycopg2.connect(self.db_url) as conn:
+        with get_connection(self.db_url) as conn:
             with conn.cursor() as cur:
                 self._ensure_row(cur, user_id)
                 self._reset_if_new_day(cur, user_id)
@@ -101,7 +102,7 @@ class TokenBankService:
         if not self.db_url:
             return None
 
-        with psycopg2.connect(self.db_url) as conn:
+        with get_connection(self.db_url) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -126,7 +127,7 @@ class TokenBankService:
         if not self.db_url:
             return
 
-        with psycopg2.connect(self.db_url) as conn:
+        with get_connection(self.db_url) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -147,7 +148,7 @@ class TokenBankService:
         if not self.db_url:
             return []
 
-        with psycopg2.connect(self.db_url) as conn:
+        with get_connection(self.db_url) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
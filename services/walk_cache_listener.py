@@ -1,31 +1,26 @@
 """
 Walk Cache Listener — Invalidation via PostgreSQL NOTIFY/LISTEN.
 
-Listens for `walk_inferences_change` notifications and evicts the
-`daily_activity_cache` entry for the affected user/date.
+Listens for `walk_inferences_change` notifications, evicts the
+`daily_activity` cache entry for the affected user/date and folds the walk
+into the user's cached smart-nag histogram. Walk changes and the
+`language_stats_change`, `message_log_change` and `budget_tracking_change`
+channels (migrations/add_context_invalidation_triggers.sql) also invalidate
+the user's cached narrator/aggregate context via services.cache.invalidate_user.
 Runs as a background task in the MCP server process.
 """
 import asyncio
 import json
 import logging
 import os
-from typing import Optional
 
 import asyncpg
 
+from services.cache import get_cache, invalidate_user
 from services.timezone_service import today_eastern
 
 logger = logging.getLogger("mecris.walk_cache_listener")
 
-# Module-level cache reference (populated by mcp_server on startup)
-daily_activity_cache: Optional[dict] = None
-
-
-def set_cache_reference(cache: dict):
-    """Called by mcp_server at startup to inject the cache dict."""
-    global daily_activity_cache
-    daily_activity_cache = cache
-
 
 async def start_walk_cache_listener() -> asyncio.Task:
     """
@@ -45,8 +40,9 @@ async def start_walk_cache_listener() -> asyncio.Task:
         conn = None
         try:
             conn = await asyncpg.connect(dsn)
-            await conn.add_listener("walk_inferences_change", _on_walk_change)
-            logger.info("Walk cache listener started on channel 'walk_inferences_change'")
+            for channel, callback in CHANNELS.items():
+                await conn.add_listener(channel, callback)
+            logger.info(f"Walk cache listener started on channels {sorted(CHANNELS)}")
 
             # Keep connection alive
             while True:
@@ -58,10 +54,11 @@ async def start_walk_cache_listener() -> asyncio.Task:
             logger.error(f"Walk cache listener error: {e}")
         finally:
             if conn:
-                try:
-                    await conn.remove_listener("walk_inferences_change", _on_walk_change)
-                except Exception:
-                    pass
+                for channel, callback in CHANNELS.items():
+                    try:
+                        await conn.remove_listener(channel, callback)
+                    except Exception:
+                        pass
                 await conn.close()
 
     return asyncio.create_task(_listener_task())
@@ -79,8 +76,37 @@ def _on_walk_change(conn: asyncpg.Connection, pid: int, channel: str, payload: s
         today = today_eastern().isoformat()
         key = f"{user_id}:bike:{today}"
 
-        if daily_activity_cache and key in daily_activity_cache:
-            del daily_activity_cache[key]
+        if get_cache("daily_activity").delete(key):
             logger.info(f"Evicted walk cache for {key} (op: {data.get('op')})")
+
+        # Fold the walk into today's smart-nag histogram ("{user_id}:walk_histogram:{today}");
+        # payloads from the pre-start_time trigger drop it so the next tick refetches
+        histograms = get_cache("walk_histogram", max_size=1024, ttl=24 * 3600)
+        histogram_key = f"{user_id}:walk_histogram:{today}"
+        histogram = histograms.get(histogram_key)
+        if histogram is not None:
+            if data.get("start_time"):
+                histogram.add_walk(data["start_time"])
+            else:
+                histograms.delete(histogram_key)
+        invalidate_user(user_id, namespaces=(), reason=channel)
+    except Exception as e:
+        logger.error(f"Walk cache invalidation failed: {e}")
+
+
+def _on_context_change(conn: asyncpg.Connection, pid: int, channel: str, payload: str):
+    """Callback fired when a language_stats, message_log or budget_tracking row changes."""
+    try:
+        user_id = json.loads(payload).get("user_id")
+        if user_id:
+            invalidate_user(user_id, namespaces=(), reason=channel)
     except Exception as e:
-        logger.error(f"Walk cache invalidation failed: {e}")
\ No newline at end of file
+        logger.error(f"Context cache invalidation failed for {channel}: {e}")
+
+
+CHANNELS = {
+    "walk_inferences_change": _on_walk_change,
+    "language_stats_change": _on_context_change,
+    "message_log_change": _on_context_change,
+    "budget_tracking_change": _on_context_change,
+}
\ No newline at end of file
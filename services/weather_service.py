@@ -1,9 +1,11 @@
 import os
 import requests
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any, Tuple, Optional
 
+from services.cache import get_cache
+
 logger = logging.getLogger("mecris")
 
 class WeatherService:
@@ -15,19 +17,20 @@ class WeatherService:
         self.lon = os.getenv("LONGITUDE", "-86.2520")
         self.mock_mode = os.getenv("MOCK_WEATHER", "false").lower() == "true"
         
-        # Cache implementation
-        self._cache = {}
+        # Shared TTL cache keyed by location (services/cache.py)
         self.cache_minutes = 60
+        self._cache = get_cache("weather", max_size=16, ttl=self.cache_minutes * 60, persist=True)
+        self._cache_key = (self.lat, self.lon)
 
     def get_weather(self) -> Dict[str, Any]:
         """Fetch current weather from OpenWeather with 1-hour cache or return mock data."""
         now = datetime.now()
         
         # Check cache
-        if "data" in self._cache and "expires" in self._cache:
-            if now < self._cache["expires"]:
-                logger.debug("Returning cached weather data")
-                return self._cache["data"]
+        cached = self._cache.get(self._cache_key)
+        if cached is not None:
+            logger.debug("Returning cached weather data")
+            return cached
 
         if self.mock_mode or not self.api_key:
             if not self.api_key and not self.mock_mode:
@@ -77,18 +80,16 @@ class WeatherService:
         except Exception as e:
             logger.error(f"Weather API fetch failed: {e}")
             # If we have stale data, return it instead of an error to prevent breaking context
-            if "data" in self._cache:
+            stale = self._cache.get_stale(self._cache_key)
+            if stale is not None:
                 logger.warning("Returning stale weather data due to API error")
-                return {**self._cache["data"], "stale": True, "error": str(e)}
+                return {**stale, "stale": True, "error": str(e)}
             
             return {"error": str(e), "source": "error"}
 
     def _update_cache(self, data: Dict[str, Any]):
         """Internal helper to update the local cache."""
-        self._cache = {
-            "data": data,
-            "expires": datetime.now() + timedelta(minutes=self.cache_minutes)
-        }
+        self._cache.set(self._cache_key, data, ttl=self.cache_minutes * 60)
 
     def is_walk_appropriate(self, weather: Dict[str, Any]) -> Tuple[bool, str]:
         """Determine if current conditions are suitable for a walk."""
@@ -16,6 +16,9 @@ import apscheduler.schedulers          # noqa: F401
 import apscheduler.schedulers.asyncio  # noqa: F401
 import apscheduler.triggers            # noqa: F401
 import apscheduler.triggers.date       # noqa: F401
+# Same for the local services package, which the autouse cache/pool fixtures import
+import services.cache                  # noqa: F401
+import services.neon_pool              # noqa: F401
 
 class DummyResponse:
     def __init__(self, json_data=None, status_code=200):
@@ -92,3 +95,79 @@ def mock_usage_tracker_init(monkeypatch):
         import usage_tracker as _ut
         monkeypatch.setattr(_ut, "_tracker_instance", None)
         monkeypatch.setattr(_ut.UsageTracker, "init_database", lambda self: None)
+
+
+@pytest.fixture(autouse=True)
+def reset_neon_pools():
+    """Drop pooled (often mocked) Neon connections so they never leak across tests."""
+    from services import neon_pool
+    neon_pool.close_all()
+    yield
+    neon_pool.close_all()
+
+
+@pytest.fixture(autouse=True)
+def disable_neon_async(monkeypatch):
+    """Route Neon reads through the (mockable) psycopg2 fallback by default.
+
+    Tests for services/neon_async.py opt back in with MECRIS_NEON_ASYNC=true.
+    """
+    monkeypatch.setenv("MECRIS_NEON_ASYNC", "false")
+
+
+@pytest.fixture(autouse=True)
+def disable_spend_write_behind(monkeypatch):
+    """Record spend synchronously so tests can assert on the INSERTs.
+
+    Tests for services/spend_queue.py opt back in with MECRIS_SPEND_WRITE_BEHIND=true.
+    """
+    monkeypatch.setenv("MECRIS_SPEND_WRITE_BEHIND", "false")
+
+
+@pytest.fixture(autouse=True)
+def disable_context_cache(monkeypatch):
+    """Build narrator/aggregate context fresh on every call by default.
+
+    The cache is a process-wide singleton that would otherwise carry mocked
+    results across tests; tests for services/context_cache.py opt back in.
+    """
+    monkeypatch.setenv("MECRIS_CONTEXT_CACHE", "false")
+
+
+@pytest.fixture(autouse=True)
+def reset_beeminder_clients():
+    """Pooled Beeminder clients and decrypted credentials are process-wide; never share them across tests."""
+    import beeminder_client
+    from services.beeminder_pool import beeminder_pool
+    beeminder_client.invalidate_credentials()
+    beeminder_pool.clear()
+    yield
+    beeminder_client.invalidate_credentials()
+    beeminder_pool.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_caches():
+    """services/cache.py namespaces (goals, daily activity, weather) are process-wide; start every test cold."""
+    from services.cache import clear_all
+    clear_all()
+    yield
+    clear_all()
+
+
+@pytest.fixture(autouse=True)
+def reset_twilio_clients():
+    """twilio_sender reuses one Client per credential pair; tests patch Client, so never share it."""
+    import twilio_sender
+    twilio_sender.reset_clients()
+    yield
+    twilio_sender.reset_clients()
+
+
+@pytest.fixture(autouse=True)
+def disable_delivery_queue(monkeypatch):
+    """Deliver reminders inline so tests can assert on the send and its message_log row.
+
+    Tests for services/delivery_queue.py exercise the queue directly.
+    """
+    monkeypatch.setenv("MECRIS_DELIVERY_QUEUE", "false")
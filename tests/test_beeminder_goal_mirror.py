@@ -0,0 +1,89 @@
+"""Tests for the incremental (diff_since) Beeminder goal mirror in BeeminderClient."""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import beeminder_client
+from beeminder_client import BeeminderClient
+
+
+def _goal(gid, slug, safebuf=5, **extra):
+    return {"id": gid, "slug": slug, "safebuf": safebuf, "curval": 1, "goalval": None, "rate": 1, **extra}
+
+
+def _client(responses):
+    client = BeeminderClient(user_id="user-1")
+    client.username, client.auth_token = "alice", "token"
+    api = AsyncMock(side_effect=responses)
+    return client, api
+
+
+@pytest.mark.asyncio
+async def test_first_call_is_full_fetch_then_incremental_merge():
+    client, api = _client([
+        [_goal("g1", "bike"), _goal("g2", "reviewstack")],
+        {"goals": [_goal("g2", "reviewstack", safebuf=0, datapoints=[{"value": 1}])], "deleted_goals": []},
+    ])
+    with patch.object(client, "_api_call", api):
+        first = await client.get_user_goals()
+        second = await client.get_user_goals()
+
+    assert [g["slug"] for g in first] == ["bike", "reviewstack"]
+    by_slug = {g["slug"]: g for g in second}
+    assert by_slug["reviewstack"]["safebuf"] == 0
+    assert "datapoints" not in by_slug["reviewstack"]
+    assert by_slug["bike"]["safebuf"] == 5
+
+    assert api.call_args_list[0].args == ("users/alice/goals.json",)
+    endpoint, = api.call_args_list[1].args
+    assert endpoint == "users/alice.json"
+    assert api.call_args_list[1].kwargs["query"]["diff_since"] <= client._mirror_synced_at
+
+
+@pytest.mark.asyncio
+async def test_new_and_deleted_goals_are_applied():
+    client, api = _client([
+        [_goal("g1", "bike"), _goal("g2", "old")],
+        {"goals": [_goal("g3", "new")], "deleted_goals": [{"id": "g2"}]},
+    ])
+    with patch.object(client, "_api_call", api):
+        await client.get_user_goals()
+        goals = await client.get_user_goals()
+
+    assert sorted(g["slug"] for g in goals) == ["bike", "new"]
+
+
+@pytest.mark.asyncio
+async def test_new_day_forces_full_refresh():
+    client, api = _client([[_goal("g1", "bike")], [_goal("g1", "bike", safebuf=4)]])
+    with patch.object(client, "_api_call", api):
+        await client.get_user_goals()
+        client._mirror_day = "1999-01-01"
+        goals = await client.get_user_goals()
+
+    assert api.call_args_list[1].args == ("users/alice/goals.json",)
+    assert goals[0]["safebuf"] == 4
+
+
+@pytest.mark.asyncio
+async def test_diff_since_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("MECRIS_BEEMINDER_DIFF_SINCE", "false")
+    client, api = _client([[_goal("g1", "bike")], [_goal("g1", "bike")]])
+    with patch.object(client, "_api_call", api):
+        await client.get_user_goals()
+        await client.get_user_goals()
+
+    assert all(call.args == ("users/alice/goals.json",) for call in api.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_api_error_keeps_mirror_and_returns_empty():
+    client, api = _client([
+        [_goal("g1", "bike")],
+        beeminder_client.BeeminderAPIError("boom", status_code=500),
+        {"goals": []},
+    ])
+    with patch.object(client, "_api_call", api):
+        await client.get_user_goals()
+        assert await client.get_user_goals() == []
+        assert [g["slug"] for g in await client.get_user_goals()] == ["bike"]
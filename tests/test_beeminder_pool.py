@@ -0,0 +1,115 @@
+"""Tests for services/beeminder_pool.py and the BeeminderClient credential cache."""
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import beeminder_client
+from beeminder_client import BeeminderAPIError, BeeminderClient
+from services.beeminder_pool import BeeminderClientPool
+from services.encryption_service import EncryptionService
+
+TEST_KEY = "0" * 64
+
+
+def _db_returning(row):
+    mock_conn = MagicMock()
+    mock_cur = MagicMock()
+    mock_cur.fetchone.return_value = row
+    mock_conn.__enter__.return_value = mock_conn
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
+    return mock_conn
+
+
+@pytest.fixture
+def encrypted_row():
+    svc = EncryptionService(key_hex=TEST_KEY)
+    return (svc.encrypt("testuser"), svc.encrypt("secret-token"), None)
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_client_per_user():
+    pool = BeeminderClientPool(max_size=4)
+    a1 = pool.get("user-a")
+    assert pool.get("user-a") is a1
+    assert pool.get("user-b") is not a1
+    assert pool.stats()["hits"] == 1
+    assert pool.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_closes_least_recent_client():
+    pool = BeeminderClientPool(max_size=2)
+    a = pool.get("user-a")
+    a.close = AsyncMock()
+    b = pool.get("user-b")
+    b.close = AsyncMock()
+    pool.get("user-a")  # refresh a; b is now least recent
+    pool.get("user-c")
+    await asyncio.sleep(0)
+
+    b.close.assert_awaited_once()
+    a.close.assert_not_awaited()
+    assert pool.stats()["evictions"] == 1
+    assert pool.get("user-a") is a
+
+
+@pytest.mark.asyncio
+async def test_credentials_are_cached_across_clients(encrypted_row):
+    tracker = MagicMock()
+    tracker.resolve_user_id.return_value = "user-1"
+    with patch.dict(os.environ, {"NEON_DB_URL": "postgres://fake", "MASTER_ENCRYPTION_KEY": TEST_KEY}), \
+         patch("psycopg2.connect", return_value=_db_returning(encrypted_row)) as connect, \
+         patch("usage_tracker.UsageTracker", return_value=tracker):
+        first = BeeminderClient(user_id="user-1")
+        await first._load_credentials()
+        second = BeeminderClient(user_id="user-1")
+        await second._load_credentials()
+
+    assert connect.call_count == 1
+    assert (second.username, second.auth_token) == ("testuser", "secret-token")
+
+
+@pytest.mark.asyncio
+async def test_evict_drops_clients_and_cached_credentials(encrypted_row):
+    pool = BeeminderClientPool(max_size=4)
+    tracker = MagicMock()
+    tracker.resolve_user_id.return_value = "user-1"
+    with patch.dict(os.environ, {"NEON_DB_URL": "postgres://fake", "MASTER_ENCRYPTION_KEY": TEST_KEY}), \
+         patch("psycopg2.connect", return_value=_db_returning(encrypted_row)) as connect, \
+         patch("usage_tracker.UsageTracker", return_value=tracker):
+        client = pool.get("user-1")
+        await client._load_credentials()
+        assert pool.evict("user-1") == 1
+        assert pool.get("user-1") is not client
+        await pool.get("user-1")._load_credentials()
+
+    assert connect.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_credentials_are_reloaded(monkeypatch):
+    pool = BeeminderClientPool(max_size=4)
+    client = pool.get("user-1")
+    client.username, client.auth_token = "testuser", "secret-token"
+    client.credentials_loaded_at = 0.0
+    monkeypatch.setattr(beeminder_client, "CREDENTIAL_TTL_SECONDS", 1.0)
+
+    assert pool.get("user-1") is client
+    assert client.auth_token is None
+    assert pool.stats()["credential_refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unauthorized_response_invalidates_cached_token():
+    beeminder_client._credential_cache["user-1"] = (float("inf"), "testuser", "stale-token")
+    client = BeeminderClient(user_id="user-1")
+    client.username, client.auth_token = "testuser", "stale-token"
+    client.client.get = AsyncMock(return_value=MagicMock(status_code=401, text="bad_token"))
+
+    with pytest.raises(BeeminderAPIError):
+        await client._api_call("users/testuser/goals.json")
+
+    assert "user-1" not in beeminder_client._credential_cache
+    assert client.auth_token is None
@@ -378,7 +378,7 @@ class TestGetEstimatedCostsDB:
         mock_conn.__exit__ = MagicMock(return_value=False)
         mock_conn.cursor.return_value = mock_cursor
 
-        with patch("billing_reconciliation.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             total, records = r._get_estimated_costs(Provider.ANTHROPIC, target_date, "user1")
 
         assert abs(total - 0.8) < 0.001
@@ -402,7 +402,7 @@ class TestGetEstimatedCostsDB:
         mock_conn.__exit__ = MagicMock(return_value=False)
         mock_conn.cursor.return_value = mock_cursor
 
-        with patch("billing_reconciliation.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             total, records = r._get_estimated_costs(Provider.ANTHROPIC, target_date, "user1")
 
         assert total == 0.0
@@ -430,7 +430,7 @@ class TestUpdateUsageRecordsDB:
         mock_conn.__exit__ = MagicMock(return_value=False)
         mock_conn.cursor.return_value = mock_cursor
 
-        with patch("billing_reconciliation.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             count = r._update_usage_records_with_actual_costs(
                 Provider.ANTHROPIC, target_date, records, 1.5, "user1"
             )
@@ -476,7 +476,7 @@ class TestGetReconciliationSummary:
         mock_cursor = _make_mock_cursor(provider_rows, recent_rows)
         mock_conn = _make_mock_conn(mock_cursor)
 
-        with patch("billing_reconciliation.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             result = r.get_reconciliation_summary(days=7)
 
         assert result["period_days"] == 7
@@ -496,7 +496,7 @@ class TestGetReconciliationSummary:
         mock_cursor = _make_mock_cursor([], [])
         mock_conn = _make_mock_conn(mock_cursor)
 
-        with patch("billing_reconciliation.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             result = r.get_reconciliation_summary(days=3)
 
         assert result["period_days"] == 3
@@ -515,7 +515,7 @@ class TestGetReconciliationSummary:
         mock_cursor = _make_mock_cursor(provider_rows, [])
         mock_conn = _make_mock_conn(mock_cursor)
 
-        with patch("billing_reconciliation.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             result = r.get_reconciliation_summary(days=7)
 
         assert set(result["provider_summary"]) == {"anthropic", "groq"}
@@ -528,7 +528,7 @@ class TestGetReconciliationSummary:
 
     def test_reraises_on_db_exception(self):
         r = _make_reconciler()
-        with patch("billing_reconciliation.psycopg2.connect", side_effect=Exception("conn refused")):
+        with patch("services.neon_pool.psycopg2.connect", side_effect=Exception("conn refused")):
             with pytest.raises(Exception, match="conn refused"):
                 r.get_reconciliation_summary()
 
@@ -539,7 +539,7 @@ class TestGetReconciliationSummary:
         mock_cursor = _make_mock_cursor(provider_rows, recent_rows)
         mock_conn = _make_mock_conn(mock_cursor)
 
-        with patch("billing_reconciliation.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             r.get_reconciliation_summary(days=7, user_id="override_user")
 
         # Both execute calls should use the override user_id
@@ -1,4 +1,5 @@
 """Tests for BudgetGovernor — TDG red phase. Plan: yebyen/mecris#26"""
+import json
 import pytest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
@@ -240,6 +241,62 @@ def test_spend_log_corrupt_file_recovers_gracefully(tmp_path):
     assert gov._total_spent("anthropic_api") == pytest.approx(0.0)
 
 
+def test_spend_journal_appends_instead_of_rewriting(tmp_path):
+    """record_spend() appends one JSONL line per event."""
+    log_path = tmp_path / "spend_log.json"
+    gov = BudgetGovernor(spend_log_path=str(log_path))
+    gov.record_spend("groq", 0.10)
+    gov.record_spend("helix", 0.20)
+
+    lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [(l["seq"], l["bucket"]) for l in lines] == [(1, "groq"), (2, "helix")]
+
+
+def test_spend_journal_compacts_into_snapshot(tmp_path, monkeypatch):
+    """Old events fold into per-bucket totals; the window's events stay replayable."""
+    monkeypatch.setenv("MECRIS_SPEND_JOURNAL_COMPACT_EVERY", "3")
+    log_path = tmp_path / "spend_log.json"
+    gov = BudgetGovernor(spend_log_path=str(log_path))
+    gov._spend_log.append({"bucket": "groq", "cost": 1.00, "ts": datetime.now(timezone.utc) - timedelta(hours=2)})
+    for _ in range(3):
+        gov.record_spend("groq", 0.10)
+
+    assert log_path.read_text() == ""
+    snapshot = json.loads((tmp_path / "spend_log.json.snapshot").read_text())
+    assert snapshot["totals"]["groq"] == pytest.approx(1.00)
+    assert len(snapshot["events"]) == 3
+
+    gov.record_spend("groq", 0.05)
+    restarted = BudgetGovernor(spend_log_path=str(log_path))
+    assert restarted._total_spent("groq") == pytest.approx(1.35)
+    assert restarted._window_spent("groq") == pytest.approx(0.35)
+
+
+def test_journal_lines_already_in_snapshot_are_not_replayed(tmp_path):
+    """A crash between writing the snapshot and truncating the journal must not double count."""
+    log_path = tmp_path / "spend_log.json"
+    gov = BudgetGovernor(spend_log_path=str(log_path))
+    gov.record_spend("groq", 0.10)
+    journal = log_path.read_text()
+    gov._compact()
+    log_path.write_text(journal)  # simulate the truncate never happening
+
+    restarted = BudgetGovernor(spend_log_path=str(log_path))
+    assert restarted._total_spent("groq") == pytest.approx(0.10)
+
+
+def test_legacy_json_array_log_is_migrated(tmp_path):
+    """A pre-journal JSON array log is loaded and compacted into the new layout."""
+    log_path = tmp_path / "spend_log.json"
+    old_ts = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    log_path.write_text(json.dumps([{"bucket": "anthropic_api", "cost": 0.42, "ts": old_ts}]))
+
+    gov = BudgetGovernor(spend_log_path=str(log_path))
+    assert gov._total_spent("anthropic_api") == pytest.approx(0.42)
+    assert log_path.read_text() == ""
+    assert BudgetGovernor(spend_log_path=str(log_path))._total_spent("anthropic_api") == pytest.approx(0.42)
+
+
 # ---------------------------------------------------------------------------
 # budget_gate — enforcement guard for MCP handlers (plan: yebyen/mecris#31)
 # ---------------------------------------------------------------------------
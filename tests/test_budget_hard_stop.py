@@ -6,7 +6,7 @@ from virtual_budget_manager import VirtualBudgetManager, Provider
 @pytest.fixture
 def mock_psycopg2():
     with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake"}):
-        with patch("virtual_budget_manager.psycopg2.connect") as mock_connect:
+        with patch("services.neon_pool.psycopg2.connect") as mock_connect:
             mock_conn = MagicMock()
             mock_cur = MagicMock()
 
@@ -0,0 +1,121 @@
+"""Tests for services/cache.py: bounded TTL+LRU caches, counters and user invalidation."""
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services import cache as cache_module
+from services.cache import TTLCache, get_cache, invalidate_user, register_invalidation_hook
+
+
+def test_get_set_and_hit_counters():
+    cache = TTLCache("t", max_size=4, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_expired_entry_is_a_miss_but_still_available_stale():
+    cache = TTLCache("t", max_size=4, ttl=60)
+    cache.set("a", "old", ttl=-1)
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get_stale("a") == "old"
+    assert cache.stats()["expired"] == 1
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache("t", max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # b is now least recent
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_evicted_before_live_ones():
+    cache = TTLCache("t", max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=-1)
+    cache.set("c", 3)
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_invalidate_user_matches_plain_tuple_and_prefixed_keys():
+    cache = TTLCache("t", max_size=8, ttl=60)
+    for key in ("u1", ("u1", "x"), "u1:bike:2026-01-01", "u10:bike:2026-01-01", "u2"):
+        cache.set(key, True)
+    assert cache.invalidate_user("u1") == 3
+    assert "u10:bike:2026-01-01" in cache and "u2" in cache
+    assert cache.stats()["invalidations"] == 3
+
+
+def test_registry_applies_env_overrides(monkeypatch):
+    monkeypatch.setenv("MECRIS_CACHE_TTL_ENV_TEST", "5")
+    monkeypatch.setenv("MECRIS_CACHE_MAX_ENV_TEST", "3")
+    monkeypatch.delitem(cache_module._registry, "env_test", raising=False)
+    cache = get_cache("env_test", max_size=100, ttl=100)
+    assert (cache.ttl, cache.max_size) == (5.0, 3)
+    assert get_cache("env_test") is cache
+
+
+def test_invalidate_user_scopes_namespaces_and_runs_hooks(monkeypatch):
+    hook = MagicMock()
+    monkeypatch.setattr(cache_module, "_invalidation_hooks", [hook])
+    a = get_cache("scope_a")
+    b = get_cache("scope_b")
+    a.set("u1:x", 1)
+    b.set("u1:x", 1)
+
+    assert invalidate_user("u1", namespaces=("scope_a",), reason="test") == 1
+    assert "u1:x" not in a and "u1:x" in b
+    hook.assert_called_once_with("u1", "test")
+
+    assert invalidate_user("u1", namespaces=(), reason="notify") == 0
+    assert hook.call_count == 2
+
+
+def test_failing_hook_does_not_block_invalidation(monkeypatch):
+    good = MagicMock()
+    monkeypatch.setattr(cache_module, "_invalidation_hooks", [])
+    register_invalidation_hook(MagicMock(side_effect=RuntimeError("boom")))
+    register_invalidation_hook(good)
+    invalidate_user("u1", reason="test")
+    good.assert_called_once_with("u1", "test")
+
+
+def test_context_cache_subscribes_to_invalidation():
+    from services.context_cache import context_cache
+    assert context_cache.invalidate in cache_module._invalidation_hooks
+
+
+@pytest.mark.asyncio
+async def test_cached_goals_use_shared_cache_and_stale_fallback():
+    sys.modules.pop("mcp_server", None)
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "u1"}), \
+         patch("psycopg2.connect"):
+        import mcp_server
+
+        client = MagicMock()
+        client.get_all_goals = AsyncMock(return_value=[{"slug": "bike"}])
+        tracker = MagicMock()
+        tracker.resolve_user_id.return_value = "u1"
+        with patch("mcp_server.usage_tracker", tracker), \
+             patch("mcp_server.get_user_beeminder_client", return_value=client):
+            assert await mcp_server.get_cached_beeminder_goals("u1") == [{"slug": "bike"}]
+            assert await mcp_server.get_cached_beeminder_goals("u1") == [{"slug": "bike"}]
+            assert client.get_all_goals.await_count == 1
+
+            mcp_server.beeminder_goals_cache.set("u1", [{"slug": "old"}], ttl=-1)
+            client.get_all_goals.side_effect = RuntimeError("beeminder down")
+            assert await mcp_server.get_cached_beeminder_goals("u1") == [{"slug": "old"}]
+
+        stats = mcp_server.get_cache_stats()
+    assert stats["caches"]["beeminder_goals"]["hits"] >= 1
+    assert {"context_cache", "singleflight", "beeminder_pool", "neon_pool"} <= set(stats)
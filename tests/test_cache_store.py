@@ -0,0 +1,150 @@
+"""Tests for services/cache_store.py: write-behind persistence of services/cache.py namespaces."""
+import time
+
+import pytest
+
+from services import cache as cache_module
+from services import cache_store
+from services.cache import TTLCache, get_cache
+from services.cache_store import CacheStore, WriteBehind
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = CacheStore(str(tmp_path / "cache.db"))
+    yield s
+    s.close()
+
+
+def _writer(store):
+    # Huge interval: tests flush explicitly instead of racing the thread
+    return WriteBehind(store, interval=3600)
+
+
+def test_entries_survive_restart_with_original_expiry(store):
+    first = TTLCache("goals", ttl=60)
+    writer = _writer(store)
+    writer.attach(first)
+    first.set("u1", [{"slug": "bike"}])
+    first.set(("41.6", "-86.2"), {"temperature": 70}, ttl=30)
+    assert writer.flush() == 2
+
+    second = TTLCache("goals", ttl=60)
+    assert _writer(store).attach(second) == 2
+    assert second.get("u1") == [{"slug": "bike"}]
+    assert second.get(("41.6", "-86.2")) == {"temperature": 70}
+    remaining = second._data[("41.6", "-86.2")][0] - time.monotonic()
+    assert 25 < remaining <= 30
+
+
+def test_invalidations_are_persisted_as_deletes(store):
+    first = TTLCache("activity", ttl=60)
+    writer = _writer(store)
+    writer.attach(first)
+    first.set("u1:bike:2026-01-01", {"has_activity_today": True})
+    first.set("u2:bike:2026-01-01", {"has_activity_today": False})
+    writer.flush()
+    first.invalidate_user("u1")
+    writer.flush()
+
+    second = TTLCache("activity", ttl=60)
+    _writer(store).attach(second)
+    assert "u1:bike:2026-01-01" not in second
+    assert "u2:bike:2026-01-01" in second
+
+
+def test_expired_rows_are_not_restored(store):
+    store.write("ns", {"k": (time.time() - 1, "old")}, [])
+    cache = TTLCache("ns", ttl=60)
+    assert _writer(store).attach(cache) == 0
+
+
+def test_unserialisable_values_stay_memory_only(store):
+    cache = TTLCache("ns", ttl=60)
+    writer = _writer(store)
+    writer.attach(cache)
+    cache.set("ok", {"n": 1})
+    cache.set("bad", {1, 2})
+    writer.flush()
+    assert [key for key, _, _ in store.load("ns")] == ["ok"]
+
+
+def test_clear_wipes_namespace_on_disk(store):
+    cache = TTLCache("ns", ttl=60)
+    writer = _writer(store)
+    writer.attach(cache)
+    cache.set("k", 1)
+    writer.flush()
+    cache.clear()
+    writer.flush()
+    assert store.load("ns") == []
+
+
+def test_get_cache_persist_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache_store, "_writer", None)
+    monkeypatch.delitem(cache_module._registry, "persist_off", raising=False)
+    assert get_cache("persist_off", persist=True).stats()["persisted"] is False
+
+    monkeypatch.setenv("MECRIS_CACHE_PERSIST", "true")
+    monkeypatch.setenv("MECRIS_CACHE_DB_PATH", str(tmp_path / "warm.db"))
+    monkeypatch.setattr(cache_store.atexit, "register", lambda fn: None)
+    monkeypatch.delitem(cache_module._registry, "persist_on", raising=False)
+    cache = get_cache("persist_on", persist=True)
+    try:
+        assert cache.stats()["persisted"] is True
+        cache.set("u1", [1, 2])
+        assert cache_store.flush_persistent_caches() == 1
+        assert cache_store.persistence_stats()["rows_written"] == 1
+    finally:
+        cache_store._writer._stop.set()
+        cache_store._writer.store.close()
+
+
+@pytest.fixture
+def shared_pair(tmp_path):
+    # Two handles on one WAL file stand in for two local processes
+    path = str(tmp_path / "shared.db")
+    stores = [CacheStore(path, wal=True), CacheStore(path, wal=True)]
+    caches = []
+    for store in stores:
+        cache = TTLCache("beeminder_goals", ttl=60)
+        cache.attach_shared(store, l1_ttl=0)
+        caches.append(cache)
+    yield caches
+    for store in stores:
+        store.close()
+
+
+def test_shared_backend_serves_other_process_writes(shared_pair):
+    a, b = shared_pair
+    a.set("u1", [{"slug": "bike"}])
+    assert b.get("u1") == [{"slug": "bike"}]
+    assert b.stats()["shared_hits"] == 1
+
+
+def test_shared_backend_expiry_is_checked_in_the_read(shared_pair):
+    a, b = shared_pair
+    a.set("u1", "old", ttl=-1)
+    assert b.get("u1") is None
+    assert b.get_stale("u1") == "old"
+
+
+def test_shared_invalidation_reaches_rows_never_read_locally(shared_pair):
+    a, b = shared_pair
+    a.set("u1", [1])
+    a.set(("u1", "x"), [2])
+    a.set("u1:bike:2026-01-01", [3])
+    a.set("u10:bike:2026-01-01", [4])
+    b.invalidate_user("u1")
+    assert a.get("u1") is None and a.get(("u1", "x")) is None and a.get("u1:bike:2026-01-01") is None
+    assert a.get("u10:bike:2026-01-01") == [4]
+
+
+def test_shared_store_failure_degrades_to_local_miss(tmp_path):
+    store = CacheStore(str(tmp_path / "shared.db"), wal=True)
+    cache = TTLCache("ns", ttl=60)
+    cache.attach_shared(store, l1_ttl=5)
+    store.close()
+    cache.set("k", 1)
+    assert cache.get("k") == 1
+    assert cache.get("missing") is None
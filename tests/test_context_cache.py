@@ -0,0 +1,188 @@
+"""
+Tests for services/context_cache.py — event-invalidated narrator context cache
+with stale-while-revalidate, and its pg_notify wiring in walk_cache_listener.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from services import walk_cache_listener
+from services.context_cache import ContextCache
+
+
+@pytest.fixture(autouse=True)
+def enable_context_cache(monkeypatch):
+    monkeypatch.setenv("MECRIS_CONTEXT_CACHE", "true")
+
+
+def _builder(*values, delay=0):
+    """Async builder returning successive values; records how often it ran."""
+    calls = []
+
+    async def build():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return values[min(len(calls), len(values)) - 1]
+
+    build.calls = calls
+    return build
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_a_memory_read():
+    cache = ContextCache(soft_ttl=60, max_stale=600)
+    build = _builder({"v": 1})
+    assert await cache.get("narrator", "u1", build) == {"v": 1}
+    assert await cache.get("narrator", "u1", build) == {"v": 1}
+    assert len(build.calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing_in_background():
+    cache = ContextCache(soft_ttl=0, max_stale=600)
+    build = _builder({"v": 1}, {"v": 2}, delay=0.01)
+    assert await cache.get("narrator", "u1", build) == {"v": 1}
+
+    # Past the soft TTL: old copy returned immediately, one refresh scheduled
+    assert await cache.get("narrator", "u1", build) == {"v": 1}
+    assert await cache.get("narrator", "u1", build) == {"v": 1}
+    await asyncio.sleep(0.05)
+    assert len(build.calls) == 2
+    assert cache.stats()["refreshes"] == 1
+
+    cache.soft_ttl = 60
+    assert await cache.get("narrator", "u1", build) == {"v": 2}
+
+
+@pytest.mark.asyncio
+async def test_invalidation_forces_inline_rebuild_for_that_user_only():
+    cache = ContextCache(soft_ttl=60, max_stale=600)
+    build = _builder({"v": 1}, {"v": 2})
+    other = _builder({"other": True})
+    await cache.get("narrator", "u1", build)
+    await cache.get("daily_aggregate", "u2", other)
+
+    cache.invalidate("u1", reason="walk_inferences_change")
+
+    assert await cache.get("narrator", "u1", build) == {"v": 2}
+    assert await cache.get("daily_aggregate", "u2", other) == {"other": True}
+    assert len(other.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_build_racing_an_invalidation_is_not_stored():
+    cache = ContextCache(soft_ttl=60, max_stale=600)
+    build = _builder({"v": "old"}, {"v": "new"}, delay=0.05)
+    pending = asyncio.ensure_future(cache.get("narrator", "u1", build))
+    await asyncio.sleep(0.01)
+    cache.invalidate("u1")
+    assert await pending == {"v": "old"}
+
+    assert await cache.get("narrator", "u1", build) == {"v": "new"}
+    assert cache.stats()["discarded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_build():
+    cache = ContextCache(soft_ttl=60, max_stale=600)
+    build = _builder({"v": 1}, delay=0.05)
+    results = await asyncio.gather(*(cache.get("narrator", "u1", build) for _ in range(5)))
+    assert len(build.calls) == 1
+    assert all(r == {"v": 1} for r in results)
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached_and_degraded_results_refresh_next_read():
+    cache = ContextCache(soft_ttl=60, max_stale=600)
+    failing = _builder({"error": "neon down"}, {"v": 1})
+    assert "error" in await cache.get("narrator", "u1", failing)
+    assert await cache.get("narrator", "u1", failing) == {"v": 1}
+
+    degraded = _builder({"degraded_sources": {"weather": "timeout"}}, {"degraded_sources": {}})
+    await cache.get("narrator", "u2", degraded)
+    await cache.get("narrator", "u2", degraded)  # stale hit -> background refresh
+    await asyncio.sleep(0.01)
+    assert len(degraded.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_allow_stale_false_rebuilds_inline_past_the_soft_ttl():
+    cache = ContextCache(soft_ttl=0, max_stale=600)
+    build = _builder({"walked": False}, {"walked": True})
+    await cache.get("narrator", "u1", build)
+    assert await cache.get("narrator", "u1", build, allow_stale=False) == {"walked": True}
+    assert cache.stats()["stale_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reminder_context_never_takes_a_stale_copy():
+    import os
+    import sys
+    from unittest.mock import AsyncMock
+    sys.modules.pop("mcp_server", None)
+    with patch.dict(os.environ, {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}), \
+         patch("psycopg2.connect"):
+        import mcp_server
+        with patch.object(mcp_server, "resolve_target_user", return_value="test-user"), \
+             patch.object(mcp_server, "_record_presence", AsyncMock()), \
+             patch.object(mcp_server.context_cache, "get", AsyncMock(return_value={})) as get:
+            await mcp_server._reminder_context("test-user")
+            await mcp_server.get_narrator_context("test-user")
+    assert get.await_args_list[0].kwargs["allow_stale"] is False
+    assert get.await_args_list[1].kwargs["allow_stale"] is True
+
+
+@pytest.mark.asyncio
+async def test_entries_are_capped_least_recently_used_first():
+    cache = ContextCache(soft_ttl=60, max_stale=600, max_entries=2)
+    await cache.get("narrator", "u1", _builder({"v": 1}))
+    await cache.get("narrator", "u2", _builder({"v": 2}))
+    await cache.get("narrator", "u1", _builder({"v": "unused"}))  # u1 is now the most recent
+    await cache.get("narrator", "u3", _builder({"v": 3}))
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert list(cache._entries) == [("narrator", "u1"), ("narrator", "u3")]
+    rebuild = _builder({"v": 22})
+    assert await cache.get("narrator", "u2", rebuild) == {"v": 22}
+    assert len(rebuild.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_builds(monkeypatch):
+    monkeypatch.setenv("MECRIS_CONTEXT_CACHE", "false")
+    cache = ContextCache(soft_ttl=60, max_stale=600)
+    build = _builder({"v": 1})
+    await cache.get("narrator", "u1", build)
+    await cache.get("narrator", "u1", build)
+    assert len(build.calls) == 2
+
+
+@pytest.mark.parametrize("channel", ["walk_inferences_change", "language_stats_change", "message_log_change", "budget_tracking_change"])
+def test_listener_channels_invalidate_context(channel):
+    assert channel in walk_cache_listener.CHANNELS
+    callback = walk_cache_listener.CHANNELS[channel]
+    with patch.object(walk_cache_listener, "invalidate_user") as invalidate:
+        callback(None, 1, channel, json.dumps({"user_id": "u1", "op": "UPDATE"}))
+    invalidate.assert_called_once_with("u1", namespaces=(), reason=channel)
+
+
+def test_walk_notification_folds_into_cached_histogram():
+    from services.cache import get_cache
+    from services.smart_nag import WalkHistogram
+    from services.timezone_service import today_eastern
+
+    key = f"u1:walk_histogram:{today_eastern().isoformat()}"
+    histogram = WalkHistogram()
+    get_cache("walk_histogram").set(key, histogram)
+    payload = {"user_id": "u1", "op": "INSERT", "start_time": "2026-04-21T14:05:00+00:00"}
+    walk_cache_listener._on_walk_change(None, 1, "walk_inferences_change", json.dumps(payload))
+    assert list(histogram.day_masks.values()) == [1 << 10]  # binned by the Eastern (EDT) hour
+
+    # Notifications without start_time (older trigger) drop the entry instead
+    walk_cache_listener._on_walk_change(None, 1, "walk_inferences_change", json.dumps({"user_id": "u1", "op": "UPDATE"}))
+    assert get_cache("walk_histogram").get(key) is None
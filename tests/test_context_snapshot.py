@@ -0,0 +1,142 @@
+"""
+Tests for services/context_snapshot.py — per-tick memoization of context providers.
+
+Within one reminder evaluation every provider is fetched at most once; the
+snapshot logs how many duplicate fetches it saved.
+"""
+
+import asyncio
+import logging
+import sys
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import pytest
+
+from services.context_snapshot import context_snapshot, current_snapshot, snapshot_cached
+
+
+def _counting_provider(name, value=None, delay=0):
+    calls = []
+
+    @snapshot_cached(name)
+    async def provider(user_id: str = None):
+        calls.append(user_id)
+        await asyncio.sleep(delay)
+        return value if value is not None else {"user": user_id}
+
+    return provider, calls
+
+
+@pytest.mark.asyncio
+async def test_provider_is_fetched_once_per_snapshot():
+    provider, calls = _counting_provider("stats")
+    with context_snapshot("tick") as snap:
+        first = await provider("u1")
+        second = await provider(user_id="u1")
+        await provider("u2")
+
+    assert first is second
+    assert calls == ["u1", "u2"]
+    assert snap.stats()["fetches"] == 2
+    assert snap.stats()["duplicate_fetches_saved"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_snapshot_is_a_pass_through():
+    provider, calls = _counting_provider("stats")
+    await provider("u1")
+    await provider("u1")
+    assert calls == ["u1", "u1"]
+    assert current_snapshot() is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_in_flight_fetch():
+    provider, calls = _counting_provider("slow", delay=0.05)
+    with context_snapshot("tick"):
+        results = await asyncio.gather(provider("u1"), provider("u1"), provider("u1"))
+    assert calls == ["u1"]
+    assert results[0] is results[1] is results[2]
+
+
+@pytest.mark.asyncio
+async def test_caller_timeout_does_not_cancel_shared_fetch():
+    provider, calls = _counting_provider("slow", value={"ok": True}, delay=0.1)
+    with context_snapshot("tick"):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(provider("u1"), timeout=0.01)
+        assert await provider("u1") == {"ok": True}
+    assert calls == ["u1"]
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_retried():
+    attempts = []
+
+    @snapshot_cached("flaky")
+    async def flaky(user_id: str = None):
+        attempts.append(user_id)
+        if len(attempts) == 1:
+            raise RuntimeError("neon down")
+        return "ok"
+
+    with context_snapshot("tick"):
+        with pytest.raises(RuntimeError):
+            await flaky("u1")
+        assert await flaky("u1") == "ok"
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshot_follows_spawned_tasks_and_logs_savings(caplog):
+    provider, calls = _counting_provider("stats")
+    with caplog.at_level(logging.INFO, logger="mecris.services.context_snapshot"):
+        with context_snapshot("reminder:u1"):
+            await provider("u1")
+            await asyncio.ensure_future(provider("u1"))
+    assert calls == ["u1"]
+    assert "saved 1 duplicate fetches (statsx1)" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_reminder_tick_builds_narrator_context_once():
+    """Coaching's context provider and the velocity provider reuse the tick's fetches."""
+    sys.modules.pop("mcp_server", None)
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}), \
+         patch("psycopg2.connect"):
+        import mcp_server
+
+        narrator_calls = []
+        velocity_calls = []
+
+        async def _narrator_body(user_id=None):
+            narrator_calls.append(user_id)
+            await mcp_server.get_language_velocity_stats(user_id)
+            return {"daily_walk_status": {}, "vacation_mode": False}
+
+        async def _velocity_body(user_id=None):
+            velocity_calls.append(user_id)
+            return {}
+
+        narrator = snapshot_cached("narrator_context")(_narrator_body)
+        velocity = snapshot_cached("language_velocity_stats")(_velocity_body)
+
+        async def _check(user_id):
+            ctx = await mcp_server.get_narrator_context(user_id)
+            coaching_ctx = await mcp_server.get_narrator_context(user_id)
+            await mcp_server.get_language_velocity_stats(user_id)
+            assert ctx is coaching_ctx
+            return {"should_send": False, "reason": "nothing to do"}
+
+        reminder_service = MagicMock()
+        reminder_service.check_reminder_needed = AsyncMock(side_effect=_check)
+        with patch("mcp_server.resolve_target_user", return_value="test-user"), \
+             patch("mcp_server.get_narrator_context", narrator), \
+             patch("mcp_server.get_language_velocity_stats", velocity), \
+             patch("mcp_server.reminder_service", reminder_service), \
+             patch("mcp_server.scheduler"):
+            result = await mcp_server.trigger_reminder_check("test-user")
+
+    assert result == {"triggered": False, "reason": "nothing to do"}
+    assert narrator_calls == ["test-user"]
+    assert velocity_calls == ["test-user"]
@@ -0,0 +1,191 @@
+"""Async outbound delivery: worker pool, retries with backoff, queued message_log rows, reused Twilio client."""
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services.delivery_queue import DeliveryQueue
+
+
+def _flaky(*results):
+    """send() that returns each result in turn (raising any exception given)."""
+    calls = []
+
+    def send():
+        result = results[min(len(calls), len(results) - 1)]
+        calls.append(1)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    send.calls = calls
+    return send
+
+
+@pytest.mark.asyncio
+async def test_failed_send_is_retried_until_it_succeeds():
+    outcomes = []
+
+    async def on_done(result):
+        outcomes.append(result)
+
+    q = DeliveryQueue(workers=1, max_attempts=3, backoff=0)
+    send = _flaky(ConnectionError("connection refused"), {"sent": False}, {"sent": True, "method": "sms"})
+    await q.enqueue(send, on_done, label="walk:u1")
+    assert await q.drain(timeout=5)
+
+    assert len(send.calls) == 3
+    assert outcomes[0]["sent"] is True
+    assert outcomes[0]["attempts"] == 3
+    assert q.stats()["retries"] == 2
+    assert q.stats()["delivered"] == 1
+    await q.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts():
+    outcomes = []
+
+    async def on_done(result):
+        outcomes.append(result)
+
+    q = DeliveryQueue(workers=1, max_attempts=2, backoff=0)
+    send = _flaky({"sent": False})
+    await q.enqueue(send, on_done)
+    await q.drain(timeout=5)
+
+    assert len(send.calls) == 2
+    assert outcomes[0]["sent"] is False
+    assert q.stats()["failed"] == 1
+    await q.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_not_retried():
+    """Twilio may have accepted a message whose response timed out; resending would duplicate it."""
+    from requests.exceptions import ReadTimeout
+    outcomes = []
+
+    async def on_done(result):
+        outcomes.append(result)
+
+    q = DeliveryQueue(workers=1, max_attempts=3, backoff=0)
+    send = _flaky(ReadTimeout("read timed out"), {"sent": True})
+    await q.enqueue(send, on_done)
+    await q.drain(timeout=5)
+
+    assert len(send.calls) == 1
+    assert outcomes[0]["sent"] is False
+    assert q.stats()["retries"] == 0
+    await q.shutdown()
+
+
+def test_template_send_raises_only_when_twilio_may_have_the_message():
+    import twilio_sender
+    from requests.exceptions import ReadTimeout
+    env = {"TWILIO_ACCOUNT_SID": "AC1", "TWILIO_AUTH_TOKEN": "tok", "TWILIO_WHATSAPP_FROM": "whatsapp:+1"}
+    with patch.dict(os.environ, env), patch("twilio_sender.Client") as mock_client:
+        create = mock_client.return_value.messages.create
+        unavailable = Exception("HTTP 503 unavailable")
+        unavailable.status = 503  # as on TwilioRestException
+        create.side_effect = unavailable
+        assert twilio_sender.send_whatsapp_template("HX1", {}, to_number="+2", raise_errors=True) is False
+        create.side_effect = ReadTimeout("read timed out")
+        with pytest.raises(ReadTimeout):
+            twilio_sender.send_whatsapp_template("HX1", {}, to_number="+2", raise_errors=True)
+        assert twilio_sender.send_whatsapp_template("HX1", {}, to_number="+2") is False
+
+
+@pytest.mark.asyncio
+async def test_notification_prefs_update_drops_cached_prefs():
+    import twilio_sender
+    sys.modules.pop("mcp_server", None)
+    with patch.dict(os.environ, {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}), \
+         patch("psycopg2.connect"):
+        import mcp_server
+        twilio_sender._prefs_cache().set("test-user", {"notification_prefs": {"vacation_mode": False}})
+        with patch.object(mcp_server.neon_checker, "update_notification_prefs", return_value=True), \
+             patch.object(mcp_server.usage_tracker, "resolve_user_id", return_value="test-user"):
+            result = await mcp_server.set_notification_prefs(vacation_mode=True, user_id="test-user")
+    assert result["status"] == "success"
+    assert twilio_sender._prefs_cache().get("test-user") is None
+
+
+@pytest.mark.asyncio
+async def test_workers_deliver_concurrently_and_report_latency():
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def send():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return {"sent": True}
+
+    q = DeliveryQueue(workers=3, max_attempts=1, backoff=0)
+    for _ in range(6):
+        await q.enqueue(send)
+    assert await q.drain(timeout=5)
+
+    stats = q.stats()
+    assert peak == 3
+    assert stats["delivered"] == 6
+    assert stats["queued"] == 0
+    assert stats["latency_p95_s"] >= stats["latency_p50_s"] > 0
+    await q.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_send_reminder_message_queues_and_records_outcome(monkeypatch):
+    monkeypatch.setenv("MECRIS_DELIVERY_QUEUE", "true")
+    sys.modules.pop("mcp_server", None)
+    with patch.dict(os.environ, {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}), \
+         patch("psycopg2.connect") as mock_connect:
+        import mcp_server
+        mock_cur = mock_connect.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+        mock_cur.fetchone.return_value = (42,)
+
+        with patch.object(mcp_server, "smart_send_message", return_value={"sent": True, "method": "sms"}):
+            result = await mcp_server.send_reminder_message({"type": "walk_reminder", "message": "Walk!"}, user_id="test-user")
+            assert result["queued"] is True
+            assert result["delivery_id"].startswith("dlv-")
+            assert await mcp_server.get_delivery_queue().drain(timeout=5)
+
+        insert = next(c for c in mock_cur.execute.call_args_list if c.args[0].startswith("INSERT INTO message_log"))
+        assert insert.args[1][4] == "queued"
+        update = next(c for c in mock_cur.execute.call_args_list if c.args[0].startswith("UPDATE message_log"))
+        assert update.args[1] == ("sent", None, 42)
+        await mcp_server.shutdown_delivery_queues()
+
+
+def test_twilio_client_is_reused_across_sends():
+    import twilio_sender
+    with patch.dict(os.environ, {"TWILIO_ACCOUNT_SID": "AC1", "TWILIO_AUTH_TOKEN": "tok"}), \
+         patch("twilio_sender.Client") as mock_client:
+        first = twilio_sender.get_client("AC1", "tok")
+        second = twilio_sender.get_client("AC1", "tok")
+    assert first is second
+    mock_client.assert_called_once_with("AC1", "tok")
+
+
+def test_template_pool_is_read_once_until_file_changes(tmp_path):
+    import twilio_sender
+    pool_path = tmp_path / "approved_templates.json"
+    pool_path.write_text(json.dumps({"HX1": {"name": "walk"}}))
+
+    real_open = open
+    with patch("builtins.open", side_effect=real_open) as spy:
+        assert twilio_sender._load_template_pool(str(pool_path)) == {"HX1": {"name": "walk"}}
+        assert twilio_sender._load_template_pool(str(pool_path)) == {"HX1": {"name": "walk"}}
+    assert spy.call_count == 1
+
+    pool_path.write_text(json.dumps({"HX2": {}}))
+    os.utime(pool_path, (0, 12345))
+    assert twilio_sender._load_template_pool(str(pool_path)) == {"HX2": {}}
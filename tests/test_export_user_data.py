@@ -51,7 +51,8 @@ def _make_cursor_with_tables(user_row, table_rows=None):
 # export_user_data — happy path
 # ---------------------------------------------------------------------------
 
-def test_export_user_data_returns_all_tables():
+@pytest.mark.asyncio
+async def test_export_user_data_returns_all_tables():
     """Happy path: exported=True, data dict has all 6 table keys."""
     sys.modules.pop("mcp_server", None)
 
@@ -66,7 +67,7 @@ def test_export_user_data_returns_all_tables():
     with env_patch, db_patch as mock_connect:
         mock_connect.return_value = mock_conn
         from mcp_server import export_user_data
-        result = export_user_data(user_id="test-user")
+        result = await export_user_data(user_id="test-user")
 
     assert result["exported"] is True
     assert result["user_id"] == "test-user"
@@ -75,7 +76,8 @@ def test_export_user_data_returns_all_tables():
     assert set(result["data"].keys()) == expected_tables
 
 
-def test_export_user_data_users_table_populated():
+@pytest.mark.asyncio
+async def test_export_user_data_users_table_populated():
     """Happy path: users list contains the user's row."""
     sys.modules.pop("mcp_server", None)
 
@@ -90,7 +92,7 @@ def test_export_user_data_users_table_populated():
     with env_patch, db_patch as mock_connect:
         mock_connect.return_value = mock_conn
         from mcp_server import export_user_data
-        result = export_user_data(user_id="test-user")
+        result = await export_user_data(user_id="test-user")
 
     assert len(result["data"]["users"]) == 1
     assert result["data"]["users"][0]["pocket_id_sub"] == "test-user"
@@ -100,7 +102,8 @@ def test_export_user_data_users_table_populated():
 # export_user_data — unknown user
 # ---------------------------------------------------------------------------
 
-def test_export_user_data_unknown_user_returns_error():
+@pytest.mark.asyncio
+async def test_export_user_data_unknown_user_returns_error():
     """When user does not exist, returns exported=False with error message."""
     sys.modules.pop("mcp_server", None)
 
@@ -121,7 +124,7 @@ def test_export_user_data_unknown_user_returns_error():
     with env_patch, db_patch as mock_connect:
         mock_connect.return_value = mock_conn
         from mcp_server import export_user_data
-        result = export_user_data(user_id="ghost-user")
+        result = await export_user_data(user_id="ghost-user")
 
     assert result["exported"] is False
     assert "not found" in result["error"].lower()
@@ -132,7 +135,8 @@ def test_export_user_data_unknown_user_returns_error():
 # export_user_data — no DB configured
 # ---------------------------------------------------------------------------
 
-def test_export_user_data_no_neon_url():
+@pytest.mark.asyncio
+async def test_export_user_data_no_neon_url():
     """Returns error dict when NEON_DB_URL is not configured at call time."""
     sys.modules.pop("mcp_server", None)
 
@@ -141,7 +145,7 @@ def test_export_user_data_no_neon_url():
     with env_patch, db_patch:
         from mcp_server import export_user_data
         with patch.dict("os.environ", {"NEON_DB_URL": ""}):
-            result = export_user_data(user_id="test-user")
+            result = await export_user_data(user_id="test-user")
 
     assert result["exported"] is False
     assert "neon" in result["error"].lower() or "not configured" in result["error"].lower()
@@ -151,7 +155,8 @@ def test_export_user_data_no_neon_url():
 # export_user_data — default user resolution
 # ---------------------------------------------------------------------------
 
-def test_export_user_data_resolves_default_user_when_none():
+@pytest.mark.asyncio
+async def test_export_user_data_resolves_default_user_when_none():
     """When user_id=None, resolves via usage_tracker.resolve_user_id."""
     sys.modules.pop("mcp_server", None)
 
@@ -168,7 +173,7 @@ def test_export_user_data_resolves_default_user_when_none():
         from mcp_server import export_user_data
         with patch("mcp_server.usage_tracker") as mock_tracker:
             mock_tracker.resolve_user_id.return_value = "resolved-user"
-            result = export_user_data(user_id=None)
+            result = await export_user_data(user_id=None)
 
     mock_tracker.resolve_user_id.assert_called_once_with(None)
     assert result["user_id"] == "resolved-user"
@@ -242,7 +242,7 @@ class TestGetUsageForVirtualBudget:
         mock_conn.__exit__ = MagicMock(return_value=False)
         mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cur)
         mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        with patch("groq_odometer_tracker.psycopg2.connect", return_value=mock_conn), \
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn), \
              patch.object(t, "resolve_user_id", side_effect=lambda x: x or t.user_id):
             result = t.get_usage_for_virtual_budget("test_user")
         assert result["has_data"] is False
@@ -259,7 +259,7 @@ class TestGetUsageForVirtualBudget:
         mock_conn.__exit__ = MagicMock(return_value=False)
         mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cur)
         mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
-        with patch("groq_odometer_tracker.psycopg2.connect", return_value=mock_conn), \
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn), \
              patch("groq_odometer_tracker.datetime") as mock_dt, \
              patch.object(t, "resolve_user_id", side_effect=lambda x: x or t.user_id):
             mock_dt.now.return_value = now
@@ -79,6 +79,7 @@ def test_score_delta_backup_detection_updates_daily_completions():
 
     mock_beeminder = MagicMock()
     service = LanguageSyncService(mock_beeminder)
+    service.neon_url = "postgres://fake"
 
     # Simulate: last_points=500, current points=600 → delta=100; no upstream "today" data
     scraper_data = {
@@ -108,7 +109,7 @@ def test_score_delta_backup_detection_updates_daily_completions():
     mock_conn.__enter__ = lambda s: mock_conn
     mock_conn.__exit__ = MagicMock(return_value=False)
 
-    with patch("psycopg2.connect", return_value=mock_conn):
+    with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
         service._update_neon_db(scraper_data, goal_map, summary, "test_user")
 
     # Find the INSERT call
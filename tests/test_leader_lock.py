@@ -0,0 +1,167 @@
+"""Advisory-lock leader election: one persistent connection, NOTIFY wake-ups, immediate demotion on connection loss."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.leader_lock import LEADER_CHANNEL, AdvisoryLeaderLock, lock_key
+
+
+def _fake_conn(lock_free=True):
+    conn = MagicMock()
+    conn.is_closed.return_value = False
+    conn.fetchval = AsyncMock(return_value=lock_free)
+    conn.execute = AsyncMock(return_value="UPDATE 1")
+    conn.add_listener = AsyncMock()
+    conn.close = AsyncMock()
+    return conn
+
+
+async def _connected_lock(conn, **kwargs):
+    lock = AdvisoryLeaderLock("postgres://fake", "u1", **kwargs)
+    with patch("services.leader_lock.asyncpg.connect", AsyncMock(return_value=conn)) as connect:
+        await lock.connect()
+    connect.assert_awaited_once_with("postgresql://fake")
+    return lock
+
+
+def test_lock_key_is_stable_per_user():
+    assert lock_key("u1") == lock_key("u1")
+    assert lock_key("u1") != lock_key("u2")
+    assert -2**63 <= lock_key("u1") < 2**63
+
+
+@pytest.mark.asyncio
+async def test_acquire_and_release_notifies_standbys():
+    conn = _fake_conn()
+    lock = await _connected_lock(conn)
+    conn.add_listener.assert_awaited_once_with(LEADER_CHANNEL, lock._on_notify)
+
+    assert await lock.try_acquire() is True
+    assert conn.fetchval.await_args.args == ("SELECT pg_try_advisory_lock($1)", lock_key("u1"))
+
+    await lock.release()
+    statements = [c.args[0] for c in conn.execute.await_args_list]
+    assert statements == ["SELECT pg_advisory_unlock($1)", "SELECT pg_notify($1, $2)"]
+    assert conn.execute.await_args_list[1].args[1:] == (LEADER_CHANNEL, "u1")
+    conn.close.assert_awaited_once()
+    assert lock.held is False and lock.conn is None
+
+
+@pytest.mark.asyncio
+async def test_standby_wakes_on_notify_for_its_user_only():
+    lock = await _connected_lock(_fake_conn(lock_free=False), retry_seconds=5)
+    assert await lock.try_acquire() is False
+
+    waiter = asyncio.create_task(lock.wait())
+    lock._on_notify(lock.conn, 1, LEADER_CHANNEL, "someone-else")
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    lock._on_notify(lock.conn, 1, LEADER_CHANNEL, "u1")
+    await asyncio.wait_for(waiter, 1)
+
+
+@pytest.mark.asyncio
+async def test_connection_loss_drops_the_lock_and_wakes_the_leader():
+    lock = await _connected_lock(_fake_conn(), heartbeat_seconds=5)
+    await lock.try_acquire()
+
+    waiter = asyncio.create_task(lock.wait())
+    await asyncio.sleep(0)
+    lock._on_terminated(lock.conn)
+    await asyncio.wait_for(waiter, 1)
+    assert lock.held is False
+
+
+class _ScriptedLock:
+    """Stands in for AdvisoryLeaderLock; each wait() runs the next step of a script."""
+
+    def __init__(self, scheduler, steps):
+        self.scheduler, self.steps = scheduler, list(steps)
+        self.held = False
+        self.connected = False
+        self.released = 0
+        self.executed = []
+
+    async def connect(self):
+        self.connected = True
+
+    async def try_acquire(self):
+        self.held = True
+        return True
+
+    async def execute(self, query, *args):
+        self.executed.append(query)
+
+    async def wait(self):
+        if self.steps:
+            self.steps.pop(0)(self)
+        else:
+            self.scheduler.running = False
+
+    async def release(self):
+        self.released += 1
+        self.held, self.connected = False, False
+
+
+@pytest.fixture
+def advisory_scheduler(monkeypatch):
+    monkeypatch.setenv("MECRIS_LEADER_ELECTION", "advisory")
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}):
+        from scheduler import MecrisScheduler
+        s = MecrisScheduler(user_id="test-user")
+    s.scheduler = MagicMock()
+    s.running = True
+    s._has_obs_columns = True
+    return s
+
+
+@pytest.mark.asyncio
+async def test_advisory_election_leads_until_connection_is_lost(advisory_scheduler):
+    s = advisory_scheduler
+    observed = []
+
+    def lose_connection(lock):
+        observed.append(s.is_leader)
+        lock.held = lock.connected = False
+
+    def stop(lock):
+        observed.append(s.is_leader)
+        s.running = False
+
+    lock = _ScriptedLock(s, [lose_connection, stop])
+    with patch("scheduler.AdvisoryLeaderLock", return_value=lock), \
+         patch.object(s, "_start_leader_jobs", AsyncMock()) as start, \
+         patch.object(s, "_stop_leader_jobs") as stop_jobs, \
+         patch("scheduler.asyncio.sleep", AsyncMock()):
+        await s._election_loop()
+
+    # Leader first; after the drop it is demoted, then re-elected on a fresh connection
+    assert observed == [True, True]
+    stop_jobs.assert_called_once()
+    assert start.await_count == 2
+    assert s.intent == "claim leadership"
+    assert any("heartbeat = NOW()" in q for q in lock.executed)
+    # The final release on exit unlocks and NOTIFYs standbys
+    assert lock.released >= 2
+    assert s.is_leader is False
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_election_is_the_default(monkeypatch):
+    monkeypatch.delenv("MECRIS_LEADER_ELECTION", raising=False)
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}):
+        from scheduler import MecrisScheduler
+        s = MecrisScheduler(user_id="test-user")
+    s.running = True
+
+    async def attempt():
+        s.running = False
+
+    with patch.object(s, "_attempt_leadership", side_effect=attempt) as legacy, \
+         patch.object(s, "_advisory_election_loop", AsyncMock()) as advisory, \
+         patch("scheduler.asyncio.sleep", AsyncMock()):
+        await s._election_loop()
+    legacy.assert_called_once()
+    advisory.assert_not_awaited()
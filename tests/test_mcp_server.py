@@ -298,12 +298,12 @@ async def test_daily_aggregate_status_not_all_clear_when_walk_missing():
 # ---------------------------------------------------------------------------
 
 @pytest.mark.asyncio
-async def test_get_walk_history_returns_datetimes_from_db():
-    """get_walk_history queries walk_inferences and returns a list of datetimes."""
+async def test_get_walk_history_returns_histogram_from_db():
+    """get_walk_history reduces walk_inferences to per-day hour masks SQL-side and caches them."""
     import datetime
     sys.modules.pop("mcp_server", None)
 
-    walk_dt = datetime.datetime(2026, 4, 20, 9, 30, 0)
+    walk_day = datetime.date(2026, 4, 20)
 
     # Import within the mock context so import-time DB calls succeed
     env_patch, db_patch = _make_mcp_importable()
@@ -313,7 +313,7 @@ async def test_get_walk_history_returns_datetimes_from_db():
     # Call the function with a fresh targeted mock after import
     import mcp_server
     mock_cur = MagicMock()
-    mock_cur.fetchall.return_value = [(walk_dt,)]
+    mock_cur.fetchall.return_value = [(walk_day, 1 << 9)]
     mock_conn = MagicMock()
     mock_conn.__enter__ = MagicMock(return_value=mock_conn)
     mock_conn.__exit__ = MagicMock(return_value=False)
@@ -325,11 +325,23 @@ async def test_get_walk_history_returns_datetimes_from_db():
          patch.object(mcp_server, "usage_tracker") as mock_tracker:
         mock_tracker.resolve_user_id.return_value = "test-user"
         result = await get_walk_history("test-user")
+        again = await get_walk_history("test-user")
 
-    assert result == [walk_dt]
-    sql_calls = [str(c) for c in mock_cur.execute.call_args_list]
-    assert any("walk_inferences" in s for s in sql_calls)
-    assert any("start_time" in s for s in sql_calls)
+    assert result.day_masks == {walk_day: 1 << 9}
+    assert again is result
+    assert mock_cur.execute.call_count == 1
+    sql, params = mock_cur.execute.call_args.args
+    assert "walk_inferences" in sql
+    assert "bit_or" in sql
+    # start_time is TEXT: cast it and bin by the Eastern hour that evaluate_nag's current_hour uses
+    assert "(start_time::TIMESTAMPTZ AT TIME ZONE 'America/New_York') AS local_start" in sql
+    assert "extract(hour FROM local_start)" in sql
+    assert "WHERE local_start >= %s" in sql
+    assert params[1].tzinfo is None
+
+    # A new walk is folded into the cached histogram instead of refetching
+    mcp_server.record_walk_in_histogram("test-user", "2026-04-21T14:05:00")
+    assert result.day_masks[datetime.date(2026, 4, 21)] == 1 << 14
 
 
 @pytest.mark.asyncio
@@ -347,7 +359,8 @@ async def test_get_walk_history_returns_empty_when_no_neon_url():
         mock_tracker.resolve_user_id.return_value = "test-user"
         result = await get_walk_history("test-user")
 
-    assert result == []
+    assert not result
+    assert result.day_masks == {}
 
 
 @pytest.mark.asyncio
@@ -366,4 +379,5 @@ async def test_get_walk_history_returns_empty_on_db_error():
         mock_tracker.resolve_user_id.return_value = "test-user"
         result = await get_walk_history("test-user")
 
-    assert result == []
+    assert not result
+    assert result.day_masks == {}
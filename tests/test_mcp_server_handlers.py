@@ -443,3 +443,32 @@ def test_complete_goal_delegates_to_usage_tracker():
 
     assert result == expected
     mock_tracker.complete_goal.assert_called_once_with(7, "test-user")
+
+
+# ---------------------------------------------------------------------------
+# get_last_sent_times — one DISTINCT ON (type) query per reminder tick
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_get_last_sent_times_single_query():
+    import datetime
+    sys.modules.pop("mcp_server", None)
+
+    env_patch, db_patch = _make_mcp_importable()
+    with env_patch, db_patch:
+        from mcp_server import get_last_sent_times
+        walk = datetime.datetime(2026, 3, 30, 14, tzinfo=datetime.timezone.utc)
+        arabic = datetime.datetime(2026, 3, 30, 16, tzinfo=datetime.timezone.utc)
+        cur = MagicMock()
+        cur.fetchall.return_value = [("arabic_review_reminder", arabic), ("walk_reminder", walk)]
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = cur
+        cm = MagicMock()
+        cm.__enter__.return_value = conn
+        with patch("mcp_server.get_connection", return_value=cm), \
+             patch("mcp_server.usage_tracker.resolve_user_id", return_value="u1"):
+            result = await get_last_sent_times("u1")
+
+    assert cur.execute.call_count == 1
+    assert "DISTINCT ON (type)" in cur.execute.call_args.args[0]
+    assert result == {"arabic_review_reminder": arabic, "walk_reminder": walk, None: arabic}
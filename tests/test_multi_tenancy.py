@@ -98,8 +98,8 @@ def test_neon_sync_checker_initialization(neon_checker):
 def test_has_walk_today_with_user_id(mock_connect, neon_checker):
     mock_conn = MagicMock()
     mock_cur = MagicMock()
-    mock_connect.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cur
+    mock_connect.return_value.__enter__.return_value = mock_conn
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
     mock_cur.fetchone.return_value = (1,)
 
     user_id = "test-user-123"
@@ -116,8 +116,8 @@ def test_has_walk_today_with_user_id(mock_connect, neon_checker):
 def test_get_language_stats_with_user_id(mock_connect, neon_checker):
     mock_conn = MagicMock()
     mock_cur = MagicMock()
-    mock_connect.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cur
+    mock_connect.return_value.__enter__.return_value = mock_conn
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
     mock_cur.fetchall.return_value = [
         ("ARABIC", 10, 5, 50, 1.5, 120, "reviewstack", 3),
         ("GREEK", 20, 10, 100, 2.0, 240, "greek", 1)
@@ -139,8 +139,8 @@ def test_get_language_stats_with_user_id(mock_connect, neon_checker):
 def test_update_pump_multiplier_with_user_id(mock_connect, neon_checker):
     mock_conn = MagicMock()
     mock_cur = MagicMock()
-    mock_connect.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cur
+    mock_connect.return_value.__enter__.return_value = mock_conn
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
 
     user_id = "test-user-789"
     with patch.object(neon_checker, 'resolve_user_id', return_value=user_id):
@@ -157,8 +157,8 @@ def test_update_pump_multiplier_with_user_id(mock_connect, neon_checker):
 def test_get_latest_walk_with_user_id(mock_connect, neon_checker):
     mock_conn = MagicMock()
     mock_cur = MagicMock()
-    mock_connect.return_value = mock_conn
-    mock_conn.cursor.return_value = mock_cur
+    mock_connect.return_value.__enter__.return_value = mock_conn
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
     mock_cur.fetchone.return_value = (time.time(), 1000, 800.0, "google_fit")
 
     user_id = "test-user-walk"
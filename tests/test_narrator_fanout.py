@@ -0,0 +1,188 @@
+"""
+Tests for the concurrent fan-out in get_narrator_context.
+
+Sources are gathered concurrently, each under its own deadline; a source that
+times out or raises degrades to a default value and is listed in
+degraded_sources instead of failing or stalling the whole context.
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import ExitStack
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import pytest
+
+
+def _slow(value, delay):
+    """AsyncMock that resolves to value after delay seconds."""
+    async def _impl(*_args, **_kwargs):
+        await asyncio.sleep(delay)
+        return value
+    return AsyncMock(side_effect=_impl)
+
+
+async def _run_narrator(overrides=None, timeouts=None, timed=False, sections=None):
+    """Run get_narrator_context with every source mocked; overrides replace individual patches.
+
+    With timed=True returns (result, seconds spent inside get_narrator_context).
+    """
+    sys.modules.pop("mcp_server", None)
+
+    tracker = MagicMock()
+    tracker.get_goals.return_value = [{"status": "active"}]
+    tracker.get_budget_status.return_value = {"days_remaining": 5.0, "remaining_budget": 10.0}
+    neon = MagicMock()
+    neon.get_language_stats.return_value = {"greek": {"next_7_days": 500}}
+    neon.get_latest_walk.return_value = None
+    neon.get_notification_prefs.return_value = {}
+    client = MagicMock()
+    client.get_emergencies = AsyncMock(return_value=[])
+    client.get_runway_summary = AsyncMock(return_value=[])
+    lang_sync = MagicMock()
+    lang_sync._greek_backlog_active.return_value = True
+    weather = MagicMock()
+    weather.get_weather.return_value = {}
+    weather.is_walk_appropriate.return_value = (True, "Weather fine")
+    governor = MagicMock()
+    governor.get_narrator_summary.return_value = {}
+
+    targets = {
+        "mcp_server.usage_tracker": tracker,
+        "mcp_server.resolve_target_user": MagicMock(return_value="test-user"),
+        "mcp_server._record_presence": AsyncMock(),
+        "mcp_server.get_cached_beeminder_goals": AsyncMock(return_value=[]),
+        "mcp_server.get_user_beeminder_client": MagicMock(return_value=client),
+        "mcp_server.get_cached_daily_activity": AsyncMock(return_value={"status": "done"}),
+        "mcp_server.get_groq_context_for_narrator": MagicMock(return_value={}),
+        "mcp_server.neon_checker": neon,
+        "mcp_server.language_sync_service": lang_sync,
+        "mcp_server.weather_service": weather,
+        "mcp_server._neon_budget_governor": governor,
+        "mcp_server._get_presence_summary": AsyncMock(return_value={}),
+        "mcp_server._enrich_bookmarks_for_narrator": MagicMock(return_value=[]),
+        "mcp_server.anthropic_cost_tracker": None,
+        "mcp_server.get_daily_aggregate_status": AsyncMock(return_value={"score": "1/3", "all_clear": False}),
+    }
+    targets.update(overrides or {})
+
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}), \
+         patch("psycopg2.connect"):
+        with ExitStack() as stack:
+            for target, value in targets.items():
+                stack.enter_context(patch(target, value))
+            stack.enter_context(patch("mcp_server.scheduler"))
+            if timeouts is not None:
+                stack.enter_context(patch("mcp_server.NARRATOR_SOURCE_TIMEOUTS", timeouts))
+            from mcp_server import get_narrator_context
+            start = time.monotonic()
+            result = await get_narrator_context(sections=sections)
+            return (result, time.monotonic() - start) if timed else result
+
+
+@pytest.mark.asyncio
+async def test_all_sources_ok_has_no_degraded_sources():
+    result = await _run_narrator()
+    assert "error" not in result
+    assert result["degraded_sources"] == {}
+    assert result["greek_backlog_boost"] is True
+    assert result["daily_aggregate_status"]["score"] == "1/3"
+
+
+@pytest.mark.asyncio
+async def test_slow_source_times_out_and_degrades():
+    """A source past its deadline yields a partial context instead of blocking."""
+    slow_aggregate = _slow({"score": "3/3"}, 5)
+    result, elapsed = await _run_narrator(
+        overrides={"mcp_server.get_daily_aggregate_status": slow_aggregate},
+        timeouts={"daily_aggregate": 0.05},
+        timed=True,
+    )
+
+    assert elapsed < 2
+    assert result["degraded_sources"] == {"daily_aggregate": "timeout"}
+    assert result["daily_aggregate_status"] == {"error": "timeout"}
+    # Every other section is still populated
+    assert result["summary"].startswith("Active goals: 1")
+    assert result["greek_backlog_boost"] is True
+
+
+@pytest.mark.asyncio
+async def test_failing_source_degrades_with_error():
+    failing_walk = AsyncMock(side_effect=RuntimeError("neon down"))
+    result = await _run_narrator(overrides={"mcp_server.get_cached_daily_activity": failing_walk})
+
+    assert "error" not in result
+    assert result["daily_walk_status"] == {}
+    assert result["degraded_sources"]["daily_walk_status"] == "error: neon down"
+
+
+@pytest.mark.asyncio
+async def test_sources_are_fetched_concurrently():
+    """Three 0.2s sources finish in roughly one source's latency, not the sum."""
+    result, elapsed = await _run_narrator(overrides={
+        "mcp_server.get_cached_beeminder_goals": _slow([], 0.2),
+        "mcp_server.get_cached_daily_activity": _slow({"status": "done"}, 0.2),
+        "mcp_server.get_daily_aggregate_status": _slow({"score": "0/3"}, 0.2),
+    }, timed=True)
+
+    assert result["degraded_sources"] == {}
+    assert elapsed < 0.55
+
+
+@pytest.mark.asyncio
+async def test_beeminder_dependents_share_one_goals_fetch():
+    goals = [{"slug": "bike", "derail_risk": "CRITICAL"}]
+    fetch_goals = AsyncMock(return_value=goals)
+    client = MagicMock()
+    client.get_emergencies = AsyncMock(return_value=[{"message": "bike derails today"}])
+    client.get_runway_summary = AsyncMock(return_value=[])
+    result = await _run_narrator(overrides={
+        "mcp_server.get_cached_beeminder_goals": fetch_goals,
+        "mcp_server.get_user_beeminder_client": MagicMock(return_value=client),
+    })
+
+    fetch_goals.assert_awaited_once()
+    client.get_emergencies.assert_awaited_once_with(goals)
+    assert result["beeminder_alerts"] == ["bike derails today"]
+    assert "DERAILING: bike" in result["urgent_items"]
+
+
+@pytest.mark.asyncio
+async def test_sections_skip_unrequested_sources():
+    """The reminder job's sections never pay for bookmarks, weather, Groq or presence."""
+    bookmarks = MagicMock(return_value=[])
+    presence = AsyncMock(return_value={})
+    groq = MagicMock(return_value={})
+    aggregate = AsyncMock(return_value={"score": "1/3"})
+    result = await _run_narrator(overrides={
+        "mcp_server._enrich_bookmarks_for_narrator": bookmarks,
+        "mcp_server._get_presence_summary": presence,
+        "mcp_server.get_groq_context_for_narrator": groq,
+        "mcp_server.get_daily_aggregate_status": aggregate,
+    }, sections=["daily_walk_status", "vacation_mode", "beeminder_alerts"])
+
+    assert set(result) == {"daily_walk_status", "vacation_mode", "beeminder_alerts", "degraded_sources", "last_updated"}
+    assert result["daily_walk_status"] == {"status": "done"}
+    bookmarks.assert_not_called()
+    presence.assert_not_awaited()
+    groq.assert_not_called()
+    aggregate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sections_without_beeminder_dependents_skip_goal_fetch():
+    fetch_goals = AsyncMock(return_value=[])
+    result = await _run_narrator(
+        overrides={"mcp_server.get_cached_beeminder_goals": fetch_goals},
+        sections=["greek_backlog_boost"],
+    )
+    fetch_goals.assert_not_awaited()
+    assert result["greek_backlog_boost"] is True
+
+
+@pytest.mark.asyncio
+async def test_unknown_section_is_rejected():
+    result = await _run_narrator(sections=["daily_walk_status", "horoscope"])
+    assert "horoscope" in result["error"]
@@ -0,0 +1,193 @@
+"""Tests for services/neon_async.py — asyncpg read path for the hot endpoints."""
+import datetime
+import zoneinfo
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import asyncpg
+import pytest
+
+from services import neon_async
+from services.neon_async import AsyncNeonReader, async_enabled
+
+FAKE_URL = "postgres://user:pw@ep-fake-pooler.neon.tech/neondb"
+
+
+@pytest.fixture
+def enable_async(monkeypatch):
+    monkeypatch.setenv("MECRIS_NEON_ASYNC", "true")
+
+
+@pytest.fixture
+def fake_conn():
+    """An asyncpg connection double served by a patched create_pool."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.fetchrow = AsyncMock(return_value=None)
+    conn.fetchval = AsyncMock(return_value=1)
+
+    acquire_cm = MagicMock()
+    acquire_cm.__aenter__ = AsyncMock(return_value=conn)
+    acquire_cm.__aexit__ = AsyncMock(return_value=False)
+    pool = MagicMock()
+    pool.acquire.return_value = acquire_cm
+    pool.close = AsyncMock()
+
+    with patch("services.neon_async.asyncpg.create_pool", AsyncMock(return_value=pool)) as create_pool:
+        conn.create_pool = create_pool
+        yield conn
+    neon_async._pools.clear()
+    neon_async._pool_locks.clear()
+
+
+def test_async_enabled_switch(monkeypatch):
+    monkeypatch.setenv("MECRIS_NEON_ASYNC", "true")
+    assert async_enabled(FAKE_URL) is True
+    assert async_enabled(None) is False
+    monkeypatch.setenv("MECRIS_NEON_ASYNC", "false")
+    assert async_enabled(FAKE_URL) is False
+
+
+@pytest.mark.asyncio
+async def test_pool_is_created_once_with_pooler_settings(enable_async, fake_conn):
+    reader = AsyncNeonReader(FAKE_URL)
+    assert await reader.ping() is True
+    assert await reader.ping() is True
+
+    fake_conn.create_pool.assert_awaited_once()
+    args, kwargs = fake_conn.create_pool.call_args
+    assert args[0].startswith("postgresql://")
+    assert kwargs["statement_cache_size"] == 0  # PgBouncer transaction mode
+
+
+@pytest.mark.asyncio
+async def test_get_language_stats_maps_rows_like_sync_checker(enable_async, fake_conn):
+    fake_conn.fetch.return_value = [
+        ("ARABIC", 2600, 5, 100, Decimal("2.0"), 50, "reviewstack", 3),
+        ("Greek", 20, 2, 40, None, None, None, None),
+    ]
+    stats = await AsyncNeonReader(FAKE_URL).get_language_stats("yebyen")
+
+    assert stats["arabic"]["multiplier"] == 2.0
+    assert stats["arabic"]["beeminder_slug"] == "reviewstack"
+    assert stats["greek"] == {
+        "current": 20, "tomorrow": 2, "next_7_days": 40, "multiplier": 1.0,
+        "daily_completions": 0, "beeminder_slug": None, "safebuf": 0,
+    }
+    query, user_arg = fake_conn.fetch.call_args[0]
+    assert "familiar_id = $1" in query  # familiar_id resolved in-query
+    assert user_arg == "yebyen"
+
+
+@pytest.mark.asyncio
+async def test_has_walk_today_passes_naive_eastern_midnight(enable_async, fake_conn):
+    fake_conn.fetchrow.return_value = (2,)
+    midnight = datetime.datetime(2026, 3, 20, tzinfo=zoneinfo.ZoneInfo("US/Eastern"))
+    with patch("services.neon_async.day_start_eastern", return_value=midnight):
+        assert await AsyncNeonReader(FAKE_URL).has_walk_today("u1") is True
+
+    query, start_arg, min_steps, user_arg = fake_conn.fetchrow.call_args[0]
+    assert user_arg == "u1" and "familiar_id = $3" in query
+    assert start_arg == datetime.datetime(2026, 3, 20)
+    assert min_steps == 2000
+
+
+@pytest.mark.asyncio
+async def test_walk_reads_without_a_user_scan_all_users_like_sync_checker(enable_async, fake_conn):
+    fake_conn.fetchrow.return_value = (1,)
+    reader = AsyncNeonReader(FAKE_URL)
+    with patch("services.neon_async.credentials_manager.resolve_user_id", return_value=None):
+        assert await reader.has_walk_today() is True
+        query, *params = fake_conn.fetchrow.call_args[0]
+        assert "user_id" not in query and len(params) == 2
+
+        fake_conn.fetchrow.return_value = None
+        assert await reader.get_latest_walk() is None
+        query, *params = fake_conn.fetchrow.call_args[0]
+        assert "WHERE" not in query and params == []
+
+
+def test_pools_of_closed_loops_are_dropped(enable_async, fake_conn):
+    import asyncio
+    reader = AsyncNeonReader(FAKE_URL)
+    first = asyncio.new_event_loop()
+    first.run_until_complete(reader.ping())
+    first.close()
+    stale = neon_async._pools[first][FAKE_URL]
+
+    second = asyncio.new_event_loop()
+    try:
+        second.run_until_complete(reader.ping())
+    finally:
+        second.close()
+    assert fake_conn.create_pool.await_count == 2
+    assert first not in neon_async._pools
+    stale.terminate.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_read_errors_degrade_like_sync_checker(enable_async, fake_conn):
+    fake_conn.fetchrow.side_effect = OSError("connection refused")
+    reader = AsyncNeonReader(FAKE_URL)
+    assert await reader.has_walk_today("u1") is False
+    assert await reader.get_latest_walk("u1") is None
+    assert await reader.get_notification_prefs("u1") == {}
+
+
+@pytest.mark.asyncio
+async def test_notification_prefs_decodes_jsonb_text(enable_async, fake_conn):
+    fake_conn.fetchrow.return_value = ('{"vacation_mode": true}',)
+    assert await AsyncNeonReader(FAKE_URL).get_notification_prefs("u1") == {"vacation_mode": True}
+
+
+@pytest.mark.asyncio
+async def test_budget_status_single_round_trip(enable_async, fake_conn):
+    period_end = datetime.date.today() + datetime.timedelta(days=10)
+    fake_conn.fetchrow.return_value = {
+        "total_budget": Decimal("20"), "remaining_budget": Decimal("15"),
+        "budget_period_end": period_end,
+        "today_spend": Decimal("0.5"), "week_spend": Decimal("3.5"),
+    }
+    status = await AsyncNeonReader(FAKE_URL).get_budget_status("u1")
+
+    assert fake_conn.fetchrow.await_count == 1
+    assert status["days_remaining"] == 10
+    assert status["daily_burn_rate"] == Decimal("0.5")
+    assert status["budget_health"] == "GOOD"
+
+
+@pytest.mark.asyncio
+async def test_budget_status_missing_row_returns_error(enable_async, fake_conn):
+    status = await AsyncNeonReader(FAKE_URL).get_budget_status("u1")
+    assert "No budget information" in status["error"]
+
+
+@pytest.mark.asyncio
+async def test_budget_status_falls_back_without_daily_rollup(enable_async, fake_conn, monkeypatch):
+    from usage_tracker import UsageTracker
+    monkeypatch.setattr(UsageTracker, "_daily_rollup_available", True)
+    period_end = datetime.date.today() + datetime.timedelta(days=10)
+    fake_conn.fetchrow.side_effect = [
+        asyncpg.exceptions.UndefinedTableError("no rollup"),
+        {"total_budget": 20.0, "remaining_budget": 15.0, "budget_period_end": period_end,
+         "today_spend": 0.5, "week_spend": None},
+    ]
+    status = await AsyncNeonReader(FAKE_URL).get_budget_status("u1")
+
+    assert "usage_daily_rollup" in fake_conn.fetchrow.call_args_list[0].args[0]
+    assert "usage_daily_rollup" not in fake_conn.fetchrow.call_args_list[1].args[0]
+    assert status["today_spend"] == 0.5
+    assert UsageTracker._daily_rollup_available is False
+
+
+@pytest.mark.asyncio
+async def test_scheduler_heartbeats_fall_back_without_obs_columns(enable_async, fake_conn):
+    hb = datetime.datetime(2026, 4, 1, tzinfo=datetime.timezone.utc)
+    fake_conn.fetch.side_effect = [
+        asyncpg.exceptions.UndefinedColumnError("column last_status does not exist"),
+        [("leader", hb, 2.0, None, None, None)],
+    ]
+    rows = await AsyncNeonReader(FAKE_URL).get_scheduler_heartbeats("u1")
+
+    assert rows == [("leader", hb, 2.0, None, None, None)]
+    assert "NULL, NULL, NULL" in fake_conn.fetch.call_args[0][0]
@@ -6,12 +6,12 @@ from services.neon_sync_checker import NeonSyncChecker
 
 @pytest.fixture
 def mock_psycopg2():
-    with patch("services.neon_sync_checker.psycopg2") as mock_pg:
+    with patch("services.neon_pool.psycopg2") as mock_pg:
         # Setup mock connection and cursor
         mock_conn = MagicMock()
         mock_cur = MagicMock()
-        mock_pg.connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cur
+        mock_pg.connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cur
         yield mock_cur
 
 def test_neon_checker_no_url():
@@ -15,11 +15,13 @@ def checker():
 async def test_has_walk_today_workout_bypass(checker):
     # Setup mock cursor to return 1 (walk found via Workouts source)
     mock_conn = MagicMock()
+    mock_conn.__enter__.return_value = mock_conn
     mock_cur = MagicMock()
+    mock_cur.__enter__.return_value = mock_cur
     mock_cur.fetchone.return_value = (1,)
-    mock_conn.cursor.return_value = mock_cur
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
     
-    with patch('psycopg2.connect', return_value=mock_conn):
+    with patch('services.neon_pool.psycopg2.connect', return_value=mock_conn):
         # Even with 100 steps, it should return True because of the 'Workouts' SQL clause
         result = checker.has_walk_today(user_id="test", min_steps=2000)
         assert result is True
@@ -33,11 +35,13 @@ async def test_has_walk_today_workout_bypass(checker):
 @pytest.mark.asyncio
 async def test_has_walk_today_distance_bypass(checker):
     mock_conn = MagicMock()
+    mock_conn.__enter__.return_value = mock_conn
     mock_cur = MagicMock()
+    mock_cur.__enter__.return_value = mock_cur
     mock_cur.fetchone.return_value = (1,)
-    mock_conn.cursor.return_value = mock_cur
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
     
-    with patch('psycopg2.connect', return_value=mock_conn):
+    with patch('services.neon_pool.psycopg2.connect', return_value=mock_conn):
         # 1609.34m is 1.0 mile. Should count as a walk.
         result = checker.has_walk_today(user_id="test", min_steps=2000)
         assert result is True
@@ -37,8 +37,9 @@ def test_update_pump_multiplier_no_db_url():
 def test_update_pump_multiplier_success(checker):
     """Returns True after a successful UPDATE + commit."""
     mock_conn = MagicMock()
+    mock_conn.__enter__.return_value = mock_conn
     mock_conn.cursor.return_value = MagicMock()
-    with patch("services.neon_sync_checker.psycopg2.connect", return_value=mock_conn):
+    with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
         result = checker.update_pump_multiplier("Arabic", 2.5, user_id="yebyen")
     assert result is True
 
@@ -46,8 +47,9 @@ def test_update_pump_multiplier_success(checker):
 def test_update_pump_multiplier_calls_commit(checker):
     """conn.commit() is called exactly once after the UPDATE."""
     mock_conn = MagicMock()
+    mock_conn.__enter__.return_value = mock_conn
     mock_conn.cursor.return_value = MagicMock()
-    with patch("services.neon_sync_checker.psycopg2.connect", return_value=mock_conn):
+    with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
         checker.update_pump_multiplier("Arabic", 2.0, user_id="yebyen")
     mock_conn.commit.assert_called_once()
 
@@ -55,9 +57,11 @@ def test_update_pump_multiplier_calls_commit(checker):
 def test_update_pump_multiplier_language_uppercased(checker):
     """Lowercase language_name is uppercased in the SQL execute params."""
     mock_conn = MagicMock()
+    mock_conn.__enter__.return_value = mock_conn
     mock_cur = MagicMock()
-    mock_conn.cursor.return_value = mock_cur
-    with patch("services.neon_sync_checker.psycopg2.connect", return_value=mock_conn):
+    mock_cur.__enter__.return_value = mock_cur
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
+    with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
         checker.update_pump_multiplier("arabic", 1.5, user_id="yebyen")
     args, _ = mock_cur.execute.call_args
     assert args[1][1] == "ARABIC"
@@ -66,9 +70,11 @@ def test_update_pump_multiplier_language_uppercased(checker):
 def test_update_pump_multiplier_mixed_case_uppercased(checker):
     """Mixed-case language names are uppercased in the SQL execute params."""
     mock_conn = MagicMock()
+    mock_conn.__enter__.return_value = mock_conn
     mock_cur = MagicMock()
-    mock_conn.cursor.return_value = mock_cur
-    with patch("services.neon_sync_checker.psycopg2.connect", return_value=mock_conn):
+    mock_cur.__enter__.return_value = mock_cur
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
+    with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
         checker.update_pump_multiplier("Greek", 3.0, user_id="yebyen")
     args, _ = mock_cur.execute.call_args
     assert args[1][1] == "GREEK"
@@ -77,9 +83,11 @@ def test_update_pump_multiplier_mixed_case_uppercased(checker):
 def test_update_pump_multiplier_correct_params(checker):
     """multiplier and resolved user_id are in the correct SQL param positions."""
     mock_conn = MagicMock()
+    mock_conn.__enter__.return_value = mock_conn
     mock_cur = MagicMock()
-    mock_conn.cursor.return_value = mock_cur
-    with patch("services.neon_sync_checker.psycopg2.connect", return_value=mock_conn):
+    mock_cur.__enter__.return_value = mock_cur
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
+    with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
         checker.update_pump_multiplier("Arabic", 2.0, user_id="yebyen")
     args, _ = mock_cur.execute.call_args
     params = args[1]
@@ -90,7 +98,7 @@ def test_update_pump_multiplier_correct_params(checker):
 def test_update_pump_multiplier_connect_exception_returns_false(checker):
     """Returns False (does not raise) when psycopg2.connect raises."""
     with patch(
-        "services.neon_sync_checker.psycopg2.connect",
+        "services.neon_pool.psycopg2.connect",
         side_effect=Exception("connection refused"),
     ):
         result = checker.update_pump_multiplier("Arabic", 2.0, user_id="yebyen")
@@ -100,9 +108,11 @@ def test_update_pump_multiplier_connect_exception_returns_false(checker):
 def test_update_pump_multiplier_execute_exception_returns_false(checker):
     """Returns False when cursor.execute raises (partial transaction, no commit)."""
     mock_conn = MagicMock()
+    mock_conn.__enter__.return_value = mock_conn
     mock_cur = MagicMock()
+    mock_cur.__enter__.return_value = mock_cur
     mock_cur.execute.side_effect = Exception("column not found")
-    mock_conn.cursor.return_value = mock_cur
-    with patch("services.neon_sync_checker.psycopg2.connect", return_value=mock_conn):
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cur
+    with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
         result = checker.update_pump_multiplier("Arabic", 2.0, user_id="yebyen")
     assert result is False
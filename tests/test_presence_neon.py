@@ -93,7 +93,7 @@ class TestNeonPresenceStoreUpsert:
         row = _fake_row(status="pulse")
         mock_conn, _ = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             record = store.upsert("user1", StatusType.PULSE)
 
@@ -105,7 +105,7 @@ class TestNeonPresenceStoreUpsert:
         row = _fake_row(status="active_human", source="web")
         mock_conn, _ = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             record = store.upsert("user1", StatusType.ACTIVE_HUMAN, source="web")
 
@@ -117,7 +117,7 @@ class TestNeonPresenceStoreUpsert:
         row = _fake_row()
         mock_conn, mock_cursor = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             store.upsert("user1", StatusType.PULSE)
 
@@ -130,7 +130,7 @@ class TestNeonPresenceStoreUpsert:
         row = _fake_row(status="needs_attention", source="bot")
         mock_conn, mock_cursor = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             store.upsert("user42", StatusType.NEEDS_ATTENTION, source="bot")
 
@@ -149,7 +149,7 @@ class TestNeonPresenceStoreGet:
         row = _fake_row(status="pound_sand")
         mock_conn, _ = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             record = store.get("user1")
 
@@ -159,7 +159,7 @@ class TestNeonPresenceStoreGet:
     def test_get_returns_none_when_no_record(self):
         mock_conn, _ = _mock_conn(None)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             record = store.get("nonexistent")
 
@@ -170,7 +170,7 @@ class TestNeonPresenceStoreGet:
         row = ("user1", ts, None, None, "cli", "pulse")
         mock_conn, _ = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             record = store.get("user1")
 
@@ -186,7 +186,7 @@ class TestStateMachine:
         row = _fake_row(status="pound_sand", source="cli")
         mock_conn, mock_cursor = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             record = store.set_pound_sand("user1")
 
@@ -199,7 +199,7 @@ class TestStateMachine:
         row = _fake_row(status="shits_on_fire_yo", source="bot")
         mock_conn, mock_cursor = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             record = store.escalate_to_sofy("user1")
 
@@ -212,7 +212,7 @@ class TestStateMachine:
         row = _fake_row(status="shits_on_fire_yo", source="bot")
         mock_conn, mock_cursor = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             store.escalate_to_sofy("user1")
 
@@ -223,7 +223,7 @@ class TestStateMachine:
         row = _fake_row(status="pound_sand", source="cli")
         mock_conn, mock_cursor = _mock_conn(row)
 
-        with patch("ghost.presence.psycopg2.connect", return_value=mock_conn):
+        with patch("services.neon_pool.psycopg2.connect", return_value=mock_conn):
             store = NeonPresenceStore("postgresql://fake")
             store.set_pound_sand("user1")
 
@@ -0,0 +1,172 @@
+"""Tenant-aware reminder fan-out: bounded concurrency, isolation, latency and shared per-tick providers."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.context_snapshot import snapshot_cached
+from services.reminder_fanout import ReminderFanout, fan_out
+
+
+def _due(*user_ids):
+    async def list_due_users():
+        return list(user_ids)
+    return list_due_users
+
+
+@pytest.mark.asyncio
+async def test_fan_out_respects_concurrency_bound():
+    running, peak = 0, 0
+
+    async def worker(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return item
+
+    outcomes = await fan_out(range(10), worker, concurrency=3)
+    assert peak == 3
+    assert {item: result for item, (result, _) in outcomes.items()} == {i: i for i in range(10)}
+
+
+@pytest.mark.asyncio
+async def test_failing_and_slow_users_do_not_block_others():
+    async def evaluate(user_id):
+        if user_id == "boom":
+            raise RuntimeError("provider down")
+        if user_id == "slow":
+            await asyncio.sleep(5)
+        return {"triggered": user_id == "ok"}
+
+    fanout = ReminderFanout(evaluate, _due("ok", "quiet", "boom", "slow"), concurrency=4, user_timeout=0.05)
+    tick = await fanout.run_tick()
+
+    assert tick["users"] == 4
+    assert tick["triggered"] == ["ok"]
+    assert set(tick["errors"]) == {"boom", "slow"}
+    assert tick["errors"]["boom"] == "provider down"
+    assert set(fanout.stats()["latency_by_user_s"]) == {"ok", "quiet", "boom", "slow"}
+    assert tick["latency_max_s"] < 1
+
+
+@pytest.mark.asyncio
+async def test_list_failure_is_reported():
+    async def list_due_users():
+        raise RuntimeError("db down")
+
+    fanout = ReminderFanout(MagicMock(), list_due_users, concurrency=2)
+    assert await fanout.run_tick() == {"error": "db down"}
+    fanout.evaluate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_global_provider_fetched_once_per_tick():
+    calls = []
+
+    @snapshot_cached("test_weather")
+    async def weather():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"temp": 60}
+
+    async def evaluate(user_id):
+        return {"triggered": False, "weather": await weather()}
+
+    fanout = ReminderFanout(evaluate, _due("a", "b", "c"), concurrency=3)
+    await fanout.run_tick()
+    assert len(calls) == 1
+    await fanout.run_tick()
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_registers_single_fanout_job(monkeypatch):
+    monkeypatch.setenv("MECRIS_REMINDER_FANOUT", "true")
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}):
+        from scheduler import MecrisScheduler
+        s = MecrisScheduler(user_id="test-user")
+    s.scheduler = MagicMock()
+    s.scheduler.get_job.return_value = None
+
+    with patch("ghost.presence.is_human_present", return_value=False):
+        await s._start_leader_jobs()
+
+    # A user's leader registers no reminder job; the fan-out leader owns the tenant-wide one
+    job_ids = [c.kwargs["id"] for c in s.scheduler.add_job.call_args_list]
+    assert "auto_reminder_fanout" not in job_ids
+    assert "auto_reminder_check_test-user" not in job_ids
+
+    s._start_fanout_jobs()
+    assert s.scheduler.add_job.call_args.kwargs["id"] == "auto_reminder_fanout"
+
+
+def test_demoting_a_user_leader_keeps_the_fanout_job(monkeypatch):
+    monkeypatch.setenv("MECRIS_REMINDER_FANOUT", "true")
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}):
+        from scheduler import MecrisScheduler
+        s = MecrisScheduler(user_id="test-user")
+    s.scheduler = MagicMock()
+    s.scheduler.running = True
+
+    s._stop_leader_jobs()
+    removed = [c.args[0] for c in s.scheduler.remove_job.call_args_list]
+    assert "auto_reminder_fanout" not in removed
+
+    s._stop_fanout_jobs()
+    assert s.scheduler.remove_job.call_args.args == ("auto_reminder_fanout",)
+
+
+@pytest.mark.asyncio
+async def test_fanout_job_runs_only_on_the_fanout_slot_holder():
+    import sys
+    import scheduler as _sched
+    fake_mcp = MagicMock()
+    fake_mcp.scheduler.is_leader = True  # leads its own user only
+    fake_mcp.scheduler.is_fanout_leader = False
+    fake_mcp.reminder_fanout.run_tick = AsyncMock()
+    with patch.dict(sys.modules, {"mcp_server": fake_mcp}):
+        await _sched._global_reminder_fanout_job()
+        fake_mcp.reminder_fanout.run_tick.assert_not_awaited()
+        fake_mcp.scheduler.is_fanout_leader = True
+        await _sched._global_reminder_fanout_job()
+    fake_mcp.reminder_fanout.run_tick.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fanout_election_leases_its_own_slot(monkeypatch):
+    monkeypatch.setenv("MECRIS_REMINDER_FANOUT", "true")
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}):
+        from scheduler import FANOUT_SLOT, MecrisScheduler
+        s = MecrisScheduler(user_id="test-user")
+    s.scheduler = MagicMock()
+    s.scheduler.running = True
+    s.scheduler.get_job.return_value = None
+    s.running = True
+    rounds = iter([True, False])
+
+    def claim():
+        try:
+            return next(rounds)
+        except StopIteration:
+            s.running = False
+            return False
+
+    async def no_sleep(_):
+        pass
+
+    with patch.object(s, "_claim_fanout_slot_sync", side_effect=claim), \
+         patch("scheduler.asyncio.sleep", side_effect=no_sleep):
+        await s._fanout_election_loop()
+    assert s.scheduler.add_job.call_args.kwargs["id"] == "auto_reminder_fanout"
+    assert s.scheduler.remove_job.call_args.args == ("auto_reminder_fanout",)
+    assert s.is_fanout_leader is False
+
+    cur = MagicMock(rowcount=1)
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+    with patch("scheduler.get_connection") as get_connection:
+        get_connection.return_value.__enter__.return_value = conn
+        assert s._claim_fanout_slot_sync() is True
+    assert cur.execute.call_args.args[1][2] == FANOUT_SLOT
@@ -0,0 +1,232 @@
+"""Event-driven reminder planning: ReminderService.next_check_at and the self-rescheduling plan job."""
+import datetime
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.reminder_service import ReminderService
+
+
+def make_async_mock(return_value):
+    async def mock_coro(*args, **kwargs):
+        return return_value
+    return mock_coro
+
+
+def _service(context, last_sent=None):
+    return ReminderService(
+        make_async_mock(context), make_async_mock({}),
+        last_sent_map_provider=make_async_mock(last_sent or {}),
+    )
+
+
+def _local(*args):
+    return datetime.datetime(*args).astimezone()
+
+
+@pytest.mark.asyncio
+async def test_idle_user_sleeps_until_next_clock_boundary():
+    """Walked, no critical goals, nothing cooling down → no hourly wakes."""
+    context = {"daily_walk_status": {"has_activity_today": True}, "goal_runway": [], "time_window_start": 13}
+    now = datetime.datetime(2026, 3, 20, 10, 5)
+    assert await _service(context).next_check_at("u1", now=now) == _local(2026, 3, 20, 13, 0)
+
+
+@pytest.mark.asyncio
+async def test_overnight_idle_user_wakes_at_horizon_or_morning(monkeypatch):
+    context = {"daily_walk_status": {"has_activity_today": True}, "goal_runway": []}
+    now = datetime.datetime(2026, 3, 20, 21, 0)
+    assert await _service(context).next_check_at("u1", now=now) == _local(2026, 3, 21, 3, 0)
+    monkeypatch.setenv("MECRIS_REMINDER_PLAN_HORIZON_HOURS", "24")
+    assert await _service(context).next_check_at("u1", now=now) == _local(2026, 3, 21, 8, 0)
+
+
+@pytest.mark.asyncio
+async def test_tier3_onset_is_planned_from_losedate():
+    now = datetime.datetime(2026, 3, 20, 21, 0)
+    losedate = datetime.datetime(2026, 3, 20, 23, 30)
+    context = {
+        "daily_walk_status": {"has_activity_today": True},
+        "goal_runway": [{"slug": "bike", "derail_risk": "CRITICAL", "losedate": int(losedate.timestamp())}],
+    }
+    assert await _service(context).next_check_at("u1", now=now) == _local(2026, 3, 20, 21, 30)
+
+
+@pytest.mark.asyncio
+async def test_cooldown_expiry_is_a_decision_point():
+    now = datetime.datetime(2026, 3, 20, 21, 0)
+    context = {"daily_walk_status": {"has_activity_today": True}, "goal_runway": []}
+    last_sent = {None: datetime.datetime(2026, 3, 20, 20, 50)}
+    assert await _service(context, last_sent).next_check_at("u1", now=now) == _local(2026, 3, 20, 21, 20)
+
+
+@pytest.mark.asyncio
+async def test_unwalked_daytime_user_is_checked_hourly():
+    now = datetime.datetime(2026, 3, 20, 14, 10)
+    context = {"daily_walk_status": {"has_activity_today": False}, "goal_runway": [], "time_window_start": 13}
+    assert await _service(context).next_check_at("u1", now=now) == _local(2026, 3, 20, 15, 0)
+
+
+def test_parse_runway_hours_prefers_losedate():
+    rs = _service({})
+    with patch("services.reminder_service.time.time", return_value=1_000_000):
+        assert rs._parse_runway_hours({"runway": "0 days", "losedate": 1_000_000 + 5400}) == 1.5
+
+
+def test_beeminder_goal_deadline_uses_losedate():
+    from beeminder_client import BeeminderClient
+    client = BeeminderClient.__new__(BeeminderClient)
+    goal = client._parse_goal({"slug": "bike", "safebuf": 0, "losedate": 1774051200})
+    assert goal.losedate == 1774051200
+    assert goal.deadline == datetime.datetime.fromtimestamp(1774051200)
+    assert goal.to_dict()["losedate"] == 1774051200
+
+
+@pytest.mark.asyncio
+async def test_plan_job_rearms_at_next_decision_point():
+    import scheduler as _sched
+    next_at = datetime.datetime(2026, 3, 20, 21, 30, tzinfo=datetime.timezone.utc)
+    fake_mcp = MagicMock()
+    fake_mcp.scheduler.owns_reminder_plan.return_value = True
+    fake_mcp.trigger_reminder_check = AsyncMock(return_value={"triggered": False})
+    fake_mcp.reminder_service.next_check_at = AsyncMock(return_value=next_at)
+    with patch.dict(sys.modules, {"mcp_server": fake_mcp}):
+        await _sched._global_reminder_plan_job("u1")
+    fake_mcp.trigger_reminder_check.assert_awaited_once_with(user_id="u1", apply_fuzz=True)
+    fake_mcp.scheduler.plan_reminder.assert_called_once_with("u1", next_at)
+
+
+@pytest.mark.asyncio
+async def test_plan_job_falls_back_to_poll_interval_on_error():
+    import scheduler as _sched
+    fake_mcp = MagicMock()
+    fake_mcp.scheduler.owns_reminder_plan.return_value = True
+    fake_mcp.trigger_reminder_check = AsyncMock(side_effect=RuntimeError("boom"))
+    with patch.dict(sys.modules, {"mcp_server": fake_mcp}):
+        await _sched._global_reminder_plan_job("u1")
+    (user_id, run_at), _ = fake_mcp.scheduler.plan_reminder.call_args
+    assert user_id == "u1"
+    assert run_at - datetime.datetime.now(datetime.timezone.utc) > datetime.timedelta(minutes=29)
+
+
+@pytest.mark.asyncio
+async def test_start_leader_jobs_seeds_plan_job(monkeypatch):
+    import scheduler as _sched
+    monkeypatch.setenv("MECRIS_REMINDER_PLANNER", "true")
+    s = _sched.MecrisScheduler.__new__(_sched.MecrisScheduler)
+    s.user_id = "u1"
+    s.scheduler = MagicMock()
+    s.scheduler.get_job.return_value = None
+    with patch("ghost.presence.is_human_present", return_value=False):
+        await s._start_leader_jobs()
+    job_ids = [c.kwargs["id"] for c in s.scheduler.add_job.call_args_list]
+    assert "reminder_plan_u1" in job_ids
+    assert "auto_reminder_check_u1" not in job_ids
+
+
+@pytest.mark.asyncio
+async def test_planner_with_fanout_plans_every_due_user(monkeypatch):
+    """Turning the planner on must not drop reminders for tenants other than the leader's own user."""
+    import scheduler as _sched
+    monkeypatch.setenv("MECRIS_REMINDER_PLANNER", "true")
+    monkeypatch.setenv("MECRIS_REMINDER_FANOUT", "true")
+    s = _sched.MecrisScheduler.__new__(_sched.MecrisScheduler)
+    s.user_id = "u1"
+    s.scheduler = MagicMock()
+    s.scheduler.get_job.return_value = None
+    with patch("ghost.presence.is_human_present", return_value=False):
+        await s._start_leader_jobs()
+    # Plans are tenant-wide: the user's own leader registers none of them
+    assert not [c for c in s.scheduler.add_job.call_args_list if "reminder" in c.kwargs["id"]]
+
+    s._start_fanout_jobs()
+    job_ids = [c.kwargs["id"] for c in s.scheduler.add_job.call_args_list]
+    assert "auto_reminder_plan_seed" in job_ids
+    assert "auto_reminder_fanout" not in job_ids
+
+    fake_mcp = MagicMock()
+    fake_mcp.scheduler.is_fanout_leader = True
+    fake_mcp._list_due_reminder_users = AsyncMock(return_value=["u1", "u2", "u3"])
+    with patch.dict(sys.modules, {"mcp_server": fake_mcp}):
+        await _sched._global_reminder_plan_seed_job()
+    planned = [c.args[0] for c in fake_mcp.scheduler.ensure_reminder_plan.call_args_list]
+    assert planned == ["u1", "u2", "u3"]
+
+
+def test_ensure_reminder_plan_keeps_an_existing_plan():
+    import scheduler as _sched
+    s = _sched.MecrisScheduler.__new__(_sched.MecrisScheduler)
+    s.scheduler = MagicMock()
+    s.ensure_reminder_plan("u2")
+    s.scheduler.add_job.assert_not_called()
+    s.scheduler.get_job.return_value = None
+    s.ensure_reminder_plan("u2")
+    assert s.scheduler.add_job.call_args.kwargs["id"] == "reminder_plan_u2"
+
+
+def test_stop_leader_jobs_survives_a_plan_job_that_is_running(monkeypatch):
+    """A firing DateTrigger job is already out of the store; the other jobs must still go."""
+    from apscheduler.jobstores.base import JobLookupError
+    import scheduler as _sched
+    monkeypatch.setenv("MECRIS_REMINDER_PLANNER", "true")
+    s = _sched.MecrisScheduler.__new__(_sched.MecrisScheduler)
+    s.user_id = "u1"
+    s.scheduler = MagicMock()
+    s.scheduler.running = True
+
+    def remove_job(job_id):
+        if job_id == "reminder_plan_u1":
+            raise JobLookupError(job_id)
+    s.scheduler.remove_job.side_effect = remove_job
+
+    s._stop_leader_jobs()
+    removed = [c.args[0] for c in s.scheduler.remove_job.call_args_list]
+    assert removed == ["reminder_plan_u1", "auto_language_sync_u1", "auto_walk_sync_u1",
+                       "auto_cooperative_monitor_u1", "auto_archivist_u1"]
+
+
+@pytest.mark.asyncio
+async def test_plan_job_on_a_non_owner_is_rearmed_not_dropped():
+    import scheduler as _sched
+    fake_mcp = MagicMock()
+    fake_mcp.scheduler.owns_reminder_plan.return_value = False
+    fake_mcp.trigger_reminder_check = AsyncMock()
+    with patch.dict(sys.modules, {"mcp_server": fake_mcp}):
+        await _sched._global_reminder_plan_job("u2")
+    fake_mcp.trigger_reminder_check.assert_not_awaited()
+    fake_mcp.scheduler.owns_reminder_plan.assert_called_once_with("u2")
+    (user_id, run_at), _ = fake_mcp.scheduler.plan_reminder.call_args
+    assert user_id == "u2"
+    assert run_at > datetime.datetime.now(datetime.timezone.utc)
+
+
+def test_plan_ownership_follows_the_fanout_slot(monkeypatch):
+    import scheduler as _sched
+    s = _sched.MecrisScheduler.__new__(_sched.MecrisScheduler)
+    s.user_id, s.is_leader, s.is_fanout_leader = "u1", True, False
+    monkeypatch.setenv("MECRIS_REMINDER_FANOUT", "false")
+    assert s.owns_reminder_plan("u1") is True
+    assert s.owns_reminder_plan("u2") is False
+    monkeypatch.setenv("MECRIS_REMINDER_FANOUT", "true")
+    assert s.owns_reminder_plan("u1") is False
+    s.is_fanout_leader = True
+    assert s.owns_reminder_plan("u2") is True
+
+
+def test_demoting_a_user_leader_keeps_shared_plan_jobs(monkeypatch):
+    import scheduler as _sched
+    monkeypatch.setenv("MECRIS_REMINDER_PLANNER", "true")
+    monkeypatch.setenv("MECRIS_REMINDER_FANOUT", "true")
+    s = _sched.MecrisScheduler.__new__(_sched.MecrisScheduler)
+    s.user_id = "u1"
+    s.scheduler = MagicMock()
+    s.scheduler.running = True
+
+    s._stop_leader_jobs()
+    removed = [c.args[0] for c in s.scheduler.remove_job.call_args_list]
+    assert "auto_reminder_plan_seed" not in removed
+    assert "reminder_plan_u1" not in removed
+
+    s._stop_fanout_jobs()
+    assert s.scheduler.remove_job.call_args.args == ("auto_reminder_plan_seed",)
@@ -1334,3 +1334,57 @@ async def test_smart_nag_provider_failure_falls_back_gracefully():
         # Provider failed gracefully — standard walk_reminder still fires
         assert result["should_send"] is True
         assert result["type"] == "walk_reminder"
+
+
+@pytest.mark.asyncio
+async def test_last_sent_map_loaded_once_per_tick():
+    """With last_sent_map_provider, every cooldown check reads one per-tick map instead of log_provider."""
+    mock_context = {
+        "daily_walk_status": {"has_activity_today": True},
+        "beeminder_alerts": [],
+        "goal_runway": [
+            {"slug": "reviewstack", "title": "Arabic Reviews", "derail_risk": "CRITICAL", "runway": "0 days"}
+        ]
+    }
+    MOCKED_NOW = datetime.datetime(2026, 3, 30, 11, 0, 0)
+    SENT_AT = MOCKED_NOW - datetime.timedelta(hours=1.5)
+    calls = []
+
+    async def mock_map(user_id=None):
+        calls.append(user_id)
+        return {"arabic_review_reminder": SENT_AT, None: SENT_AT}
+
+    async def mock_last_sent(msg_type, user_id=None):
+        raise AssertionError("per-type lookup should not run when the map is available")
+
+    rs = ReminderService(make_async_mock(mock_context), make_async_mock({}), log_provider=mock_last_sent,
+                         last_sent_map_provider=mock_map)
+
+    class MockNow(datetime.datetime):
+        @classmethod
+        def now(cls, *args, **kwargs):
+            return MOCKED_NOW
+
+    with patch('services.reminder_service.datetime', MockNow):
+        result = await rs.check_reminder_needed("u1")
+    assert result["should_send"] is False
+    assert "cooldown" in result.get("reason", "").lower()
+    assert calls == ["u1"]
+
+
+@pytest.mark.asyncio
+async def test_last_sent_map_failure_falls_back_to_log_provider():
+    async def broken_map(user_id=None):
+        raise ConnectionError("neon down")
+
+    seen = []
+
+    async def mock_last_sent(msg_type, user_id=None):
+        seen.append(msg_type)
+        return datetime.datetime.now() - datetime.timedelta(minutes=5)
+
+    rs = ReminderService(make_async_mock({}), make_async_mock({}), log_provider=mock_last_sent,
+                         last_sent_map_provider=broken_map)
+    result = await rs.check_reminder_needed()
+    assert "Global rate limit" in result["reason"]
+    assert seen == [None]
@@ -28,7 +28,7 @@ async def test_scheduler_election_claims_leader(test_scheduler):
     mock_cur.rowcount = 1
     
     # Patch the psycopg2 module and start/stop jobs
-    with patch("scheduler.psycopg2", mock_psycopg2), \
+    with patch("services.neon_pool.psycopg2", mock_psycopg2), \
          patch.object(test_scheduler, "_start_leader_jobs", AsyncMock()) as mock_start:
         
         test_scheduler.neon_url = "postgres://fake"
@@ -54,7 +54,7 @@ async def test_scheduler_election_yields_leader(test_scheduler):
     mock_cur.rowcount = 0
     mock_cur.fetchone.return_value = ("other_process_id", datetime.datetime.now())
 
-    with patch("scheduler.psycopg2", mock_psycopg2), \
+    with patch("services.neon_pool.psycopg2", mock_psycopg2), \
          patch.object(test_scheduler, "_stop_leader_jobs", MagicMock()) as mock_stop:
         
         test_scheduler.neon_url = "postgres://fake"
@@ -132,7 +132,7 @@ class TestWriteObsStatus:
         mock_cur.fetchone.return_value = ("this_process_id", datetime.datetime.now())
         test_scheduler._has_obs_columns = True
 
-        with patch("scheduler.psycopg2", mock_psycopg2), \
+        with patch("services.neon_pool.psycopg2", mock_psycopg2), \
              patch.object(test_scheduler, "_start_leader_jobs", AsyncMock()):
             test_scheduler.neon_url = "postgres://fake"
             test_scheduler.process_id = "this_process_id"
@@ -156,7 +156,7 @@ class TestWriteObsStatus:
         mock_cur.fetchone.return_value = ("other_process_id", datetime.datetime.now())
         test_scheduler._has_obs_columns = True
 
-        with patch("scheduler.psycopg2", mock_psycopg2), \
+        with patch("services.neon_pool.psycopg2", mock_psycopg2), \
              patch.object(test_scheduler, "_stop_leader_jobs", MagicMock()):
             test_scheduler.neon_url = "postgres://fake"
             test_scheduler.process_id = "this_process_id"
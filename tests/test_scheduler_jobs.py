@@ -56,8 +56,10 @@ def _fresh_scheduler(**attrs):
     s.user_id = "u1"
     s.process_id = "pid-test"
     s.is_leader = False
+    s.is_fanout_leader = False
     s.running = False
     s._election_task = None
+    s._fanout_election_task = None
     s._has_obs_columns = None
     s.scheduler = MagicMock()
     for k, v in attrs.items():
@@ -150,7 +152,7 @@ async def test_global_walk_sync_job_non_leader_skips():
     from scheduler import _global_walk_sync_job
     mock_mcp = _mock_mcp(is_leader=False)
     with patch.dict(sys.modules, {"mcp_server": mock_mcp}), \
-         patch("scheduler.psycopg2") as mock_pg:
+         patch("services.neon_pool.psycopg2") as mock_pg:
         await _global_walk_sync_job("u1")
     mock_pg.connect.assert_not_called()
 
@@ -164,7 +166,7 @@ async def test_global_walk_sync_job_no_neon_url_skips():
     env_without_neon = {k: v for k, v in os.environ.items() if k != "NEON_DB_URL"}
     with patch.dict(sys.modules, {"mcp_server": mock_mcp}), \
          patch.dict("os.environ", env_without_neon, clear=True), \
-         patch("scheduler.psycopg2") as mock_pg:
+         patch("services.neon_pool.psycopg2") as mock_pg:
         await _global_walk_sync_job("u1")
     mock_pg.connect.assert_not_called()
 
@@ -183,7 +185,8 @@ async def test_global_walk_sync_job_no_pending_walks_returns_early():
     mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
     mock_conn.cursor.return_value.__enter__.return_value = mock_cur
 
-    with patch.dict(sys.modules, {"mcp_server": mock_mcp, "psycopg2": mock_psycopg2}), \
+    with patch.dict(sys.modules, {"mcp_server": mock_mcp}), \
+         patch("services.neon_pool.psycopg2", mock_psycopg2), \
          patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake"}):
         await _global_walk_sync_job("u1")
 
@@ -236,7 +239,7 @@ async def test_global_cooperative_monitor_job_no_neon_url_skips():
     env_without_neon = {k: v for k, v in os.environ.items() if k != "NEON_DB_URL"}
     with patch.dict(sys.modules, {"mcp_server": mock_mcp}), \
          patch.dict("os.environ", env_without_neon, clear=True), \
-         patch("scheduler.psycopg2") as mock_pg:
+         patch("services.neon_pool.psycopg2") as mock_pg:
         await _global_cooperative_monitor_job("u1")
     mock_pg.connect.assert_not_called()
 
@@ -287,7 +290,7 @@ def test_start_when_not_running_initialises_db_and_scheduler():
 def test_init_db_exception_raises_connection_error():
     """_init_db re-raises psycopg2 failures as ConnectionError."""
     s = _fresh_scheduler()
-    with patch("scheduler.psycopg2.connect", side_effect=Exception("db down")):
+    with patch("services.neon_pool.psycopg2.connect", side_effect=Exception("db down")):
         with pytest.raises(ConnectionError, match="Neon database"):
             s._init_db()
 
@@ -300,7 +303,7 @@ def test_init_db_exception_raises_connection_error():
 async def test_attempt_leadership_no_user_id_returns_early():
     """user_id=None: _attempt_leadership returns without any DB calls."""
     s = _fresh_scheduler(user_id=None)
-    with patch("scheduler.psycopg2.connect") as mock_connect:
+    with patch("services.neon_pool.psycopg2.connect") as mock_connect:
         await s._attempt_leadership()
     mock_connect.assert_not_called()
 
@@ -387,7 +390,7 @@ def test_shutdown_non_leader_skips_neon_cleanup():
     """Non-leader shutdown: no Neon UPDATE; APScheduler.shutdown called."""
     s = _fresh_scheduler(is_leader=False)
     s.scheduler.running = True
-    with patch("scheduler.psycopg2.connect") as mock_connect:
+    with patch("services.neon_pool.psycopg2.connect") as mock_connect:
         s.shutdown()
     mock_connect.assert_not_called()
     s.scheduler.shutdown.assert_called_once()
@@ -402,7 +405,7 @@ def test_shutdown_leader_clears_process_id_in_neon():
     mock_cur = MagicMock()
     mock_psycopg2.connect.return_value.__enter__.return_value = mock_conn
     mock_conn.cursor.return_value.__enter__.return_value = mock_cur
-    with patch("scheduler.psycopg2", mock_psycopg2):
+    with patch("services.neon_pool.psycopg2", mock_psycopg2):
         s.shutdown()
     update_calls = [c for c in mock_cur.execute.call_args_list if "UPDATE" in str(c)]
     assert len(update_calls) == 1
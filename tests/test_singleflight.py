@@ -0,0 +1,99 @@
+"""Tests for services/singleflight.py and its use by the mcp_server caches."""
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.singleflight import SingleFlight, singleflight
+
+
+def _slow(value, delay=0.05):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    fetch.calls = calls
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_for_same_key_share_one_call():
+    flight = SingleFlight("test")
+    fetch = _slow({"goals": []})
+    results = await asyncio.gather(*(flight.do("u1", fetch) for _ in range(5)))
+
+    assert len(fetch.calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"calls": 1, "shared": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_later_calls_are_not_coalesced():
+    flight = SingleFlight("test")
+    fetch = _slow("x", delay=0.01)
+    await asyncio.gather(flight.do("u1", fetch), flight.do("u2", fetch))
+    await flight.do("u1", fetch)
+    assert len(fetch.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_waiter_and_next_call_retries():
+    flight = SingleFlight("test")
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("neon down")
+
+    results = await asyncio.gather(flight.do("u1", boom), flight.do("u1", boom), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert await flight.do("u1", _slow("ok", delay=0)) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight("test")
+    fetch = _slow("ok", delay=0.05)
+    impatient = asyncio.ensure_future(asyncio.wait_for(flight.do("u1", fetch), timeout=0.01))
+    patient = asyncio.ensure_future(flight.do("u1", fetch))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await impatient
+    assert await patient == "ok"
+    assert len(fetch.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_decorator_keys_on_bound_arguments():
+    calls = []
+
+    @singleflight("test_decorator")
+    async def stats(user_id: str = None):
+        calls.append(user_id)
+        await asyncio.sleep(0.01)
+        return user_id
+
+    await asyncio.gather(stats("u1"), stats(user_id="u1"), stats("u2"))
+    assert sorted(calls) == ["u1", "u2"]
+
+
+@pytest.mark.asyncio
+async def test_expired_goal_cache_misses_share_one_beeminder_fetch():
+    sys.modules.pop("mcp_server", None)
+    with patch.dict("os.environ", {"NEON_DB_URL": "postgres://fake", "DEFAULT_USER_ID": "test-user"}), \
+         patch("psycopg2.connect"):
+        import mcp_server
+
+        client = MagicMock()
+        client.get_all_goals = AsyncMock(side_effect=_slow([{"slug": "bike"}]))
+        tracker = MagicMock()
+        tracker.resolve_user_id.return_value = "test-user"
+        with patch("mcp_server.usage_tracker", tracker), \
+             patch("mcp_server.get_user_beeminder_client", return_value=client):
+            results = await asyncio.gather(*(mcp_server.get_cached_beeminder_goals("test-user") for _ in range(3)))
+
+    assert client.get_all_goals.await_count == 1
+    assert all(r == [{"slug": "bike"}] for r in results)
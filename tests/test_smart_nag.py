@@ -1,16 +1,17 @@
 """
 tests/test_smart_nag.py — Unit tests for services/smart_nag.py
 
-Covers: success_probability, evaluate_nag, find_peak_success_window.
+Covers: success_probability, evaluate_nag, find_peak_success_window, WalkHistogram.
 Uses synthetic walk data with a fixed 'now' so tests are deterministic.
 """
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from services.smart_nag import (
     HISTORY_DAYS,
     SUPPRESS_THRESHOLD,
     WINDOW_HOURS,
+    WalkHistogram,
     evaluate_nag,
     find_peak_success_window,
     success_probability,
@@ -174,3 +175,40 @@ def test_peak_returns_sentinel_for_empty_history():
 
     assert peak_hour == -1
     assert peak_prob == 0.0
+
+
+# ── WalkHistogram ────────────────────────────────────────────────────────────
+
+
+def test_histogram_matches_raw_walk_probabilities():
+    """Reducing to per-day hour masks gives the same answers as the raw walk list."""
+    walks = make_walks_at_hour(14, 20) + make_walks_at_hour(9, 5) + make_walks_at_hour(23, 3)
+    walks.append(FIXED_NOW - timedelta(days=HISTORY_DAYS + 2))
+    histogram = WalkHistogram.from_walks(walks, now=FIXED_NOW)
+
+    assert len(histogram.day_masks) <= HISTORY_DAYS
+    for hour in range(24):
+        assert success_probability(histogram, hour) == success_probability(walks, hour, now=FIXED_NOW)
+    assert find_peak_success_window(histogram) == find_peak_success_window(walks, now=FIXED_NOW)
+    assert evaluate_nag(histogram, 16, False) == evaluate_nag(walks, 16, False, now=FIXED_NOW)
+
+
+def test_histogram_add_walk_updates_probabilities():
+    histogram = WalkHistogram.from_walks(make_walks_at_hour(14, 20), now=FIXED_NOW)
+    before = histogram.probabilities()[8]
+    histogram.add_walk("2026-04-21T12:10:00Z")  # 08:10 EDT
+    histogram.add_walk(datetime(2026, 4, 21, 8, 10, tzinfo=timezone(timedelta(hours=-4))))  # same Eastern hour
+
+    assert histogram.day_masks[FIXED_NOW.date()] == (1 << 14) | (1 << 8)
+    assert histogram.probabilities()[8] == pytest.approx(before + 1 / HISTORY_DAYS)
+
+
+def test_histogram_bins_aware_walks_by_eastern_hour():
+    """Walk hours share evaluate_nag's clock (US/Eastern), not UTC, across DST and midnight."""
+    histogram = WalkHistogram()
+    histogram.add_walk("2026-01-15T19:30:00Z")   # 14:30 EST
+    histogram.add_walk("2026-04-21T02:00:00Z")   # 22:00 EDT the previous day
+    assert histogram.day_masks == {
+        datetime(2026, 1, 15).date(): 1 << 14,
+        datetime(2026, 4, 20).date(): 1 << 22,
+    }
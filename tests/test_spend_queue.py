@@ -0,0 +1,202 @@
+"""Tests for services/spend_queue.py: write-behind spend recording with a durable spill file."""
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services import spend_queue as spend_queue_module
+from services.spend_queue import SpendQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    # Huge interval: tests flush explicitly instead of racing the thread
+    q = SpendQueue("postgresql://test", flush_interval=3600, spill_path=str(tmp_path / "spill.jsonl"))
+    yield q
+    q._stopped = True
+    q._wake.set()
+
+
+def _connection(cursor):
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    cm = MagicMock()
+    cm.__enter__.return_value = conn
+    return cm
+
+
+def _governor_row(cost=0.01):
+    return {"user_id": "u1", "bucket": "groq", "cost": cost, "ts": datetime.now(timezone.utc)}
+
+
+def _session_row(user_id="u1", cost=0.5):
+    return {"timestamp": datetime.now(), "model": "claude", "input_tokens": 10, "output_tokens": 5,
+            "estimated_cost": cost, "session_type": "interactive", "notes": "", "user_id": user_id}
+
+
+def test_flush_writes_one_multi_row_insert_per_kind(queue):
+    for _ in range(3):
+        queue.enqueue("governor_spend", _governor_row())
+    queue.enqueue("usage_session", _session_row("u1", 0.5))
+    queue.enqueue("usage_session", _session_row("u1", 0.25))
+
+    cur = MagicMock()
+    with patch("services.neon_pool.get_connection", return_value=_connection(cur)), \
+         patch("psycopg2.extras.execute_values") as execute_values:
+        assert queue.flush() == 5
+
+    sqls = [c.args[1] for c in execute_values.call_args_list]
+    assert "INSERT INTO usage_sessions" in sqls[0]
+    assert "UPDATE budget_tracking" in sqls[1]
+    assert "INSERT INTO budget_governor_spend_log" in sqls[2]
+    assert len(execute_values.call_args_list[2].args[2]) == 3
+    # Budget tracking is decremented once per user for the batch
+    (user_id, spent, _), = execute_values.call_args_list[1].args[2]
+    assert (user_id, spent) == ("u1", pytest.approx(0.75))
+    assert queue.stats()["buffered"] == 0
+
+
+def test_failed_flush_spills_and_next_flush_replays(queue):
+    queue.enqueue("governor_spend", _governor_row(0.02))
+    with patch("services.neon_pool.get_connection", side_effect=ConnectionError("neon down")):
+        assert queue.flush() == 0
+    with open(queue.spill_path) as f:
+        spilled = [json.loads(line) for line in f]
+    assert spilled[0]["kind"] == "governor_spend"
+    assert spilled[0]["row"]["cost"] == 0.02
+
+    queue.enqueue("governor_spend", _governor_row(0.03))
+    cur = MagicMock()
+    with patch("services.neon_pool.get_connection", return_value=_connection(cur)), \
+         patch("psycopg2.extras.execute_values") as execute_values:
+        assert queue.flush() == 2
+    costs = [row[2] for row in execute_values.call_args.args[2]]
+    assert costs == [0.02, 0.03]
+    assert queue.stats()["replayed"] == 1
+
+    # Nothing left to replay
+    with patch("services.neon_pool.get_connection", return_value=_connection(cur)):
+        assert queue.flush() == 0
+
+
+def test_failed_replay_keeps_rows_for_the_next_attempt(queue):
+    queue.enqueue("governor_spend", _governor_row(0.02))
+    with patch("services.neon_pool.get_connection", side_effect=ConnectionError("neon down")):
+        queue.flush()
+        queue.enqueue("governor_spend", _governor_row(0.03))
+        queue.flush()
+
+    with patch("services.neon_pool.get_connection", return_value=_connection(MagicMock())), \
+         patch("psycopg2.extras.execute_values") as execute_values:
+        assert queue.flush() == 2
+    assert sorted(row[2] for row in execute_values.call_args.args[2]) == [0.02, 0.03]
+
+
+def test_full_buffer_spills_instead_of_growing(tmp_path):
+    q = SpendQueue("postgresql://test", max_buffer=2, flush_interval=3600, spill_path=str(tmp_path / "spill.jsonl"))
+    try:
+        for _ in range(3):
+            q.enqueue("governor_spend", _governor_row())
+        assert q.stats()["buffered"] == 2
+        assert q.stats()["spilled"] == 1
+    finally:
+        q._stopped = True
+        q._wake.set()
+
+
+def test_shutdown_flushes_buffer(queue):
+    queue.enqueue("governor_spend", _governor_row())
+    with patch("services.neon_pool.get_connection", return_value=_connection(MagicMock())), \
+         patch("psycopg2.extras.execute_values"):
+        assert queue.shutdown(timeout=1) == 1
+    assert queue._thread is None or not queue._thread.is_alive()
+
+
+def test_governor_record_spend_enqueues_and_counts_locally(monkeypatch):
+    from services.budget_governor import NeonBudgetGovernor
+    monkeypatch.setenv("MECRIS_SPEND_WRITE_BEHIND", "true")
+    with patch("services.budget_governor.NeonBudgetGovernor._init_db"):
+        gov = NeonBudgetGovernor(neon_url="postgresql://test", user_id="u1")
+    fake_queue = MagicMock()
+    with patch("services.budget_governor.get_spend_queue", return_value=fake_queue), \
+         patch.object(gov, "_load_spend_log", return_value=[]) as loader, \
+         patch("services.neon_pool.get_connection") as get_connection:
+        gov._total_spent("groq")
+        gov.record_spend("groq", 0.4)
+        # The same row coming back from Neon is not counted twice
+        kind, row = fake_queue.enqueue.call_args.args
+        loader.return_value = [{"id": 7, **row}]
+        assert gov._total_spent("groq") == pytest.approx(0.4)
+    assert kind == "governor_spend"
+    get_connection.assert_not_called()
+
+
+def test_shutdown_spend_queues_flushes_registered_queues(monkeypatch):
+    fake_queue = MagicMock()
+    monkeypatch.setattr(spend_queue_module, "_queues", {"postgresql://test": fake_queue})
+    spend_queue_module.shutdown_spend_queues()
+    fake_queue.shutdown.assert_called_once()
+
+
+def test_usage_tracker_enqueues_encrypted_session(monkeypatch):
+    from services.encryption_service import EncryptionService
+    from usage_tracker import UsageTracker
+    monkeypatch.setenv("MECRIS_SPEND_WRITE_BEHIND", "true")
+    tracker = UsageTracker.__new__(UsageTracker)
+    tracker.neon_url = "postgresql://test"
+    tracker.user_id = "u1"
+    tracker.use_neon = True
+    tracker.encryption = EncryptionService(key_hex="0" * 64)
+    tracker.pricing = {"claude-3-5-sonnet-20241022": {"input": 3.0 / 1_000_000, "output": 15.0 / 1_000_000}}
+
+    fake_queue = MagicMock()
+    with patch("usage_tracker.get_spend_queue", return_value=fake_queue), \
+         patch.object(UsageTracker, "resolve_user_id", return_value="u1"), \
+         patch("usage_tracker.get_connection") as get_connection:
+        cost = tracker.record_session("claude-3-5-sonnet-20241022", 1000, 100, notes="private", user_id="u1")
+
+    kind, row = fake_queue.enqueue.call_args.args
+    assert kind == "usage_session"
+    assert row["estimated_cost"] == cost
+    assert row["notes"] != "private"
+    get_connection.assert_not_called()
+
+
+def test_data_error_dead_letters_bad_row_and_writes_the_rest(queue):
+    import psycopg2
+    queue.enqueue("usage_session", _session_row(user_id="u1", cost=0.1))
+    queue.enqueue("usage_session", _session_row(user_id="deleted-user", cost=0.2))
+    queue.enqueue("governor_spend", _governor_row(0.03))
+
+    written = []
+
+    def execute_values(cur, sql, rows):
+        if any("deleted-user" in row for row in rows) and "INSERT INTO usage_sessions" in sql:
+            raise psycopg2.IntegrityError("violates foreign key constraint on user_id")
+        written.extend(rows)
+
+    cur = MagicMock()
+    with patch("services.neon_pool.get_connection", return_value=_connection(cur)), \
+         patch("psycopg2.extras.execute_values", side_effect=execute_values):
+        assert queue.flush() == 2
+
+    assert queue.stats()["dead_lettered"] == 1
+    assert queue.stats()["spilled"] == 0
+    with open(f"{queue.spill_path}.dead") as f:
+        dead = [json.loads(line) for line in f]
+    assert dead[0]["row"]["user_id"] == "deleted-user"
+    assert "foreign key" in dead[0]["error"]
+    assert ("u1", 0.03) in [(row[0], row[2]) for row in written if len(row) == 4]
+    executed = [c.args[0] for c in cur.execute.call_args_list]
+    assert "ROLLBACK TO SAVEPOINT spend_row" in executed
+
+
+def test_operational_error_spills_for_retry(queue):
+    import psycopg2
+    queue.enqueue("governor_spend", _governor_row(0.02))
+    with patch("services.neon_pool.get_connection", side_effect=psycopg2.OperationalError("server closed")):
+        assert queue.flush() == 0
+    assert queue.stats()["spilled"] == 1
+    assert queue.stats()["dead_lettered"] == 0
+
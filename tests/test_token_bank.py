@@ -15,7 +15,7 @@ AGENT_ROLE = "Archivist"
 @pytest.fixture
 def mock_psycopg2():
     """Patch psycopg2 in the token_bank module; yield the cursor mock."""
-    with patch("services.token_bank.psycopg2") as mock_pg:
+    with patch("services.neon_pool.psycopg2") as mock_pg:
         mock_conn = MagicMock()
         mock_cur = MagicMock()
         mock_pg.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
@@ -0,0 +1,69 @@
+"""UsageTracker.get_budget_status reads today's and the 7-day spend from usage_daily_rollup."""
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from usage_tracker import UsageTracker
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    with patch("usage_tracker.UsageTracker.init_database"):
+        t = UsageTracker()
+    t.use_neon = True
+    monkeypatch.setattr(t, "resolve_user_id", lambda user_id: user_id)
+    monkeypatch.setattr(UsageTracker, "_daily_rollup_available", True)
+    return t
+
+
+def _budget_connection(cur):
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+    cm = MagicMock()
+    cm.__enter__.return_value = conn
+    return cm
+
+
+def _budget_row():
+    return {"total_budget": 20.0, "remaining_budget": 15.0,
+            "budget_period_end": datetime.date.today() + datetime.timedelta(days=10)}
+
+
+def test_budget_status_reads_daily_rollup(tracker):
+    cur = MagicMock()
+    cur.fetchone.side_effect = [_budget_row(), {"today_spend": 0.5, "week_spend": 3.5}]
+    with patch("usage_tracker.get_connection", return_value=_budget_connection(cur)):
+        status = tracker.get_budget_status("u1")
+
+    assert status["today_spend"] == 0.5
+    assert status["daily_burn_rate"] == 0.5
+    assert cur.execute.call_count == 2
+    assert "usage_daily_rollup" in cur.execute.call_args.args[0]
+
+
+def test_budget_status_falls_back_without_rollup(tracker):
+    import psycopg2.errors
+    cur = MagicMock()
+    cur.execute.side_effect = [None, psycopg2.errors.UndefinedTable("no rollup"), None, None]
+    cur.fetchone.side_effect = [_budget_row(), {"sum": 0.25}, {"sum": 1.4}]
+    with patch("usage_tracker.get_connection", return_value=_budget_connection(cur)):
+        status = tracker.get_budget_status("u1")
+
+    assert status["today_spend"] == 0.25
+    assert UsageTracker._daily_rollup_available is False
+    assert "usage_sessions" in cur.execute.call_args.args[0]
+
+
+def test_rollup_trigger_treats_null_cost_as_zero():
+    """estimated_cost is nullable in the Go schema; total_cost is NOT NULL, so the trigger must COALESCE."""
+    import importlib.util
+    import os
+    path = os.path.join(os.path.dirname(__file__), "..", "scripts", "migrate_usage_daily_rollup.py")
+    spec = importlib.util.spec_from_file_location("migrate_usage_daily_rollup", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    assert "total_cost - COALESCE(OLD.estimated_cost, 0)" in migration.SQL
+    assert "COALESCE(NEW.estimated_cost, 0), 1," in migration.SQL
+    assert "COALESCE(SUM(estimated_cost), 0), COUNT(*)" in migration.SQL
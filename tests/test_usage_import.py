@@ -0,0 +1,102 @@
+"""Bulk usage ingestion: UsageTracker.import_sessions, iter_usage_records and `mecris usage import`."""
+import argparse
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from usage_tracker import UsageTracker, iter_usage_records
+
+
+def _connection(cur):
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+    cm = MagicMock()
+    cm.__enter__.return_value = conn
+    return cm
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    with patch("usage_tracker.UsageTracker.init_database"):
+        t = UsageTracker()
+    t.use_neon = True
+    monkeypatch.setattr(t, "resolve_user_id", lambda user_id: user_id)
+    return t
+
+
+def _session(ts, model="claude-3-5-sonnet-20241022", i=1000, o=100, **extra):
+    return {"timestamp": ts, "model": model, "input_tokens": i, "output_tokens": o, **extra}
+
+
+def test_calculate_costs_matches_calculate_cost(tracker):
+    models = ["claude-3-5-sonnet-20241022", "claude-3-haiku-20240307", "unknown"]
+    ins, outs = [1000, 2000, 3000], [10, 20, 30]
+    assert tracker.calculate_costs(models, ins, outs) == [
+        tracker.calculate_cost(m, i, o) for m, i, o in zip(models, ins, outs)
+    ]
+
+
+def test_import_copies_batches_and_counts_db_duplicates(tracker):
+    cur = MagicMock()
+    cur.rowcount = 1
+    records = [
+        _session("2026-01-01T10:00:00"),
+        _session("2026-01-01T10:00:00"),  # same natural key, dropped in Python
+        _session("2026-01-02T10:00:00", session_cost=0.5),
+        {"model": "no timestamp"},
+    ]
+    with patch("usage_tracker.get_connection", return_value=_connection(cur)):
+        stats = tracker.import_sessions(records, user_id="u1")
+
+    assert stats == {"read": 4, "inserted": 1, "duplicates": 2, "skipped": 1}
+    sql, buf = cur.copy_expert.call_args.args
+    assert "COPY usage_sessions_import" in sql
+    lines = buf.getvalue().splitlines()
+    assert len(lines) == 2
+    assert lines[0].split(",")[4] == str(tracker.calculate_cost("claude-3-5-sonnet-20241022", 1000, 100))
+    assert lines[1].split(",")[4] == "0.5"
+    insert_sql, params = cur.execute.call_args.args
+    assert "NOT EXISTS" in insert_sql
+    assert params == ("u1", "u1")
+
+
+def test_import_splits_into_batches(tracker):
+    cur = MagicMock()
+    cur.rowcount = 2
+    records = [_session(f"2026-01-0{d}T10:00:00") for d in range(1, 6)]
+    with patch("usage_tracker.get_connection", return_value=_connection(cur)):
+        stats = tracker.import_sessions(records, user_id="u1", batch_size=2)
+    assert cur.copy_expert.call_count == 3
+    assert stats["read"] == 5
+
+
+def test_dry_run_does_not_connect(tracker):
+    with patch("usage_tracker.get_connection") as get_connection:
+        stats = tracker.import_sessions([_session("2026-01-01T10:00:00")], user_id="u1", dry_run=True)
+    assert stats["inserted"] == 1
+    get_connection.assert_not_called()
+
+
+def test_iter_usage_records_reads_json_array_and_jsonl(tmp_path):
+    array = tmp_path / "claude_usage.json"
+    array.write_text(json.dumps([{"timestamp": "2026-02-26T08:57:18", "session_cost": 0.01}], indent=2))
+    jsonl = tmp_path / "sessions.jsonl"
+    jsonl.write_text('{"timestamp": "2026-01-01T00:00:00"}\n\nnot json\n{"timestamp": "2026-01-02T00:00:00"}\n')
+
+    assert [r["session_cost"] for r in iter_usage_records(str(array))] == [0.01]
+    assert [r["timestamp"][:10] for r in iter_usage_records(str(jsonl))] == ["2026-01-01", "2026-01-02"]
+
+
+def test_cli_usage_import(tmp_path, capsys):
+    from cli.main import run_usage_import
+    path = tmp_path / "sessions.jsonl"
+    path.write_text('{"timestamp": "2026-01-01T00:00:00"}\n')
+    tracker = MagicMock()
+    tracker.import_sessions.return_value = {"read": 1, "inserted": 1, "duplicates": 0, "skipped": 0}
+    args = argparse.Namespace(path=str(path), user_id="u1", batch_size=10, dry_run=False)
+    with patch("cli.main.credentials_manager.resolve_user_id", return_value="u1"), \
+         patch("usage_tracker.get_tracker", return_value=tracker):
+        assert run_usage_import(args) == 0
+    assert tracker.import_sessions.call_args.kwargs["batch_size"] == 10
+    assert "1 session(s) imported" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+"""Usage summaries come from a single GROUPING SETS scan and accept a since cursor."""
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from usage_tracker import UsageTracker
+from virtual_budget_manager import VirtualBudgetManager
+
+
+def _connection(cur):
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+    cm = MagicMock()
+    cm.__enter__.return_value = conn
+    return cm
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    with patch("usage_tracker.UsageTracker.init_database"):
+        t = UsageTracker()
+    t.use_neon = True
+    monkeypatch.setattr(t, "resolve_user_id", lambda user_id: user_id)
+    return t
+
+
+def test_usage_tracker_summary_single_scan(tracker):
+    d1, d2 = datetime.date(2026, 10, 15), datetime.date(2026, 10, 16)
+    cur = MagicMock()
+    cur.fetchall.return_value = [
+        {"date": d1, "session_type": None, "model": None, "by_date": 0, "by_type": 1, "cost": 1.0, "count": 2},
+        {"date": d2, "session_type": None, "model": None, "by_date": 0, "by_type": 1, "cost": 0.5, "count": 1},
+        {"date": None, "session_type": "interactive", "model": None, "by_date": 1, "by_type": 0, "cost": 1.5, "count": 3},
+        {"date": None, "session_type": None, "model": "sonnet", "by_date": 1, "by_type": 1, "cost": 1.5, "count": 3},
+    ]
+    with patch("usage_tracker.get_connection", return_value=_connection(cur)):
+        summary = tracker.get_usage_summary(7, "u1")
+
+    assert cur.execute.call_count == 1
+    assert "GROUPING SETS" in cur.execute.call_args.args[0]
+    assert [d["date"] for d in summary["daily_usage"]] == ["2026-10-16", "2026-10-15"]
+    assert summary["cursor"] == "2026-10-16"
+    assert summary["total_cost"] == 1.5
+    assert summary["type_breakdown"] == {"interactive": {"cost": 1.5, "count": 3}}
+    assert summary["model_breakdown"] == {"sonnet": {"cost": 1.5, "count": 3}}
+
+
+def test_usage_tracker_summary_since_narrows_window(tracker):
+    cur = MagicMock()
+    cur.fetchall.return_value = []
+    since = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+    with patch("usage_tracker.get_connection", return_value=_connection(cur)):
+        summary = tracker.get_usage_summary(30, "u1", since=since)
+
+    assert cur.execute.call_args.args[1][1] == datetime.datetime.fromisoformat(since)
+    assert summary["since"] == since
+    assert summary["cursor"] == since
+
+
+def test_virtual_budget_summary_single_scan():
+    with patch("virtual_budget_manager.credentials_manager.resolve_user_id", return_value="u1"):
+        vbm = VirtualBudgetManager(user_id="u1")
+    vbm.neon_url = "postgres://fake"
+    vbm.ensure_db_initialized = MagicMock()
+    totals = {"sessions": 2, "input_tokens": 10, "output_tokens": 5, "estimated_cost": 0.3, "total_cost": 0.25}
+    cur = MagicMock()
+    cur.fetchall.return_value = [
+        {"provider": "groq", "date": None, "all_days": 1, **totals},
+        {"provider": "groq", "date": datetime.date(2026, 10, 15), "all_days": 0, **totals, "estimated_cost": 0.1},
+        {"provider": "groq", "date": datetime.date(2026, 10, 16), "all_days": 0, **totals, "estimated_cost": 0.2},
+    ]
+    with patch("virtual_budget_manager.get_connection", return_value=_connection(cur)):
+        summary = vbm.get_usage_summary(7)
+
+    assert cur.execute.call_count == 1
+    assert summary["provider_totals"]["groq"]["sessions"] == 2
+    assert list(summary["daily_breakdown"]) == ["2026-10-16", "2026-10-15"]
+    assert summary["daily_breakdown"]["2026-10-15"] == {"groq": 0.1}
+    assert summary["cursor"] == "2026-10-16"
+    assert summary["total_actual"] == 0.25
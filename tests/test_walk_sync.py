@@ -58,13 +58,7 @@ async def test_global_walk_sync_job_success():
              patch("psycopg2.connect", return_value=mock_conn):
 
             import scheduler
-            # Patch psycopg2 in the scheduler module's namespace
-            with patch.object(scheduler, "psycopg2") as mock_p2:
-                mock_p2.connect.return_value = mock_conn
-                # We need to make sure the RealDictCursor is available if they still try to use it
-                # though we changed the code to not use it for now.
-
-                await scheduler._global_walk_sync_job(user_id)
+            await scheduler._global_walk_sync_job(user_id)
 
             # Verify Beeminder call
             mock_beeminder.add_datapoint.assert_called_once()
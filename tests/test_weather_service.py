@@ -150,7 +150,7 @@ class TestGetWeatherMockAndCache:
             ws = WeatherService()
             first = ws.get_weather()
             # Tamper with cache data to detect whether cache is returned
-            ws._cache["data"]["_marker"] = "cached"
+            ws._cache.get(ws._cache_key)["_marker"] = "cached"
             second = ws.get_weather()
         assert second.get("_marker") == "cached"
 
@@ -158,10 +158,9 @@ class TestGetWeatherMockAndCache:
         """Manually expire the cache; next call should produce fresh data."""
         with patch.dict(os.environ, {"MOCK_WEATHER": "true"}):
             ws = WeatherService()
-            _ = ws.get_weather()
+            first = ws.get_weather()
             # Force expiry
-            ws._cache["expires"] = datetime.now() - timedelta(minutes=1)
-            ws._cache["data"]["_marker"] = "stale"
+            ws._cache.set(ws._cache_key, {**first, "_marker": "stale"}, ttl=-60)
             fresh = ws.get_weather()
         # Fresh mock data won't carry the _marker
         assert fresh.get("_marker") != "stale"
@@ -171,10 +170,7 @@ class TestGetWeatherMockAndCache:
         with patch.dict(os.environ, {"MOCK_WEATHER": "false", "OPENWEATHER_API_KEY": "real_key"}):
             ws = WeatherService()
             # Populate cache but mark as expired
-            ws._cache = {
-                "data": {"temperature": 65.0, "source": "openweather-3.0"},
-                "expires": datetime.now() - timedelta(minutes=5),
-            }
+            ws._cache.set(ws._cache_key, {"temperature": 65.0, "source": "openweather-3.0"}, ttl=-300)
             with patch("services.weather_service.requests.get", side_effect=Exception("timeout")):
                 data = ws.get_weather()
         assert data.get("stale") is True
@@ -7,19 +7,100 @@ Integrated messaging for beemergencies and system alerts
 import os
 import logging
 import json
+import threading
 from twilio.rest import Client
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 logger = logging.getLogger("mecris.twilio")
 
+APPROVED_POOL_PATH = "data/approved_templates.json"
+
+# One Client per credential pair: its HTTP session (and TLS connection) is reused across sends
+_clients: Dict[Tuple[str, str], Client] = {}
+_clients_lock = threading.Lock()
+# {path: (mtime, pool)}; the template pool is re-read only when the file changes
+_template_pools: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _prefs_cache():
+    """{user_id: users row subset from get_user_preferences}; dropped via invalidate_user on profile changes."""
+    from services.cache import get_cache
+    return get_cache("user_prefs", max_size=1024, ttl=600)
+
+
+def get_client(account_sid: str, auth_token: str) -> Client:
+    key = (account_sid, auth_token)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = Client(account_sid, auth_token)
+            _clients[key] = client
+        return client
+
+
+def reset_clients() -> None:
+    with _clients_lock:
+        _clients.clear()
+    _template_pools.clear()
+
+
+def _load_template_pool(path: str = APPROVED_POOL_PATH) -> Dict[str, Any]:
+    """Approved template pool, or {} when the file is missing or unreadable."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    cached = _template_pools.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, 'r') as f:
+            pool = json.load(f)
+    except Exception as e:
+        logger.warning(f"Failed to load approved template pool: {e}")
+        return {}
+    _template_pools[path] = (mtime, pool)
+    return pool
+
+
+def _user_preferences(user_id: str) -> Dict[str, Any]:
+    prefs = _prefs_cache().get(user_id)
+    if prefs is None:
+        from usage_tracker import get_tracker
+        prefs = get_tracker().get_user_preferences(user_id) or {}
+        if prefs:
+            _prefs_cache().set(user_id, prefs)
+    return prefs
+
+
+def _user_phone(user_id: str, user_data: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Decrypted phone number on file for user_id, if any."""
+    if user_data is None:
+        user_data = _user_preferences(user_id)
+    enc_phone = user_data.get("phone_number_encrypted")
+    if not enc_phone:
+        return None
+    try:
+        from services.encryption_service import EncryptionService
+        return EncryptionService().decrypt(enc_phone)
+    except Exception as e:
+        logger.error(f"Failed to decrypt user phone for {user_id}: {e}")
+        return None
+
 def send_sms(message: str, to_number: Optional[str] = None) -> bool:
     """Send SMS via Twilio (DISABLED: requires A2P 10DLC registration which is not active)."""
     logger.error("SMS attempted but DISABLED: No A2P campaign active. SMS will fail and incur costs.")
     return False
 
-def send_whatsapp_template(content_sid: str, variables: Dict[str, str], to_number: Optional[str] = None, user_id: Optional[str] = None) -> bool:
+def _twilio_refused(exc: Exception) -> bool:
+    """Twilio answered 429/5xx (TwilioRestException.status): no message was created."""
+    status = getattr(exc, "status", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def send_whatsapp_template(content_sid: str, variables: Dict[str, str], to_number: Optional[str] = None, user_id: Optional[str] = None, raise_errors: bool = False) -> bool:
     """
     Send a WhatsApp Message Template (Required for starting conversations).
     
@@ -28,6 +109,10 @@ def send_whatsapp_template(content_sid: str, variables: Dict[str, str], to_numbe
         variables: Dictionary of template variables {"1": "65", "2": "Arabic", "3": "Boris & Fiona"}
         to_number: Recipient number
         user_id: User identifier to fetch number from DB
+        raise_errors: Re-raise send exceptions instead of returning False, so the
+            delivery queue can tell a refused connection (safe to retry) from a
+            timeout after Twilio may have accepted the message. Twilio's own
+            429/5xx replies still return False: the message was not created.
     """
     try:
         account_sid = os.getenv('TWILIO_ACCOUNT_SID')
@@ -37,16 +122,7 @@ def send_whatsapp_template(content_sid: str, variables: Dict[str, str], to_numbe
         # 1. Resolve to_number from user_id if provided
         final_to = to_number
         if user_id and not final_to:
-            from usage_tracker import get_tracker
-            user_data = get_tracker().get_user_preferences(user_id)
-            enc_phone = user_data.get("phone_number_encrypted")
-            if enc_phone:
-                try:
-                    from services.encryption_service import EncryptionService
-                    encryption = EncryptionService()
-                    final_to = encryption.decrypt(enc_phone)
-                except Exception as e:
-                    logger.error(f"Failed to decrypt user phone for {user_id}: {e}")
+            final_to = _user_phone(user_id)
         
         # 2. Fallback to env
         final_to = final_to or os.getenv('TWILIO_TO_NUMBER')
@@ -58,7 +134,7 @@ def send_whatsapp_template(content_sid: str, variables: Dict[str, str], to_numbe
         if not final_to.startswith('whatsapp:'):
             final_to = f'whatsapp:{final_to}'
 
-        client = Client(account_sid, auth_token)
+        client = get_client(account_sid, auth_token)
         message_obj = client.messages.create(
             from_=from_number,
             to=final_to,
@@ -69,6 +145,8 @@ def send_whatsapp_template(content_sid: str, variables: Dict[str, str], to_numbe
         return True
     except Exception as e:
         logger.error(f"Failed to send WhatsApp Template: {e}")
+        if raise_errors and not _twilio_refused(e):
+            raise
         return False
 
 def send_message(message: str, to_number: Optional[str] = None, user_id: Optional[str] = None) -> bool:
@@ -81,16 +159,7 @@ def send_message(message: str, to_number: Optional[str] = None, user_id: Optiona
         # 1. Resolve to_number from user_id if provided
         final_to = to_number
         if user_id and not final_to:
-            from usage_tracker import get_tracker
-            user_data = get_tracker().get_user_preferences(user_id)
-            enc_phone = user_data.get("phone_number_encrypted")
-            if enc_phone:
-                try:
-                    from services.encryption_service import EncryptionService
-                    encryption = EncryptionService()
-                    final_to = encryption.decrypt(enc_phone)
-                except Exception as e:
-                    logger.error(f"Failed to decrypt user phone for {user_id}: {e}")
+            final_to = _user_phone(user_id)
         
         # 2. Fallback to env
         final_to = final_to or os.getenv('TWILIO_TO_NUMBER')
@@ -102,7 +171,7 @@ def send_message(message: str, to_number: Optional[str] = None, user_id: Optiona
         if not final_to.startswith('whatsapp:'):
             final_to = f'whatsapp:{final_to}'
         
-        client = Client(account_sid, auth_token)
+        client = get_client(account_sid, auth_token)
         message_obj = client.messages.create(body=message, from_=from_number, to=final_to)
         logger.info(f"WhatsApp message sent: {message_obj.sid}")
         return True
@@ -116,40 +185,24 @@ def smart_send_message(message: str, to_number: Optional[str] = None, user_id: O
     content_sid = os.getenv('TWILIO_WHATSAPP_TEMPLATE_SID')
     
     # Check for approved template pool
-    approved_pool_path = "data/approved_templates.json"
-    if os.path.exists(approved_pool_path):
-        try:
-            with open(approved_pool_path, 'r') as f:
-                pool_data = json.load(f)
-                approved_sids = pool_data.get("approved_sids", [])
-                if approved_sids:
-                    # If current SID not in pool, or no SID set, use first approved
-                    if not content_sid or content_sid not in approved_sids:
-                        content_sid = approved_sids[0]
-                        logger.info(f"Using fallback approved template: {content_sid}")
-        except Exception as e:
-            logger.warning(f"Failed to load approved template pool: {e}")
+    pool_data = _load_template_pool()
+    approved_sids = pool_data.get("approved_sids", [])
+    if approved_sids:
+        # If current SID not in pool, or no SID set, use first approved
+        if not content_sid or content_sid not in approved_sids:
+            content_sid = approved_sids[0]
+            logger.info(f"Using fallback approved template: {content_sid}")
 
-    # Check vacation_mode and phone number from DB if user_id provided
-    from usage_tracker import get_tracker
-    tracker = get_tracker()
-    
     # Defaults
     vacation_mode = False
     target_phone = to_number or os.getenv('TWILIO_TO_NUMBER')
     
+    # Check vacation_mode and phone number from DB if user_id provided
     if user_id:
-        user_data = tracker.get_user_preferences(user_id)
+        user_data = _user_preferences(user_id)
         if user_data:
             # If the phone is encrypted in DB, we need to decrypt it to send
-            enc_phone = user_data.get("phone_number_encrypted")
-            if enc_phone:
-                try:
-                    from services.encryption_service import EncryptionService
-                    encryption = EncryptionService()
-                    target_phone = encryption.decrypt(enc_phone)
-                except Exception as e:
-                    logger.error(f"Failed to decrypt user phone for {user_id}: {e}")
+            target_phone = _user_phone(user_id, user_data) or target_phone
             
             # Fetch vacation mode from specific field or JSONB prefs
             vacation_mode = user_data.get("notification_prefs", {}).get("vacation_mode", False)
@@ -168,14 +221,8 @@ def smart_send_message(message: str, to_number: Optional[str] = None, user_id: O
     
     # Logic: If we have a template SID and we are doing WhatsApp, try that first
     if delivery_method in ['whatsapp', 'both'] and content_sid:
-        # Load template pool to identify mapping
-        template_name = "unknown"
-        if os.path.exists(approved_pool_path):
-            try:
-                with open(approved_pool_path, 'r') as f:
-                    pool_data = json.load(f)
-                    template_name = pool_data.get("approved_templates", {}).get(content_sid, "unknown")
-            except: pass
+        # Template pool identifies the variable mapping
+        template_name = pool_data.get("approved_templates", {}).get(content_sid, "unknown")
 
         import re
         
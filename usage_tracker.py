@@ -6,13 +6,15 @@ we maintain local estimates and allow manual budget updates.
 
 import json
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 import os
 import logging
 
 from services.credentials_manager import credentials_manager
 from services.encryption_service import EncryptionService
+from services.neon_pool import get_connection
+from services.spend_queue import get_spend_queue, write_behind_enabled
 
 logger = logging.getLogger("mecris.usage")
 
@@ -27,6 +29,9 @@ class UsageSession:
     notes: str = ""
 
 class UsageTracker:
+    # Flipped process-wide the first time usage_daily_rollup turns out to be missing
+    _daily_rollup_available = True
+
     def __init__(self, user_id: str = None):
         self.neon_url = os.getenv("NEON_DB_URL")
         self.user_id = credentials_manager.resolve_user_id(user_id)
@@ -82,8 +87,7 @@ class UsageTracker:
 
     def _init_neon(self):
         """Initialize Neon PostgreSQL database."""
-        import psycopg2
-        with psycopg2.connect(self.neon_url) as conn:
+        with get_connection(self.neon_url) as conn:
             with conn.cursor() as cur:
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS usage_sessions (
@@ -155,6 +159,11 @@ class UsageTracker:
                         channel TEXT DEFAULT 'whatsapp'
                     )
                 """)
+                # Serves the per-tick DISTINCT ON (type) last-sent lookup
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_message_log_user_type_sent_at
+                        ON message_log (user_id, type, sent_at DESC)
+                """)
 
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS autonomous_turns (
@@ -198,8 +207,7 @@ class UsageTracker:
             return user_id or self.user_id
             
         try:
-            import psycopg2
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT pocket_id_sub FROM users WHERE familiar_id = %s", (user_id,))
                     row = cur.fetchone()
@@ -221,6 +229,122 @@ class UsageTracker:
         cost = (input_tokens * pricing["input"]) + (output_tokens * pricing["output"])
         return round(cost, 6)
 
+    def calculate_costs(self, models: List[str], input_tokens: List[int], output_tokens: List[int]) -> List[float]:
+        """calculate_cost over a whole batch, looking pricing up once per distinct model."""
+        default = self.pricing["claude-3-5-sonnet-20241022"]
+        rates = {m: self.pricing.get(m, default) for m in set(models)}
+        return [
+            round(i * rates[m]["input"] + o * rates[m]["output"], 6)
+            for m, i, o in zip(models, input_tokens, output_tokens)
+        ]
+
+    def import_sessions(self, records: Iterable[Dict[str, Any]], user_id: str = None,
+                        batch_size: int = 5000, dry_run: bool = False) -> Dict[str, int]:
+        """Bulk-load historical sessions (e.g. from iter_usage_records).
+
+        Each batch is COPYed into a temp table and inserted with one
+        INSERT ... SELECT that skips sessions already present under the natural
+        key (user_id, timestamp, model, input_tokens, output_tokens,
+        session_type), so re-running an import is harmless. Records without a
+        cost get one from the pricing table. budget_tracking is left alone:
+        imported history belongs to past budget periods.
+        """
+        target_user_id = self.resolve_user_id(user_id)
+        stats = {"read": 0, "inserted": 0, "duplicates": 0, "skipped": 0}
+        batch: List[Dict[str, Any]] = []
+        for record in records:
+            stats["read"] += 1
+            session = self._normalize_import(record)
+            if session is None:
+                stats["skipped"] += 1
+                continue
+            batch.append(session)
+            if len(batch) >= batch_size:
+                self._import_batch(batch, target_user_id, stats, dry_run)
+                batch = []
+        if batch:
+            self._import_batch(batch, target_user_id, stats, dry_run)
+        return stats
+
+    @staticmethod
+    def _normalize_import(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map an exported usage record onto usage_sessions columns; None if unusable."""
+        if not isinstance(record, dict) or not record.get("timestamp"):
+            return None
+        try:
+            timestamp = datetime.fromisoformat(str(record["timestamp"]).replace("Z", "+00:00"))
+            cost = next((record[k] for k in ("estimated_cost", "session_cost", "cost") if record.get(k) is not None), None)
+            return {
+                "timestamp": timestamp,
+                "model": record.get("model") or "unknown",
+                "input_tokens": int(record.get("input_tokens") or 0),
+                "output_tokens": int(record.get("output_tokens") or 0),
+                "estimated_cost": None if cost is None else float(cost),
+                "session_type": record.get("session_type") or "import",
+                "notes": record.get("notes") or record.get("description") or "",
+            }
+        except (TypeError, ValueError):
+            return None
+
+    def _import_batch(self, batch: List[Dict[str, Any]], user_id: str, stats: Dict[str, int], dry_run: bool) -> None:
+        import csv
+        import io
+
+        # Drop duplicates inside the batch before touching the database
+        unique: Dict[Tuple, Dict[str, Any]] = {}
+        for s in batch:
+            unique.setdefault((s["timestamp"], s["model"], s["input_tokens"], s["output_tokens"], s["session_type"]), s)
+        stats["duplicates"] += len(batch) - len(unique)
+        rows = list(unique.values())
+
+        missing = [s for s in rows if s["estimated_cost"] is None]
+        costs = self.calculate_costs([s["model"] for s in missing], [s["input_tokens"] for s in missing],
+                                     [s["output_tokens"] for s in missing])
+        for s, cost in zip(missing, costs):
+            s["estimated_cost"] = cost
+
+        if dry_run:
+            stats["inserted"] += len(rows)
+            return
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for s in rows:
+            notes = s["notes"]
+            if notes and self.encryption.aesgcm:
+                notes = self.encryption.encrypt(notes)
+            writer.writerow([s["timestamp"].isoformat(), s["model"], s["input_tokens"], s["output_tokens"],
+                             s["estimated_cost"], s["session_type"], notes])
+        buf.seek(0)
+
+        with get_connection(self.neon_url) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS usage_sessions_import (
+                        timestamp TIMESTAMPTZ, model TEXT, input_tokens INTEGER, output_tokens INTEGER,
+                        estimated_cost DOUBLE PRECISION, session_type TEXT, notes TEXT
+                    ) ON COMMIT DELETE ROWS
+                """)
+                cur.copy_expert("""
+                    COPY usage_sessions_import (timestamp, model, input_tokens, output_tokens, estimated_cost, session_type, notes)
+                    FROM STDIN WITH (FORMAT csv)
+                """, buf)
+                cur.execute("""
+                    INSERT INTO usage_sessions
+                    (timestamp, model, input_tokens, output_tokens, estimated_cost, session_type, notes, user_id)
+                    SELECT i.timestamp, i.model, i.input_tokens, i.output_tokens, i.estimated_cost, i.session_type, i.notes, %s
+                    FROM usage_sessions_import i
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM usage_sessions s
+                        WHERE s.user_id = %s AND s.timestamp = i.timestamp AND s.model = i.model
+                          AND s.input_tokens = i.input_tokens AND s.output_tokens = i.output_tokens
+                          AND s.session_type = i.session_type
+                    )
+                """, (user_id, user_id))
+                inserted = cur.rowcount
+        stats["inserted"] += inserted
+        stats["duplicates"] += len(rows) - inserted
+
     def record_session(self, model: str, input_tokens: int, output_tokens: int, 
                       session_type: str = "interactive", notes: str = "", user_id: str = None) -> float:
         """Record a usage session and return estimated cost."""
@@ -236,11 +360,18 @@ class UsageTracker:
             except Exception as e:
                 logger.error(f"UsageTracker: Failed to encrypt session notes: {e}")
         
+        if self.use_neon and write_behind_enabled():
+            get_spend_queue(self.neon_url).enqueue("usage_session", {
+                "timestamp": now, "model": model, "input_tokens": input_tokens, "output_tokens": output_tokens,
+                "estimated_cost": cost, "session_type": session_type, "notes": stored_notes,
+                "user_id": target_user_id,
+            })
+            return cost
+
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             INSERT INTO usage_sessions 
@@ -261,14 +392,52 @@ class UsageTracker:
 
         raise RuntimeError("UsageTracker: Neon connection not active. Cannot record session.")
 
+    @staticmethod
+    def build_budget_status(budget_info: Dict, today_spend, week_spend) -> Dict:
+        """Derive the budget status dict (burn rate, alerts, health) from raw Neon values.
+
+        Shared by get_budget_status and the asyncpg read path in services/neon_async.py.
+        """
+        total, remaining = budget_info['total_budget'], budget_info['remaining_budget']
+        period_end_val = budget_info['budget_period_end']
+        if isinstance(period_end_val, str):
+            period_end = datetime.fromisoformat(period_end_val.replace('Z', '+00:00'))
+        else:
+            # If it is a date object from the driver
+            period_end = datetime.combine(period_end_val, datetime.min.time())
+            
+        days_remaining = (period_end.date() - date.today()).days
+        
+        daily_burn_rate = week_spend / 7 if week_spend > 0 else 0
+        projected_spend = daily_burn_rate * days_remaining
+        
+        # Generate alerts
+        alerts = []
+        if remaining < 5: alerts.append("LOW_BUDGET")
+        if projected_spend > remaining: alerts.append("BURN_RATE_HIGH")
+        if days_remaining <= 1: alerts.append("PERIOD_ENDING")
+        if today_spend > 2: alerts.append("DAILY_LIMIT_EXCEEDED")
+        
+        return {
+            "total_budget": total,
+            "remaining_budget": remaining,
+            "used_budget": round(total - remaining, 2),
+            "days_remaining": days_remaining,
+            "today_spend": round(today_spend, 4),
+            "daily_burn_rate": round(daily_burn_rate, 4),
+            "projected_spend": round(projected_spend, 4),
+            "period_end": str(budget_info['budget_period_end']),
+            "alerts": alerts,
+            "budget_health": "GOOD" if not alerts else "WARNING" if len(alerts) < 3 else "CRITICAL"
+        }
+
     def get_budget_status(self, user_id: str = None) -> Dict:
         """Get current budget status with alerts."""
         target_user_id = self.resolve_user_id(user_id)
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         cur.execute("SELECT * FROM budget_tracking WHERE user_id = %s", (target_user_id,))
                         budget_info = cur.fetchone()
@@ -276,62 +445,50 @@ class UsageTracker:
                         if not budget_info:
                             return {"error": f"No budget information found for {target_user_id} in Neon"}
                         
-                        total, remaining = budget_info['total_budget'], budget_info['remaining_budget']
-                        period_end_val = budget_info['budget_period_end']
-                        if isinstance(period_end_val, str):
-                            period_end = datetime.fromisoformat(period_end_val.replace('Z', '+00:00'))
-                        else:
-                            # If it is a date object from psycopg2
-                            period_end = datetime.combine(period_end_val, datetime.min.time())
-                            
-                        days_remaining = (period_end.date() - date.today()).days
-                        
-                        # today spend
-                        cur.execute("""
-                            SELECT SUM(estimated_cost) FROM usage_sessions 
-                            WHERE user_id = %s AND (timestamp::TIMESTAMPTZ AT TIME ZONE 'America/New_York')::date = CURRENT_DATE AT TIME ZONE 'America/New_York'
-                        """, (target_user_id,))
-                        today_spend = cur.fetchone()['sum'] or 0
-                        
-                        cur.execute("SELECT SUM(estimated_cost) FROM usage_sessions WHERE user_id = %s AND timestamp > NOW() - INTERVAL '7 days'", (target_user_id,))
-                        week_spend = cur.fetchone()['sum'] or 0
-                        
-                        daily_burn_rate = week_spend / 7 if week_spend > 0 else 0
-                        projected_spend = daily_burn_rate * days_remaining
-                        
-                        # Generate alerts
-                        alerts = []
-                        if remaining < 5: alerts.append("LOW_BUDGET")
-                        if projected_spend > remaining: alerts.append("BURN_RATE_HIGH")
-                        if days_remaining <= 1: alerts.append("PERIOD_ENDING")
-                        if today_spend > 2: alerts.append("DAILY_LIMIT_EXCEEDED")
-                        
-                        return {
-                            "total_budget": total,
-                            "remaining_budget": remaining,
-                            "used_budget": round(total - remaining, 2),
-                            "days_remaining": days_remaining,
-                            "today_spend": round(today_spend, 4),
-                            "daily_burn_rate": round(daily_burn_rate, 4),
-                            "projected_spend": round(projected_spend, 4),
-                            "period_end": str(budget_info['budget_period_end']),
-                            "alerts": alerts,
-                            "budget_health": "GOOD" if not alerts else "WARNING" if len(alerts) < 3 else "CRITICAL"
-                        }
+                        today_spend, week_spend = self._recent_spend(conn, cur, target_user_id)
+                        return self.build_budget_status(budget_info, today_spend, week_spend)
             except Exception as e:
                 logger.error(f"UsageTracker: Neon get_budget_status failed: {e}")
                 raise
 
         raise RuntimeError("UsageTracker: Neon connection not active. Cannot get budget status.")
 
+    def _recent_spend(self, conn, cur, user_id: str) -> Tuple[float, float]:
+        """Today's and the last 7 local days' spend, from usage_daily_rollup when migrated."""
+        if self._daily_rollup_available:
+            import psycopg2
+            try:
+                # A handful of (user_id, day) primary-key rows instead of two scans of usage_sessions
+                cur.execute("""
+                    SELECT COALESCE(SUM(total_cost) FILTER (WHERE day = (NOW() AT TIME ZONE 'America/New_York')::date), 0) AS today_spend,
+                           COALESCE(SUM(total_cost), 0) AS week_spend
+                    FROM usage_daily_rollup
+                    WHERE user_id = %s AND day > (NOW() AT TIME ZONE 'America/New_York')::date - 7
+                """, (user_id,))
+                row = cur.fetchone()
+                return row['today_spend'], row['week_spend']
+            except psycopg2.errors.UndefinedTable:
+                conn.rollback()
+                logger.warning("usage_daily_rollup missing; run scripts/migrate_usage_daily_rollup.py")
+                UsageTracker._daily_rollup_available = False
+
+        cur.execute("""
+            SELECT SUM(estimated_cost) FROM usage_sessions 
+            WHERE user_id = %s AND (timestamp::TIMESTAMPTZ AT TIME ZONE 'America/New_York')::date = CURRENT_DATE AT TIME ZONE 'America/New_York'
+        """, (user_id,))
+        today_spend = cur.fetchone()['sum'] or 0
+
+        cur.execute("SELECT SUM(estimated_cost) FROM usage_sessions WHERE user_id = %s AND timestamp > NOW() - INTERVAL '7 days'", (user_id,))
+        week_spend = cur.fetchone()['sum'] or 0
+        return today_spend, week_spend
+
     def get_recent_sessions(self, limit: int = 10, user_id: str = None) -> List[Dict]:
         """Get the most recent usage sessions."""
         target_user_id = self.resolve_user_id(user_id)
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         cur.execute("""
                             SELECT timestamp, model, input_tokens, output_tokens, estimated_cost, session_type, notes 
@@ -369,9 +526,8 @@ class UsageTracker:
         
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         if total_budget and period_end:
                             cur.execute("""
@@ -406,9 +562,8 @@ class UsageTracker:
         target_user_id = self.resolve_user_id(user_id)
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         cur.execute("""
                             SELECT id, title, description, priority, status, created_at, completed_at, due_date
@@ -441,9 +596,8 @@ class UsageTracker:
         
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         cur.execute("SELECT title FROM goals WHERE id = %s AND user_id = %s", (goal_id, target_user_id))
                         goal = cur.fetchone()
@@ -473,9 +627,8 @@ class UsageTracker:
         
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             INSERT INTO goals (title, description, priority, status, created_at, due_date, user_id)
@@ -497,9 +650,8 @@ class UsageTracker:
         
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             SELECT COUNT(*) FROM alert_log 
@@ -519,9 +671,8 @@ class UsageTracker:
         
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             INSERT INTO alert_log (alert_type, alert_level, message, sent_at, context, user_id)
@@ -545,9 +696,8 @@ class UsageTracker:
 
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor() as cur:
                         cur.execute("""
                             INSERT INTO autonomous_turns 
@@ -566,9 +716,8 @@ class UsageTracker:
         target_user_id = self.resolve_user_id(user_id)
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         cur.execute("""
                             SELECT phone_number_encrypted, timezone, notification_prefs, vacation_mode_until
@@ -584,52 +733,51 @@ class UsageTracker:
                 logger.error(f"UsageTracker: Neon get_user_preferences failed: {e}")
         return {}
 
-    def get_usage_summary(self, days: int = 7, user_id: str = None) -> Dict:
-        """Get usage summary for the last N days."""
+    def get_usage_summary(self, days: int = 7, user_id: str = None, since: Optional[str] = None) -> Dict:
+        """Get usage summary for the last N days.
+
+        All three breakdowns come from one GROUPING SETS scan. Pass the
+        previous response's ``cursor`` as ``since`` (an ISO date) to fetch only
+        that day onward; the breakdowns then cover the same narrower window.
+        """
         target_user_id = self.resolve_user_id(user_id)
         cutoff_date = (datetime.now() - timedelta(days=days))
-        
+        if since:
+            # The cursor day is re-read because it may have gained sessions since
+            cutoff_date = max(cutoff_date, datetime.combine(date.fromisoformat(str(since)[:10]), datetime.min.time()))
+
         if self.use_neon:
             try:
-                import psycopg2
                 from psycopg2.extras import RealDictCursor
-                with psycopg2.connect(self.neon_url) as conn:
+                with get_connection(self.neon_url) as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        # Daily usage
-                        cur.execute("""
-                            SELECT timestamp::date as date, SUM(estimated_cost) as cost
-                            FROM usage_sessions 
-                            WHERE user_id = %s AND timestamp > %s
-                            GROUP BY timestamp::date
-                            ORDER BY date DESC
-                        """, (target_user_id, cutoff_date,))
-                        
-                        daily_usage = [dict(row) for row in cur.fetchall()]
-                        for d in daily_usage:
-                            d['date'] = str(d['date'])
-                        
-                        # Usage by session type
-                        cur.execute("""
-                            SELECT session_type, SUM(estimated_cost) as cost, COUNT(*) as count
-                            FROM usage_sessions 
-                            WHERE user_id = %s AND timestamp > %s
-                            GROUP BY session_type
-                        """, (target_user_id, cutoff_date,))
-                        type_usage = {row['session_type']: {"cost": row['cost'], "count": row['count']} for row in cur.fetchall()}
-                        
-                        # Model breakdown
                         cur.execute("""
-                            SELECT model, SUM(estimated_cost) as cost, COUNT(*) as count
+                            SELECT timestamp::date AS date, session_type, model,
+                                   GROUPING(timestamp::date) AS by_date,
+                                   GROUPING(session_type) AS by_type,
+                                   SUM(estimated_cost) AS cost, COUNT(*) AS count
                             FROM usage_sessions 
-                            WHERE user_id = %s AND timestamp > %s
-                            GROUP BY model
+                            WHERE user_id = %s AND timestamp >= %s
+                            GROUP BY GROUPING SETS ((timestamp::date), (session_type), (model))
                         """, (target_user_id, cutoff_date,))
-                        model_usage = {row['model']: {"cost": row['cost'], "count": row['count']} for row in cur.fetchall()}
-                        
+
+                        daily_usage, type_usage, model_usage = [], {}, {}
+                        # GROUPING() is 0 for the column a row is grouped by
+                        for row in cur.fetchall():
+                            if row['by_date'] == 0:
+                                daily_usage.append({"date": str(row['date']), "cost": row['cost']})
+                            elif row['by_type'] == 0:
+                                type_usage[row['session_type']] = {"cost": row['cost'], "count": row['count']}
+                            else:
+                                model_usage[row['model']] = {"cost": row['cost'], "count": row['count']}
+                        daily_usage.sort(key=lambda d: d['date'], reverse=True)
+
                         total_cost = sum(d['cost'] for d in daily_usage)
                         
                         return {
                             "period_days": days,
+                            "since": cutoff_date.date().isoformat(),
+                            "cursor": daily_usage[0]['date'] if daily_usage else since,
                             "total_cost": round(total_cost, 4),
                             "daily_usage": daily_usage,
                             "type_breakdown": type_usage,
@@ -641,6 +789,34 @@ class UsageTracker:
 
         raise RuntimeError("UsageTracker: Neon connection not active. Cannot get usage summary.")
 
+def iter_usage_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield usage records from a JSON array (claude_usage.json) or a JSONL stream ("-" for stdin)."""
+    import sys
+
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        first = ""
+        while not first:
+            ch = f.read(1)
+            if not ch:
+                return
+            first = ch.strip()
+        if first == "[":
+            yield from json.loads(first + f.read())
+            return
+        # JSONL: stream line by line so large exports never sit in memory
+        line = first + f.readline()
+        while line:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning(f"iter_usage_records: skipping unparseable line in {path}")
+            line = f.readline()
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
 # Global singleton instance
 _tracker_instance = None
 
@@ -11,7 +11,7 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import os
-import psycopg2
+from services.neon_pool import get_connection
 from psycopg2.extras import RealDictCursor
 import logging
 
@@ -75,7 +75,7 @@ class VirtualBudgetManager:
 
     def init_database(self):
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         CREATE TABLE IF NOT EXISTS budget_allocations (
@@ -145,7 +145,7 @@ class VirtualBudgetManager:
         now = datetime.now()
         
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT id FROM budget_allocations WHERE user_id = %s AND period_type = %s AND period_start = %s", (target_user_id, "daily", today))
                     if not cur.fetchone():
@@ -170,7 +170,7 @@ class VirtualBudgetManager:
         self._ensure_daily_budget(target_user_id)
         today = date.today()
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT remaining_amount FROM budget_allocations WHERE user_id = %s AND period_type = %s AND period_start = %s", (target_user_id, "daily", today))
                     res = cur.fetchone()
@@ -198,7 +198,7 @@ class VirtualBudgetManager:
             return {"recorded": False, "reason": "No DB configured"}
             
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("INSERT INTO provider_usage (user_id, provider, model, input_tokens, output_tokens, estimated_cost, timestamp, session_type, notes) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)", (target_user_id, provider.value, model, input_tokens, output_tokens, cost, now, session_type, notes))
                     cur.execute("UPDATE budget_allocations SET remaining_amount = remaining_amount - %s, updated_at = %s WHERE user_id = %s AND period_type = %s AND period_start = %s", (cost, now, target_user_id, "daily", today))
@@ -213,7 +213,7 @@ class VirtualBudgetManager:
         self._ensure_daily_budget(target_user_id)
         today = date.today()
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute("SELECT budget_amount, remaining_amount, updated_at FROM budget_allocations WHERE user_id = %s AND period_type = %s AND period_start = %s", (target_user_id, "daily", today))
                     dbudget = cur.fetchone()
@@ -252,7 +252,7 @@ class VirtualBudgetManager:
         today, now = date.today(), datetime.now()
         tomorrow = today + timedelta(days=1)
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("INSERT INTO budget_allocations (user_id, period_type, budget_amount, remaining_amount, period_start, period_end, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s) ON CONFLICT DO NOTHING", (target_user_id, "daily", self.daily_budget, self.daily_budget, today, tomorrow, now, now))
             return {"reset": True, "new_budget": self.daily_budget, "date": today.isoformat(), "timestamp": now.isoformat()}
@@ -260,23 +260,34 @@ class VirtualBudgetManager:
             logger.error(f"reset_daily_budget failed for {target_user_id}: {e}")
             return {"error": str(e)}
 
-    def get_usage_summary(self, days: int = 7, user_id: str = None) -> Dict:
+    def get_usage_summary(self, days: int = 7, user_id: str = None, since: Optional[str] = None) -> Dict:
+        """Provider totals and daily breakdown from one GROUPING SETS scan; see UsageTracker.get_usage_summary for since/cursor."""
         self.ensure_db_initialized()
         target_user_id = user_id or self.user_id
         if not self.neon_url: return {"error": "Neon DB not configured"}
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        start = datetime.now() - timedelta(days=days)
+        if since:
+            start = max(start, datetime.combine(date.fromisoformat(str(since)[:10]), datetime.min.time()))
+        cutoff = start.isoformat()
         try:
-            with psycopg2.connect(self.neon_url) as conn:
+            with get_connection(self.neon_url) as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute("SELECT provider, COUNT(*) as sessions, SUM(input_tokens) as input_tokens, SUM(output_tokens) as output_tokens, SUM(estimated_cost) as estimated_cost, SUM(CASE WHEN reconciled THEN actual_cost ELSE estimated_cost END) as total_cost FROM provider_usage WHERE user_id = %s AND timestamp > %s GROUP BY provider", (target_user_id, cutoff,))
-                    ptotals = {row["provider"]: dict(row) for row in cur.fetchall()}
-                    cur.execute("SELECT timestamp::date as date, provider, SUM(estimated_cost) as daily_cost FROM provider_usage WHERE user_id = %s AND timestamp > %s GROUP BY timestamp::date, provider ORDER BY date DESC", (target_user_id, cutoff,))
-                    breakdown = {}
+                    cur.execute("""
+                        SELECT provider, timestamp::date AS date, GROUPING(timestamp::date) AS all_days,
+                               COUNT(*) as sessions, SUM(input_tokens) as input_tokens, SUM(output_tokens) as output_tokens,
+                               SUM(estimated_cost) as estimated_cost,
+                               SUM(CASE WHEN reconciled THEN actual_cost ELSE estimated_cost END) as total_cost
+                        FROM provider_usage WHERE user_id = %s AND timestamp >= %s
+                        GROUP BY GROUPING SETS ((provider), (timestamp::date, provider))
+                    """, (target_user_id, cutoff,))
+                    ptotals, breakdown = {}, {}
                     for row in cur.fetchall():
-                        d = str(row["date"])
-                        if d not in breakdown: breakdown[d] = {}
-                        breakdown[d][row["provider"]] = row["daily_cost"]
-                    return {"period_days": days, "provider_totals": ptotals, "daily_breakdown": breakdown, "total_estimated": sum(p["estimated_cost"] for p in ptotals.values()), "total_actual": sum(p["total_cost"] for p in ptotals.values())}
+                        if row["all_days"]:
+                            ptotals[row["provider"]] = {k: row[k] for k in ("provider", "sessions", "input_tokens", "output_tokens", "estimated_cost", "total_cost")}
+                        else:
+                            breakdown.setdefault(str(row["date"]), {})[row["provider"]] = row["estimated_cost"]
+                    breakdown = dict(sorted(breakdown.items(), reverse=True))
+                    return {"period_days": days, "since": start.date().isoformat(), "cursor": next(iter(breakdown), since), "provider_totals": ptotals, "daily_breakdown": breakdown, "total_estimated": sum(p["estimated_cost"] for p in ptotals.values()), "total_actual": sum(p["total_cost"] for p in ptotals.values())}
         except Exception as e:
             logger.error(f"get_usage_summary failed for {target_user_id}: {e}")
             return {"error": str(e)}